@@ -9,6 +9,7 @@ from typing import List, Dict, Any, Optional
 import logging
 import json
 import os
+import asyncio
 from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
@@ -184,11 +185,11 @@ async def get_analytics_summary(
         Summary with counts and breakdowns
     """
     try:
-        # Get all services and their questionnaire status
-        services_status = await get_all_services_status(lot, gcloud_version)
-        
-        # Get all questionnaire responses
-        all_responses = await get_all_questionnaire_responses(lot, gcloud_version)
+        # Get all services and their questionnaire status, and all questionnaire responses
+        services_status, all_responses = await asyncio.gather(
+            get_all_services_status(lot, gcloud_version),
+            get_all_questionnaire_responses(lot, gcloud_version)
+        )
         
         # Aggregate by section and question
         sections_analytics = await aggregate_responses_by_section(all_responses, lot, gcloud_version)
@@ -337,8 +338,8 @@ async def seed_questionnaire_data():
                 }
                 
                 if use_azure:
-                    from app.services.azure_blob_service import AzureBlobService
-                    azure_blob_service = AzureBlobService()
+                    from app.services.azure_blob_service import get_azure_blob_service
+                    azure_blob_service = get_azure_blob_service()
                     
                     blob_key = f"GCloud {service['gcloud_version']}/PA Services/Cloud Support Services LOT {service['lot']}/{service['service_name']}/questionnaire_responses.json"
                     
@@ -395,6 +396,43 @@ async def seed_questionnaire_data():
         raise HTTPException(status_code=500, detail=f"Error seeding data: {str(e)}")
 
 
+async def _list_lot(storage, gcloud_version: str, lot_val: str):
+    """Service folder names and questionnaire response keys in one LOT"""
+    base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot_val}/"
+    service_folders = set()
+    response_keys = {}
+    for blob in await storage.list(base_prefix):
+        # Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{folder}/{filename}
+        parts = blob.name.split('/')
+        if len(parts) >= 5:
+            service_folders.add(parts[3])
+            if parts[4] == 'questionnaire_responses.json':
+                response_keys[parts[3]] = blob.name
+    return service_folders, response_keys
+
+
+async def _load_lot_responses(storage, gcloud_version: str, lot_val: str):
+    """
+    Service folders of a LOT with their parsed questionnaire responses
+
+    Response files are fetched concurrently; one that cannot be read or parsed
+    maps to its exception.
+    """
+    service_folders, response_keys = await _list_lot(storage, gcloud_version, lot_val)
+    names = sorted(response_keys)
+    contents = await storage.get_many([response_keys[name] for name in names])
+    responses = {}
+    for service_name, content in zip(names, contents):
+        if isinstance(content, Exception):
+            responses[service_name] = content
+            continue
+        try:
+            responses[service_name] = json.loads(content.decode('utf-8'))
+        except Exception as e:
+            responses[service_name] = e
+    return service_folders, responses
+
+
 async def get_all_services_status(
     lot: Optional[str],
     gcloud_version: str
@@ -405,129 +443,55 @@ async def get_all_services_status(
     Returns:
         List of ServiceStatus objects
     """
+    from app.services.async_storage import get_async_storage
+    storage = get_async_storage()
     services_status = []
     
-    # Check if we're in Azure
-    use_azure = bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
+    lots_to_check = [lot] if lot else ["2a", "2b", "3"]
+    lot_results = await asyncio.gather(*(_load_lot_responses(storage, gcloud_version, lot_val) for lot_val in lots_to_check))
     
-    if use_azure:
-        from app.services.azure_blob_service import AzureBlobService
-        azure_blob_service = AzureBlobService()
-        
-        # Get all service folders
-        lots_to_check = [lot] if lot else ["2a", "2b", "3"]
-        
-        for lot_val in lots_to_check:
-            base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot_val}/"
-            blob_list = azure_blob_service.list_blobs(prefix=base_prefix)
-            
-            # Extract unique service folder names
-            service_folders = set()
-            for blob_name in blob_list:
-                parts = blob_name.split('/')
-                if len(parts) >= 4:
-                    service_folders.add(parts[3])
+    for lot_val, (service_folders, responses) in zip(lots_to_check, lot_results):
+        # Check each service for questionnaire responses
+        for service_name in sorted(service_folders):
+            has_responses = service_name in responses
+            is_draft = True
+            is_locked = False
+            last_updated = None
             
-            # Check each service for questionnaire responses
-            for service_name in service_folders:
-                response_blob = f"{base_prefix}{service_name}/questionnaire_responses.json"
-                
-                has_responses = azure_blob_service.blob_exists(response_blob)
-                is_draft = True
-                is_locked = False
-                last_updated = None
-                
-                if has_responses:
-                    try:
-                        json_bytes = azure_blob_service.get_file_bytes(response_blob)
-                        response_data = json.loads(json_bytes.decode('utf-8'))
-                        is_draft = response_data.get('is_draft', True)
-                        is_locked = response_data.get('is_locked', False)
-                        last_updated = response_data.get('updated_at')
-                        
-                        # Calculate completion percentage
-                        answers = response_data.get('answers', [])
-                        parser = get_parser()
-                        if parser:
-                            questions = parser.parse_questions_for_lot(lot_val)
-                            total_questions = sum(len(q_list) for q_list in questions.values())
-                            completion_percentage = (len(answers) / total_questions * 100) if total_questions > 0 else 0
-                        else:
-                            completion_percentage = 100 if not is_draft else 50
-                    except Exception as e:
-                        logger.warning(f"Failed to parse questionnaire for {service_name}: {e}")
-                        completion_percentage = 0
-                else:
+            if has_responses:
+                try:
+                    response_data = responses[service_name]
+                    if isinstance(response_data, Exception):
+                        raise response_data
+                    is_draft = response_data.get('is_draft', True)
+                    is_locked = response_data.get('is_locked', False)
+                    last_updated = response_data.get('updated_at')
+                    
+                    # Calculate completion percentage
+                    answers = response_data.get('answers', [])
+                    parser = get_parser()
+                    if parser:
+                        questions = parser.parse_questions_for_lot(lot_val)
+                        total_questions = sum(len(q_list) for q_list in questions.values())
+                        completion_percentage = (len(answers) / total_questions * 100) if total_questions > 0 else 0
+                    else:
+                        completion_percentage = 100 if not is_draft else 50
+                except Exception as e:
+                    logger.warning(f"Failed to parse questionnaire for {service_name}: {e}")
                     completion_percentage = 0
-                
-                services_status.append(ServiceStatus(
-                    service_name=service_name,
-                    lot=lot_val,
-                    gcloud_version=gcloud_version,
-                    has_responses=has_responses,
-                    is_draft=is_draft,
-                    is_locked=is_locked,
-                    completion_percentage=completion_percentage,
-                    last_updated=last_updated
-                ))
-    else:
-        # Local filesystem
-        from sharepoint_service.mock_sharepoint import MOCK_BASE_PATH
-        
-        lots_to_check = [lot] if lot else ["2a", "2b", "3"]
-        
-        for lot_val in lots_to_check:
-            base_path = MOCK_BASE_PATH / f"GCloud {gcloud_version}" / "PA Services" / f"Cloud Support Services LOT {lot_val}"
-            
-            if not base_path.exists():
-                continue
+            else:
+                completion_percentage = 0
             
-            # Get all service folders
-            for service_folder in base_path.iterdir():
-                if not service_folder.is_dir():
-                    continue
-                
-                service_name = service_folder.name
-                response_path = service_folder / "questionnaire_responses.json"
-                
-                has_responses = response_path.exists()
-                is_draft = True
-                is_locked = False
-                last_updated = None
-                
-                if has_responses:
-                    try:
-                        with open(response_path, 'r', encoding='utf-8') as f:
-                            response_data = json.load(f)
-                        is_draft = response_data.get('is_draft', True)
-                        is_locked = response_data.get('is_locked', False)
-                        last_updated = response_data.get('updated_at')
-                        
-                        # Calculate completion percentage
-                        answers = response_data.get('answers', [])
-                        parser = get_parser()
-                        if parser:
-                            questions = parser.parse_questions_for_lot(lot_val)
-                            total_questions = sum(len(q_list) for q_list in questions.values())
-                            completion_percentage = (len(answers) / total_questions * 100) if total_questions > 0 else 0
-                        else:
-                            completion_percentage = 100 if not is_draft else 50
-                    except Exception as e:
-                        logger.warning(f"Failed to parse questionnaire for {service_name}: {e}")
-                        completion_percentage = 0
-                else:
-                    completion_percentage = 0
-                
-                services_status.append(ServiceStatus(
-                    service_name=service_name,
-                    lot=lot_val,
-                    gcloud_version=gcloud_version,
-                    has_responses=has_responses,
-                    is_draft=is_draft,
-                    is_locked=is_locked,
-                    completion_percentage=completion_percentage,
-                    last_updated=last_updated
-                ))
+            services_status.append(ServiceStatus(
+                service_name=service_name,
+                lot=lot_val,
+                gcloud_version=gcloud_version,
+                has_responses=has_responses,
+                is_draft=is_draft,
+                is_locked=is_locked,
+                completion_percentage=completion_percentage,
+                last_updated=last_updated
+            ))
     
     return services_status
 
@@ -542,65 +506,21 @@ async def get_all_questionnaire_responses(
     Returns:
         List of response dictionaries
     """
+    from app.services.async_storage import get_async_storage
+    storage = get_async_storage()
     all_responses = []
     
-    # Check if we're in Azure
-    use_azure = bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
+    lots_to_check = [lot] if lot else ["2a", "2b", "3"]
+    lot_results = await asyncio.gather(*(_load_lot_responses(storage, gcloud_version, lot_val) for lot_val in lots_to_check))
     
-    if use_azure:
-        from app.services.azure_blob_service import AzureBlobService
-        azure_blob_service = AzureBlobService()
-        
-        lots_to_check = [lot] if lot else ["2a", "2b", "3"]
-        
-        for lot_val in lots_to_check:
-            base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot_val}/"
-            blob_list = azure_blob_service.list_blobs(prefix=base_prefix)
-            
-            # Find all questionnaire_responses.json files
-            for blob_name in blob_list:
-                if blob_name.endswith('questionnaire_responses.json'):
-                    try:
-                        json_bytes = azure_blob_service.get_file_bytes(blob_name)
-                        response_data = json.loads(json_bytes.decode('utf-8'))
-                        
-                        # Extract service name from blob path
-                        parts = blob_name.split('/')
-                        service_name = parts[3] if len(parts) > 3 else 'Unknown'
-                        
-                        response_data['service_name'] = service_name
-                        response_data['lot'] = lot_val
-                        all_responses.append(response_data)
-                    except Exception as e:
-                        logger.warning(f"Failed to load questionnaire from {blob_name}: {e}")
-    else:
-        # Local filesystem
-        from sharepoint_service.mock_sharepoint import MOCK_BASE_PATH
-        
-        lots_to_check = [lot] if lot else ["2a", "2b", "3"]
-        
-        for lot_val in lots_to_check:
-            base_path = MOCK_BASE_PATH / f"GCloud {gcloud_version}" / "PA Services" / f"Cloud Support Services LOT {lot_val}"
-            
-            if not base_path.exists():
+    for lot_val, (_, responses) in zip(lots_to_check, lot_results):
+        for service_name, response_data in sorted(responses.items()):
+            if isinstance(response_data, Exception):
+                logger.warning(f"Failed to load questionnaire for {service_name}: {response_data}")
                 continue
-            
-            for service_folder in base_path.iterdir():
-                if not service_folder.is_dir():
-                    continue
-                
-                response_path = service_folder / "questionnaire_responses.json"
-                
-                if response_path.exists():
-                    try:
-                        with open(response_path, 'r', encoding='utf-8') as f:
-                            response_data = json.load(f)
-                        
-                        response_data['service_name'] = service_folder.name
-                        response_data['lot'] = lot_val
-                        all_responses.append(response_data)
-                    except Exception as e:
-                        logger.warning(f"Failed to load questionnaire from {response_path}: {e}")
+            response_data['service_name'] = service_name
+            response_data['lot'] = lot_val
+            all_responses.append(response_data)
     
     return all_responses
 
@@ -1,14 +1,18 @@
 """Proposals API routes"""
 
 from fastapi import APIRouter, HTTPException, Header, Query
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from pathlib import Path
 from datetime import datetime
 import os
+import json
 import shutil
+import asyncio
 import logging
 
+from app.utils.identity import canonical_name, canonical_names
+
 logger = logging.getLogger(__name__)
 
 # Lazy import for Lambda compatibility
@@ -115,18 +119,199 @@ def extract_name_from_email(email: str) -> str:
     return name
 
 
-def get_proposals_by_owner(owner_name: str) -> List[dict]:
+LOCAL_LOTS = ("2", "2a", "2b", "3")
+
+
+def _get_local_catalog():
+    """Catalog of the local mock SharePoint tree, or None when there is none"""
+    if not MOCK_BASE_PATH or not MOCK_BASE_PATH.exists():
+        return None
+    try:
+        from sharepoint_service.mock_sharepoint import get_mock_catalog
+    except ImportError:
+        from app.sharepoint_service.mock_sharepoint import get_mock_catalog
+    return get_mock_catalog(MOCK_BASE_PATH)
+
+
+def _proposal_from_local_folder(folder) -> dict:
+    """
+    Build a proposal summary from a catalogued local service folder.
+    
+    Args:
+        folder: FolderRecord with parsed metadata
+        
+    Returns:
+        Proposal dict as returned by the dashboard endpoints
+    """
+    metadata = folder.metadata
+    service_name = metadata.get('service', folder.name)
+    gcloud_version = folder.gcloud_version
+    lot_num = folder.lot
+    
+    # Regular or draft documents, with mtimes recorded by the catalog
+    service_desc_path = folder.document("SERVICE DESC")
+    pricing_doc_path = folder.document("Pricing Doc")
+    service_desc_exists = service_desc_path is not None
+    pricing_doc_exists = pricing_doc_path is not None
+    mtimes = [folder.files[path.name] for path in (service_desc_path, pricing_doc_path) if path is not None]
+    last_update = max(mtimes) if mtimes else None
+    
+    # Determine status
+    if service_desc_exists and pricing_doc_exists:
+        status = "complete"
+        completion_percentage = 100.0
+    elif service_desc_exists or pricing_doc_exists:
+        status = "incomplete"
+        completion_percentage = 50.0
+    else:
+        status = "draft"
+        completion_percentage = 0.0
+    
+    # Format last update
+    last_update_str = None
+    if last_update:
+        last_update_str = datetime.fromtimestamp(last_update).isoformat()
+    
+    # Create proposal ID from service name and gcloud version
+    proposal_id = f"{service_name}_{gcloud_version}_{lot_num}".replace(" ", "_").lower()
+    
+    return {
+        "id": proposal_id,
+        "title": service_name,
+        "framework_version": f"G-Cloud {gcloud_version}",
+        "gcloud_version": gcloud_version,
+        "lot": lot_num,
+        "status": status,
+        "completion_percentage": completion_percentage,
+        "section_count": 2,  # SERVICE DESC and Pricing Doc
+        "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
+        "created_at": last_update_str or datetime.now().isoformat(),
+        "updated_at": last_update_str or datetime.now().isoformat(),
+        "last_update": last_update_str,
+        "service_desc_exists": service_desc_exists,
+        "pricing_doc_exists": pricing_doc_exists,
+        "owner": metadata.get('owner', '').strip(),
+        "sponsor": metadata.get('sponsor', ''),
+    }
+
+
+def _catalog_proposals(owner: Optional[str] = None, aliases: Optional[List[str]] = None) -> Optional[List[dict]]:
+    """
+    Proposals from the persistent proposal catalog.
+    
+    Args:
+        owner: Only this owner's proposals (all owners when None)
+        aliases: Other identities of the owner (e.g. email address)
+        
+    Returns:
+        List of proposals, or None when the catalog is off or unavailable (scan storage instead)
+    """
+    try:
+        from app.services.proposal_catalog import get_proposal_catalog
+        catalog = get_proposal_catalog()
+        if catalog is not None:
+            return catalog.proposals(owner=owner, aliases=aliases or [])
+    except Exception as e:
+        logger.warning(f"Proposal catalog unavailable, scanning storage: {e}")
+    return None
+
+
+def _parse_metadata_blob(blob_name: str, content: bytes) -> Dict[str, str]:
+    """Parse a metadata.json or legacy OWNER *.txt metadata file"""
+    if blob_name.endswith('.json'):
+        return json.loads(content.decode('utf-8'))
+    metadata = {}
+    for line in content.decode('utf-8').split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip().lstrip('0123456789. ').strip()
+            value = value.strip()
+            if key:
+                metadata[key.lower().replace(' ', '_')] = value
+    return metadata
+
+
+async def _azure_service_folders(accept_json: bool) -> List[Tuple[str, str, str, list, Dict[str, str]]]:
+    """
+    Service folders in Azure Blob Storage with their parsed metadata.
+    
+    Folders come from the blob listing index; their metadata files are then
+    fetched concurrently through the async storage interface.
+    
+    Args:
+        accept_json: Use metadata.json files as well as OWNER *.txt files
+        
+    Returns:
+        (gcloud_version, lot, folder_name, blobs, metadata) for each folder with readable metadata
+    """
+    from app.services.async_storage import get_async_storage
+    storage = get_async_storage()
+    
+    # Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service_folder}/{filename}
+    lots = [(gcloud_version, lot) for gcloud_version in ["14", "15"] for lot in LOCAL_LOTS]
+    listings = await asyncio.gather(*(
+        storage.list(f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/")
+        for gcloud_version, lot in lots
+    ))
+    
+    candidates = []
+    for (gcloud_version, lot), blob_list in zip(lots, listings):
+        # Group blobs by folder (service_folder)
+        service_folders = {}
+        for blob in blob_list:
+            parts = blob.name.split('/')
+            if len(parts) >= 4:
+                service_folders.setdefault(parts[3], []).append(blob)
+        
+        for folder_name, blobs in service_folders.items():
+            # Look for metadata file (metadata.json or OWNER *.txt)
+            metadata_blob = None
+            for blob in blobs:
+                if accept_json and 'metadata.json' in blob.name:
+                    metadata_blob = blob.name
+                    break
+                elif blob.name.endswith('.txt') and 'OWNER' in blob.name:
+                    metadata_blob = blob.name
+                    break
+            if metadata_blob:
+                candidates.append((gcloud_version, lot, folder_name, blobs, metadata_blob))
+    
+    contents = await storage.get_many([candidate[4] for candidate in candidates])
+    folders = []
+    for (gcloud_version, lot, folder_name, blobs, metadata_blob), content in zip(candidates, contents):
+        try:
+            if isinstance(content, Exception):
+                raise content
+            metadata = _parse_metadata_blob(metadata_blob, content)
+        except Exception as e:
+            logger.warning(f"Error processing metadata blob {metadata_blob}: {e}")
+            continue
+        folders.append((gcloud_version, lot, folder_name, blobs, metadata))
+    return folders
+
+
+async def get_proposals_by_owner(owner_name: str, aliases: Optional[List[str]] = None) -> List[dict]:
     """
     Get all proposals where OWNER matches the given owner name.
     Works with both local (mock_sharepoint) and S3 storage.
     
+    Names are compared by canonical form (case, whitespace, accents, dotted email
+    forms and "Lastname, Firstname" are ignored).
+    
     Args:
         owner_name: Owner name to match (e.g., "Firstname Lastname")
+        aliases: Other identities of the same user (e.g., their email address)
         
     Returns:
         List of proposals with metadata
     """
+    # Indexed query when the proposal catalog is enabled
+    catalogued = _catalog_proposals(owner=owner_name, aliases=aliases)
+    if catalogued is not None:
+        return catalogued
+    
     proposals = []
+    owner_keys = canonical_names([owner_name, *(aliases or [])])
     
     # Import SharePoint service functions (switches between local and S3)
     try:
@@ -147,59 +332,26 @@ def get_proposals_by_owner(owner_name: str) -> List[dict]:
         # Search through both GCloud 14 and 15
         for gcloud_version in ["14", "15"]:
             try:
-                folders = list_all_folders(gcloud_version)
+                folders = await asyncio.to_thread(list_all_folders, gcloud_version)
                 
                 for folder in folders:
                     service_name = folder.get('service_name', '')
                     lot = folder.get('lot', '2')
                     folder_owner = folder.get('owner', '')
                     
-                    # Check if owner matches (case-insensitive)
-                    if folder_owner.lower() != owner_name.lower():
+                    # Check if owner matches (canonical names)
+                    if canonical_name(folder_owner) not in owner_keys:
                         continue
                     
                     folder_path = folder.get('folder_path', '')
                     if folder_path:
-                        metadata = read_metadata_file(folder_path)
-                        if metadata and metadata.get('owner', '').lower() == owner_name.lower():
-                            # Check if documents exist
-                            service_desc_exists = False
-                            pricing_doc_exists = False
-                            last_update = None
-                            
-                            if get_document_path:
-                                # Check SERVICE DESC
-                                service_desc_path = get_document_path(service_name, "SERVICE DESC", lot, gcloud_version)
-                                if service_desc_path:
-                                    service_desc_exists = True
-                                    # Get S3 object last modified time
-                                    try:
-                                        import boto3
-                                        s3_client = boto3.client('s3')
-                                        bucket_name = os.environ.get('SHAREPOINT_BUCKET_NAME', '')
-                                        if bucket_name:
-                                            obj_response = s3_client.head_object(Bucket=bucket_name, Key=service_desc_path)
-                                            last_update = obj_response['LastModified'].isoformat()
-                                    except Exception as e:
-                                        logger.warning(f"Could not get S3 object timestamp: {e}")
-                                        last_update = datetime.now().isoformat()
-                                
-                                # Check Pricing Doc
-                                pricing_doc_path = get_document_path(service_name, "Pricing Doc", lot, gcloud_version)
-                                if pricing_doc_path:
-                                    pricing_doc_exists = True
-                                    # Update last_update if pricing doc is newer
-                                    try:
-                                        import boto3
-                                        s3_client = boto3.client('s3')
-                                        bucket_name = os.environ.get('SHAREPOINT_BUCKET_NAME', '')
-                                        if bucket_name:
-                                            obj_response = s3_client.head_object(Bucket=bucket_name, Key=pricing_doc_path)
-                                            pricing_update = obj_response['LastModified'].isoformat()
-                                            if not last_update or pricing_update > last_update:
-                                                last_update = pricing_update
-                                    except Exception:
-                                        pass
+                        # list_all_folders already parsed the metadata file
+                        metadata = folder
+                        if metadata and canonical_name(metadata.get('owner', '')) in owner_keys:
+                            # Document existence and last modified time come from the same folder scan
+                            service_desc_exists = bool(folder.get('service_desc_key'))
+                            pricing_doc_exists = bool(folder.get('pricing_doc_key'))
+                            last_update = folder.get('last_modified')
                             
                             # Determine status
                             if service_desc_exists and pricing_doc_exists:
@@ -244,152 +396,71 @@ def get_proposals_by_owner(owner_name: str) -> List[dict]:
     # If using Azure, use Azure Blob Storage
     if use_azure:
         try:
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
-            
-            # Search in SharePoint folder structure
-            # Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service_folder}/{filename}
-            for gcloud_version in ["14", "15"]:
-                for lot in ["2", "2a", "2b", "3"]:
-                    base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
-                    blob_list = azure_blob_service.list_blobs(prefix=base_prefix)
-                    
-                    # Group blobs by folder (service_folder)
-                    service_folders = {}
-                    for blob_name in blob_list:
-                        # Extract folder name from blob path
-                        # Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{folder}/{filename}
-                        parts = blob_name.split('/')
-                        if len(parts) >= 4:
-                            folder_name = parts[3]
-                            if folder_name not in service_folders:
-                                service_folders[folder_name] = []
-                            service_folders[folder_name].append(blob_name)
-                    
-                    # Check each service folder
-                    for folder_name, blob_names in service_folders.items():
-                        # Look for metadata file (metadata.json or OWNER *.txt)
-                        metadata_blob = None
-                        metadata_format = None  # 'json' or 'txt'
-                        
-                        for blob_name in blob_names:
-                            # Check for metadata.json (can be at end or in path)
-                            if 'metadata.json' in blob_name or blob_name.endswith('/metadata.json'):
-                                metadata_blob = blob_name
-                                metadata_format = 'json'
-                                break
-                            elif blob_name.endswith('.txt') and 'OWNER' in blob_name:
-                                metadata_blob = blob_name
-                                metadata_format = 'txt'
-                                break
-                        
-                        if not metadata_blob:
-                            continue
-                        
-                        # Read metadata
-                        try:
-                            metadata_bytes = azure_blob_service.get_file_bytes(metadata_blob)
-                            
-                            if metadata_format == 'json':
-                                # Parse JSON metadata
-                                import json
-                                metadata = json.loads(metadata_bytes.decode('utf-8'))
-                            else:
-                                # Parse text metadata (legacy format)
-                                metadata_content = metadata_bytes.decode('utf-8')
-                                metadata = {}
-                                for line in metadata_content.split('\n'):
-                                    if ':' in line:
-                                        key, value = line.split(':', 1)
-                                        key = key.strip().lstrip('0123456789. ').strip()
-                                        value = value.strip()
-                                        if key:
-                                            metadata[key.lower().replace(' ', '_')] = value
-                            
-                            folder_owner = metadata.get('owner', '').strip()
-                            if not folder_owner or folder_owner.lower() != owner_name.lower():
-                                logger.debug(f"Skipping folder {folder_name}: owner '{folder_owner}' doesn't match '{owner_name}'")
-                                continue
-                            
-                            # Get service name from metadata (try both 'service' and 'service_name' keys)
-                            service_name = metadata.get('service_name') or metadata.get('service') or folder_name
-                            logger.debug(f"Found proposal: {service_name} (owner: {folder_owner}, lot: {lot}, version: {gcloud_version})")
-                            
-                            # Check if documents exist
-                            service_desc_exists = False
-                            pricing_doc_exists = False
-                            last_update = None
-                            
-                            # Check for SERVICE DESC files (including drafts)
-                            for blob_name in blob_names:
-                                if 'SERVICE DESC' in blob_name and blob_name.endswith('.docx'):
-                                    service_desc_exists = True
-                                    # Get blob last modified time
-                                    try:
-                                        blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                            container=azure_blob_service.container_name,
-                                            blob=blob_name
-                                        )
-                                        props = blob_client.get_blob_properties()
-                                        mtime = props.last_modified.timestamp()
-                                        if last_update is None or mtime > last_update:
-                                            last_update = mtime
-                                    except Exception as e:
-                                        logger.warning(f"Error getting blob timestamp: {e}")
-                                elif 'Pricing Doc' in blob_name and blob_name.endswith('.docx'):
-                                    pricing_doc_exists = True
-                                    try:
-                                        blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                            container=azure_blob_service.container_name,
-                                            blob=blob_name
-                                        )
-                                        props = blob_client.get_blob_properties()
-                                        mtime = props.last_modified.timestamp()
-                                        if last_update is None or mtime > last_update:
-                                            last_update = mtime
-                                    except Exception as e:
-                                        logger.warning(f"Error getting blob timestamp: {e}")
-                            
-                            # Determine status
-                            if service_desc_exists and pricing_doc_exists:
-                                status = "complete"
-                                completion_percentage = 100.0
-                            elif service_desc_exists or pricing_doc_exists:
-                                status = "incomplete"
-                                completion_percentage = 50.0
-                            else:
-                                status = "draft"
-                                completion_percentage = 0.0
-                            
-                            # Format last update
-                            last_update_str = None
-                            if last_update:
-                                last_update_str = datetime.fromtimestamp(last_update).isoformat()
-                            
-                            # Create proposal ID
-                            proposal_id = f"{service_name}_{gcloud_version}_{lot}".replace(" ", "_").lower()
-                            
-                            proposals.append({
-                                "id": proposal_id,
-                                "title": service_name,
-                                "framework_version": f"G-Cloud {gcloud_version}",
-                                "gcloud_version": gcloud_version,
-                                "lot": lot,
-                                "status": status,
-                                "completion_percentage": completion_percentage,
-                                "section_count": 2,
-                                "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
-                                "created_at": last_update_str or datetime.now().isoformat(),
-                                "updated_at": last_update_str or datetime.now().isoformat(),
-                                "last_update": last_update_str,
-                                "service_desc_exists": service_desc_exists,
-                                "pricing_doc_exists": pricing_doc_exists,
-                                "owner": folder_owner,
-                                "sponsor": metadata.get('sponsor', ''),
-                            })
-                        except Exception as e:
-                            logger.warning(f"Error processing metadata blob {metadata_blob}: {e}")
-                            continue
+            for gcloud_version, lot, folder_name, blobs, metadata in await _azure_service_folders(accept_json=True):
+                folder_owner = metadata.get('owner', '').strip()
+                if not folder_owner or canonical_name(folder_owner) not in owner_keys:
+                    logger.debug(f"Skipping folder {folder_name}: owner '{folder_owner}' doesn't match '{owner_name}'")
+                    continue
+                
+                # Get service name from metadata (try both 'service' and 'service_name' keys)
+                service_name = metadata.get('service_name') or metadata.get('service') or folder_name
+                logger.debug(f"Found proposal: {service_name} (owner: {folder_owner}, lot: {lot}, version: {gcloud_version})")
+                
+                # Check if documents exist
+                service_desc_exists = False
+                pricing_doc_exists = False
+                last_update = None
+                
+                # Check for SERVICE DESC files (including drafts)
+                # Last modified time comes from the listing entry
+                for blob in blobs:
+                    if 'SERVICE DESC' in blob.name and blob.name.endswith('.docx'):
+                        service_desc_exists = True
+                    elif 'Pricing Doc' in blob.name and blob.name.endswith('.docx'):
+                        pricing_doc_exists = True
+                    else:
+                        continue
+                    mtime = blob.mtime
+                    if mtime is not None and (last_update is None or mtime > last_update):
+                        last_update = mtime
+                
+                # Determine status
+                if service_desc_exists and pricing_doc_exists:
+                    status = "complete"
+                    completion_percentage = 100.0
+                elif service_desc_exists or pricing_doc_exists:
+                    status = "incomplete"
+                    completion_percentage = 50.0
+                else:
+                    status = "draft"
+                    completion_percentage = 0.0
+                
+                # Format last update
+                last_update_str = None
+                if last_update:
+                    last_update_str = datetime.fromtimestamp(last_update).isoformat()
+                
+                # Create proposal ID
+                proposal_id = f"{service_name}_{gcloud_version}_{lot}".replace(" ", "_").lower()
+                
+                proposals.append({
+                    "id": proposal_id,
+                    "title": service_name,
+                    "framework_version": f"G-Cloud {gcloud_version}",
+                    "gcloud_version": gcloud_version,
+                    "lot": lot,
+                    "status": status,
+                    "completion_percentage": completion_percentage,
+                    "section_count": 2,
+                    "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
+                    "created_at": last_update_str or datetime.now().isoformat(),
+                    "updated_at": last_update_str or datetime.now().isoformat(),
+                    "last_update": last_update_str,
+                    "service_desc_exists": service_desc_exists,
+                    "pricing_doc_exists": pricing_doc_exists,
+                    "owner": folder_owner,
+                    "sponsor": metadata.get('sponsor', ''),
+                })
         except Exception as e:
             logger.error(f"Error getting proposals from Azure Blob Storage: {e}", exc_info=True)
         
@@ -398,149 +469,21 @@ def get_proposals_by_owner(owner_name: str) -> List[dict]:
         return proposals
     
     # Local filesystem path
-    if not MOCK_BASE_PATH or not MOCK_BASE_PATH.exists():
+    catalog = _get_local_catalog()
+    if catalog is None:
         return proposals
     
-    # Iterate through all GCloud versions
-    for gcloud_dir in sorted(MOCK_BASE_PATH.glob("GCloud *")):
-        if not gcloud_dir.is_dir():
+    # Every GCloud version, LOTs 2, 2a, 2b and 3, from the in-memory catalog
+    for folder in catalog.folders():
+        if folder.lot not in LOCAL_LOTS or not folder.metadata:
             continue
         
-        gcloud_version = gcloud_dir.name.replace("GCloud ", "")
-        
-        pa_services = gcloud_dir / "PA Services"
-        if not pa_services.exists():
+        # Match owner name (canonical names)
+        folder_owner = folder.metadata.get('owner', '').strip()
+        if canonical_name(folder_owner) not in owner_keys:
             continue
         
-        # Check all LOTs (2, 2a, 2b, 3)
-        for lot_num in ["2", "2a", "2b", "3"]:
-            lot_folder = pa_services / f"Cloud Support Services LOT {lot_num}"
-            if not lot_folder.exists() or not lot_folder.is_dir():
-                continue
-            
-            # Check each service folder
-            for service_dir in lot_folder.iterdir():
-                if not service_dir.is_dir():
-                    continue
-                
-                # Read metadata file
-                if read_metadata_file:
-                    metadata = read_metadata_file(service_dir)
-                    if not metadata:
-                        continue
-                    
-                    # Match owner name (case-insensitive)
-                    folder_owner = metadata.get('owner', '').strip()
-                    if folder_owner.lower() != owner_name.lower():
-                        continue
-                    
-                    service_name = metadata.get('service', service_dir.name)
-                    
-                    # Check if both SERVICE DESC and Pricing Doc exist
-                    service_desc_exists = False
-                    pricing_doc_exists = False
-                    last_update = None
-                    
-                    if get_document_path:
-                        # Check SERVICE DESC
-                        service_desc_path = get_document_path(service_name, "SERVICE DESC", lot_num, gcloud_version)
-                        # Handle tuple return from Azure (blob_key, None) vs Path object for local
-                        if service_desc_path:
-                            if isinstance(service_desc_path, tuple):
-                                # Azure Blob Storage: tuple (blob_key, None)
-                                blob_key = service_desc_path[0]
-                                if blob_key:
-                                    try:
-                                        from app.services.azure_blob_service import AzureBlobService
-                                        azure_blob_service = AzureBlobService()
-                                        if azure_blob_service.blob_exists(blob_key):
-                                            service_desc_exists = True
-                                            # Get blob last modified time
-                                            blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                                container=azure_blob_service.container_name,
-                                                blob=blob_key
-                                            )
-                                            props = blob_client.get_blob_properties()
-                                            mtime = props.last_modified.timestamp()
-                                            if last_update is None or mtime > last_update:
-                                                last_update = mtime
-                                    except Exception as e:
-                                        logger.warning(f"Error checking Azure blob for SERVICE DESC: {e}")
-                            elif hasattr(service_desc_path, 'exists') and service_desc_path.exists():
-                                # Local Path object
-                                service_desc_exists = True
-                                mtime = service_desc_path.stat().st_mtime
-                                if last_update is None or mtime > last_update:
-                                    last_update = mtime
-                        
-                        # Check Pricing Doc
-                        pricing_doc_path = get_document_path(service_name, "Pricing Doc", lot_num, gcloud_version)
-                        # Handle tuple return from Azure (blob_key, None) vs Path object for local
-                        if pricing_doc_path:
-                            if isinstance(pricing_doc_path, tuple):
-                                # Azure Blob Storage: tuple (blob_key, None)
-                                blob_key = pricing_doc_path[0]
-                                if blob_key:
-                                    try:
-                                        from app.services.azure_blob_service import AzureBlobService
-                                        azure_blob_service = AzureBlobService()
-                                        if azure_blob_service.blob_exists(blob_key):
-                                            pricing_doc_exists = True
-                                            # Get blob last modified time
-                                            blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                                container=azure_blob_service.container_name,
-                                                blob=blob_key
-                                            )
-                                            props = blob_client.get_blob_properties()
-                                            mtime = props.last_modified.timestamp()
-                                            if last_update is None or mtime > last_update:
-                                                last_update = mtime
-                                    except Exception as e:
-                                        logger.warning(f"Error checking Azure blob for Pricing Doc: {e}")
-                            elif hasattr(pricing_doc_path, 'exists') and pricing_doc_path.exists():
-                                # Local Path object
-                                pricing_doc_exists = True
-                                mtime = pricing_doc_path.stat().st_mtime
-                                if last_update is None or mtime > last_update:
-                                    last_update = mtime
-                    
-                    # Determine status
-                    if service_desc_exists and pricing_doc_exists:
-                        status = "complete"
-                        completion_percentage = 100.0
-                    elif service_desc_exists or pricing_doc_exists:
-                        status = "incomplete"
-                        completion_percentage = 50.0
-                    else:
-                        status = "draft"
-                        completion_percentage = 0.0
-                    
-                    # Format last update
-                    last_update_str = None
-                    if last_update:
-                        last_update_str = datetime.fromtimestamp(last_update).isoformat()
-                    
-                    # Create proposal ID from service name and gcloud version
-                    proposal_id = f"{service_name}_{gcloud_version}_{lot_num}".replace(" ", "_").lower()
-                    
-                    proposals.append({
-                        "id": proposal_id,
-                        "title": service_name,
-                        "framework_version": f"G-Cloud {gcloud_version}",
-                        "gcloud_version": gcloud_version,
-                        "lot": lot_num,
-                        "status": status,
-                        "completion_percentage": completion_percentage,
-                        "section_count": 2,  # SERVICE DESC and Pricing Doc
-                        "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
-                        "created_at": last_update_str or datetime.now().isoformat(),
-                        "updated_at": last_update_str or datetime.now().isoformat(),
-                        "last_update": last_update_str,
-                        "service_desc_exists": service_desc_exists,
-                        "pricing_doc_exists": pricing_doc_exists,
-                        "owner": folder_owner,
-                        "sponsor": metadata.get('sponsor', ''),
-                    })
+        proposals.append(_proposal_from_local_folder(folder))
     
     # Sort by last update (most recent first)
     proposals.sort(key=lambda x: x.get("last_update") or "", reverse=True)
@@ -584,8 +527,9 @@ async def get_all_proposals(
             logger.warning(f"Could not determine owner name from headers or email")
             return []
         
-        # Get proposals from SharePoint (matches by owner name)
-        proposals = get_proposals_by_owner(owner_name)
+        # Get proposals from SharePoint (matches by owner name, or the email form of it)
+        effective_email = x_user_email or owner_email
+        proposals = await get_proposals_by_owner(owner_name, aliases=[effective_email] if effective_email else None)
         
         return proposals
         
@@ -617,6 +561,11 @@ async def get_all_proposals_admin():
         List of all proposals across all owners
     """
     try:
+        # Indexed query when the proposal catalog is enabled
+        catalogued = _catalog_proposals()
+        if catalogued is not None:
+            return catalogued
+        
         # Check if we're in Azure
         use_azure = not USE_S3 and bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
         
@@ -630,34 +579,16 @@ async def get_all_proposals_admin():
             
             # Get all proposals from both GCloud 14 and 15
             for version in ["14", "15"]:
-                folders = list_all_folders(version)
+                folders = await asyncio.to_thread(list_all_folders, version)
                 for folder in folders:
                     service_name = folder.get('service_name', '')
                     lot = folder.get('lot', '2')
                     owner = folder.get('owner', '')
                     
-                    # Check if both SERVICE DESC and Pricing Doc exist
-                    service_desc_exists = False
-                    pricing_doc_exists = False
-                    last_update = None
-                    
-                    if get_document_path:
-                        # Check SERVICE DESC
-                        service_desc_path = get_document_path(service_name, "SERVICE DESC", lot, version)
-                        if service_desc_path:
-                            service_desc_exists = True
-                            # For S3, we'd need to get object metadata for last_update
-                            # For now, we'll use current time as placeholder
-                            from datetime import datetime
-                            last_update = datetime.now().timestamp()
-                        
-                        # Check Pricing Doc
-                        pricing_doc_path = get_document_path(service_name, "Pricing Doc", lot, version)
-                        if pricing_doc_path:
-                            pricing_doc_exists = True
-                            from datetime import datetime
-                            if last_update is None:
-                                last_update = datetime.now().timestamp()
+                    # Document existence and last modified time come from the folder scan
+                    service_desc_exists = bool(folder.get('service_desc_key'))
+                    pricing_doc_exists = bool(folder.get('pricing_doc_key'))
+                    last_update = datetime.fromisoformat(folder['last_modified']).timestamp() if folder.get('last_modified') else None
                     
                     # Determine status
                     if service_desc_exists and pricing_doc_exists:
@@ -704,131 +635,67 @@ async def get_all_proposals_admin():
         # If using Azure, use Azure Blob Storage
         if use_azure:
             try:
-                from app.services.azure_blob_service import AzureBlobService
-                azure_blob_service = AzureBlobService()
-                
                 proposals = []
                 
-                # Search in SharePoint folder structure
-                for gcloud_version in ["14", "15"]:
-                    for lot in ["2", "2a", "2b", "3"]:
-                        base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
-                        blob_list = azure_blob_service.list_blobs(prefix=base_prefix)
-                        
-                        # Group blobs by folder (service_folder)
-                        service_folders = {}
-                        for blob_name in blob_list:
-                            parts = blob_name.split('/')
-                            if len(parts) >= 4:
-                                folder_name = parts[3]
-                                if folder_name not in service_folders:
-                                    service_folders[folder_name] = []
-                                service_folders[folder_name].append(blob_name)
-                        
-                        # Check each service folder
-                        for folder_name, blob_names in service_folders.items():
-                            # Look for metadata file (OWNER *.txt)
-                            metadata_blob = None
-                            for blob_name in blob_names:
-                                if blob_name.endswith('.txt') and 'OWNER' in blob_name:
-                                    metadata_blob = blob_name
-                                    break
-                            
-                            if not metadata_blob:
-                                continue
-                            
-                            # Read metadata
-                            try:
-                                metadata_bytes = azure_blob_service.get_file_bytes(metadata_blob)
-                                metadata_content = metadata_bytes.decode('utf-8')
-                                
-                                # Parse metadata
-                                metadata = {}
-                                for line in metadata_content.split('\n'):
-                                    if ':' in line:
-                                        key, value = line.split(':', 1)
-                                        key = key.strip().lstrip('0123456789. ').strip()
-                                        value = value.strip()
-                                        if key:
-                                            metadata[key.lower().replace(' ', '_')] = value
-                                
-                                folder_owner = metadata.get('owner', '').strip()
-                                service_name = metadata.get('service', folder_name)
-                                
-                                # Check if documents exist
-                                service_desc_exists = False
-                                pricing_doc_exists = False
-                                last_update = None
-                                
-                                # Check for SERVICE DESC files
-                                for blob_name in blob_names:
-                                    if 'SERVICE DESC' in blob_name and blob_name.endswith('.docx') and '_draft' not in blob_name:
-                                        service_desc_exists = True
-                                        try:
-                                            blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                                container=azure_blob_service.container_name,
-                                                blob=blob_name
-                                            )
-                                            props = blob_client.get_blob_properties()
-                                            mtime = props.last_modified.timestamp()
-                                            if last_update is None or mtime > last_update:
-                                                last_update = mtime
-                                        except Exception as e:
-                                            logger.warning(f"Error getting blob timestamp: {e}")
-                                    elif 'Pricing Doc' in blob_name and blob_name.endswith('.docx'):
-                                        pricing_doc_exists = True
-                                        try:
-                                            blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                                container=azure_blob_service.container_name,
-                                                blob=blob_name
-                                            )
-                                            props = blob_client.get_blob_properties()
-                                            mtime = props.last_modified.timestamp()
-                                            if last_update is None or mtime > last_update:
-                                                last_update = mtime
-                                        except Exception as e:
-                                            logger.warning(f"Error getting blob timestamp: {e}")
-                                
-                                # Determine status
-                                if service_desc_exists and pricing_doc_exists:
-                                    status = "complete"
-                                    completion_percentage = 100.0
-                                elif service_desc_exists or pricing_doc_exists:
-                                    status = "incomplete"
-                                    completion_percentage = 50.0
-                                else:
-                                    status = "draft"
-                                    completion_percentage = 0.0
-                                
-                                # Format last update
-                                last_update_str = None
-                                if last_update:
-                                    last_update_str = datetime.fromtimestamp(last_update).isoformat()
-                                
-                                # Create proposal ID
-                                proposal_id = f"{service_name}_{gcloud_version}_{lot}".replace(" ", "_").lower()
-                                
-                                proposals.append({
-                                    "id": proposal_id,
-                                    "title": service_name,
-                                    "framework_version": f"G-Cloud {gcloud_version}",
-                                    "gcloud_version": gcloud_version,
-                                    "lot": lot,
-                                    "status": status,
-                                    "completion_percentage": completion_percentage,
-                                    "section_count": 2,
-                                    "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
-                                    "created_at": last_update_str or datetime.now().isoformat(),
-                                    "updated_at": last_update_str or datetime.now().isoformat(),
-                                    "last_update": last_update_str,
-                                    "service_desc_exists": service_desc_exists,
-                                    "pricing_doc_exists": pricing_doc_exists,
-                                    "owner": folder_owner,
-                                    "sponsor": metadata.get('sponsor', ''),
-                                })
-                            except Exception as e:
-                                logger.warning(f"Error processing metadata blob {metadata_blob}: {e}")
-                                continue
+                for gcloud_version, lot, folder_name, blobs, metadata in await _azure_service_folders(accept_json=False):
+                    folder_owner = metadata.get('owner', '').strip()
+                    service_name = metadata.get('service', folder_name)
+                    
+                    # Check if documents exist
+                    service_desc_exists = False
+                    pricing_doc_exists = False
+                    last_update = None
+                    
+                    # Check for SERVICE DESC files
+                    # Last modified time comes from the listing entry
+                    for blob in blobs:
+                        if 'SERVICE DESC' in blob.name and blob.name.endswith('.docx') and '_draft' not in blob.name:
+                            service_desc_exists = True
+                        elif 'Pricing Doc' in blob.name and blob.name.endswith('.docx'):
+                            pricing_doc_exists = True
+                        else:
+                            continue
+                        mtime = blob.mtime
+                        if mtime is not None and (last_update is None or mtime > last_update):
+                            last_update = mtime
+                    
+                    # Determine status
+                    if service_desc_exists and pricing_doc_exists:
+                        status = "complete"
+                        completion_percentage = 100.0
+                    elif service_desc_exists or pricing_doc_exists:
+                        status = "incomplete"
+                        completion_percentage = 50.0
+                    else:
+                        status = "draft"
+                        completion_percentage = 0.0
+                    
+                    # Format last update
+                    last_update_str = None
+                    if last_update:
+                        last_update_str = datetime.fromtimestamp(last_update).isoformat()
+                    
+                    # Create proposal ID
+                    proposal_id = f"{service_name}_{gcloud_version}_{lot}".replace(" ", "_").lower()
+                    
+                    proposals.append({
+                        "id": proposal_id,
+                        "title": service_name,
+                        "framework_version": f"G-Cloud {gcloud_version}",
+                        "gcloud_version": gcloud_version,
+                        "lot": lot,
+                        "status": status,
+                        "completion_percentage": completion_percentage,
+                        "section_count": 2,
+                        "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
+                        "created_at": last_update_str or datetime.now().isoformat(),
+                        "updated_at": last_update_str or datetime.now().isoformat(),
+                        "last_update": last_update_str,
+                        "service_desc_exists": service_desc_exists,
+                        "pricing_doc_exists": pricing_doc_exists,
+                        "owner": folder_owner,
+                        "sponsor": metadata.get('sponsor', ''),
+                    })
                 
                 # Sort by last update (most recent first)
                 proposals.sort(key=lambda x: x.get("last_update") or "", reverse=True)
@@ -838,147 +705,15 @@ async def get_all_proposals_admin():
                 raise HTTPException(status_code=500, detail=f"Error loading proposals: {str(e)}")
         
         # Local file system path
-        if not MOCK_BASE_PATH or not MOCK_BASE_PATH.exists():
+        catalog = _get_local_catalog()
+        if catalog is None:
             return []
         
-        proposals = []
-        
-        # Iterate through all GCloud versions
-        for gcloud_dir in sorted(MOCK_BASE_PATH.glob("GCloud *")):
-            if not gcloud_dir.is_dir():
-                continue
-            
-            gcloud_version = gcloud_dir.name.replace("GCloud ", "")
-            
-            pa_services = gcloud_dir / "PA Services"
-            if not pa_services.exists():
-                continue
-            
-            # Check all LOTs (2, 2a, 2b, 3)
-            for lot_num in ["2", "2a", "2b", "3"]:
-                lot_folder = pa_services / f"Cloud Support Services LOT {lot_num}"
-                if not lot_folder.exists() or not lot_folder.is_dir():
-                    continue
-                
-                # Check each service folder
-                for service_dir in lot_folder.iterdir():
-                    if not service_dir.is_dir():
-                        continue
-                    
-                    # Read metadata file
-                    if read_metadata_file:
-                        metadata = read_metadata_file(service_dir)
-                        if not metadata:
-                            continue
-                        
-                        service_name = metadata.get('service', service_dir.name)
-                        folder_owner = metadata.get('owner', '').strip()
-                        
-                        # Check if both SERVICE DESC and Pricing Doc exist
-                        service_desc_exists = False
-                        pricing_doc_exists = False
-                        last_update = None
-                        
-                        if get_document_path:
-                            # Check SERVICE DESC
-                            service_desc_path = get_document_path(service_name, "SERVICE DESC", lot_num, gcloud_version)
-                            # Handle tuple return from Azure (blob_key, None) vs Path object for local
-                            if service_desc_path:
-                                if isinstance(service_desc_path, tuple):
-                                    # Azure Blob Storage: tuple (blob_key, None)
-                                    blob_key = service_desc_path[0]
-                                    if blob_key:
-                                        try:
-                                            from app.services.azure_blob_service import AzureBlobService
-                                            azure_blob_service = AzureBlobService()
-                                            if azure_blob_service.blob_exists(blob_key):
-                                                service_desc_exists = True
-                                                # Get blob last modified time
-                                                blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                                    container=azure_blob_service.container_name,
-                                                    blob=blob_key
-                                                )
-                                                props = blob_client.get_blob_properties()
-                                                mtime = props.last_modified.timestamp()
-                                                if last_update is None or mtime > last_update:
-                                                    last_update = mtime
-                                        except Exception as e:
-                                            logger.warning(f"Error checking Azure blob for SERVICE DESC: {e}")
-                                elif hasattr(service_desc_path, 'exists') and service_desc_path.exists():
-                                    # Local Path object
-                                    service_desc_exists = True
-                                    mtime = service_desc_path.stat().st_mtime
-                                    if last_update is None or mtime > last_update:
-                                        last_update = mtime
-                            
-                            # Check Pricing Doc
-                            pricing_doc_path = get_document_path(service_name, "Pricing Doc", lot_num, gcloud_version)
-                            # Handle tuple return from Azure (blob_key, None) vs Path object for local
-                            if pricing_doc_path:
-                                if isinstance(pricing_doc_path, tuple):
-                                    # Azure Blob Storage: tuple (blob_key, None)
-                                    blob_key = pricing_doc_path[0]
-                                    if blob_key:
-                                        try:
-                                            from app.services.azure_blob_service import AzureBlobService
-                                            azure_blob_service = AzureBlobService()
-                                            if azure_blob_service.blob_exists(blob_key):
-                                                pricing_doc_exists = True
-                                                # Get blob last modified time
-                                                blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                                                    container=azure_blob_service.container_name,
-                                                    blob=blob_key
-                                                )
-                                                props = blob_client.get_blob_properties()
-                                                mtime = props.last_modified.timestamp()
-                                                if last_update is None or mtime > last_update:
-                                                    last_update = mtime
-                                        except Exception as e:
-                                            logger.warning(f"Error checking Azure blob for Pricing Doc: {e}")
-                                elif hasattr(pricing_doc_path, 'exists') and pricing_doc_path.exists():
-                                    # Local Path object
-                                    pricing_doc_exists = True
-                                    mtime = pricing_doc_path.stat().st_mtime
-                                    if last_update is None or mtime > last_update:
-                                        last_update = mtime
-                        
-                        # Determine status
-                        if service_desc_exists and pricing_doc_exists:
-                            status = "complete"
-                            completion_percentage = 100.0
-                        elif service_desc_exists or pricing_doc_exists:
-                            status = "incomplete"
-                            completion_percentage = 50.0
-                        else:
-                            status = "draft"
-                            completion_percentage = 0.0
-                        
-                        # Format last update
-                        last_update_str = None
-                        if last_update:
-                            last_update_str = datetime.fromtimestamp(last_update).isoformat()
-                        
-                        # Create proposal ID from service name and gcloud version
-                        proposal_id = f"{service_name}_{gcloud_version}_{lot_num}".replace(" ", "_").lower()
-                        
-                        proposals.append({
-                            "id": proposal_id,
-                            "title": service_name,
-                            "framework_version": f"G-Cloud {gcloud_version}",
-                            "gcloud_version": gcloud_version,
-                            "lot": lot_num,
-                            "status": status,
-                            "completion_percentage": completion_percentage,
-                            "section_count": 2,
-                            "valid_sections": 2 if status == "complete" else 1 if status == "incomplete" else 0,
-                            "created_at": last_update_str or datetime.now().isoformat(),
-                            "updated_at": last_update_str or datetime.now().isoformat(),
-                            "last_update": last_update_str,
-                            "service_desc_exists": service_desc_exists,
-                            "pricing_doc_exists": pricing_doc_exists,
-                            "owner": folder_owner,
-                            "sponsor": metadata.get('sponsor', ''),
-                        })
+        proposals = [
+            _proposal_from_local_folder(folder)
+            for folder in catalog.folders()
+            if folder.lot in LOCAL_LOTS and folder.metadata
+        ]
         
         # Sort by last update (most recent first)
         proposals.sort(key=lambda x: x.get("last_update") or "", reverse=True)
@@ -989,6 +724,29 @@ async def get_all_proposals_admin():
         raise HTTPException(status_code=500, detail=f"Error getting all proposals: {str(e)}")
 
 
+@router.post("/admin/catalog/reconcile")
+async def reconcile_proposal_catalog():
+    """
+    Rebuild the proposal catalog from storage.
+    
+    The catalog otherwise reconciles itself every PROPOSAL_CATALOG_RECONCILE_SECONDS;
+    use this after folders are changed outside the API.
+    
+    Returns:
+        Number of catalogued folders and the reconciliation time
+    """
+    from app.services.proposal_catalog import get_proposal_catalog
+    catalog = get_proposal_catalog()
+    if catalog is None:
+        raise HTTPException(status_code=400, detail="Proposal catalog is disabled (PROPOSAL_CATALOG=off)")
+    try:
+        await asyncio.to_thread(catalog.reconcile)
+        return catalog.stats()
+    except Exception as e:
+        logger.error(f"Error reconciling proposal catalog: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error reconciling proposal catalog: {str(e)}")
+
+
 @router.delete("/{service_name}")
 async def delete_proposal(
     service_name: str,
@@ -1029,6 +787,13 @@ async def delete_proposal(
         
         # Delete the entire folder and all its contents
         shutil.rmtree(folder_path)
+        try:
+            from sharepoint_service.mock_sharepoint import note_local_change
+            note_local_change(folder_path)
+        except ImportError:
+            pass
+        from app.services.proposal_catalog import remove_folder
+        remove_folder(folder_path)
         
         return {"message": f"Proposal '{service_name}' deleted successfully"}
         
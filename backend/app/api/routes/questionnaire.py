@@ -271,8 +271,8 @@ async def lock_questionnaire(
         use_azure = bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
         
         if use_azure:
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
+            from app.services.azure_blob_service import get_azure_blob_service
+            azure_blob_service = get_azure_blob_service()
             
             blob_key = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/questionnaire_responses.json"
             
@@ -379,8 +379,8 @@ async def save_questionnaire_responses(
     if use_azure:
         # Save to Azure Blob Storage
         try:
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
+            from app.services.azure_blob_service import get_azure_blob_service
+            azure_blob_service = get_azure_blob_service()
             
             # Construct blob key: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/questionnaire_responses.json
             blob_key = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/questionnaire_responses.json"
@@ -456,17 +456,13 @@ async def load_questionnaire_responses(
     if use_azure:
         # Load from Azure Blob Storage
         try:
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
+            from app.services.async_storage import get_async_storage
             
             # Construct blob key
             blob_key = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/questionnaire_responses.json"
             
-            if not azure_blob_service.blob_exists(blob_key):
-                raise FileNotFoundError(f"Questionnaire responses not found: {blob_key}")
-            
-            # Get file bytes
-            json_bytes = azure_blob_service.get_file_bytes(blob_key)
+            # Get file bytes without blocking the event loop (FileNotFoundError if missing)
+            json_bytes = await get_async_storage().get(blob_key)
             response_data = json.loads(json_bytes.decode('utf-8'))
             
             # Convert answers list to dict keyed by question text
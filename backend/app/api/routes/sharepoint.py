@@ -428,3 +428,36 @@ async def create_sharepoint_metadata(
             status_code=500,
             detail=f"Internal error creating metadata: {str(e)}"
         )
+
+
+class BlobIndexResponse(BaseModel):
+    """Blob listing index state after a refresh"""
+    blobs: int
+    refreshes: int
+    age_seconds: Optional[float] = None
+
+
+@router.post("/index/refresh", response_model=BlobIndexResponse, tags=["SharePoint"])
+async def refresh_blob_index():
+    """
+    Rebuild the in-memory blob listing index from Azure Blob Storage.
+    
+    The index otherwise refreshes itself once its TTL (BLOB_INDEX_TTL_SECONDS) expires;
+    use this after files are changed outside the API.
+    
+    Returns:
+        BlobIndexResponse with the number of indexed blobs
+    """
+    if not os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""):
+        raise HTTPException(status_code=400, detail="Blob listing index is only used with Azure Blob Storage")
+    try:
+        from app.services.blob_index import get_blob_index
+        index = get_blob_index()
+        index.refresh()
+        return BlobIndexResponse(**index.stats())
+    except Exception as e:
+        logger.error(f"Error refreshing blob listing index: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal error refreshing blob index: {str(e)}"
+        )
@@ -8,9 +8,12 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field, validator, model_validator
 from typing import List, Optional, Literal, Dict
 import os
+import json
+import asyncio
 import uuid
 import re
 import logging
+from pathlib import Path
 
 from app.services.document_generator import DocumentGenerator
 from app.services.s3_service import S3Service
@@ -85,6 +88,18 @@ class ServiceDescriptionRequest(BaseModel):
         return v.strip()
 
 
+class BatchGenerateRequest(BaseModel):
+    """Request model for generating many Service Descriptions at once"""
+    items: List[ServiceDescriptionRequest] = Field(..., min_items=1, max_items=200, description="Service Descriptions to generate")
+
+
+class JobSubmittedResponse(BaseModel):
+    """Response model for an accepted generation job"""
+    job_id: str
+    status: str
+    status_url: str
+
+
 class GenerateResponse(BaseModel):
     """Response after generating documents"""
     success: bool
@@ -95,6 +110,129 @@ class GenerateResponse(BaseModel):
     pdf_path: str
 
 
+def _ensure_new_proposal_metadata(request: ServiceDescriptionRequest):
+    """Ensure metadata.json exists for a new proposal so it appears in the dashboard"""
+    # If this is a new proposal, ensure metadata.json exists
+    # This ensures proposals appear in the dashboard even if metadata wasn't created during folder creation
+    if request.new_proposal_metadata and not request.update_metadata:
+        try:
+            from sharepoint_service.sharepoint_online import create_metadata_file
+            import os
+            
+            service_name = request.new_proposal_metadata.get('service', request.title)
+            lot = request.new_proposal_metadata.get('lot', '2')
+            gcloud_version = request.new_proposal_metadata.get('gcloud_version', '15')
+            owner = request.new_proposal_metadata.get('owner', '')
+            sponsor = request.new_proposal_metadata.get('sponsor', '')
+            
+            if service_name and owner:
+                # Construct folder path
+                folder_path = f"GCloud {gcloud_version}/PA Services/{service_name}"
+                
+                # Prepare metadata
+                metadata = {
+                    "service_name": service_name,
+                    "owner": owner,
+                    "sponsor": sponsor or '',
+                    "lot": lot,
+                    "gcloud_version": gcloud_version
+                }
+                
+                # Try to create/update metadata file (don't fail if it doesn't work)
+                try:
+                    create_metadata_file(folder_path, metadata, gcloud_version)
+                    logger.info(f"Created/updated metadata.json for {service_name}")
+                except Exception as e:
+                    logger.warning(f"Failed to create/update metadata.json (non-fatal): {e}")
+        except Exception as e:
+            logger.warning(f"Failed to ensure metadata.json exists (non-fatal): {e}")
+
+
+def _generation_kwargs(request: ServiceDescriptionRequest) -> Dict:
+    """Keyword arguments for DocumentGenerator.generate_service_description"""
+    return dict(
+        title=request.title,
+        description=request.description,
+        features=request.features,
+        benefits=request.benefits,
+        service_definition=request.service_definition or [],
+        update_metadata=request.update_metadata,
+        save_as_draft=request.save_as_draft or False,
+        new_proposal_metadata=request.new_proposal_metadata
+    )
+
+
+def _build_generate_response(result: Dict) -> GenerateResponse:
+    """Convert a generator result into download URLs for the frontend"""
+    # Handle PDF path - may be None in Lambda if PDF generation not implemented
+    # Check for pdf_blob_key (Azure), pdf_s3_key (AWS), or pdf_path (local)
+    pdf_path = result.get('pdf_path') or result.get('pdf_blob_key') or result.get('pdf_s3_key', '')
+    
+    # Check if we're in Azure
+    use_azure = bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
+    
+    if pdf_path and not pdf_path.startswith('http'):
+        if use_azure and result.get('pdf_blob_key'):
+            # Azure: Check if PDF blob exists and create download URL
+            try:
+                from app.services.azure_blob_service import get_azure_blob_service
+                azure_blob_service = get_azure_blob_service()
+                pdf_blob_key = result.get('pdf_blob_key')
+                if pdf_blob_key and azure_blob_service.blob_exists(pdf_blob_key):
+                    # Extract filename from blob key for download URL
+                    pdf_filename_for_url = Path(pdf_blob_key).name
+                    pdf_path = f"/api/v1/templates/service-description/download/{pdf_filename_for_url}"
+                else:
+                    # PDF doesn't exist yet (conversion may have failed or is in progress)
+                    pdf_path = ""
+            except Exception as e:
+                logger.warning(f"Failed to check Azure blob for PDF: {e}")
+                pdf_path = ""
+        elif _use_s3 and s3_service:
+            # AWS: Convert S3 key to presigned URL
+            try:
+                pdf_path = s3_service.get_presigned_url(pdf_path, expiration=3600)
+            except:
+                pass
+    
+    # Convert local file paths to download URLs for frontend
+    # Always provide download URL even if file is in folder (for local download)
+    word_path = result.get('word_path', '')
+    word_filename_for_url = None
+    if word_path and not word_path.startswith('http'):
+        # Extract filename from path (includes _draft if it's a draft)
+        word_filename_for_url = Path(word_path).name if word_path else None
+        if word_filename_for_url:
+            # Convert to download URL (works for both /tmp/generated_documents and folder paths)
+            word_path = f"/api/v1/templates/service-description/download/{word_filename_for_url}"
+    
+    # Convert PDF path to download URL if it's a local path (not Azure, not AWS, not already a URL)
+    pdf_filename_for_url = None
+    if pdf_path and not pdf_path.startswith('http') and not pdf_path.startswith('/api/'):
+        pdf_filename_for_url = Path(pdf_path).name if pdf_path else None
+        # Only convert if PDF file exists locally (for local development)
+        pdf_path_local = Path(pdf_path)
+        if pdf_path_local.exists() and pdf_filename_for_url:
+            pdf_path = f"/api/v1/templates/service-description/download/{pdf_filename_for_url}"
+        elif not use_azure and not _use_s3:
+            # Local development: PDF doesn't exist yet, keep original path for "Coming Soon" message
+            pdf_path = pdf_path
+        # Azure/AWS: PDF path already handled above
+    
+    # Use actual filename from path if available, otherwise fallback to filename_base
+    word_filename = word_filename_for_url if word_filename_for_url else f"{result['filename']}.docx"
+    pdf_filename = pdf_filename_for_url if pdf_filename_for_url else f"{result['filename']}.pdf"
+    
+    return GenerateResponse(
+        success=True,
+        message="Documents generated successfully",
+        word_filename=word_filename,
+        pdf_filename=pdf_filename,
+        word_path=word_path,
+        pdf_path=pdf_path or f"{result.get('filename', 'document')}.pdf"  # Fallback to filename if no path
+    )
+
+
 @router.post("/service-description/generate", response_model=GenerateResponse)
 async def generate_service_description(request: ServiceDescriptionRequest):
     """
@@ -106,121 +244,12 @@ async def generate_service_description(request: ServiceDescriptionRequest):
     If update_metadata is provided, replaces existing documents instead of creating new ones.
     """
     try:
-        # If this is a new proposal, ensure metadata.json exists
-        # This ensures proposals appear in the dashboard even if metadata wasn't created during folder creation
-        if request.new_proposal_metadata and not request.update_metadata:
-            try:
-                from sharepoint_service.sharepoint_online import create_metadata_file
-                import os
-                
-                service_name = request.new_proposal_metadata.get('service', title)
-                lot = request.new_proposal_metadata.get('lot', '2')
-                gcloud_version = request.new_proposal_metadata.get('gcloud_version', '15')
-                owner = request.new_proposal_metadata.get('owner', '')
-                sponsor = request.new_proposal_metadata.get('sponsor', '')
-                
-                if service_name and owner:
-                    # Construct folder path
-                    folder_path = f"GCloud {gcloud_version}/PA Services/{service_name}"
-                    
-                    # Prepare metadata
-                    metadata = {
-                        "service_name": service_name,
-                        "owner": owner,
-                        "sponsor": sponsor or '',
-                        "lot": lot,
-                        "gcloud_version": gcloud_version
-                    }
-                    
-                    # Try to create/update metadata file (don't fail if it doesn't work)
-                    try:
-                        create_metadata_file(folder_path, metadata, gcloud_version)
-                        logger.info(f"Created/updated metadata.json for {service_name}")
-                    except Exception as e:
-                        logger.warning(f"Failed to create/update metadata.json (non-fatal): {e}")
-            except Exception as e:
-                logger.warning(f"Failed to ensure metadata.json exists (non-fatal): {e}")
-        
-        result = document_generator.generate_service_description(
-            title=request.title,
-            description=request.description,
-            features=request.features,
-            benefits=request.benefits,
-            service_definition=request.service_definition or [],
-            update_metadata=request.update_metadata,
-            save_as_draft=request.save_as_draft or False,
-            new_proposal_metadata=request.new_proposal_metadata
-        )
-        
-        # Handle PDF path - may be None in Lambda if PDF generation not implemented
-        # Check for pdf_blob_key (Azure), pdf_s3_key (AWS), or pdf_path (local)
-        pdf_path = result.get('pdf_path') or result.get('pdf_blob_key') or result.get('pdf_s3_key', '')
-        
-        # Check if we're in Azure
-        use_azure = bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
-        
-        if pdf_path and not pdf_path.startswith('http'):
-            if use_azure and result.get('pdf_blob_key'):
-                # Azure: Check if PDF blob exists and create download URL
-                try:
-                    from app.services.azure_blob_service import AzureBlobService
-                    azure_blob_service = AzureBlobService()
-                    pdf_blob_key = result.get('pdf_blob_key')
-                    if pdf_blob_key and azure_blob_service.blob_exists(pdf_blob_key):
-                        # Extract filename from blob key for download URL
-                        pdf_filename_for_url = Path(pdf_blob_key).name
-                        pdf_path = f"/api/v1/templates/service-description/download/{pdf_filename_for_url}"
-                    else:
-                        # PDF doesn't exist yet (conversion may have failed or is in progress)
-                        pdf_path = ""
-                except Exception as e:
-                    logger.warning(f"Failed to check Azure blob for PDF: {e}")
-                    pdf_path = ""
-            elif _use_s3 and s3_service:
-                # AWS: Convert S3 key to presigned URL
-                try:
-                    pdf_path = s3_service.get_presigned_url(pdf_path, expiration=3600)
-                except:
-                    pass
-        
-        # Convert local file paths to download URLs for frontend
-        # Always provide download URL even if file is in folder (for local download)
-        word_path = result.get('word_path', '')
-        word_filename_for_url = None
-        if word_path and not word_path.startswith('http'):
-            # Extract filename from path (includes _draft if it's a draft)
-            from pathlib import Path
-            word_filename_for_url = Path(word_path).name if word_path else None
-            if word_filename_for_url:
-                # Convert to download URL (works for both /tmp/generated_documents and folder paths)
-                word_path = f"/api/v1/templates/service-description/download/{word_filename_for_url}"
-        
-        # Convert PDF path to download URL if it's a local path (not Azure, not AWS, not already a URL)
-        pdf_filename_for_url = None
-        if pdf_path and not pdf_path.startswith('http') and not pdf_path.startswith('/api/'):
-            from pathlib import Path
-            pdf_filename_for_url = Path(pdf_path).name if pdf_path else None
-            # Only convert if PDF file exists locally (for local development)
-            pdf_path_local = Path(pdf_path)
-            if pdf_path_local.exists() and pdf_filename_for_url:
-                pdf_path = f"/api/v1/templates/service-description/download/{pdf_filename_for_url}"
-            elif not use_azure and not _use_s3:
-                # Local development: PDF doesn't exist yet, keep original path for "Coming Soon" message
-                pdf_path = pdf_path
-            # Azure/AWS: PDF path already handled above
+        # Storage calls and PDF conversion (which may wait for a converter slot) block; run them off the event loop
+        await asyncio.to_thread(_ensure_new_proposal_metadata, request)
         
-        # Use actual filename from path if available, otherwise fallback to filename_base
-        word_filename = word_filename_for_url if word_filename_for_url else f"{result['filename']}.docx"
-        pdf_filename = pdf_filename_for_url if pdf_filename_for_url else f"{result['filename']}.pdf"
+        result = await asyncio.to_thread(document_generator.generate_service_description, **_generation_kwargs(request))
         
-        return GenerateResponse(
-            success=True,
-            message="Documents generated successfully",
-            word_filename=word_filename,
-            pdf_filename=pdf_filename,
-            word_path=word_path,
-            pdf_path=pdf_path or f"{result.get('filename', 'document')}.pdf"  # Fallback to filename if no path
-        )
+        return _build_generate_response(result)
     
     except FileNotFoundError as e:
         raise HTTPException(status_code=500, detail=f"Template not found: {str(e)}")
@@ -228,6 +257,87 @@ async def generate_service_description(request: ServiceDescriptionRequest):
         raise HTTPException(status_code=500, detail=f"Document generation failed: {str(e)}")
 
 
+@router.post("/service-description/generate-batch")
+async def generate_service_description_batch(request: BatchGenerateRequest):
+    """
+    Generate many Service Descriptions in parallel
+    
+    Items are generated on a bounded process pool. Results stream back as
+    newline-delimited JSON, one line per item in completion order, tagged with
+    the item's index in the request.
+    """
+    from fastapi.responses import StreamingResponse
+    from app.services.batch_generator import batch_generator
+    
+    # Metadata files are written with blocking storage calls; keep them off the event loop
+    def ensure_metadata():
+        for item in request.items:
+            _ensure_new_proposal_metadata(item)
+    
+    await asyncio.to_thread(ensure_metadata)
+    items = [_generation_kwargs(item) for item in request.items]
+    
+    async def stream_results():
+        async for outcome in batch_generator.generate(items):
+            index = outcome["index"]
+            line = {"index": index, "title": request.items[index].title, "success": outcome["success"]}
+            if outcome["success"]:
+                try:
+                    line["result"] = _build_generate_response(outcome["result"]).model_dump()
+                except Exception as e:
+                    line.update(success=False, error=f"Document generation failed: {str(e)}")
+            else:
+                line["error"] = f"Document generation failed: {outcome['error']}"
+            yield json.dumps(line) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.post("/service-description/jobs", response_model=JobSubmittedResponse, status_code=202)
+async def submit_service_description_job(request: ServiceDescriptionRequest):
+    """
+    Queue Service Description generation and return immediately
+    
+    Generation, upload and PDF conversion run on a background worker. Poll
+    status_url (optionally with ?wait=<seconds> to long-poll) for the result,
+    which has the same shape as the /service-description/generate response.
+    """
+    from app.services.generation_jobs import generation_jobs
+    
+    def run_job() -> Dict:
+        _ensure_new_proposal_metadata(request)
+        result = document_generator.generate_service_description(**_generation_kwargs(request))
+        return _build_generate_response(result).model_dump()
+    
+    job = generation_jobs.submit("service_description", run_job)
+    return JobSubmittedResponse(
+        job_id=job.id,
+        status=job.status,
+        status_url=f"/api/v1/templates/service-description/jobs/{job.id}"
+    )
+
+
+@router.get("/service-description/jobs/{job_id}")
+async def get_service_description_job(job_id: str, wait: float = 0):
+    """
+    Get the status of a generation job
+    
+    Args:
+        job_id: Job id returned by the submit endpoint
+        wait: Seconds to wait for the job to finish before responding (max 30)
+    """
+    from app.services.generation_jobs import generation_jobs
+    
+    wait = max(0.0, min(wait, 30.0))
+    if wait:
+        job = await asyncio.to_thread(generation_jobs.wait, job_id, wait)
+    else:
+        job = generation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+
 @router.get("/service-description/download/{filename:path}")
 async def download_document(filename: str):
     """Download generated Word or PDF document"""
@@ -253,68 +363,21 @@ async def download_document(filename: str):
         s3_key = None
         target_bucket = output_bucket or sharepoint_bucket
 
-        def head_exists(bucket: str, key: str) -> bool:
-            if not bucket:
-                return False
-            try:
-                s3_client.head_object(Bucket=bucket, Key=key)
-                return True
-            except Exception:
-                return False
-
-        candidate_keys = []
-        # First, prefer generated/ locations in the output bucket (PDF converter target)
-        candidate_keys.append(f"generated/{filename}")
-        if filename.lower().startswith("pa gc"):
-            try:
-                service_part = filename.split("SERVICE DESC", 1)[1].strip()
-                if service_part.lower().endswith(".pdf") or service_part.lower().endswith(".docx"):
-                    service_part = service_part[:-4]
-                candidate_keys.append(f"generated/{service_part}.pdf")
-            except Exception:
-                pass
-
-        for key in candidate_keys:
-            if head_exists(output_bucket, key):
-                s3_key = key
-                target_bucket = output_bucket
-                break
-
-        # Fall back to SharePoint hierarchy
-        if not s3_key:
-            if head_exists(sharepoint_bucket, f"generated/{filename}"):
-                s3_key = f"generated/{filename}"
-                target_bucket = sharepoint_bucket
-            else:
-                try:
-                    # Search structured folders
-                    for gcloud_version in ["14", "15"]:
-                        for lot in ["2", "3"]:
-                            base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
-                            paginator = s3_client.get_paginator('list_objects_v2')
-                            pages = paginator.paginate(Bucket=sharepoint_bucket, Prefix=base_prefix)
-
-                            for page in pages:
-                                if 'Contents' not in page:
-                                    continue
-                                for obj in page['Contents']:
-                                    if obj['Key'].endswith(filename):
-                                        s3_key = obj['Key']
-                                        target_bucket = sharepoint_bucket
-                                        break
-                                if s3_key:
-                                    break
-                            if s3_key:
-                                break
-                        if s3_key:
-                            break
-                except Exception as e:
-                    logger.error(f"Error searching for file in S3: {e}")
-
-        # Final attempt: direct object with exact filename in output bucket
-        if not s3_key and head_exists(output_bucket, filename):
-            s3_key = filename
-            target_bucket = output_bucket
+        # One index lookup; only a miss falls back to HEAD checks of the generated/ keys
+        from app.services.document_locator import get_document_locator, RANK_OUTPUT_GENERATED
+        locator = get_document_locator()
+        location = locator.lookup(filename)
+        if location is None and filename.lower().startswith("pa gc") and "SERVICE DESC" in filename:
+            # Legacy converter output named after the service only: generated/{service}.pdf
+            service_part = filename.split("SERVICE DESC", 1)[1].strip()
+            if service_part.lower().endswith(".pdf") or service_part.lower().endswith(".docx"):
+                service_part = service_part[:-4]
+            legacy = locator.lookup(f"{service_part}.pdf")
+            if legacy and legacy.rank == RANK_OUTPUT_GENERATED:
+                location = legacy
+        if location:
+            s3_key = location.key
+            target_bucket = location.bucket
         
         if not s3_key:
             raise HTTPException(status_code=404, detail=f"File not found in S3: {filename}")
@@ -331,6 +394,18 @@ async def download_document(filename: str):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error generating presigned URL: {str(e)}")
     else:
+        # Azure: documents saved to proposal folders are streamed straight to blob storage
+        # (no local copy), so serve them from there. Falls through to the filesystem for
+        # documents generated without proposal metadata.
+        if os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""):
+            try:
+                # A stale locator rescans with blocking listings; keep it off the event loop
+                blob_key = await asyncio.to_thread(_find_document_blob, filename)
+                if blob_key:
+                    return _stream_blob(blob_key, Path(blob_key).name)
+            except Exception as e:
+                logger.warning(f"Failed to serve {filename} from Azure Blob Storage: {e}")
+        
         # Docker/local: serve from filesystem
         # Check if we're running in Docker (/app exists) or locally
         is_docker = Path("/app").exists()
@@ -353,43 +428,15 @@ async def download_document(filename: str):
             if not file_path.exists():
                 file_path = backend_dir / "generated_documents" / filename
             
-            # Priority 3: mock_sharepoint folders (for updated documents)
+            # Priority 3: mock_sharepoint folders (for updated documents), including draft variants
             if not file_path.exists():
-                # Try to find the file in mock_sharepoint structure
                 # Path structure: mock_sharepoint/GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/{filename}
                 mock_base = project_root / "mock_sharepoint"
                 if mock_base.exists():
-                    # Search more thoroughly - check all service folders
-                    for gcloud_dir in sorted(mock_base.glob("GCloud *")):
-                        if not gcloud_dir.is_dir():
-                            continue
-                        pa_services = gcloud_dir / "PA Services"
-                        if not pa_services.exists():
-                            continue
-                        # Search in both LOT 2 and LOT 3 folders
-                        for lot_num in ["2", "3"]:
-                            lot_folder = pa_services / f"Cloud Support Services LOT {lot_num}"
-                            if not lot_folder.exists() or not lot_folder.is_dir():
-                                continue
-                            # Check each service folder
-                            for service_dir in lot_folder.iterdir():
-                                if not service_dir.is_dir():
-                                    continue
-                                potential_file = service_dir / filename
-                                if potential_file.exists():
-                                    file_path = potential_file
-                                    break
-                                # Also check for draft file if regular file doesn't exist
-                                if '_draft' not in filename:
-                                    draft_filename = filename.replace('.docx', '_draft.docx').replace('.pdf', '_draft.pdf')
-                                    draft_file = service_dir / draft_filename
-                                    if draft_file.exists():
-                                        file_path = draft_file
-                                        break
-                            if file_path and file_path.exists():
-                                break
-                        if file_path and file_path.exists():
-                            break
+                    from app.services.document_locator import get_document_locator
+                    location = get_document_locator(mock_base).lookup(filename)
+                    if location:
+                        file_path = Path(location.key)
         
         if not file_path or not file_path.exists():
             raise HTTPException(status_code=404, detail=f"File not found: {filename}")
@@ -404,6 +451,27 @@ async def download_document(filename: str):
         )
 
 
+def _find_document_blob(filename: str) -> Optional[str]:
+    """Resolve a generated document filename (or its _draft variant) to its blob key in the SharePoint container"""
+    from app.services.document_locator import get_document_locator
+    location = get_document_locator().lookup(filename)
+    return location.key if location else None
+
+
+def _stream_blob(blob_key: str, filename: str):
+    """Stream a blob to the client through the async storage interface, without staging it on local disk"""
+    from fastapi.responses import StreamingResponse
+    from urllib.parse import quote
+    from app.services.async_storage import get_async_storage
+    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document" \
+        if filename.endswith('.docx') else "application/pdf"
+    return StreamingResponse(
+        get_async_storage().stream(blob_key),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}"}
+    )
+
+
 @router.get("/")
 async def list_templates():
     """List available G-Cloud templates"""
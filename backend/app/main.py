@@ -57,6 +57,24 @@ async def root():
     }
 
 
+def _cache_stats() -> dict:
+    """Hit/miss counters of the in-process caches"""
+    from app.services.template_cache import template_cache
+    from app.services.image_cache import image_cache
+    from app.services.pdf_cache import pdf_cache_stats
+    return {
+        "template": {"hits": template_cache.hits, "misses": template_cache.misses},
+        "image": {"hits": image_cache.hits, "misses": image_cache.misses},
+        "pdf": pdf_cache_stats.snapshot(),
+    }
+
+
+def _converter_metrics() -> dict:
+    """Admission and latency metrics of the PDF conversion backends"""
+    from app.services.pdf_converters import converter_metrics
+    return converter_metrics()
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Detailed health check endpoint"""
@@ -68,6 +86,8 @@ async def health_check():
                 "api": "ok",
                 # TODO: Add database, redis, and other service checks
             },
+            "caches": _cache_stats(),
+            "pdf_converters": _converter_metrics(),
         },
     )
 
@@ -86,6 +106,11 @@ async def startup_event():
     print(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     print(f"Environment: {settings.ENVIRONMENT}")
     print(f"Debug mode: {settings.DEBUG}")
+    try:
+        from app.services.proposal_catalog import start_reconciler
+        start_reconciler()
+    except Exception as e:
+        logger.warning(f"Failed to start proposal catalog reconciler: {e}")
     # TODO: Initialize database connection pool
     # TODO: Initialize Redis connection
     # TODO: Initialize Azure services
@@ -95,6 +120,11 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event"""
     print(f"Shutting down {settings.APP_NAME}")
+    try:
+        from app.services.batch_generator import batch_generator
+        batch_generator.shutdown()
+    except Exception as e:
+        logger.warning(f"Failed to stop batch generation pool: {e}")
     # TODO: Close database connections
     # TODO: Close Redis connections
     # TODO: Cleanup resources
@@ -0,0 +1,349 @@
+"""
+Async storage interface for the SharePoint-style document store
+
+The same keys ("GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{folder}/{file}")
+address Azure Blob Storage, the S3 SharePoint bucket and the local mock_sharepoint
+tree. Route handlers await these calls instead of making blocking SDK calls on the
+event loop, and fetch independent objects concurrently with get_many.
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from app.services.blob_index import BlobEntry
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class AsyncStorage:
+    """Base class: list/get/put/exists/delete/stream by key"""
+
+    name = "base"
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max_concurrency or int(os.environ.get("STORAGE_MAX_CONCURRENCY", "16"))
+
+    async def list(self, prefix: str = "") -> List[BlobEntry]:
+        raise NotImplementedError
+
+    async def get(self, key: str) -> bytes:
+        """
+        Raises:
+            FileNotFoundError: If the key does not exist
+        """
+        raise NotImplementedError
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def stream(self, key: str) -> AsyncIterator[bytes]:
+        """Content in chunks, for StreamingResponse"""
+        raise NotImplementedError
+
+    async def get_many(self, keys: Sequence[str]) -> List[Union[bytes, Exception]]:
+        """
+        Fetch several objects concurrently (at most max_concurrency in flight)
+
+        Returns:
+            Contents in key order; a failed fetch yields its exception instead
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(key):
+            async with semaphore:
+                return await self.get(key)
+
+        return await asyncio.gather(*(fetch(key) for key in keys), return_exceptions=True)
+
+    async def close(self) -> None:
+        pass
+
+
+class AzureAsyncStorage(AsyncStorage):
+    """Azure Blob Storage through azure.storage.blob.aio"""
+
+    name = "azure"
+
+    def __init__(self, connection_string: str, container_name: str, index=None, **kwargs):
+        """
+        Args:
+            connection_string: Storage account connection string
+            container_name: Container holding the SharePoint tree
+            index: Optional BlobListingIndex answering list() from memory
+        """
+        super().__init__(**kwargs)
+        from azure.storage.blob.aio import BlobServiceClient
+        self._service = BlobServiceClient.from_connection_string(connection_string)
+        self.container_client = self._service.get_container_client(container_name)
+        self.index = index
+
+    async def list(self, prefix: str = "") -> List[BlobEntry]:
+        if self.index is not None:
+            # A stale index refreshes with a blocking listing; keep it off the event loop
+            return await asyncio.to_thread(self.index.list_blobs, prefix)
+        return [BlobEntry.from_blob_properties(blob) async for blob in self.container_client.list_blobs(name_starts_with=prefix)]
+
+    async def get(self, key: str) -> bytes:
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            downloader = await self.container_client.get_blob_client(key).download_blob()
+            return await downloader.readall()
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {key}")
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        from azure.storage.blob import ContentSettings
+        settings = ContentSettings(content_type=content_type) if content_type else None
+        await self.container_client.get_blob_client(key).upload_blob(data, overwrite=True, content_settings=settings)
+        if self.index is not None:
+            self.index.note_write(key, len(data))
+        return key
+
+    async def exists(self, key: str) -> bool:
+        return await self.container_client.get_blob_client(key).exists()
+
+    async def delete(self, key: str) -> None:
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            await self.container_client.get_blob_client(key).delete_blob()
+        except ResourceNotFoundError:
+            pass
+        if self.index is not None:
+            self.index.invalidate()
+
+    async def stream(self, key: str) -> AsyncIterator[bytes]:
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            downloader = await self.container_client.get_blob_client(key).download_blob()
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {key}")
+        async for chunk in downloader.chunks():
+            yield chunk
+
+    async def close(self) -> None:
+        await self._service.close()
+
+
+class S3AsyncStorage(AsyncStorage):
+    """
+    S3 bucket through boto3 on worker threads
+
+    boto3 clients are thread-safe, so each call runs in the default executor and
+    concurrency comes from get_many rather than from an async HTTP client.
+    """
+
+    name = "s3"
+
+    def __init__(self, bucket: str, client=None, **kwargs):
+        super().__init__(**kwargs)
+        self.bucket = bucket
+        if client is None:
+            import boto3
+            client = boto3.client('s3')
+        self.client = client
+
+    async def list(self, prefix: str = "") -> List[BlobEntry]:
+        def _list():
+            entries = []
+            for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=self.bucket, Prefix=prefix):
+                entries.extend(BlobEntry.from_s3_object(obj) for obj in page.get('Contents', []))
+            return entries
+        return await asyncio.to_thread(_list)
+
+    async def get(self, key: str) -> bytes:
+        def _get():
+            try:
+                return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+            except self.client.exceptions.NoSuchKey:
+                raise FileNotFoundError(f"Object not found: {key}")
+        return await asyncio.to_thread(_get)
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        extra = {'ContentType': content_type} if content_type else {}
+        await asyncio.to_thread(self.client.put_object, Bucket=self.bucket, Key=key, Body=data, **extra)
+        return key
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        def _head():
+            try:
+                self.client.head_object(Bucket=self.bucket, Key=key)
+                return True
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                    return False
+                raise
+        return await asyncio.to_thread(_head)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def stream(self, key: str) -> AsyncIterator[bytes]:
+        def _open():
+            try:
+                return self.client.get_object(Bucket=self.bucket, Key=key)['Body']
+            except self.client.exceptions.NoSuchKey:
+                raise FileNotFoundError(f"Object not found: {key}")
+        body = await asyncio.to_thread(_open)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+
+class LocalAsyncStorage(AsyncStorage):
+    """
+    Local mock_sharepoint directory; keys are paths relative to root
+
+    Listings of a LOT (or service folder) are answered from the mock SharePoint
+    catalog, which covers the files directly inside each service folder, rather
+    than walking the tree; other prefixes walk the directory.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.root = Path(root)
+
+    def _catalog(self):
+        try:
+            from sharepoint_service.mock_sharepoint import get_mock_catalog
+            return get_mock_catalog(self.root)
+        except Exception as e:
+            logger.warning(f"Mock SharePoint catalog unavailable, walking {self.root}: {e}")
+            return None
+
+    def _note_change(self, path: Path):
+        try:
+            from sharepoint_service.mock_sharepoint import note_local_change
+            note_local_change(path)
+        except Exception as e:
+            logger.warning(f"Failed to note {path} in mock SharePoint catalog: {e}")
+
+    def _list_catalog(self, prefix: str) -> Optional[List[BlobEntry]]:
+        """Entries under a LOT or service folder prefix from the catalog (None for other prefixes)"""
+        from sharepoint_service.mock_catalog import LOT_PREFIX
+        parts = prefix.split('/')
+        if len(parts) < 4 or not parts[0].startswith("GCloud ") or parts[1] != "PA Services" \
+                or not parts[2].startswith(LOT_PREFIX):
+            return None
+        catalog = self._catalog()
+        if catalog is None:
+            return None
+        lot_key = '/'.join(parts[:3])
+        entries = []
+        for folder in catalog.folders(parts[0][len("GCloud "):], parts[2][len(LOT_PREFIX):]):
+            for filename, mtime in folder.files.items():
+                key = f"{lot_key}/{folder.name}/{filename}"
+                if key.startswith(prefix):
+                    entries.append(BlobEntry(name=key, last_modified=datetime.fromtimestamp(mtime, tz=timezone.utc)))
+        return sorted(entries, key=lambda entry: entry.name)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Key escapes storage root: {key}")
+        return path
+
+    async def list(self, prefix: str = "") -> List[BlobEntry]:
+        def _list():
+            catalogued = self._list_catalog(prefix)
+            if catalogued is not None:
+                return catalogued
+            # Walk only the deepest directory the prefix names
+            directory = prefix.rsplit('/', 1)[0] if '/' in prefix else ""
+            base = self._path(directory) if directory else self.root
+            if not base.is_dir():
+                return []
+            entries = []
+            for path in base.rglob('*'):
+                key = path.relative_to(self.root).as_posix()
+                if path.is_file() and key.startswith(prefix):
+                    stat = path.stat()
+                    entries.append(BlobEntry(
+                        name=key,
+                        size=stat.st_size,
+                        last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+                    ))
+            return sorted(entries, key=lambda entry: entry.name)
+        return await asyncio.to_thread(_list)
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._path(key).read_bytes)
+
+    async def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        def _put():
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._note_change(path)
+        await asyncio.to_thread(_put)
+        return key
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def delete(self, key: str) -> None:
+        path = self._path(key)
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        self._note_change(path)
+
+    async def stream(self, key: str) -> AsyncIterator[bytes]:
+        handle = await asyncio.to_thread(open, self._path(key), 'rb')
+        try:
+            while True:
+                chunk = await asyncio.to_thread(handle.read, CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            handle.close()
+
+
+_storages: Dict[str, AsyncStorage] = {}
+
+
+def get_async_storage() -> AsyncStorage:
+    """
+    Process-wide storage for the deployment mode: Azure when
+    AZURE_STORAGE_CONNECTION_STRING is set, S3 (SHAREPOINT_BUCKET_NAME) when
+    USE_S3=true, otherwise the local mock_sharepoint tree
+    """
+    connection_string = os.environ.get("AZURE_STORAGE_CONNECTION_STRING", "")
+    if connection_string:
+        container = os.environ.get("AZURE_STORAGE_CONTAINER_NAME", "sharepoint")
+        key = f"azure:{container}"
+        if key not in _storages:
+            from app.services.blob_index import get_blob_index
+            _storages[key] = AzureAsyncStorage(connection_string, container, index=get_blob_index())
+    elif os.environ.get("USE_S3", "false").lower() == "true":
+        bucket = os.environ.get("SHAREPOINT_BUCKET_NAME", "")
+        key = f"s3:{bucket}"
+        if key not in _storages:
+            _storages[key] = S3AsyncStorage(bucket)
+    else:
+        from sharepoint_service.mock_sharepoint import MOCK_BASE_PATH
+        key = f"local:{MOCK_BASE_PATH}"
+        if key not in _storages:
+            _storages[key] = LocalAsyncStorage(MOCK_BASE_PATH)
+    return _storages[key]
@@ -4,14 +4,83 @@ Used in Azure Functions deployment
 """
 
 import os
+import time
+import threading
 from pathlib import Path
-from typing import Optional
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient, ContentSettings
 from azure.core.exceptions import AzureError, ResourceNotFoundError
 import logging
 
+from app.services.blob_index import BlobEntry
+
 logger = logging.getLogger(__name__)
 
+# One BlobServiceClient (and HTTP connection pool) per connection string, shared process-wide
+_clients: Dict[str, BlobServiceClient] = {}
+# (connection string, container) pairs whose existence has been checked by this process
+_checked_containers: Set[Tuple[str, str]] = set()
+_services: Dict[Tuple[str, str], "AzureBlobService"] = {}
+_lock = threading.Lock()
+
+
+def _transport_options() -> Dict:
+    """
+    Client transport settings
+    
+    AZURE_BLOB_MAX_CONNECTIONS: HTTP connection pool size (default 32)
+    AZURE_BLOB_CONNECTION_TIMEOUT / AZURE_BLOB_READ_TIMEOUT: seconds (default 20 / 60)
+    AZURE_BLOB_RETRY_TOTAL: retries per operation (default 3)
+    """
+    options = {
+        "connection_timeout": float(os.environ.get("AZURE_BLOB_CONNECTION_TIMEOUT", "20")),
+        "read_timeout": float(os.environ.get("AZURE_BLOB_READ_TIMEOUT", "60")),
+        "retry_total": int(os.environ.get("AZURE_BLOB_RETRY_TOTAL", "3")),
+    }
+    max_connections = int(os.environ.get("AZURE_BLOB_MAX_CONNECTIONS", "32"))
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from azure.core.pipeline.transport import RequestsTransport
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        options["transport"] = RequestsTransport(session=session, session_owner=False)
+    except ImportError:
+        logger.warning("requests transport unavailable, using the Azure SDK default connection pool")
+    return options
+
+
+def _shared_client(connection_string: str) -> BlobServiceClient:
+    with _lock:
+        client = _clients.get(connection_string)
+        if client is None:
+            client = BlobServiceClient.from_connection_string(connection_string, **_transport_options())
+            _clients[connection_string] = client
+        return client
+
+
+def get_azure_blob_service(
+    connection_string: Optional[str] = None,
+    container_name: Optional[str] = None
+) -> "AzureBlobService":
+    """
+    Process-wide AzureBlobService for the configured storage account and container
+    
+    Raises:
+        ValueError: If no connection string is configured
+    """
+    connection_string = connection_string or os.environ.get("AZURE_STORAGE_CONNECTION_STRING", "")
+    container_name = container_name or os.environ.get("AZURE_STORAGE_CONTAINER_NAME", "sharepoint")
+    key = (connection_string, container_name)
+    service = _services.get(key)
+    if service is None:
+        service = AzureBlobService(connection_string, container_name)
+        with _lock:
+            service = _services.setdefault(key, service)
+    return service
+
 
 class AzureBlobService:
     """Handles Azure Blob Storage operations for templates and generated documents"""
@@ -27,20 +96,47 @@ class AzureBlobService:
         if not self.connection_string:
             raise ValueError("Azure Storage connection string not configured")
         
-        # Initialize Blob Service Client
+        # Called with (blob_name, size) after every write made through this service
+        self._write_listeners: List[Callable[[str, Optional[int]], None]] = []
+        
+        # Clients are shared per connection string; the container check runs once per process
         try:
-            self.blob_service_client = BlobServiceClient.from_connection_string(self.connection_string)
+            self.blob_service_client = _shared_client(self.connection_string)
             self.container_client = self.blob_service_client.get_container_client(self.container_name)
-            # Ensure container exists
-            try:
-                self.container_client.get_container_properties()
-            except ResourceNotFoundError:
-                logger.info(f"Container {self.container_name} does not exist, creating it...")
-                self.container_client.create_container()
+            self._ensure_container()
         except Exception as e:
             logger.error(f"Failed to initialize Azure Blob Service: {e}")
             raise
     
+    def _ensure_container(self):
+        key = (self.connection_string, self.container_name)
+        if key in _checked_containers:
+            return
+        try:
+            self.container_client.get_container_properties()
+        except ResourceNotFoundError:
+            logger.info(f"Container {self.container_name} does not exist, creating it...")
+            self.container_client.create_container()
+        with _lock:
+            _checked_containers.add(key)
+    
+    def add_write_listener(self, listener: Callable[[str, Optional[int]], None]):
+        """Register a callback for blobs written through this service (e.g. listing caches)"""
+        self._write_listeners.append(listener)
+    
+    def notify_write(self, blob_name: str, size: Optional[int] = None):
+        """
+        Report a write to listeners
+        
+        Called automatically by the upload/copy methods; call it directly for blobs
+        written out of band (e.g. by the PDF converter Function).
+        """
+        for listener in self._write_listeners:
+            try:
+                listener(blob_name, size)
+            except Exception as e:
+                logger.warning(f"Blob write listener failed for {blob_name}: {e}")
+    
     def upload_file(self, local_path: Path, blob_name: str) -> str:
         """
         Upload a file to Azure Blob Storage
@@ -62,11 +158,54 @@ class AzureBlobService:
                 blob_client.upload_blob(data, overwrite=True)
             
             logger.info(f"Uploaded {local_path} to {blob_name}")
+            self.notify_write(blob_name, Path(local_path).stat().st_size)
             return blob_name
         except AzureError as e:
             logger.error(f"Failed to upload file to Azure Blob Storage: {e}")
             raise IOError(f"Failed to upload document to Azure Blob Storage: {e}")
     
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        blob_name: str,
+        length: Optional[int] = None,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Upload a file-like object (e.g. an in-memory buffer) to Azure Blob Storage
+        
+        Args:
+            stream: Readable binary stream positioned at the start of the content
+            blob_name: Blob name (key) where content will be stored
+            length: Content length in bytes, if known
+            content_type: Optional MIME type stored with the blob
+            metadata: Optional blob metadata (ASCII string values)
+            
+        Returns:
+            Blob name of uploaded file
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            content_settings = ContentSettings(content_type=content_type) if content_type else None
+            blob_client.upload_blob(
+                stream,
+                length=length,
+                overwrite=True,
+                content_settings=content_settings,
+                metadata=metadata,
+            )
+            
+            logger.info(f"Uploaded stream to {blob_name}")
+            self.notify_write(blob_name, length)
+            return blob_name
+        except AzureError as e:
+            logger.error(f"Failed to upload stream to Azure Blob Storage: {e}")
+            raise IOError(f"Failed to upload document to Azure Blob Storage: {e}")
+    
     def download_file(self, blob_name: str, local_path: Path) -> Path:
         """
         Download a file from Azure Blob Storage
@@ -120,6 +259,125 @@ class AzureBlobService:
             logger.error(f"Failed to get file from Azure Blob Storage: {e}")
             raise IOError(f"Failed to get document from Azure Blob Storage: {e}")
     
+    def iter_file_chunks(self, blob_name: str) -> Iterator[bytes]:
+        """
+        Stream blob content in chunks (for HTTP responses)
+        
+        Args:
+            blob_name: Blob name (key) of the file
+            
+        Returns:
+            Iterator over content chunks
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            return blob_client.download_blob().chunks()
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {blob_name}")
+        except AzureError as e:
+            logger.error(f"Failed to stream file from Azure Blob Storage: {e}")
+            raise IOError(f"Failed to get document from Azure Blob Storage: {e}")
+    
+    def get_blob_etag(self, blob_name: str) -> str:
+        """
+        Get the ETag of a blob (used to revalidate cached copies)
+        
+        Args:
+            blob_name: Blob name (key) of the file
+            
+        Returns:
+            Blob ETag
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            return blob_client.get_blob_properties().etag
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {blob_name}")
+        except AzureError as e:
+            logger.error(f"Failed to get blob properties from Azure Blob Storage: {e}")
+            raise IOError(f"Failed to get blob properties from Azure Blob Storage: {e}")
+    
+    def get_blob_metadata(self, blob_name: str) -> Optional[Dict[str, str]]:
+        """
+        Get the user metadata stored on a blob
+        
+        Args:
+            blob_name: Blob name (key) of the file
+            
+        Returns:
+            Metadata dict, or None if the blob does not exist
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            return dict(blob_client.get_blob_properties().metadata or {})
+        except ResourceNotFoundError:
+            return None
+        except AzureError as e:
+            logger.error(f"Failed to get blob metadata from Azure Blob Storage: {e}")
+            raise IOError(f"Failed to get blob metadata from Azure Blob Storage: {e}")
+    
+    def set_blob_metadata(self, blob_name: str, metadata: Dict[str, str]) -> None:
+        """
+        Replace the user metadata stored on a blob
+        
+        Args:
+            blob_name: Blob name (key) of the file
+            metadata: Metadata dict (ASCII string values)
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            blob_client.set_blob_metadata(metadata)
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {blob_name}")
+        except AzureError as e:
+            logger.error(f"Failed to set blob metadata in Azure Blob Storage: {e}")
+            raise IOError(f"Failed to set blob metadata in Azure Blob Storage: {e}")
+    
+    def copy_blob(self, source_blob_name: str, dest_blob_name: str, metadata: Optional[Dict[str, str]] = None) -> None:
+        """
+        Server-side copy of a blob within the container
+        
+        Args:
+            source_blob_name: Blob to copy from
+            dest_blob_name: Blob to create or overwrite
+            metadata: Metadata for the copy (defaults to the source blob's metadata)
+        """
+        try:
+            source_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=source_blob_name
+            )
+            dest_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=dest_blob_name
+            )
+            copy = dest_client.start_copy_from_url(source_client.url, metadata=metadata)
+            # Copies within one storage account normally complete synchronously
+            status = copy.get('copy_status')
+            while status == 'pending':
+                time.sleep(0.2)
+                status = dest_client.get_blob_properties().copy.status
+            if status != 'success':
+                raise IOError(f"Copy of {source_blob_name} to {dest_blob_name} ended with status {status}")
+            self.notify_write(dest_blob_name)
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {source_blob_name}")
+        except AzureError as e:
+            logger.error(f"Failed to copy blob in Azure Blob Storage: {e}")
+            raise IOError(f"Failed to copy blob in Azure Blob Storage: {e}")
+    
     def blob_exists(self, blob_name: str) -> bool:
         """
         Check if a blob exists
@@ -142,7 +400,7 @@ class AzureBlobService:
         except AzureError:
             return False
     
-    def list_blobs(self, prefix: str = "") -> list:
+    def list_blobs(self, prefix: str = "") -> List[BlobEntry]:
         """
         List blobs with a given prefix
         
@@ -150,13 +408,11 @@ class AzureBlobService:
             prefix: Prefix to filter blobs
             
         Returns:
-            List of blob names
+            List of BlobEntry (name, size, last_modified, etag, content_md5) taken
+            from the listing itself, so callers need no per-blob properties request
         """
         try:
-            blobs = []
-            for blob in self.container_client.list_blobs(name_starts_with=prefix):
-                blobs.append(blob.name)
-            return blobs
+            return [BlobEntry.from_blob_properties(blob) for blob in self.container_client.list_blobs(name_starts_with=prefix)]
         except AzureError as e:
             logger.error(f"Failed to list blobs: {e}")
             return []
@@ -0,0 +1,150 @@
+"""
+Batch Service Description generation
+Fans CPU-bound python-docx work out across a bounded process pool
+"""
+
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A storage write made by a worker: (backend, key, bucket, size)
+Write = Tuple[str, str, Optional[str], Optional[int]]
+
+# Generator instance owned by each worker process (created by _init_worker)
+_worker_generator = None
+# Writes of the item the worker process is generating (process workers only)
+_worker_writes: Optional[List[Write]] = None
+
+
+def _in_worker_process() -> bool:
+    return multiprocessing.parent_process() is not None
+
+
+def _init_worker():
+    """Create the worker's DocumentGenerator once (template cache warms on first item)"""
+    global _worker_generator, _worker_writes
+    from app.services.document_generator import DocumentGenerator, add_write_listener
+    if os.environ.get("USE_S3", "false").lower() == "true":
+        from app.services.s3_service import S3Service
+        _worker_generator = DocumentGenerator(s3_service=S3Service())
+    else:
+        _worker_generator = DocumentGenerator()
+    
+    if not _in_worker_process():
+        # Thread fallback: writes already reach this process's indexes
+        return
+    # The parent's listing indexes and catalogs never see a child's writes; journal them
+    _worker_writes = []
+    add_write_listener(lambda backend, key, bucket: _worker_writes.append((backend, key, bucket, None)))
+    if _worker_generator.use_azure and _worker_generator.azure_blob_service:
+        _worker_generator.azure_blob_service.add_write_listener(
+            lambda blob_name, size=None: _worker_writes.append(('azure', blob_name, None, size))
+        )
+
+
+def _generate_item(kwargs: Dict) -> Tuple[Dict, List[Write]]:
+    """Generate one Service Description inside a worker; returns the result and the writes to replay"""
+    if _worker_generator is None:
+        _init_worker()
+    if _worker_writes is None:
+        return _worker_generator.generate_service_description(**kwargs), []
+    _worker_writes.clear()
+    result = _worker_generator.generate_service_description(**kwargs)
+    return result, list(_worker_writes)
+
+
+def _record_writes(writes: List[Write]):
+    """Register a worker process's writes with this process's download locator, listings and catalogs"""
+    for backend, key, bucket, size in writes:
+        try:
+            if backend == 'azure':
+                from app.services.azure_blob_service import get_azure_blob_service
+                get_azure_blob_service().notify_write(key, size)
+            else:
+                from app.services.document_generator import note_document_write
+                note_document_write(backend, key, bucket)
+        except Exception as e:
+            logger.warning(f"Failed to record batch write {key}: {e}")
+
+
+class BatchGenerator:
+    """Runs many generate_service_description calls on a bounded worker pool"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize batch generator
+
+        Args:
+            max_workers: Pool size (defaults to BATCH_GENERATION_MAX_WORKERS or the CPU count)
+        """
+        self.max_workers = max_workers or int(os.environ.get("BATCH_GENERATION_MAX_WORKERS", "0")) or (os.cpu_count() or 1)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            try:
+                # spawn: workers must not inherit the parent's threads or open storage clients
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            except (OSError, NotImplementedError) as e:
+                # e.g. AWS Lambda has no /dev/shm for process pool semaphores
+                logger.warning(f"Process pool unavailable ({e}), falling back to threads")
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def generate(self, items: List[Dict]) -> AsyncIterator[Dict]:
+        """
+        Generate documents, yielding each result as soon as it finishes
+
+        At most max_workers * 2 items are queued on the pool at a time.
+
+        Args:
+            items: generate_service_description keyword arguments, one dict per document
+
+        Yields:
+            Dict with index, success and either result or error
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        max_in_flight = self.max_workers * 2
+        pending: Dict[asyncio.Future, int] = {}
+        next_index = 0
+
+        while next_index < len(items) or pending:
+            while next_index < len(items) and len(pending) < max_in_flight:
+                future = loop.run_in_executor(executor, _generate_item, items[next_index])
+                pending[future] = next_index
+                next_index += 1
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    result, writes = future.result()
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {e}")
+                    if isinstance(e, BrokenExecutor):
+                        # A worker died; start a fresh pool for the next batch
+                        self._executor = None
+                    yield {"index": index, "success": False, "error": str(e)}
+                    continue
+                _record_writes(writes)
+                yield {"index": index, "success": True, "result": result}
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+batch_generator = BatchGenerator()
@@ -0,0 +1,248 @@
+"""
+In-memory index of the SharePoint-style blob taxonomy
+
+    GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service folder}/{file}
+
+Built from one paginated listing of every "GCloud " blob and kept fresh by a
+TTL plus write-through updates from uploads made through AzureBlobService, so
+routes that walk every version and LOT answer from memory instead of issuing
+one listing per prefix.
+"""
+
+import os
+import re
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_ROOT = "GCloud "
+TAXONOMY = re.compile(
+    r"^GCloud (?P<version>[^/]+)/PA Services/Cloud Support Services LOT (?P<lot>[^/]+)/(?P<folder>[^/]+)/(?P<file>.+)$"
+)
+
+
+@dataclass
+class BlobEntry:
+    """
+    A listed blob or S3 object, with the properties the listing already returns
+
+    size/etag are None for provisional entries recorded on write. content_md5 is a
+    hex digest, None when storage has none (e.g. multipart S3 uploads).
+    """
+    name: str
+    size: Optional[int] = None
+    last_modified: Optional[datetime] = None
+    etag: Optional[str] = None
+    content_md5: Optional[str] = None
+
+    @classmethod
+    def from_blob_properties(cls, blob) -> "BlobEntry":
+        """Entry from an Azure BlobProperties yielded by ContainerClient.list_blobs"""
+        content_settings = getattr(blob, "content_settings", None)
+        content_md5 = content_settings.content_md5 if content_settings else None
+        return cls(
+            name=blob.name,
+            size=blob.size,
+            last_modified=blob.last_modified,
+            etag=blob.etag,
+            content_md5=bytes(content_md5).hex() if content_md5 else None,
+        )
+
+    @classmethod
+    def from_s3_object(cls, obj: Dict) -> "BlobEntry":
+        """Entry from a 'Contents' item of an S3 list_objects_v2 page"""
+        etag = obj.get("ETag", "").strip('"') or None
+        return cls(
+            name=obj["Key"],
+            size=obj.get("Size"),
+            last_modified=obj.get("LastModified"),
+            etag=etag,
+            # Single-part uploads use the MD5 as ETag; multipart ETags end in -<parts>
+            content_md5=etag if etag and "-" not in etag else None,
+        )
+
+    @property
+    def mtime(self) -> Optional[float]:
+        """last_modified as a POSIX timestamp"""
+        return self.last_modified.timestamp() if self.last_modified else None
+
+
+class BlobListingIndex:
+    """
+    Listing cache for the GCloud folder taxonomy of one container.
+
+    Entries are held flat (sorted names, for prefix queries) and as a
+    version -> LOT -> service folder -> file name tree.
+    """
+
+    def __init__(self, azure_blob_service, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            azure_blob_service: AzureBlobService whose container is indexed
+            ttl_seconds: Maximum age before the next read re-lists (BLOB_INDEX_TTL_SECONDS, default 60)
+        """
+        self.azure_blob_service = azure_blob_service
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.environ.get("BLOB_INDEX_TTL_SECONDS", "60"))
+        self._entries: Dict[str, BlobEntry] = {}
+        self._names: List[str] = []
+        self._tree: Dict[str, Dict[str, Dict[str, Dict[str, BlobEntry]]]] = {}
+        # (version, LOT) -> ServiceNameIndex of its folder names
+        self._name_indexes: Dict[Tuple[str, str], "ServiceNameIndex"] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self.refreshes = 0
+        azure_blob_service.add_write_listener(self.note_write)
+
+    def refresh(self) -> int:
+        """
+        Rebuild the index from a single paginated listing
+
+        Returns:
+            Number of blobs indexed
+        """
+        entries = {}
+        for blob in self.azure_blob_service.container_client.list_blobs(name_starts_with=INDEX_ROOT):
+            entries[blob.name] = BlobEntry.from_blob_properties(blob)
+        tree: Dict[str, Dict[str, Dict[str, Dict[str, BlobEntry]]]] = {}
+        for entry in entries.values():
+            self._add_to_tree(tree, entry)
+        with self._lock:
+            self._entries = entries
+            self._names = sorted(entries)
+            self._tree = tree
+            self._name_indexes = {}
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+        logger.info(f"Blob listing index refreshed: {len(entries)} blobs")
+        return len(entries)
+
+    def invalidate(self):
+        """Force the next read to re-list"""
+        with self._lock:
+            self._loaded_at = None
+
+    @staticmethod
+    def _add_to_tree(tree, entry: BlobEntry) -> Optional[Tuple[str, str]]:
+        """Add entry under its service folder; returns (version, LOT) if that folder is new"""
+        match = TAXONOMY.match(entry.name)
+        if match:
+            folders = tree.setdefault(match["version"], {}).setdefault(match["lot"], {})
+            is_new = match["folder"] not in folders
+            folders.setdefault(match["folder"], {})[match["file"]] = entry
+            if is_new:
+                return match["version"], match["lot"]
+        return None
+
+    def _fresh(self) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self.ttl_seconds:
+            return True
+        with self._refresh_lock:
+            # Another thread may have refreshed while this one waited
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return True
+            try:
+                self.refresh()
+                return True
+            except Exception as e:
+                logger.warning(f"Blob listing index refresh failed, listing directly: {e}")
+                return False
+
+    def note_write(self, blob_name: str, size: Optional[int] = None):
+        """Record a blob written by this process (provisional until the next refresh)"""
+        if not blob_name.startswith(INDEX_ROOT):
+            return
+        entry = BlobEntry(name=blob_name, size=size, last_modified=datetime.now(timezone.utc))
+        with self._lock:
+            if blob_name not in self._entries:
+                bisect.insort(self._names, blob_name)
+            self._entries[blob_name] = entry
+            new_folder = self._add_to_tree(self._tree, entry)
+            if new_folder:
+                self._name_indexes.pop(new_folder, None)
+
+    def list_blobs(self, prefix: str = "") -> List[BlobEntry]:
+        """Entries starting with prefix (drop-in for AzureBlobService.list_blobs)"""
+        if not prefix.startswith(INDEX_ROOT) or not self._fresh():
+            return self.azure_blob_service.list_blobs(prefix=prefix)
+        with self._lock:
+            start = bisect.bisect_left(self._names, prefix)
+            result = []
+            for name in self._names[start:]:
+                if not name.startswith(prefix):
+                    break
+                result.append(self._entries[name])
+            return result
+
+    def entry(self, blob_name: str) -> Optional[BlobEntry]:
+        """Listed entry for a blob, or None if it does not exist"""
+        if not blob_name.startswith(INDEX_ROOT) or not self._fresh():
+            return next((e for e in self.azure_blob_service.list_blobs(prefix=blob_name) if e.name == blob_name), None)
+        with self._lock:
+            return self._entries.get(blob_name)
+
+    def folders(self, gcloud_version: str, lot: str) -> Dict[str, Dict[str, BlobEntry]]:
+        """Service folders of a LOT: folder name -> {file name -> entry}"""
+        if not self._fresh():
+            tree = {}
+            prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
+            for entry in self.list_blobs(prefix):
+                self._add_to_tree(tree, entry)
+            return tree.get(gcloud_version, {}).get(lot, {})
+        with self._lock:
+            lots = self._tree.get(gcloud_version, {})
+            return {name: dict(files) for name, files in lots.get(lot, {}).items()}
+
+    def name_index(self, gcloud_version: str, lot: str) -> "ServiceNameIndex":
+        """Fuzzy service-name index over a LOT's folders (kept until the next refresh or new folder)"""
+        try:
+            from sharepoint_service.name_index import ServiceNameIndex
+        except ImportError:
+            from app.sharepoint_service.name_index import ServiceNameIndex
+        if not self._fresh():
+            return ServiceNameIndex(self.folders(gcloud_version, lot))
+        with self._lock:
+            index = self._name_indexes.get((gcloud_version, lot))
+            if index is None:
+                names = self._tree.get(gcloud_version, {}).get(lot, {})
+                index = self._name_indexes[(gcloud_version, lot)] = ServiceNameIndex(names)
+            return index
+
+    def folder_files(self, gcloud_version: str, lot: str, folder: str) -> Dict[str, BlobEntry]:
+        """Files of one service folder: file name -> entry"""
+        if not self._fresh():
+            return self.folders(gcloud_version, lot).get(folder, {})
+        with self._lock:
+            return dict(self._tree.get(gcloud_version, {}).get(lot, {}).get(folder, {}))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            age = time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+            return {
+                "blobs": len(self._entries),
+                "refreshes": self.refreshes,
+                "age_seconds": round(age, 1) if age is not None else None,
+            }
+
+
+_index: Optional[BlobListingIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_blob_index() -> BlobListingIndex:
+    """Process-wide index over the configured container"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from app.services.azure_blob_service import get_azure_blob_service
+            _index = BlobListingIndex(get_azure_blob_service())
+        return _index
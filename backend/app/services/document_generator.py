@@ -8,19 +8,72 @@ import json
 import shutil
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK
 import uuid
-from bs4 import BeautifulSoup
 from docx.oxml import OxmlElement
 from docx.text.paragraph import Paragraph
 from docx.oxml.ns import qn
+from app.utils.docx_placeholders import replace_placeholders
+from app.utils.docx_body_index import BodyIndex
+from app.utils.docx_stream import serialize_document, DOCX_CONTENT_TYPE
+from app.utils.html_to_ooxml import HtmlRenderer
+from app.utils.docx_sections import find_section, mark_section, read_manifest, section_elements, write_manifest
+from app.utils.docx_toc import materialise_toc, toc_is_materialised
+from app.services.image_cache import image_cache, collect_image_sources
+from app.services.generation_cache import BlobGenerationCache, generation_cache_enabled, generation_key, section_manifest
+from app.services.pdf_cache import BlobPdfCache, pdf_cache_enabled, pdf_cache_stats, source_id
+from app.services.pdf_converters import ConversionRequest, ConverterOverloaded, get_pdf_converter
+from app.services.document_locator import record_upload
+from app.services.proposal_catalog import record_document
+
+# Sections that incremental updates can rewrite in place (in document order)
+CONTENT_SECTIONS = ('description', 'features', 'benefits', 'service_definition')
 
 logger = logging.getLogger(__name__)
 
 
+# Callbacks for documents written to local disk or S3: (backend, key, bucket).
+# Batch worker processes use them to report their writes back to the parent.
+_write_listeners: List[Callable[[str, str, Optional[str]], None]] = []
+
+
+def add_write_listener(listener: Callable[[str, str, Optional[str]], None]):
+    """Register a callback for documents this process writes to local disk or S3"""
+    _write_listeners.append(listener)
+
+
+def note_document_write(backend: str, key: str, bucket: Optional[str] = None):
+    """
+    Register a document written to local disk or S3 with the download locator,
+    proposal catalog, mock SharePoint catalog (local) and write listeners
+    
+    Args:
+        backend: 'local' or 's3'
+        key: Local path or S3 key
+        bucket: S3 bucket
+    """
+    record_upload(backend, key, bucket)
+    record_document(key)
+    if backend == 'local':
+        try:
+            from sharepoint_service.mock_sharepoint import note_local_change
+            note_local_change(Path(key))
+        except Exception as e:
+            logger.warning(f"Failed to note {key} in mock SharePoint catalog: {e}")
+    for listener in _write_listeners:
+        try:
+            listener(backend, key, bucket)
+        except Exception as e:
+            logger.warning(f"Document write listener failed for {key}: {e}")
+
+
+def _note_local_write(path: Path):
+    note_document_write('local', str(path))
+
+
 class DocumentGenerator:
     """Generates G-Cloud proposal documents from templates"""
     
@@ -33,14 +86,16 @@ class DocumentGenerator:
         """
         self.s3_service = s3_service
         self.use_s3 = s3_service is not None
+        # Resolved local template path, keyed by SERVICE_DESC_TEMPLATE_PATH value
+        self._template_path_cache: Dict[Optional[str], Path] = {}
         
         # Check if we're in Azure (has Azure Storage connection string but no S3)
         self.use_azure = not self.use_s3 and bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
         self.azure_blob_service = None
         if self.use_azure:
             try:
-                from app.services.azure_blob_service import AzureBlobService
-                self.azure_blob_service = AzureBlobService()
+                from app.services.azure_blob_service import get_azure_blob_service
+                self.azure_blob_service = get_azure_blob_service()
             except Exception as e:
                 logger.warning(f"Failed to initialize Azure Blob Service: {e}")
                 self.use_azure = False
@@ -70,6 +125,131 @@ class DocumentGenerator:
                 self.output_dir = Path("/tmp/generated_documents")
                 self.output_dir.mkdir(parents=True, exist_ok=True)
     
+    def _resolve_template_path(self) -> Path:
+        """
+        Locate the local Service Description template.
+        
+        The discovery result is memoised per SERVICE_DESC_TEMPLATE_PATH value so the
+        directory globs only run again if the resolved file disappears.
+        
+        Returns:
+            Path to the template (may not exist if no template could be found)
+        """
+        template_env = os.environ.get("SERVICE_DESC_TEMPLATE_PATH")
+        cached = self._template_path_cache.get(template_env)
+        if cached is not None and cached.exists():
+            return cached
+        
+        template_path: Path | None = None
+        if template_env:
+            env_path = Path(template_env)
+            if env_path.exists():
+                template_path = env_path
+        
+        if template_path is None:
+            # Check if we're running in Docker (/app exists) or locally
+            is_docker = Path("/app").exists()
+            
+            if is_docker:
+                # Docker environment: use /app paths
+                docs_dir = Path("/app/docs")
+                candidate = None
+                if docs_dir.exists():
+                    for p in docs_dir.glob("*.docx"):
+                        candidate = p
+                        break
+                template_path = candidate or (self.templates_dir / "service_description_template.docx")
+            else:
+                # Local development: use relative paths from backend directory
+                # Get the backend directory (parent of app directory)
+                backend_dir = Path(__file__).parent.parent.parent
+                templates_dir = backend_dir / "templates"
+                docs_dir = backend_dir / "docs"
+                
+                # Check docs first, then templates
+                candidate = None
+                if docs_dir.exists():
+                    for p in docs_dir.glob("*.docx"):
+                        candidate = p
+                        break
+                if candidate is None and templates_dir.exists():
+                    for p in templates_dir.glob("*.docx"):
+                        candidate = p
+                        break
+                
+                if candidate is None:
+                    # Fallback to templates directory
+                    template_path = templates_dir / "service_description_template.docx"
+                else:
+                    template_path = candidate
+        
+        if template_path.exists():
+            self._template_path_cache[template_env] = template_path
+        return template_path
+    
+    def _template_version(self) -> str:
+        """
+        Identify the current template revision for the generation cache
+        
+        Taken from the template cache, which revalidates remote templates at most
+        every TEMPLATE_CACHE_REVALIDATE_SECONDS, so no extra HEAD request is made.
+        
+        Returns:
+            Blob/object ETag for remote templates, or mtime/size for local ones
+        """
+        from app.services.template_cache import template_cache
+        
+        blob_template_key = os.environ.get("TEMPLATE_BLOB_KEY")
+        if self.use_s3:
+            template_key = os.environ.get("TEMPLATE_S3_KEY", "templates/service_description_template.docx")
+            return template_cache.version_s3(self.s3_service, template_key)
+        if self.use_azure and blob_template_key:
+            return template_cache.version_azure(self.azure_blob_service, blob_template_key)
+        return template_cache.version_local(self._resolve_template_path())
+    
+    def _azure_word_blob_key(
+        self,
+        title: str,
+        update_metadata: Dict | None,
+        new_proposal_metadata: Dict | None,
+        save_as_draft: bool
+    ) -> str:
+        """
+        Build the blob key a generated Service Description is uploaded to in Azure
+        
+        Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service_folder}/{filename}
+        """
+        if update_metadata:
+            gcloud_version = update_metadata.get('gcloud_version', '14')
+            doc_type = update_metadata.get('doc_type', 'SERVICE DESC')
+            lot = update_metadata.get('lot', '3')
+            # Service folder is the last segment of the blob prefix, when one was given
+            folder_name = update_metadata.get('service_name', title)
+            for part in reversed((update_metadata.get('folder_path') or '').rstrip('/').split('/')):
+                if part:
+                    folder_name = part
+                    break
+        else:
+            gcloud_version = new_proposal_metadata.get('gcloud_version', '15')
+            doc_type = 'SERVICE DESC'
+            lot = new_proposal_metadata.get('lot', '2')
+            # Use service_name directly with spaces - NO normalization
+            folder_name = new_proposal_metadata.get('service', title)
+        
+        word_filename = self._word_filename(gcloud_version, doc_type, folder_name, save_as_draft)
+        return f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{folder_name}/{word_filename}"
+    
+    @staticmethod
+    def _word_filename(gcloud_version: str, doc_type: str, folder_name: str, save_as_draft: bool) -> str:
+        """Exact SharePoint filename, e.g. PA GC15 SERVICE DESC [Folder Name].docx"""
+        if doc_type == 'SERVICE DESC':
+            word_filename = f"PA GC{gcloud_version} SERVICE DESC {folder_name}.docx"
+        else:
+            word_filename = f"PA GC{gcloud_version} Pricing Doc {folder_name}.docx"
+        if save_as_draft:
+            word_filename = word_filename.replace('.docx', '_draft.docx')
+        return word_filename
+    
     def generate_service_description(
         self,
         title: str,
@@ -94,123 +274,50 @@ class DocumentGenerator:
             Dict with paths to generated Word and PDF files
         """
         
-        # Load template
-        if self.use_s3:
-            # AWS Lambda: download template from S3 to /tmp
-            template_key = os.environ.get("TEMPLATE_S3_KEY", "templates/service_description_template.docx")
-            template_path = self.output_dir / "template.docx"
-            self.s3_service.download_template(template_key, template_path)
-        else:
-            # Docker/local: use local filesystem
-            template_env = os.environ.get("SERVICE_DESC_TEMPLATE_PATH")
-            template_path: Path | None = None
-            if template_env:
-                env_path = Path(template_env)
-                if env_path.exists():
-                    template_path = env_path
-            
-            if template_path is None:
-                # Check if we're running in Docker (/app exists) or locally
-                is_docker = Path("/app").exists()
-                
-                if is_docker:
-                    # Docker environment: use /app paths
-                    docs_dir = Path("/app/docs")
-                    candidate = None
-                    if docs_dir.exists():
-                        for p in docs_dir.glob("*.docx"):
-                            candidate = p
-                            break
-                    template_path = candidate or (self.templates_dir / "service_description_template.docx")
-                else:
-                    # Local development: use relative paths from backend directory
-                    # Get the backend directory (parent of app directory)
-                    backend_dir = Path(__file__).parent.parent.parent
-                    templates_dir = backend_dir / "templates"
-                    docs_dir = backend_dir / "docs"
-                    
-                    # Check docs first, then templates
-                    candidate = None
-                    if docs_dir.exists():
-                        for p in docs_dir.glob("*.docx"):
-                            candidate = p
-                            break
-                    if candidate is None and templates_dir.exists():
-                        for p in templates_dir.glob("*.docx"):
-                            candidate = p
-                            break
-                    
-                    if candidate is None:
-                        # Fallback to templates directory
-                        template_path = templates_dir / "service_description_template.docx"
-                    else:
-                        template_path = candidate
-            
-            if not Path(template_path).exists():
-                raise FileNotFoundError(f"Template not found: {template_path}")
-        
-        # Create a copy to work with
-        doc = Document(str(template_path))
+        # The template version keys the generation cache and the section manifest, which
+        # only matter for documents saved to a proposal folder (and so updated later)
+        template_version = None
+        if update_metadata or new_proposal_metadata:
+            try:
+                template_version = self._template_version()
+            except Exception as e:
+                logger.warning(f"Could not determine template version: {e}")
         
-        # Replace title (first Heading 1)
-        self._replace_title(doc, title)
+        # Azure: reuse the stored Word/PDF artefacts if nothing changed since the last save
+        generation_cache = None
+        cache_key = None
+        if self.use_azure and self.azure_blob_service and (update_metadata or new_proposal_metadata) and generation_cache_enabled() and template_version:
+            cache_key = generation_key(title, description, features, benefits, service_definition, template_version)
+            generation_cache = BlobGenerationCache(self.azure_blob_service)
+            target_blob_key = self._azure_word_blob_key(title, update_metadata, new_proposal_metadata, save_as_draft)
+            require_pdf = not save_as_draft and bool(os.environ.get("PDF_CONVERTER_FUNCTION_URL"))
+            cached = generation_cache.lookup(target_blob_key, cache_key, require_pdf)
+            if cached:
+                pdf_blob_key = cached["pdf_blob_key"]
+                return {
+                    "word_path": target_blob_key,
+                    "word_blob_key": target_blob_key,
+                    "pdf_blob_key": pdf_blob_key,
+                    "pdf_path": pdf_blob_key or "",
+                    "filename": update_metadata.get('service_name', title) if update_metadata else new_proposal_metadata.get('service', title),
+                    "word_sha256": cached["word_sha256"],
+                    "word_size": cached["word_size"],
+                    "cached": True
+                }
         
-        # Clean target sections entirely and build a fresh content block after TOC
-        self._remove_sections(doc, [
-            'Short Service Description',
-            'Key Service Features',
-            'Key Service Benefits',
-            'Service Definition',
-        ])
-        # Capture and remove 'About PA' block using marker or heading, to re-append at the very end
-        about_pa_block = self._extract_block_by_marker(doc, '{{ABOUT_PA_START}}')
-        if not about_pa_block:
-            about_pa_block = self._extract_heading_block(doc, 'About PA')
-
-        after_toc_para = self._ensure_toc_and_pagebreak(doc)
-        # Insert fresh content block starting on a new page
-        last_para = self._insert_full_content_block(
-            doc=doc,
-            after_para=after_toc_para,
-            service_title=title,
-            description=description,
-            features=features,
-            benefits=benefits,
-            service_definition=service_definition or [],
-        )
-        # Re-append About PA block as the final page on its own
-        if about_pa_block:
-            # Page break before About PA - ensure proper spacing
-            # Add multiple blank paragraphs and explicit page break for proper separation
-            tail_para = last_para or (doc.paragraphs[-1] if doc.paragraphs else None)
-            if tail_para is not None:
-                # Add a blank paragraph for spacing
-                blank_para1 = self._insert_paragraph_after(tail_para, '')
-                # Add another blank paragraph
-                blank_para2 = self._insert_paragraph_after(blank_para1, '')
-                # Add page break to the second blank paragraph (ensures proper page break)
-                blank_para2.add_run().add_break(WD_BREAK.PAGE)
-                # Add one more blank paragraph after page break to ensure spacing
-                blank_para3 = self._insert_paragraph_after(blank_para2, '')
-            body = doc._element.body
-            for el in about_pa_block:
-                body.append(el)
-
-        # Placeholders and ToC handling occur after content is built
-        self._enable_update_fields_on_open(doc)
-        
-        # Update TOC field after content insertion
-        # This ensures the TOC is populated with actual headings
-        self._update_toc_field(doc)
-
-        # Replace placeholders across all text nodes (including inside shapes/textboxes)
-        self._replace_text_in_all_wt(doc, {
-            'ENTER SERVICE NAME HERE': title,
-            'Enter Service Name Here': title,
-            'enter service name here': title,
-            'Add Title': title,
-            '{{SERVICE_NAME}}': title,
-        })
+        # Updates rewrite only the changed sections of the stored document when possible
+        manifest = None
+        if template_version:
+            manifest = section_manifest(title, description, features, benefits, service_definition, template_version)
+        doc = None
+        if update_metadata and manifest and os.environ.get("INCREMENTAL_UPDATES_ENABLED", "true").lower() == "true":
+            doc = self._update_existing_document(
+                title, description, features, benefits, service_definition or [], update_metadata, save_as_draft, manifest
+            )
+        if doc is None:
+            doc = self._build_document(title, description, features, benefits, service_definition or [])
+        if manifest:
+            write_manifest(doc, manifest)
         
         # Determine output location and filename
         if update_metadata or new_proposal_metadata:
@@ -297,16 +404,12 @@ class DocumentGenerator:
                         # Verify folder exists, if not try to find it with fuzzy match
                         actual_folder_name = service_name
                         if not folder_path.exists():
-                            # Try to find folder with fuzzy match
-                            base_path = MOCK_BASE_PATH / f"GCloud {gcloud_version}" / "PA Services"
-                            lot_folder = base_path / f"Cloud Support Services LOT {lot}"
-                            if lot_folder.exists():
-                                from sharepoint_service.mock_sharepoint import fuzzy_match
-                                for folder in lot_folder.iterdir():
-                                    if folder.is_dir() and fuzzy_match(service_name, folder.name):
-                                        folder_path = folder
-                                        actual_folder_name = folder.name  # Use actual folder name for filename
-                                        break
+                            # Try to find folder with fuzzy match (best-ranked folder name)
+                            from sharepoint_service.mock_sharepoint import find_service_folder
+                            folder = find_service_folder(service_name, lot, gcloud_version)
+                            if folder:
+                                folder_path = folder
+                                actual_folder_name = folder.name  # Use actual folder name for filename
             
             # Use exact filename format: PA GC15 SERVICE DESC [Folder Name].docx
             # Use actual_folder_name (folder.name) to match what get_document_path expects
@@ -394,40 +497,37 @@ class DocumentGenerator:
             output_dir = self.output_dir
             s3_key = None
         
-        # Ensure output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save Word document
-        doc.save(str(word_path))
-
-        # Final safeguard: replace placeholders directly in the saved XML parts
-        self._replace_in_saved_docx(str(word_path), {
-            'ENTER SERVICE NAME HERE': title,
-            'Enter Service Name Here': title,
-            'enter service name here': title,
-            'Add Title': title,
-            '{{SERVICE_NAME}}': title,
-        })
+        # Serialise once into memory; Azure/S3 uploads stream this buffer and never touch local disk
+        serialized = serialize_document(doc)
+        upload_to_azure = bool(self.use_azure and self.azure_blob_service and (update_metadata or new_proposal_metadata))
+        if not (self.use_s3 or upload_to_azure):
+            # Ensure output directory exists
+            output_dir.mkdir(parents=True, exist_ok=True)
+            # Save Word document
+            serialized.write_to(word_path)
+            _note_local_write(word_path)
         
         # Upload to Azure Blob Storage if in Azure environment
         word_blob_key = None
         pdf_blob_key = None
-        if self.use_azure and self.azure_blob_service and (update_metadata or new_proposal_metadata):
+        if upload_to_azure:
             # Construct blob key matching the SharePoint folder structure
             # Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service_folder}/{filename}
-            blob_key = None
-            if update_metadata:
-                # For Azure, use actual_folder_name which was correctly extracted above
-                # For local, folder_path might be a Path, but we should use actual_folder_name for consistency
-                folder_name = actual_folder_name
-                blob_key = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {update_metadata.get('lot', '3')}/{folder_name}/{word_filename}"
-            else:  # new_proposal_metadata
-                # Use service_name directly with spaces - NO normalization
-                blob_key = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/{word_filename}"
+            blob_key = self._azure_word_blob_key(title, update_metadata, new_proposal_metadata, save_as_draft)
             
             if blob_key:
                 try:
-                    self.azure_blob_service.upload_file(word_path, blob_key)
+                    word_metadata = (
+                        BlobGenerationCache.word_metadata(cache_key, serialized.sha256, serialized.size)
+                        if generation_cache else None
+                    )
+                    self.azure_blob_service.upload_stream(
+                        serialized.rewind(),
+                        blob_key,
+                        length=serialized.size,
+                        content_type=DOCX_CONTENT_TYPE,
+                        metadata=word_metadata,
+                    )
                     word_blob_key = blob_key
                     logger.info(f"Uploaded document to Azure Blob Storage: {word_blob_key}")
                     
@@ -436,43 +536,38 @@ class DocumentGenerator:
                     
                     # Call Azure PDF converter Function App - ONLY when completing (not saving as draft)
                     # PDFs should only be generated for final completed documents, not drafts
-                    pdf_converter_url = os.environ.get("PDF_CONVERTER_FUNCTION_URL")
-                    if pdf_converter_url and not save_as_draft:
+                    pdf_converter = get_pdf_converter(use_azure=True)
+                    if pdf_converter and not save_as_draft:
                         try:
-                            import requests  # Import at function level to avoid dependency issues
-                            function_key = os.environ.get("PDF_CONVERTER_FUNCTION_KEY", "")
-                            
-                            # Prepare request payload
-                            payload = {
-                                "word_blob_key": word_blob_key,
-                                "word_container": os.environ.get("AZURE_STORAGE_CONTAINER_NAME", "sharepoint"),
-                                "output_container": os.environ.get("AZURE_STORAGE_CONTAINER_NAME", "sharepoint"),
-                                "pdf_blob_key": pdf_blob_key
-                            }
-                            
-                            # Build URL with function key if available
-                            url = pdf_converter_url
-                            if function_key:
-                                url = f"{pdf_converter_url}?code={function_key}"
-                            
-                            # Call PDF converter
-                            response = requests.post(
-                                url,
-                                json=payload,
-                                timeout=300  # 5 minute timeout for PDF conversion
-                            )
-                            
-                            if response.status_code == 200:
-                                result = response.json()
-                                if result.get('success'):
-                                    pdf_blob_key = result.get('pdf_blob_key', pdf_blob_key)
+                            # Identical content converted before (here or at another path) reuses that PDF
+                            update_fields = not toc_is_materialised(doc)
+                            pdf_cache = BlobPdfCache(self.azure_blob_service) if pdf_cache_enabled() else None
+                            pdf_source = source_id(serialized.content_sha256(), update_fields) if pdf_cache else None
+                            if pdf_cache and pdf_cache.lookup(pdf_blob_key, pdf_source):
+                                if generation_cache:
+                                    generation_cache.record_pdf(word_blob_key, word_metadata, pdf_blob_key)
+                            else:
+                                result = pdf_converter.convert(ConversionRequest(
+                                    word_key=word_blob_key,
+                                    pdf_key=pdf_blob_key,
+                                    update_fields=update_fields
+                                ))
+                                if result.success:
+                                    pdf_blob_key = result.pdf_key
                                     logger.info(f"PDF conversion successful: {pdf_blob_key}")
+                                    # The Function wrote the PDF itself; keep the listing index current
+                                    self.azure_blob_service.notify_write(pdf_blob_key)
+                                    if pdf_cache:
+                                        pdf_cache.store(pdf_blob_key, pdf_source)
+                                    if generation_cache:
+                                        generation_cache.record_pdf(word_blob_key, word_metadata, pdf_blob_key)
                                 else:
-                                    logger.warning(f"PDF conversion failed: {result.get('error', 'Unknown error')}")
+                                    logger.warning(f"PDF conversion failed: {result.error}")
                                     pdf_blob_key = None
-                            else:
-                                logger.warning(f"PDF converter returned status {response.status_code}: {response.text}")
-                                pdf_blob_key = None
+                        except ConverterOverloaded as e:
+                            # No PDF recorded, so the next complete converts again
+                            logger.warning(f"PDF conversion deferred: {e}")
+                            pdf_blob_key = None
                         except Exception as e:
                             logger.error(f"Failed to call PDF converter: {e}", exc_info=True)
                             pdf_blob_key = None
@@ -481,7 +576,11 @@ class DocumentGenerator:
                         pdf_blob_key = None
                 except Exception as e:
                     logger.error(f"Failed to upload to Azure Blob Storage: {e}")
-                    # Don't fail the entire operation if Azure upload fails
+                    # Don't fail the entire operation if Azure upload fails - keep a local copy instead
+                    try:
+                        serialized.write_to(word_path)
+                    except Exception as write_error:
+                        logger.error(f"Failed to save local fallback copy: {write_error}")
         
         # Upload to S3 if in Lambda environment
         if self.use_s3:
@@ -508,8 +607,13 @@ class DocumentGenerator:
             import boto3
             s3_client = boto3.client('s3')
 
-            with open(word_path, 'rb') as f:
-                s3_client.upload_fileobj(f, word_bucket, word_s3_key)
+            s3_client.upload_fileobj(
+                serialized.rewind(),
+                word_bucket,
+                word_s3_key,
+                ExtraArgs={'ContentType': DOCX_CONTENT_TYPE}
+            )
+            note_document_write('s3', word_s3_key, word_bucket)
 
             # Ensure the PDF converter can access the Word file
             if s3_key and bucket_output:
@@ -536,26 +640,23 @@ class DocumentGenerator:
             pdf_url = None
             
             try:
-                import boto3
-                pdf_converter_function = os.environ.get("PDF_CONVERTER_FUNCTION_NAME")
-                if pdf_converter_function:
-                    lambda_client = boto3.client('lambda')
-                    response = lambda_client.invoke(
-                        FunctionName=pdf_converter_function,
-                        InvocationType='RequestResponse',  # Synchronous invocation
-                        Payload=json.dumps({
-                            'word_s3_key': conversion_key,
-                            'word_bucket': conversion_bucket,
-                            'output_bucket': pdf_bucket,
-                            'pdf_s3_key': pdf_s3_key
-                        })
-                    )
-                    result = json.loads(response['Payload'].read())
-                    if result.get('success'):
-                        pdf_url = result.get('pdf_url')
-                        pdf_s3_key = result.get('pdf_s3_key', pdf_s3_key)
+                pdf_converter = get_pdf_converter(use_s3=True)
+                if pdf_converter:
+                    result = pdf_converter.convert(ConversionRequest(
+                        word_key=conversion_key,
+                        pdf_key=pdf_s3_key,
+                        update_fields=not toc_is_materialised(doc),
+                        word_bucket=conversion_bucket,
+                        output_bucket=pdf_bucket
+                    ))
+                    if result.cache:
+                        pdf_cache_stats.record(result.cache == 'hit')
+                    if result.success:
+                        pdf_url = result.pdf_url
+                        pdf_s3_key = result.pdf_key
+                        note_document_write('s3', pdf_s3_key, pdf_bucket)
             except Exception as e:
-                # If PDF conversion fails, continue without PDF
+                # If PDF conversion fails (or is refused under load), continue without PDF
                 print(f"PDF conversion failed: {e}")
                 pdf_url = None
             
@@ -565,16 +666,20 @@ class DocumentGenerator:
                 "pdf_path": pdf_url or pdf_s3_key,
                 "pdf_s3_key": pdf_s3_key,
                 "pdf_bucket": pdf_bucket,
-                "filename": filename_base
+                "filename": filename_base,
+                "word_sha256": serialized.sha256,
+                "word_size": serialized.size
             }
         elif self.use_azure:
             # Azure: return blob keys
             return {
-                "word_path": str(word_path),  # Local path for download endpoint
+                "word_path": word_blob_key or str(word_path),  # Filename is used for the download endpoint
                 "word_blob_key": word_blob_key,  # Azure blob key
                 "pdf_blob_key": pdf_blob_key,  # Azure PDF blob key (None if conversion failed)
                 "pdf_path": pdf_blob_key if pdf_blob_key else "",  # For compatibility
-                "filename": filename_base
+                "filename": filename_base,
+                "word_sha256": serialized.sha256,
+                "word_size": serialized.size
             }
         else:
             # Docker/local: return local paths
@@ -602,40 +707,226 @@ class DocumentGenerator:
             else:
                 pdf_path = self.output_dir / f"{filename_base}.pdf"
             
+            # Convert with LibreOffice when it is installed on this host (completed documents only)
+            pdf_converter = get_pdf_converter()
+            if pdf_converter and not save_as_draft:
+                try:
+                    result = pdf_converter.convert(ConversionRequest(
+                        word_key=str(word_path),
+                        pdf_key=str(pdf_path),
+                        update_fields=not toc_is_materialised(doc)
+                    ))
+                    if result.success:
+                        _note_local_write(pdf_path)
+                    else:
+                        logger.warning(f"PDF conversion failed: {result.error}")
+                except ConverterOverloaded as e:
+                    logger.warning(f"PDF conversion deferred: {e}")
+            
             return {
                 "word_path": str(word_path),
                 "pdf_path": str(pdf_path),
-                "filename": filename_base
+                "filename": filename_base,
+                "word_sha256": serialized.sha256,
+                "word_size": serialized.size
             }
     
+    def _build_document(
+        self,
+        title: str,
+        description: str,
+        features: List[str],
+        benefits: List[str],
+        service_definition: List[dict]
+    ) -> Document:
+        """Build a complete Service Description from the template"""
+        # Load template (parsed once per process, deep-copied per request)
+        from app.services.template_cache import template_cache
+        blob_template_key = os.environ.get("TEMPLATE_BLOB_KEY")
+        if self.use_s3:
+            # AWS Lambda: read template from S3, revalidated by ETag
+            template_key = os.environ.get("TEMPLATE_S3_KEY", "templates/service_description_template.docx")
+            doc = template_cache.get_s3(self.s3_service, template_key)
+        elif self.use_azure and blob_template_key:
+            # Azure: optional template stored in blob storage, revalidated by ETag
+            doc = template_cache.get_azure(self.azure_blob_service, blob_template_key)
+        else:
+            # Docker/local: use local filesystem, revalidated by mtime/size
+            template_path = self._resolve_template_path()
+            if not Path(template_path).exists():
+                raise FileNotFoundError(f"Template not found: {template_path}")
+            doc = template_cache.get_local(template_path)
+        
+        # Replace title (first Heading 1)
+        self._replace_title(doc, title)
+        
+        # Clean target sections entirely and build a fresh content block after TOC
+        self._remove_sections(doc, [
+            'Short Service Description',
+            'Key Service Features',
+            'Key Service Benefits',
+            'Service Definition',
+        ])
+        # Capture and remove 'About PA' block using marker or heading, to re-append at the very end
+        about_pa_block = self._extract_block_by_marker(doc, '{{ABOUT_PA_START}}')
+        if not about_pa_block:
+            about_pa_block = self._extract_heading_block(doc, 'About PA')
+
+        after_toc_para = self._ensure_toc_and_pagebreak(doc)
+        # Insert fresh content block starting on a new page
+        last_para = self._insert_full_content_block(
+            doc=doc,
+            after_para=after_toc_para,
+            service_title=title,
+            description=description,
+            features=features,
+            benefits=benefits,
+            service_definition=service_definition,
+        )
+        # Re-append About PA block as the final page on its own
+        if about_pa_block:
+            # Page break before About PA - ensure proper spacing
+            # Add multiple blank paragraphs and explicit page break for proper separation
+            index = BodyIndex.for_document(doc)
+            tail_para = last_para or index.last_paragraph()
+            if tail_para is not None:
+                # Add a blank paragraph for spacing
+                blank_para1 = self._insert_paragraph_after(tail_para, '')
+                # Add another blank paragraph
+                blank_para2 = self._insert_paragraph_after(blank_para1, '')
+                # Add page break to the second blank paragraph (ensures proper page break)
+                blank_para2.add_run().add_break(WD_BREAK.PAGE)
+                # Add one more blank paragraph after page break to ensure spacing
+                blank_para3 = self._insert_paragraph_after(blank_para2, '')
+            index = BodyIndex.for_document(doc)
+            for el in about_pa_block:
+                index.append(el)
+
+        # Placeholders and ToC handling occur after content is built
+        self._enable_update_fields_on_open(doc)
+        
+        # Update TOC field after content insertion
+        # This ensures the TOC is populated with actual headings
+        self._update_toc_field(doc)
+
+        # Replace placeholders in one pass over every part (body, headers/footers, shapes/textboxes),
+        # including placeholders split across runs
+        replace_placeholders(doc, {
+            'ENTER SERVICE NAME HERE': title,
+            'Enter Service Name Here': title,
+            'enter service name here': title,
+            'Add Title': title,
+            '{{SERVICE_NAME}}': title,
+        })
+        self._materialise_toc(doc)
+        return doc
+    
+    def _update_existing_document(
+        self,
+        title: str,
+        description: str,
+        features: List[str],
+        benefits: List[str],
+        service_definition: List[dict],
+        update_metadata: Dict,
+        save_as_draft: bool,
+        manifest: Dict
+    ) -> Optional[Document]:
+        """
+        Rewrite only the changed sections of the previously generated document
+        
+        Sections are compared using the manifest stored in the document at generation time.
+        
+        Returns:
+            The updated document, or None when a full rebuild is needed (no stored document
+            or manifest, different template or title, or a section that cannot be located)
+        """
+        try:
+            doc = self._load_existing_document(title, update_metadata, save_as_draft)
+        except Exception as e:
+            logger.warning(f"Could not load existing document for incremental update: {e}")
+            return None
+        if doc is None:
+            return None
+        previous = read_manifest(doc)
+        if not previous or any(previous.get(key) != manifest[key] for key in ('generator', 'template', 'title')):
+            return None
+        
+        changed = [name for name in CONTENT_SECTIONS if previous.get(name) != manifest[name]]
+        if 'service_definition' in changed and not (previous.get('service_definition_blocks') and manifest['service_definition_blocks']):
+            # The section appears or disappears; rebuild rather than guess where it belongs
+            return None
+        
+        # Locate every section before mutating anything
+        located = {}
+        for name in changed:
+            bounds = find_section(doc, name)
+            elements = section_elements(*bounds) if bounds else []
+            anchor = elements[0].getprevious() if elements else None
+            if anchor is None or anchor.tag != qn('w:p'):
+                logger.info(f"Section '{name}' not found in stored document, rebuilding")
+                return None
+            located[name] = (anchor, elements)
+        
+        index = BodyIndex.for_document(doc)
+        renderers = self._section_renderers(doc, description, features, benefits, service_definition)
+        for name, (anchor, elements) in located.items():
+            for el in elements:
+                index.remove(el)
+            self._render_section(doc, index.paragraph(anchor), name, renderers[name])
+        if changed:
+            self._materialise_toc(doc)
+        logger.info(f"Incremental update rewrote sections: {', '.join(changed) or 'none'}")
+        return doc
+    
+    def _load_existing_document(self, title: str, update_metadata: Dict, save_as_draft: bool) -> Optional[Document]:
+        """Load the stored document an update would overwrite, or None if it does not exist"""
+        from io import BytesIO
+        if self.use_azure and self.azure_blob_service:
+            blob_key = self._azure_word_blob_key(title, update_metadata, None, save_as_draft)
+            if not self.azure_blob_service.blob_exists(blob_key):
+                return None
+            return Document(BytesIO(self.azure_blob_service.get_file_bytes(blob_key)))
+        
+        gcloud_version = update_metadata.get('gcloud_version', '14')
+        doc_type = update_metadata.get('doc_type', 'SERVICE DESC')
+        service_name = update_metadata.get('service_name', title)
+        folder_path = update_metadata.get('folder_path') or ''
+        if self.use_s3:
+            bucket = os.environ.get('SHAREPOINT_BUCKET_NAME', '')
+            if not bucket:
+                return None
+            if not folder_path:
+                folder_path = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {update_metadata.get('lot', '2')}/{service_name}/"
+            key = f"{folder_path}{self._word_filename(gcloud_version, doc_type, service_name, save_as_draft)}"
+            import boto3
+            from botocore.exceptions import ClientError
+            try:
+                body = boto3.client('s3').get_object(Bucket=bucket, Key=key)['Body'].read()
+            except ClientError:
+                return None
+            return Document(BytesIO(body))
+        
+        if not folder_path:
+            return None
+        folder = Path(folder_path)
+        word_path = folder / self._word_filename(gcloud_version, doc_type, folder.name, save_as_draft)
+        return Document(str(word_path)) if word_path.exists() else None
+    
     def _replace_title(self, doc: Document, new_title: str):
         """Replace the first Heading 1 with the new title"""
-        replaced = False
-        for paragraph in doc.paragraphs:
-            if paragraph.style.name == 'Heading 1':
-                # Found the title, replace it
-                paragraph.text = new_title
-                # Preserve formatting
-                for run in paragraph.runs:
-                    run.font.size = Pt(24)
-                    run.font.bold = True
-                replaced = True
-                break
-
-        # Fallback: replace literal occurrences of common placeholder text in runs
-        if not replaced:
-            placeholders = ['ENTER SERVICE NAME HERE', 'Enter Service Name Here', 'enter service name here', 'Add Title', '{{SERVICE_NAME}}']
-            for p in doc.paragraphs:
-                for r in p.runs:
-                    for placeholder in placeholders:
-                        if placeholder in r.text:
-                            r.text = r.text.replace(placeholder, new_title)
-                            replaced = True
-                            break
-                    if replaced:
-                        break
-                if replaced:
-                    break
+        index = BodyIndex.for_document(doc)
+        heading_el = index.find_heading(lambda text: True, style_name='Heading 1')
+        if heading_el is not None:
+            # Found the title, replace it
+            paragraph = index.paragraph(heading_el)
+            paragraph.text = new_title
+            # Preserve formatting
+            for run in paragraph.runs:
+                run.font.size = Pt(24)
+                run.font.bold = True
+            index.register(heading_el)
+        # Templates without a Heading 1 rely on the placeholder pass (replace_placeholders)
     
     def _replace_content_sections(
         self,
@@ -651,45 +942,39 @@ class DocumentGenerator:
         headings and replaces the content that follows them.
         """
         
-        # Track which section we're in
-        current_section = None
-        section_start_idx = None
-        
         found_description = False
         found_features = False
         found_benefits = False
 
-        for i, paragraph in enumerate(doc.paragraphs):
-            text = paragraph.text.strip()
+        index = BodyIndex.for_document(doc)
+        for el in list(index.body.iterchildren(qn('w:p'))):
+            if el.getparent() is not index.body:
+                # Removed while clearing an earlier section
+                continue
+            text = index.paragraph(el).text.strip()
             
             # Detect section headings
             if 'Short Service Description' in text:
-                current_section = 'description'
-                section_start_idx = i
                 # Clear existing content under this heading
-                self._clear_section_after_heading(doc, i)
+                self._clear_section_after_heading(doc, el)
                 # Replace content after this heading
-                self._insert_description(doc, i + 1, description)
+                self._insert_description(doc, el, description)
                 found_description = True
                 
             elif 'Key Service Features' in text:
-                current_section = 'features'
-                section_start_idx = i
-                self._clear_section_after_heading(doc, i)
+                self._clear_section_after_heading(doc, el)
                 # Replace content after this heading
-                self._insert_bullet_list(doc, i + 1, features)
+                self._insert_bullet_list(doc, el, features)
                 found_features = True
                 
             elif 'Key Service Benefits' in text:
-                current_section = 'benefits'
-                section_start_idx = i
-                self._clear_section_after_heading(doc, i)
+                self._clear_section_after_heading(doc, el)
                 # Replace content after this heading
-                self._insert_bullet_list(doc, i + 1, benefits)
+                self._insert_bullet_list(doc, el, benefits)
                 found_benefits = True
 
         # Fallback: append sections to end if headings not present
-        end_para = doc.paragraphs[-1] if doc.paragraphs else None
+        end_para = index.last_paragraph()
         def append_heading(title: str, style: str = 'Heading 2'):
             nonlocal end_para
             end_para = self._insert_paragraph_after(end_para, title, style) if end_para else doc.add_paragraph(title, style)
@@ -706,35 +991,22 @@ class DocumentGenerator:
             for b in benefits:
                 end_para = self._insert_paragraph_after(end_para, b, 'List Bullet')
 
-    def _find_heading_index(self, doc: Document, heading_text: str) -> int | None:
-        for i, p in enumerate(doc.paragraphs):
-            if p.style and p.style.name.startswith('Heading') and heading_text in (p.text or ''):
-                return i
-        return None
+    def _find_heading(self, doc: Document, heading_text: str):
+        """Return the first heading element whose text contains heading_text, or None."""
+        return BodyIndex.for_document(doc).find_heading(lambda text: heading_text in text)
 
     def _remove_sections(self, doc: Document, headings: List[str]):
         for h in headings:
-            idx = self._find_heading_index(doc, h)
-            if idx is not None:
+            heading_el = self._find_heading(doc, h)
+            if heading_el is not None:
                 # Remove from the heading paragraph itself through to next heading
-                self._remove_heading_block(doc, idx)
-
-    def _remove_heading_block(self, doc: Document, heading_idx: int):
-        body = doc._element.body
-        heading_p = doc.paragraphs[heading_idx]._p
-        # Remove the heading paragraph itself
-        el = heading_p
-        # Then continue removing siblings until next heading
-        while el is not None:
-            nxt = el.getnext()
-            if el.tag == qn('w:p'):
-                p = Paragraph(el, doc)
-                # if we're past the original heading and hit a new heading, stop
-                if el is not heading_p and p.style and p.style.name.startswith('Heading'):
-                    break
-            if el.getparent() is body:
-                body.remove(el)
-            el = nxt
+                self._remove_heading_block(doc, heading_el)
+
+    def _remove_heading_block(self, doc: Document, heading_el):
+        index = BodyIndex.for_document(doc)
+        # Remove the heading paragraph itself, then its siblings until next heading
+        for el in [heading_el] + index.section_elements(heading_el):
+            index.remove(el)
 
     def _ensure_toc_and_pagebreak(self, doc: Document):
         # Insert/refresh contents section and get the TOC paragraph
@@ -753,7 +1025,7 @@ class DocumentGenerator:
                 pass
             return after_para
         # No contents, fallback to last paragraph
-        return doc.paragraphs[-1] if doc.paragraphs else None
+        return BodyIndex.for_document(doc).last_paragraph()
 
     def _insert_full_content_block(
         self,
@@ -768,7 +1040,11 @@ class DocumentGenerator:
         cur = after_para
         def add_para(text: str, style: str | None = None, space_after: int = 12) -> Paragraph:
             nonlocal cur
-            cur = self._insert_paragraph_after(cur, text, style) if cur else doc.add_paragraph(text, style)
+            if cur:
+                cur = self._insert_paragraph_after(cur, text, style)
+            else:
+                cur = doc.add_paragraph(text, style)
+                BodyIndex.for_document(doc).register(cur._p)
             try:
                 pf = cur.paragraph_format
                 pf.space_after = Pt(space_after)
@@ -778,14 +1054,15 @@ class DocumentGenerator:
 
         # Title as Heading 1 in main content (add extra spacing below)
         add_para(service_title, 'Heading 1', space_after=16)
+        renderers = self._section_renderers(doc, description, features, benefits, service_definition)
 
         # Short Service Description
         add_para('Short Service Description', 'Heading 2', space_after=10)
-        add_para(description, 'Normal', space_after=16)
+        cur = self._render_section(doc, cur, 'description', renderers['description'])
 
         # Key Service Features as numbered red list (1-10)
         add_para('Key Service Features', 'Heading 2', space_after=10)
-        cur = self._insert_numbered_list_block(doc, cur, features[:10])
+        cur = self._render_section(doc, cur, 'features', renderers['features'])
         # extra spacing after features section
         cur = self._insert_paragraph_after(cur, '')
         try:
@@ -795,7 +1072,7 @@ class DocumentGenerator:
 
         # Key Service Benefits as numbered red list (1-10)
         add_para('Key Service Benefits', 'Heading 2', space_after=8)
-        cur = self._insert_numbered_list_block(doc, cur, benefits[:10])
+        cur = self._render_section(doc, cur, 'benefits', renderers['benefits'])
         # extra spacing after benefits section
         cur = self._insert_paragraph_after(cur, '')
         try:
@@ -804,7 +1081,44 @@ class DocumentGenerator:
             pass
 
         # Service Definition
-        if service_definition:
+        cur = self._render_section(doc, cur, 'service_definition', renderers['service_definition'])
+        return cur
+
+    def _section_renderers(
+        self,
+        doc: Document,
+        description: str,
+        features: List[str],
+        benefits: List[str],
+        service_definition: List[dict],
+    ) -> Dict[str, Callable[[Paragraph], object]]:
+        """Renderers for each regenerable section, keyed by section name.
+
+        Each renderer inserts its content after the given paragraph. Full builds and
+        incremental updates share them so both produce the same content.
+        """
+        def render_description(after: Paragraph):
+            para = self._insert_paragraph_after(after, description, 'Normal')
+            try:
+                para.paragraph_format.space_after = Pt(16)
+            except Exception:
+                pass
+
+        def render_service_definition(after: Paragraph):
+            if not service_definition:
+                return
+            # Download every embedded image concurrently before rendering the blocks
+            images = image_cache.prefetch(collect_image_sources(service_definition))
+            cur = after
+
+            def add_para(text: str, style: str, space_after: int):
+                nonlocal cur
+                cur = self._insert_paragraph_after(cur, text, style)
+                try:
+                    cur.paragraph_format.space_after = Pt(space_after)
+                except Exception:
+                    pass
+
             add_para('Service Definition', 'Heading 2', space_after=6)
             for block in service_definition:
                 subtitle = block.get('subtitle') or ''
@@ -812,10 +1126,31 @@ class DocumentGenerator:
                 if subtitle:
                     add_para(subtitle, 'Heading 3', space_after=6)
                 if content_html:
-                    cur = self._insert_html(doc, cur, content_html)
+                    cur = self._insert_html(doc, cur, content_html, images)
                     # add spacing after html block
                     cur = self._insert_paragraph_after(cur, '')
-        return cur
+
+        return {
+            'description': render_description,
+            'features': lambda after: self._insert_numbered_list_block(doc, after, features[:10]),
+            'benefits': lambda after: self._insert_numbered_list_block(doc, after, benefits[:10]),
+            'service_definition': render_service_definition,
+        }
+
+    def _render_section(self, doc: Document, after: Paragraph, name: str, render: Callable[[Paragraph], object]) -> Paragraph:
+        """Render a section after a paragraph and bookmark it so it can be rewritten in place.
+
+        Returns the last paragraph of the section (or after, if the section is empty).
+        """
+        following = after._p.getnext()
+        render(after)
+        first = after._p.getnext()
+        if first is following:
+            return after
+        last = following.getprevious() if following is not None else after._p.getparent()[-1]
+        if first.tag == qn('w:p') and last.tag == qn('w:p'):
+            mark_section(doc, name, first, last)
+        return Paragraph(last, after._parent)
 
     def _insert_numbered_list_block(self, doc: Document, after_para: Paragraph | None, items: List[str]) -> Paragraph | None:
         """Insert manual numbered list where only the numbers are red and text stays black."""
@@ -842,32 +1177,23 @@ class DocumentGenerator:
         return cur
 
     def _find_heading_element(self, doc: Document, heading_text: str):
-        for i, p in enumerate(doc.paragraphs):
-            if p.style and p.style.name.startswith('Heading') and heading_text.lower() in (p.text or '').lower():
-                return i, p._p
-        return None, None
+        """Return the first heading element whose text contains heading_text (case-insensitive), or None."""
+        needle = heading_text.lower()
+        return BodyIndex.for_document(doc).find_heading(lambda text: needle in text.lower())
 
     def _extract_heading_block(self, doc: Document, heading_text: str):
         """Extract a heading and its following content until next heading as XML elements.
         Removes them from the document and returns a list of detached elements to re-append later.
         """
-        idx, heading_el = self._find_heading_element(doc, heading_text)
+        heading_el = self._find_heading_element(doc, heading_text)
         if heading_el is None:
             return []
-        body = doc._element.body
-        result = []
-        el = heading_el
-        while el is not None:
-            nxt = el.getnext()
-            # Stop before next heading (skip removing it)
-            if el is not heading_el and el.tag == qn('w:p'):
-                p = Paragraph(el, doc)
-                if p.style and p.style.name.startswith('Heading'):
-                    break
-            # Detach and collect
-            result.append(el)
-            body.remove(el)
-            el = nxt
+        index = BodyIndex.for_document(doc)
+        # Stop before next heading (skip removing it)
+        result = [heading_el] + index.section_elements(heading_el)
+        # Detach and collect
+        for el in result:
+            index.remove(el)
         return result
 
     def _extract_block_by_marker(self, doc: Document, marker: str):
@@ -893,50 +1219,39 @@ class DocumentGenerator:
                 break
         if start_el is None:
             return []
-        body = doc._element.body
+        index = BodyIndex.for_document(doc)
         result = []
         el = start_el
         while el is not None:
             nxt = el.getnext()
             result.append(el)
-            body.remove(el)
+            index.remove(el)
             el = nxt
         return result
 
-    def _clear_section_after_heading(self, doc: Document, heading_idx: int):
+    def _clear_section_after_heading(self, doc: Document, heading_el):
         """Remove paragraphs following a heading until the next heading or end of document.
 
         Note: python-docx doesn't support deleting list items as a group, so we remove
         underlying elements paragraph by paragraph.
         """
         # Work at XML level to also remove tables and content controls
-        body = doc._element.body
-        heading_p = doc.paragraphs[heading_idx]._p
-        # Iterate siblings after heading until next heading paragraph
-        el = heading_p.getnext()
-        while el is not None:
-            # Stop at next heading paragraph
-            if el.tag == qn('w:p'):
-                # Check if it's a heading style
-                p = Paragraph(el, doc)
-                if p.style and p.style.name.startswith('Heading'):
-                    break
-            # Remove tables, paragraphs, sdts indiscriminately
-            nxt = el.getnext()
-            body.remove(el)
-            el = nxt
+        index = BodyIndex.for_document(doc)
+        # Remove tables, paragraphs, sdts indiscriminately until next heading paragraph
+        for el in index.section_elements(heading_el):
+            index.remove(el)
         
     
-    def _insert_description(self, doc: Document, start_idx: int, description: str):
+    def _insert_description(self, doc: Document, heading_el, description: str):
         """Insert description text after a heading"""
         # Create a new paragraph right after the heading with the description
-        heading_para = doc.paragraphs[start_idx - 1]
+        heading_para = BodyIndex.for_document(doc).paragraph(heading_el)
         new_para = self._insert_paragraph_after(heading_para, description, 'Normal')
     
-    def _insert_bullet_list(self, doc: Document, start_idx: int, items: List[str]):
+    def _insert_bullet_list(self, doc: Document, heading_el, items: List[str]):
         """Insert a bullet list after a heading"""
         # Insert bullet list items right after the heading
-        heading_para = doc.paragraphs[start_idx - 1]
+        heading_para = BodyIndex.for_document(doc).paragraph(heading_el)
         insert_after = heading_para
         for item in items:
             insert_after = self._insert_paragraph_after(insert_after, item, 'List Bullet')
@@ -948,26 +1263,30 @@ class DocumentGenerator:
         {"subtitle": "Service Definition Subsection", "content": "Paragraph text...", "images": ["http://..."], "table": [["H1","H2"],["R1C1","R1C2"]] }
         """
         # Find the 'Service Definition' heading
-        heading_idx = None
-        for i, p in enumerate(doc.paragraphs):
-            if p.text.strip() == 'Service Definition' or (
-                p.style and p.style.name.startswith('Heading') and 'Service Definition' in p.text
-            ):
-                heading_idx = i
-                break
-        if heading_idx is None:
+        index = BodyIndex.for_document(doc)
+        heading_el = self._find_heading(doc, 'Service Definition')
+        if heading_el is None:
+            # Older templates use a plain paragraph rather than a heading style
+            heading_el = next(
+                (el for el in index.body.iterchildren(qn('w:p'))
+                 if index.paragraph(el).text.strip() == 'Service Definition'),
+                None,
+            )
+        if heading_el is None:
             return
         # Clear existing content under the heading
-        self._clear_section_after_heading(doc, heading_idx)
+        self._clear_section_after_heading(doc, heading_el)
 
-        insert_after = doc.paragraphs[heading_idx]
+        insert_after = index.paragraph(heading_el)
+        images = image_cache.prefetch(collect_image_sources(blocks))
 
         # Utilities for images
         def _add_image(after_para, url: str):
             try:
-                import requests
                 from io import BytesIO
-                img_data = requests.get(url, timeout=10).content
+                img_data = images.get(url) or image_cache.fetch(url)
+                if img_data is None:
+                    return after_para
                 # Insert a new paragraph and add picture to the run
                 p = self._insert_paragraph_after(after_para, '')
                 run = p.add_run()
@@ -981,7 +1300,7 @@ class DocumentGenerator:
         for block in blocks:
             subtitle = block.get('subtitle')
             content_html = block.get('content')
-            images = block.get('images', []) or []
+            block_images = block.get('images', []) or []
             table = block.get('table')
 
             if subtitle:
@@ -992,9 +1311,9 @@ class DocumentGenerator:
 
             if content_html:
                 # Render limited HTML into docx
-                insert_after = self._insert_html(doc, insert_after, content_html)
+                insert_after = self._insert_html(doc, insert_after, content_html, images)
 
-            for img_url in images:
+            for img_url in block_images:
                 insert_after = _add_image(insert_after, img_url)
 
             if table and isinstance(table, list) and table:
@@ -1009,87 +1328,24 @@ class DocumentGenerator:
                 # Add a blank paragraph after table to maintain spacing
                 insert_after = self._insert_paragraph_after(insert_after, '')
 
-    def _insert_html(self, doc: Document, after_para, html: str):
-        """Very basic HTML renderer supporting <p>, <strong>, <em>, <ul>/<ol>/<li>, <h3>, <br>, <a>.
-        Images are expected as separate 'images' array and handled elsewhere.
+    def _insert_html(self, doc: Document, after_para, html: str, images: Dict[str, Optional[bytes]] | None = None):
+        """Render Service Definition HTML (paragraphs, inline formatting, nested lists, tables, images)
+        directly after a paragraph. See app.utils.html_to_ooxml.
+        <img> sources are looked up in images (from image_cache.prefetch) and fetched through
+        the shared image cache when missing.
         Returns the last paragraph inserted for chaining.
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        def load_image(src: str) -> Optional[bytes]:
+            return images[src] if images and src in images else image_cache.fetch(src)
 
-        def render_inline(run, node):
-            if node.name == 'strong' or node.name == 'b':
-                r = run.add_text(node.get_text())
-                run.bold = True
-                return
-            if node.name == 'em' or node.name == 'i':
-                r = run.add_text(node.get_text())
-                run.italic = True
-                return
-            if node.name == 'br':
-                run.add_break()
-                return
-            # Default text
-            run.add_text(node if isinstance(node, str) else node.get_text())
-
-        def add_paragraph_with_inlines(text_or_node, style_name=None):
-            p = self._insert_paragraph_after(after_para, '')
-            if style_name:
-                p.style = style_name
-            if isinstance(text_or_node, str):
-                p.add_run(text_or_node)
-            else:
-                for child in text_or_node.children:
-                    if isinstance(child, str):
-                        p.add_run(child)
-                    else:
-                        if child.name in ['strong','b','em','i','br']:
-                            render_inline(p.add_run(''), child)
-                        elif child.name == 'img':
-                            src = child.get('src')
-                            if src:
-                                # Insert image as separate paragraph after current
-                                p_img = self._insert_paragraph_after(p, '')
-                                try:
-                                    from io import BytesIO
-                                    if src.startswith('data:'):
-                                        # data URL: data:image/png;base64,....
-                                        import base64
-                                        header, b64 = src.split(',', 1)
-                                        img_bytes = base64.b64decode(b64)
-                                    else:
-                                        import requests
-                                        img_bytes = requests.get(src, timeout=10).content
-                                    run = p_img.add_run()
-                                    run.add_picture(BytesIO(img_bytes))
-                                    p = p_img
-                                except Exception:
-                                    # If image fetch fails, fall back to a link
-                                    p_img.add_run(f"[image: {src}]")
-                                    p = p_img
-                        else:
-                            p.add_run(child.get_text())
-            return p
-
-        last = after_para
-        for el in soup.contents:
-            if isinstance(el, str) and el.strip():
-                last = add_paragraph_with_inlines(el, None)
-            elif getattr(el, 'name', None):
-                name = el.name.lower()
-                if name == 'h3':
-                    last = add_paragraph_with_inlines(el, 'Heading 3')
-                elif name == 'p':
-                    last = add_paragraph_with_inlines(el, 'Normal')
-                elif name in ['ul','ol']:
-                    for li in el.find_all('li', recursive=False):
-                        p_li = self._insert_paragraph_after(last, li.get_text(), 'List Bullet' if name=='ul' else 'List Number')
-                        last = p_li
-                elif name == 'br':
-                    last = self._insert_paragraph_after(last, '')
-                else:
-                    # Fallback as paragraph
-                    last = add_paragraph_with_inlines(el, 'Normal')
-        return last
+        elements = HtmlRenderer(doc, load_image).render(after_para._p, html)
+        if not elements:
+            return after_para
+        index = BodyIndex.of_part(after_para.part)
+        if index is not None:
+            for el in elements:
+                index.register(el)
+        return Paragraph(elements[-1], after_para._parent)
 
     def _insert_paragraph_after(self, paragraph: Paragraph, text: str = '', style_name: str | None = None) -> Paragraph:
         """Insert a new paragraph directly after the given paragraph using low-level XML ops."""
@@ -1101,6 +1357,9 @@ class DocumentGenerator:
             new_para.add_run(text)
         if style_name:
             new_para.style = style_name
+        index = BodyIndex.of_part(paragraph.part)
+        if index is not None:
+            index.register(new_p)
         return new_para
 
     def _refresh_contents_section(self, doc: Document):
@@ -1108,23 +1367,24 @@ class DocumentGenerator:
         Returns the paragraph containing the TOC field if inserted, else None.
         """
         # Find a heading named 'Contents' or 'Table of Contents'
-        heading_idx = None
-        for i, p in enumerate(doc.paragraphs):
-            txt = (p.text or '').strip()
-            if txt.lower() in ('contents', 'table of contents') and p.style and p.style.name.startswith('Heading'):
-                heading_idx = i
-                break
-        if heading_idx is None:
+        heading_el = self._find_contents_heading(doc)
+        if heading_el is None:
             return None
         # Clear everything after this heading until next heading
-        self._clear_section_after_heading(doc, heading_idx)
+        self._clear_section_after_heading(doc, heading_el)
         # Remove any legacy TOC field codes/content and insert a TOC field
         self._remove_existing_toc(doc)
-        return self._insert_toc_after_heading(doc, heading_idx)
+        return self._insert_toc_after_heading(doc, heading_el)
 
-    def _insert_toc_after_heading(self, doc: Document, heading_idx: int):
+    def _find_contents_heading(self, doc: Document):
+        """Return the 'Contents' / 'Table of Contents' heading element, or None."""
+        return BodyIndex.for_document(doc).find_heading(
+            lambda text: text.strip().lower() in ('contents', 'table of contents')
+        )
+
+    def _insert_toc_after_heading(self, doc: Document, heading_el):
         """Insert a Table of Contents field after the specified heading and return the paragraph."""
-        para = doc.paragraphs[heading_idx]
+        para = BodyIndex.for_document(doc).paragraph(heading_el)
         p = self._insert_paragraph_after(para, '')
 
         # Build field codes: TOC \o "1-3" \h \z \u
@@ -1172,6 +1432,15 @@ class DocumentGenerator:
         except Exception:
             pass
 
+    def _materialise_toc(self, doc: Document):
+        """Fill the TOC with entries for the current headings so PDF conversion can skip field updates"""
+        if os.environ.get("TOC_MATERIALISE", "true").lower() != "true":
+            return
+        try:
+            materialise_toc(doc, BodyIndex.for_document(doc))
+        except Exception as e:
+            logger.warning(f"TOC materialisation failed, leaving the field for the converter to update: {e}")
+
     def _enable_update_fields_on_open(self, doc: Document):
         """Enable Word to update fields (e.g., TOC) when the document is opened."""
         try:
@@ -1193,31 +1462,25 @@ class DocumentGenerator:
         """
         try:
             # Find the TOC paragraph
-            toc_para = None
-            toc_heading_idx = None
-            
-            for i, p in enumerate(doc.paragraphs):
-                txt = (p.text or '').strip()
-                if txt.lower() in ('contents', 'table of contents') and p.style and p.style.name.startswith('Heading'):
-                    toc_heading_idx = i
-                    # Find the paragraph after this heading (should be the TOC field)
-                    if i + 1 < len(doc.paragraphs):
-                        toc_para = doc.paragraphs[i + 1]
-                    break
-            
-            if toc_para is None or toc_heading_idx is None:
+            index = BodyIndex.for_document(doc)
+            toc_heading_el = self._find_contents_heading(doc)
+            if toc_heading_el is None:
+                return
+            # Find the paragraph after this heading (should be the TOC field)
+            toc_para_el = index.next_paragraph(toc_heading_el)
+            if toc_para_el is None:
                 return
             
             # Delete the existing TOC field paragraph
             try:
                 # Remove the TOC paragraph
-                toc_para._p.getparent().remove(toc_para._p)
+                index.remove(toc_para_el)
             except Exception:
                 pass
             
             # Recreate the TOC field - this will force it to be populated
             # Insert new TOC field after the heading
-            heading_para = doc.paragraphs[toc_heading_idx]
+            heading_para = index.paragraph(toc_heading_el)
             new_toc_para = self._insert_paragraph_after(heading_para, '')
             
             # Build field codes: TOC \o "1-3" \h \z \u
@@ -1274,52 +1537,6 @@ class DocumentGenerator:
             # Fail silently; best-effort replacement
             pass
 
-    def _replace_text_in_all_wt(self, doc: Document, mapping: Dict[str, str]):
-        """Replace text in all w:t nodes within the main document (handles shapes/textboxes)."""
-        ns = {
-            'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-            'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-        }
-        try:
-            for xpath in ('.//w:t', './/a:t'):
-                for t in doc._element.xpath(xpath, namespaces=ns):
-                    if t.text:
-                        txt = t.text
-                        replaced = txt
-                        for old, new in mapping.items():
-                            if old in replaced:
-                                replaced = replaced.replace(old, new)
-                        if replaced != txt:
-                            t.text = replaced
-        except Exception:
-            pass
-
-    def _replace_in_saved_docx(self, docx_path: str, mapping: Dict[str, str]):
-        """Open the saved .docx and replace placeholders in XML files as a last step."""
-        try:
-            from zipfile import ZipFile, ZIP_DEFLATED
-            import io
-            with ZipFile(docx_path, 'r') as zin:
-                buf = io.BytesIO()
-                with ZipFile(buf, 'w', ZIP_DEFLATED) as zout:
-                    for item in zin.infolist():
-                        data = zin.read(item.filename)
-                        if item.filename.startswith('word/') and item.filename.endswith('.xml'):
-                            try:
-                                text = data.decode('utf-8')
-                                for old, new in mapping.items():
-                                    if old in text:
-                                        text = text.replace(old, new)
-                                data = text.encode('utf-8')
-                            except Exception:
-                                pass
-                        zout.writestr(item, data)
-            # Overwrite original file
-            with open(docx_path, 'wb') as f:
-                f.write(buf.getvalue())
-        except Exception:
-            pass
-    
     def cleanup_old_files(self, days: int = 7):
         """Remove generated documents older than specified days"""
         import time
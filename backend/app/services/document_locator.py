@@ -0,0 +1,320 @@
+"""
+Download filename -> storage location index
+
+The download endpoint receives only a filename ("PA GC15 SERVICE DESC Foo.docx").
+Rather than probing candidate keys and paging through every LOT prefix per click,
+resolve it from a map built by one scan per backend and updated whenever this
+process uploads a document. Out-of-band writes (e.g. the PDF converter) are picked
+up by rescanning after DOCUMENT_INDEX_TTL_SECONDS, or sooner on a miss. A miss
+that survives the rescan falls back to a direct existence check on the expected
+keys before the caller returns 404.
+"""
+
+import os
+import re
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Preference when the same filename exists in several places (lower wins)
+RANK_OUTPUT_GENERATED = 0
+RANK_SHAREPOINT_GENERATED = 1
+RANK_SHAREPOINT_FOLDER = 2
+RANK_OUTPUT_ROOT = 3
+
+# Scanned SharePoint hierarchy: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/
+GCLOUD_VERSIONS = ("14", "15")
+LOTS = ("2", "2a", "2b", "3")
+LOT_PREFIXES = tuple(
+    f"GCloud {version}/PA Services/Cloud Support Services LOT {lot}/"
+    for version in GCLOUD_VERSIONS for lot in LOTS
+)
+
+_DOCUMENT_FILENAME_RE = re.compile(r'^PA GC(\d+) (?:SERVICE DESC|Pricing Doc) (.+?)(?:_draft)?\.(?:docx|pdf)$')
+
+
+@dataclass(frozen=True)
+class DocumentLocation:
+    """Where a document lives: S3 bucket + key, Azure blob key, or local path"""
+    backend: str
+    key: str
+    bucket: Optional[str] = None
+    rank: int = RANK_SHAREPOINT_FOLDER
+
+    @property
+    def filename(self) -> str:
+        return self.key.replace('\\', '/').rsplit('/', 1)[-1]
+
+
+def draft_variant(filename: str) -> Optional[str]:
+    """'X.docx' -> 'X_draft.docx' (None if already a draft)"""
+    if '_draft' in filename:
+        return None
+    return filename.replace('.docx', '_draft.docx').replace('.pdf', '_draft.pdf')
+
+
+class DocumentLocator:
+    """
+    Filename -> best DocumentLocation
+
+    Args:
+        scan: Callable returning every known location (one pass over storage)
+        ttl_seconds: Rebuild age (DOCUMENT_INDEX_TTL_SECONDS, default 300)
+        miss_refresh_seconds: A miss rebuilds the index if it is older than this
+            (DOCUMENT_INDEX_MISS_REFRESH_SECONDS, default 30)
+        probe: Optional callable checking storage directly for one filename, used
+            when a lookup still misses after the refresh
+    """
+
+    def __init__(
+        self,
+        scan: Callable[[], Iterable[DocumentLocation]],
+        ttl_seconds: Optional[float] = None,
+        miss_refresh_seconds: Optional[float] = None,
+        probe: Optional[Callable[[str], Optional[DocumentLocation]]] = None
+    ):
+        self._scan = scan
+        self._probe = probe
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.environ.get("DOCUMENT_INDEX_TTL_SECONDS", "300"))
+        self.miss_refresh_seconds = miss_refresh_seconds if miss_refresh_seconds is not None \
+            else float(os.environ.get("DOCUMENT_INDEX_MISS_REFRESH_SECONDS", "30"))
+        self._locations: Dict[str, DocumentLocation] = {}
+        self._built_at: Optional[float] = None
+        # Uploads recorded while a scan is running, re-applied on top of its result
+        self._pending: Optional[List[DocumentLocation]] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.scans = 0
+
+    def rebuild(self) -> int:
+        """Rescan storage; returns the number of filenames indexed"""
+        with self._lock:
+            self._pending = []
+        locations: Dict[str, DocumentLocation] = {}
+        try:
+            for location in self._scan():
+                self._put(locations, location)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for location in self._pending:
+                self._put(locations, location)
+            self._pending = None
+            self._locations = locations
+            self._built_at = time.monotonic()
+            self.scans += 1
+        logger.info(f"Document locator rebuilt: {len(locations)} filenames")
+        return len(locations)
+
+    @staticmethod
+    def _put(locations: Dict[str, DocumentLocation], location: DocumentLocation):
+        current = locations.get(location.filename)
+        if current is None or location.rank <= current.rank:
+            locations[location.filename] = location
+
+    def record(self, location: DocumentLocation):
+        """Register an upload made by this process"""
+        with self._lock:
+            self._put(self._locations, location)
+            if self._pending is not None:
+                self._pending.append(location)
+
+    def forget(self, key: str):
+        """Drop a deleted document"""
+        with self._lock:
+            for filename, location in list(self._locations.items()):
+                if location.key == key:
+                    del self._locations[filename]
+
+    def _age(self) -> Optional[float]:
+        return time.monotonic() - self._built_at if self._built_at is not None else None
+
+    def _rebuild_if_older_than(self, seconds: float):
+        with self._build_lock:
+            age = self._age()
+            if age is None or age >= seconds:
+                try:
+                    self.rebuild()
+                except Exception as e:
+                    logger.warning(f"Document locator rebuild failed: {e}")
+
+    def _get(self, filenames: List[str]) -> Optional[DocumentLocation]:
+        with self._lock:
+            for filename in filenames:
+                location = self._locations.get(filename)
+                if location:
+                    return location
+        return None
+
+    def lookup(self, filename: str) -> Optional[DocumentLocation]:
+        """
+        Location of filename, falling back to its _draft variant
+
+        Returns:
+            DocumentLocation or None if the document is not stored anywhere indexed
+        """
+        filenames = [filename] + [name for name in [draft_variant(filename)] if name]
+        self._rebuild_if_older_than(self.ttl_seconds)
+        location = self._get(filenames)
+        if location is None:
+            # Written out-of-band since the last scan?
+            self._rebuild_if_older_than(self.miss_refresh_seconds)
+            location = self._get(filenames)
+        if location is None and self._probe is not None:
+            location = self._probe_any(filenames)
+        return location
+
+    def _probe_any(self, filenames: List[str]) -> Optional[DocumentLocation]:
+        for filename in filenames:
+            try:
+                location = self._probe(filename)
+            except Exception as e:
+                logger.warning(f"Document locator probe for {filename} failed: {e}")
+                continue
+            if location:
+                self.record(location)
+                return location
+        return None
+
+    def stats(self) -> Dict:
+        age = self._age()
+        with self._lock:
+            return {"filenames": len(self._locations), "scans": self.scans, "age_seconds": round(age, 1) if age is not None else None}
+
+
+def _scan_s3(sharepoint_bucket: str, output_bucket: str) -> Iterable[DocumentLocation]:
+    import boto3
+    s3 = boto3.client('s3')
+    paginator = s3.get_paginator('list_objects_v2')
+    prefixes = []
+    if output_bucket:
+        prefixes.append((output_bucket, 'generated/', RANK_OUTPUT_GENERATED))
+    if sharepoint_bucket:
+        prefixes.append((sharepoint_bucket, 'generated/', RANK_SHAREPOINT_GENERATED))
+        prefixes.extend((sharepoint_bucket, prefix, RANK_SHAREPOINT_FOLDER) for prefix in LOT_PREFIXES)
+    for bucket, prefix, rank in prefixes:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield DocumentLocation('s3', obj['Key'], bucket, rank)
+
+
+def _probe_s3(sharepoint_bucket: str, output_bucket: str, filename: str) -> Optional[DocumentLocation]:
+    """HEAD the keys a download used to probe; the output bucket root is not scanned"""
+    import boto3
+    from botocore.exceptions import ClientError
+    s3 = boto3.client('s3')
+    candidates = [
+        (output_bucket, f"generated/{filename}", RANK_OUTPUT_GENERATED),
+        (sharepoint_bucket, f"generated/{filename}", RANK_SHAREPOINT_GENERATED),
+        (output_bucket, filename, RANK_OUTPUT_ROOT),
+    ]
+    for bucket, key, rank in candidates:
+        if not bucket:
+            continue
+        try:
+            s3.head_object(Bucket=bucket, Key=key)
+        except ClientError:
+            continue
+        return DocumentLocation('s3', key, bucket, rank)
+    return None
+
+
+def _scan_azure() -> Iterable[DocumentLocation]:
+    from app.services.blob_index import get_blob_index
+    for entry in get_blob_index().list_blobs("GCloud "):
+        if entry.name.endswith(('.docx', '.pdf')):
+            yield DocumentLocation('azure', entry.name)
+
+
+def _probe_azure(filename: str) -> Optional[DocumentLocation]:
+    """Check the key the filename implies in each LOT folder"""
+    match = _DOCUMENT_FILENAME_RE.match(filename)
+    if not match:
+        return None
+    from app.services.azure_blob_service import get_azure_blob_service
+    azure_blob_service = get_azure_blob_service()
+    gcloud_version, folder_name = match.groups()
+    for lot in LOTS:
+        key = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{folder_name}/{filename}"
+        if azure_blob_service.blob_exists(key):
+            return DocumentLocation('azure', key)
+    return None
+
+
+def _scan_local(mock_base: Path) -> Iterable[DocumentLocation]:
+    for path in mock_base.glob("GCloud */PA Services/Cloud Support Services LOT */*/*"):
+        if path.suffix in ('.docx', '.pdf') and path.is_file():
+            yield DocumentLocation('local', str(path))
+
+
+_locator: Optional[DocumentLocator] = None
+_locator_key: Optional[Tuple] = None
+_locator_lock = threading.Lock()
+
+
+def get_document_locator(mock_base: Optional[Path] = None) -> DocumentLocator:
+    """
+    Process-wide locator for the deployment mode: S3 when USE_S3=true, Azure when
+    AZURE_STORAGE_CONNECTION_STRING is set, otherwise the local mock_sharepoint tree
+    """
+    global _locator, _locator_key
+    if os.environ.get("USE_S3", "false").lower() == "true":
+        sharepoint_bucket = os.environ.get('SHAREPOINT_BUCKET_NAME', '')
+        output_bucket = os.environ.get('OUTPUT_BUCKET_NAME', '')
+        key = ('s3', sharepoint_bucket, output_bucket)
+        scan = lambda: _scan_s3(sharepoint_bucket, output_bucket)
+        probe = lambda filename: _probe_s3(sharepoint_bucket, output_bucket, filename)
+    elif os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""):
+        key = ('azure',)
+        scan = _scan_azure
+        probe = _probe_azure
+    else:
+        if mock_base is None:
+            from sharepoint_service.mock_sharepoint import MOCK_BASE_PATH
+            mock_base = MOCK_BASE_PATH
+        key = ('local', str(mock_base))
+        scan = lambda: _scan_local(Path(mock_base))
+        probe = None
+    with _locator_lock:
+        if _locator is None or _locator_key != key:
+            _locator = DocumentLocator(scan, probe=probe)
+            _locator_key = key
+            if key[0] == 'azure':
+                _register_azure_listener(_locator)
+        return _locator
+
+
+def _register_azure_listener(locator: DocumentLocator):
+    from app.services.azure_blob_service import get_azure_blob_service
+
+    def on_write(blob_name: str, size: Optional[int] = None):
+        if blob_name.startswith("GCloud ") and blob_name.endswith(('.docx', '.pdf')):
+            locator.record(DocumentLocation('azure', blob_name))
+
+    get_azure_blob_service().add_write_listener(on_write)
+
+
+def record_upload(backend: str, key: str, bucket: Optional[str] = None):
+    """Register a document written by this process with the active locator (best effort)"""
+    try:
+        with _locator_lock:
+            locator = _locator
+        if locator is None or backend != _locator_key[0]:
+            return
+        if backend == 's3':
+            if bucket == _locator_key[2]:
+                rank = RANK_OUTPUT_GENERATED if key.startswith('generated/') else RANK_OUTPUT_ROOT
+            else:
+                rank = RANK_SHAREPOINT_GENERATED if key.startswith('generated/') else RANK_SHAREPOINT_FOLDER
+            locator.record(DocumentLocation('s3', key, bucket, rank))
+        else:
+            locator.record(DocumentLocation(backend, key))
+    except Exception as e:
+        logger.warning(f"Failed to record {key} in document locator: {e}")
@@ -0,0 +1,160 @@
+"""
+Idempotent Service Description generation
+Skips regeneration, upload and PDF conversion when the inputs and template are unchanged
+"""
+
+import os
+import json
+import hashlib
+import logging
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the document layout code changes so previously cached artefacts are rebuilt
+GENERATOR_VERSION = "1"
+
+# Blob metadata keys (Azure metadata names must be valid C# identifiers)
+META_GENERATION_KEY = "generation_key"
+META_WORD_SHA256 = "word_sha256"
+META_WORD_SIZE = "word_size"
+META_PDF_BLOB_KEY = "pdf_blob_key"
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, str):
+        text = unicodedata.normalize("NFC", value).replace("\r\n", "\n").replace("\r", "\n")
+        return text.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    return value
+
+
+def generation_key(
+    title: str,
+    description: str,
+    features: List[str],
+    benefits: List[str],
+    service_definition: Optional[List[dict]],
+    template_version: str,
+) -> str:
+    """
+    Hash the normalised generation inputs together with the template version
+
+    Args:
+        title, description, features, benefits, service_definition: generate_service_description inputs
+        template_version: Identifier of the template revision (ETag or mtime/size)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "generator": GENERATOR_VERSION,
+        "template": template_version,
+        "title": _normalise(title),
+        "description": _normalise(description),
+        "features": _normalise(features or []),
+        "benefits": _normalise(benefits or []),
+        "service_definition": _normalise(service_definition or []),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(_normalise(value), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def section_manifest(
+    title: str,
+    description: str,
+    features: List[str],
+    benefits: List[str],
+    service_definition: Optional[List[dict]],
+    template_version: str,
+) -> Dict[str, Any]:
+    """
+    Per-section content hashes stored inside a generated document
+
+    Comparing two manifests tells which heading blocks need rewriting on update.
+    """
+    return {
+        "generator": GENERATOR_VERSION,
+        "template": template_version,
+        "title": _digest(title),
+        "description": _digest(description),
+        "features": _digest((features or [])[:10]),
+        "benefits": _digest((benefits or [])[:10]),
+        "service_definition": _digest(service_definition or []),
+        "service_definition_blocks": len(service_definition or []),
+    }
+
+
+def generation_cache_enabled() -> bool:
+    return os.environ.get("GENERATION_CACHE_ENABLED", "true").lower() == "true"
+
+
+class BlobGenerationCache:
+    """
+    Generation cache stored as metadata on the generated Word blob.
+
+    Keeping the key on the artefact itself means the cache survives Function
+    instance recycling, and any out-of-band overwrite of the blob (which drops
+    its metadata) invalidates the entry automatically.
+    """
+
+    def __init__(self, azure_blob_service):
+        self.azure_blob_service = azure_blob_service
+
+    def lookup(self, word_blob_key: str, key: str, require_pdf: bool) -> Optional[Dict[str, Any]]:
+        """
+        Find reusable artefacts for a generation
+
+        Args:
+            word_blob_key: Target Word blob
+            key: generation_key() of the request
+            require_pdf: Whether a converted PDF must already exist
+
+        Returns:
+            Dict with word_sha256, word_size and pdf_blob_key, or None on a miss
+        """
+        try:
+            metadata = self.azure_blob_service.get_blob_metadata(word_blob_key)
+        except Exception as e:
+            logger.warning(f"Generation cache lookup failed for {word_blob_key}: {e}")
+            return None
+        if not metadata or metadata.get(META_GENERATION_KEY) != key:
+            return None
+
+        pdf_blob_key = metadata.get(META_PDF_BLOB_KEY) or None
+        if pdf_blob_key and not self.azure_blob_service.blob_exists(pdf_blob_key):
+            pdf_blob_key = None
+        if require_pdf and not pdf_blob_key:
+            return None
+
+        logger.info(f"Generation cache hit for {word_blob_key}")
+        return {
+            "word_sha256": metadata.get(META_WORD_SHA256),
+            "word_size": int(metadata[META_WORD_SIZE]) if metadata.get(META_WORD_SIZE) else None,
+            "pdf_blob_key": pdf_blob_key,
+        }
+
+    @staticmethod
+    def word_metadata(key: str, sha256: str, size: int) -> Dict[str, str]:
+        """Metadata to upload with a freshly generated Word blob"""
+        return {
+            META_GENERATION_KEY: key,
+            META_WORD_SHA256: sha256,
+            META_WORD_SIZE: str(size),
+        }
+
+    def record_pdf(self, word_blob_key: str, metadata: Dict[str, str], pdf_blob_key: str):
+        """Remember the converted PDF so later completes can skip conversion"""
+        try:
+            self.azure_blob_service.set_blob_metadata(word_blob_key, {**metadata, META_PDF_BLOB_KEY: pdf_blob_key})
+        except Exception as e:
+            logger.warning(f"Failed to record PDF in generation cache for {word_blob_key}: {e}")
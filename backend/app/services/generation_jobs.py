@@ -0,0 +1,134 @@
+"""
+Asynchronous document generation jobs
+Local in-process queue standing in for a real broker (e.g. Celery/Service Bus)
+"""
+
+import os
+import time
+import uuid
+import queue
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class GenerationJob:
+    """State of one submitted generation job"""
+    id: str
+    kind: str
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class LocalJobQueue:
+    """
+    In-process job queue with a fixed pool of worker threads.
+
+    Jobs are kept in memory, so status is only visible to the process that accepted
+    the job; finished jobs are pruned after job_ttl seconds.
+    """
+
+    def __init__(self, workers: Optional[int] = None, job_ttl: Optional[float] = None):
+        """
+        Args:
+            workers: Worker thread count (defaults to GENERATION_JOB_WORKERS or 2)
+            job_ttl: Seconds to keep finished jobs (defaults to GENERATION_JOB_TTL_SECONDS or 3600)
+        """
+        self.workers = workers or int(os.environ.get("GENERATION_JOB_WORKERS", "2"))
+        self.job_ttl = job_ttl if job_ttl is not None else float(os.environ.get("GENERATION_JOB_TTL_SECONDS", "3600"))
+        self._queue: "queue.Queue" = queue.Queue()
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, kind: str, fn: Callable[[], Dict[str, Any]]) -> GenerationJob:
+        """
+        Queue a job
+
+        Args:
+            kind: Job type label (e.g. "service_description")
+            fn: Callable run on a worker; its return value becomes the job result
+
+        Returns:
+            The queued job
+        """
+        self._ensure_workers()
+        job = GenerationJob(id=uuid.uuid4().hex, kind=kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._queue.put((job, fn))
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[GenerationJob]:
+        """Block until the job finishes or timeout elapses, then return it"""
+        job = self.get(job_id)
+        if job is not None and timeout > 0:
+            job.done.wait(timeout)
+        return job
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                t = threading.Thread(target=self._run, name=f"generation-job-{len(self._threads)}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _run(self):
+        while True:
+            job, fn = self._queue.get()
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = fn()
+                job.status = JOB_SUCCEEDED
+            except Exception as e:
+                logger.error(f"Generation job {job.id} failed: {e}", exc_info=True)
+                job.error = str(e)
+                job.status = JOB_FAILED
+            finally:
+                job.finished_at = time.time()
+                job.done.set()
+                self._queue.task_done()
+
+    def _prune(self):
+        cutoff = time.time() - self.job_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Global instance
+generation_jobs = LocalJobQueue()
@@ -0,0 +1,163 @@
+"""
+Content-addressed cache for images embedded in Service Definition HTML
+Prefetches image URLs / data URLs concurrently before the document is built
+"""
+
+import os
+import base64
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FETCH_TIMEOUT = 10
+
+
+def _source_key(src: str) -> str:
+    # data: URLs can be megabytes long, so index them by digest rather than by value
+    if src.startswith('data:'):
+        return 'data:' + hashlib.sha256(src.encode('utf-8')).hexdigest()
+    return src
+
+
+class ImageCache:
+    """
+    Size-bounded LRU cache of image bytes keyed by SHA-256 of the content.
+
+    A second (count-bounded) index maps image sources (URL or data URL digest)
+    to content hashes, so the same image is never downloaded or base64-decoded
+    twice, and identical images from different URLs are stored once.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_sources: int = 4096, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Total image bytes to keep (defaults to IMAGE_CACHE_MAX_BYTES or 64 MiB)
+            max_sources: Number of source -> content mappings to keep
+            max_workers: Concurrent downloads during prefetch (defaults to IMAGE_PREFETCH_WORKERS or 8)
+        """
+        self.max_bytes = max_bytes or int(os.environ.get("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.max_sources = max_sources
+        self.max_workers = max_workers or int(os.environ.get("IMAGE_PREFETCH_WORKERS", "8"))
+        self._content: "OrderedDict[str, bytes]" = OrderedDict()
+        self._sources: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, src: str) -> Optional[bytes]:
+        """Cached bytes for an image source, or None"""
+        key = _source_key(src)
+        with self._lock:
+            digest = self._sources.get(key)
+            data = self._content.get(digest) if digest else None
+            if data is None:
+                return None
+            self._sources.move_to_end(key)
+            self._content.move_to_end(digest)
+            self.hits += 1
+            return data
+
+    def fetch(self, src: str) -> Optional[bytes]:
+        """
+        Get image bytes for a source, downloading or decoding on a cache miss
+
+        Args:
+            src: http(s) URL or data URL
+
+        Returns:
+            Image bytes, or None if the image could not be loaded
+        """
+        data = self.get(src)
+        if data is not None:
+            return data
+        with self._lock:
+            self.misses += 1
+        try:
+            data = self._load(src)
+        except Exception as e:
+            logger.warning(f"Failed to load image {src[:80]}: {e}")
+            return None
+        self._store(src, data)
+        return data
+
+    def prefetch(self, sources: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Load many image sources concurrently
+
+        Args:
+            sources: Image sources (duplicates are fetched once)
+
+        Returns:
+            Mapping of source -> bytes (None for images that failed to load)
+        """
+        unique: List[str] = list(dict.fromkeys(s for s in sources if s))
+        if not unique:
+            return {}
+        if len(unique) == 1:
+            return {unique[0]: self.fetch(unique[0])}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as executor:
+            return dict(zip(unique, executor.map(self.fetch, unique)))
+
+    def clear(self):
+        with self._lock:
+            self._content.clear()
+            self._sources.clear()
+            self._size = 0
+
+    def _load(self, src: str) -> bytes:
+        if src.startswith('data:'):
+            # data URL: data:image/png;base64,....
+            header, b64 = src.split(',', 1)
+            return base64.b64decode(b64)
+        import requests
+        response = requests.get(src, timeout=IMAGE_FETCH_TIMEOUT)
+        response.raise_for_status()
+        return response.content
+
+    def _store(self, src: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest not in self._content:
+                self._content[digest] = data
+                self._size += len(data)
+            self._content.move_to_end(digest)
+            self._sources[_source_key(src)] = digest
+            self._sources.move_to_end(_source_key(src))
+            while self._size > self.max_bytes and self._content:
+                _, evicted = self._content.popitem(last=False)
+                self._size -= len(evicted)
+            while len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+
+
+def collect_image_sources(service_definition: List[dict]) -> List[str]:
+    """
+    Collect every image source referenced by Service Definition blocks
+
+    Args:
+        service_definition: Blocks with optional 'content' HTML and legacy 'images' lists
+
+    Returns:
+        Image sources in document order
+    """
+    import lxml.html
+    sources: List[str] = []
+    for block in service_definition or []:
+        content_html = block.get('content') or ''
+        if '<img' in content_html:
+            root = lxml.html.fragment_fromstring(content_html, create_parent='div')
+            sources.extend(img.get('src') for img in root.iter('img') if img.get('src'))
+        sources.extend(url for url in (block.get('images') or []) if url)
+    return sources
+
+
+# Global instance shared across generations
+image_cache = ImageCache()
@@ -0,0 +1,111 @@
+"""
+Content-hash keyed PDF conversion cache
+Reuses an existing PDF when the Word document's content has already been converted
+"""
+
+import os
+import logging
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Content-addressed copies of converted PDFs live under this prefix. They are never
+# deleted here: the storage account's "expire-pdf-cache" management policy removes them
+# (infrastructure/azure/modules/storage_account, pdf_cache_expiration_days, default 30).
+# A hit only copies from the entry, so entries age out and are rebuilt on the next miss.
+# Keep the policy's prefix in step if this is overridden.
+PDF_CACHE_PREFIX = os.environ.get("PDF_CACHE_PREFIX", "_pdf_cache/")
+
+# Blob metadata key on a PDF recording the content it was converted from
+META_SOURCE_SHA256 = "source_sha256"
+
+
+def pdf_cache_enabled() -> bool:
+    return os.environ.get("PDF_CACHE_ENABLED", "true").lower() == "true"
+
+
+def source_id(content_sha256: str, update_fields: bool) -> str:
+    """
+    Cache identity of a conversion
+
+    Args:
+        content_sha256: docx_content_hash() of the Word document
+        update_fields: Whether the converter refreshes fields (changes the output)
+    """
+    return content_sha256 + ("-fields" if update_fields else "")
+
+
+class PdfCacheStats:
+    """Process-wide hit/miss counters for PDF conversions (all backends)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class BlobPdfCache:
+    """
+    PDF cache for the Azure deployment.
+
+    A PDF blob carries the content hash it was converted from, so re-completing
+    unchanged content is a metadata read. A content-addressed copy under
+    PDF_CACHE_PREFIX lets identical content at another path be served by a
+    server-side blob copy.
+    """
+
+    def __init__(self, azure_blob_service, stats: PdfCacheStats = None):
+        self.azure_blob_service = azure_blob_service
+        self.stats = stats or pdf_cache_stats
+
+    def lookup(self, pdf_blob_key: str, source: str) -> bool:
+        """
+        Make pdf_blob_key hold the PDF for `source` without converting, if possible
+
+        Args:
+            pdf_blob_key: Target PDF blob
+            source: source_id() of the Word document
+
+        Returns:
+            True on a cache hit (the target PDF is in place)
+        """
+        hit = False
+        try:
+            metadata = self.azure_blob_service.get_blob_metadata(pdf_blob_key)
+            if metadata and metadata.get(META_SOURCE_SHA256) == source:
+                hit = True
+            elif self.azure_blob_service.blob_exists(f"{PDF_CACHE_PREFIX}{source}.pdf"):
+                self.azure_blob_service.copy_blob(
+                    f"{PDF_CACHE_PREFIX}{source}.pdf", pdf_blob_key, metadata={META_SOURCE_SHA256: source}
+                )
+                hit = True
+        except Exception as e:
+            logger.warning(f"PDF cache lookup failed for {pdf_blob_key}: {e}")
+        self.stats.record(hit)
+        if hit:
+            logger.info(f"PDF cache hit for {pdf_blob_key}")
+        return hit
+
+    def store(self, pdf_blob_key: str, source: str):
+        """Tag a freshly converted PDF with its source and keep a content-addressed copy"""
+        try:
+            metadata = self.azure_blob_service.get_blob_metadata(pdf_blob_key) or {}
+            self.azure_blob_service.set_blob_metadata(pdf_blob_key, {**metadata, META_SOURCE_SHA256: source})
+            self.azure_blob_service.copy_blob(pdf_blob_key, f"{PDF_CACHE_PREFIX}{source}.pdf")
+        except Exception as e:
+            logger.warning(f"Failed to store PDF in cache for {pdf_blob_key}: {e}")
+
+
+pdf_cache_stats = PdfCacheStats()
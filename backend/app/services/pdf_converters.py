@@ -0,0 +1,333 @@
+"""
+PDF conversion backends with admission control
+
+One interface over the deployment-specific converters: local LibreOffice
+(Docker/local mode), the Azure PDF Function over HTTP, and the AWS Lambda.
+Every backend bounds concurrent conversions with a semaphore, rejects work once
+too many callers are already queued for a slot, and records latency metrics,
+so conversion load cannot tie up every API worker.
+
+convert() blocks while it waits for a slot; async callers use convert_async()
+or run the surrounding generation in a thread.
+"""
+
+import os
+import json
+import asyncio
+import shutil
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ConverterOverloaded(RuntimeError):
+    """Raised when a conversion is refused because the backend's queue is full"""
+
+
+@dataclass
+class ConversionRequest:
+    """
+    One Word -> PDF conversion
+
+    word_key/pdf_key are blob keys (Azure), S3 keys (Lambda) or local paths (local).
+    """
+    word_key: str
+    pdf_key: str
+    update_fields: bool = True
+    word_bucket: Optional[str] = None
+    output_bucket: Optional[str] = None
+
+
+@dataclass
+class ConversionResult:
+    success: bool
+    pdf_key: Optional[str] = None
+    pdf_url: Optional[str] = None
+    cache: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ConverterMetrics:
+    """Counters and recent latencies for one backend"""
+
+    def __init__(self, window: int = 512):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.queued = 0
+
+    def enqueue(self, max_queue: int) -> bool:
+        """Count a caller waiting for a slot; False (and counted as rejected) when the queue is full"""
+        with self._lock:
+            if self.queued >= max_queue:
+                self.rejected += 1
+                return False
+            self.queued += 1
+            return True
+
+    def dequeue(self, started: bool):
+        with self._lock:
+            self.queued -= 1
+            if started:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+
+    def record(self, seconds: float, success: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self._latencies.append(seconds)
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snapshot = {
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+            }
+        if latencies:
+            snapshot.update({
+                "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000),
+                "latency_ms_p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000),
+                "latency_ms_max": round(latencies[-1] * 1000),
+            })
+        return snapshot
+
+
+class PdfConverter:
+    """Base class: admission control and metrics around a backend's _convert"""
+
+    name = "base"
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        self.max_concurrency = max_concurrency or int(os.environ.get("PDF_CONVERT_MAX_CONCURRENCY", "2"))
+        self.max_queue = max_queue if max_queue is not None else int(os.environ.get("PDF_CONVERT_MAX_QUEUE", "8"))
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(os.environ.get("PDF_CONVERT_QUEUE_TIMEOUT", "60"))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.metrics = ConverterMetrics()
+
+    def convert(self, request: ConversionRequest) -> ConversionResult:
+        """
+        Convert a document, waiting for a free slot
+
+        Raises:
+            ConverterOverloaded: The wait queue is full, or no slot freed up within queue_timeout
+        """
+        if not self.metrics.enqueue(self.max_queue):
+            raise ConverterOverloaded(f"{self.name} converter queue full ({self.max_queue} waiting)")
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        self.metrics.dequeue(started=acquired)
+        if not acquired:
+            raise ConverterOverloaded(f"No {self.name} converter slot free after {self.queue_timeout}s")
+
+        start = time.perf_counter()
+        try:
+            result = self._convert(request)
+        except Exception as e:
+            logger.error(f"{self.name} PDF conversion failed: {e}", exc_info=True)
+            result = ConversionResult(success=False, error=str(e))
+        finally:
+            self._slots.release()
+        self.metrics.record(time.perf_counter() - start, result.success)
+        return result
+
+    async def convert_async(self, request: ConversionRequest) -> ConversionResult:
+        """convert() on a worker thread, so waiting for a slot never blocks the event loop"""
+        return await asyncio.to_thread(self.convert, request)
+
+    def _convert(self, request: ConversionRequest) -> ConversionResult:
+        raise NotImplementedError
+
+
+class HttpFunctionConverter(PdfConverter):
+    """Azure PDF converter Function App called over HTTP"""
+
+    name = "http"
+
+    def __init__(self, url: str, function_key: str = "", container: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.function_key = function_key
+        self.container = container or os.environ.get("AZURE_STORAGE_CONTAINER_NAME", "sharepoint")
+
+    def _convert(self, request: ConversionRequest) -> ConversionResult:
+        import requests  # Import at function level to avoid dependency issues
+        payload = {
+            "word_blob_key": request.word_key,
+            "word_container": self.container,
+            "output_container": self.container,
+            "pdf_blob_key": request.pdf_key,
+            # Skip the converter's field-update pass when the TOC is already filled in
+            "update_fields": request.update_fields
+        }
+        # Build URL with function key if available
+        url = f"{self.url}?code={self.function_key}" if self.function_key else self.url
+        response = requests.post(
+            url,
+            json=payload,
+            timeout=300  # 5 minute timeout for PDF conversion
+        )
+        if response.status_code != 200:
+            return ConversionResult(success=False, error=f"status {response.status_code}: {response.text}")
+        result = response.json()
+        if not result.get('success'):
+            return ConversionResult(success=False, error=result.get('error', 'Unknown error'))
+        return ConversionResult(
+            success=True,
+            pdf_key=result.get('pdf_blob_key', request.pdf_key),
+            cache=result.get('cache')
+        )
+
+
+class LambdaConverter(PdfConverter):
+    """PDF converter Lambda invoked synchronously"""
+
+    name = "lambda"
+
+    def __init__(self, function_name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.function_name = function_name
+        self._client = None
+
+    def _convert(self, request: ConversionRequest) -> ConversionResult:
+        if self._client is None:
+            import boto3
+            self._client = boto3.client('lambda')
+        response = self._client.invoke(
+            FunctionName=self.function_name,
+            InvocationType='RequestResponse',  # Synchronous invocation
+            Payload=json.dumps({
+                'word_s3_key': request.word_key,
+                'word_bucket': request.word_bucket,
+                'output_bucket': request.output_bucket,
+                'pdf_s3_key': request.pdf_key,
+                'update_fields': request.update_fields
+            })
+        )
+        result = json.loads(response['Payload'].read())
+        if not result.get('success'):
+            return ConversionResult(success=False, cache=result.get('cache'), error=result.get('error', 'Unknown error'))
+        return ConversionResult(
+            success=True,
+            pdf_key=result.get('pdf_s3_key', request.pdf_key),
+            pdf_url=result.get('pdf_url'),
+            cache=result.get('cache')
+        )
+
+
+class LocalConverter(PdfConverter):
+    """
+    LibreOffice on this host (Docker/local mode)
+
+    Conversions run on the PDF converter's warm SofficePool, one worker per
+    concurrency slot, so documents skip the cold soffice start and parallel
+    conversions never share a profile.
+    """
+
+    name = "local"
+
+    def __init__(self, pool, **kwargs):
+        super().__init__(**kwargs)
+        self.pool = pool
+
+    def _convert(self, request: ConversionRequest) -> ConversionResult:
+        word_path = Path(request.word_key)
+        pdf_path = Path(request.pdf_key)
+        # The pool names its output after the Word file; convert beside the target, then rename
+        out_dir = pdf_path.parent / f".convert-{threading.get_ident()}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            produced = self.pool.convert(word_path, out_dir, update_fields=request.update_fields, timeout=self.queue_timeout)
+            os.replace(produced, pdf_path)
+            return ConversionResult(success=True, pdf_key=str(pdf_path))
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+_converters: Dict[str, PdfConverter] = {}
+_converters_lock = threading.Lock()
+
+
+def _create_local() -> Optional[LocalConverter]:
+    try:
+        from pdf_converter.soffice_pool import SofficePool, find_soffice
+        binary = find_soffice()
+    except (ImportError, RuntimeError) as e:
+        logger.info(f"Local PDF conversion unavailable: {e}")
+        return None
+    max_concurrency = int(os.environ.get("PDF_CONVERT_MAX_CONCURRENCY", "2"))
+    return LocalConverter(SofficePool(size=max_concurrency, binary=binary), max_concurrency=max_concurrency)
+
+
+def _create(backend: str) -> Optional[PdfConverter]:
+    if backend == "http":
+        url = os.environ.get("PDF_CONVERTER_FUNCTION_URL")
+        return HttpFunctionConverter(url, os.environ.get("PDF_CONVERTER_FUNCTION_KEY", "")) if url else None
+    if backend == "lambda":
+        function_name = os.environ.get("PDF_CONVERTER_FUNCTION_NAME")
+        return LambdaConverter(function_name) if function_name else None
+    if backend == "local":
+        return _create_local()
+    return None
+
+
+def get_pdf_converter(use_azure: bool = False, use_s3: bool = False) -> Optional[PdfConverter]:
+    """
+    Process-wide converter for the deployment mode
+
+    PDF_CONVERTER_BACKEND (http, lambda, local, none) overrides the mode's default:
+    http for Azure, lambda for AWS, local LibreOffice otherwise.
+
+    Returns:
+        The converter, or None when the backend is not configured/available
+    """
+    backend = os.environ.get("PDF_CONVERTER_BACKEND", "").lower()
+    if not backend:
+        backend = "http" if use_azure else "lambda" if use_s3 else "local"
+    if backend == "none":
+        return None
+    with _converters_lock:
+        converter = _converters.get(backend)
+        # Rebuild when configuration changed (e.g. URL/function name set after first use)
+        if converter is None or not _matches_config(converter):
+            converter = _create(backend)
+            if converter is None:
+                _converters.pop(backend, None)
+                return None
+            _converters[backend] = converter
+        return converter
+
+
+def _matches_config(converter: PdfConverter) -> bool:
+    if isinstance(converter, HttpFunctionConverter):
+        return (converter.url == os.environ.get("PDF_CONVERTER_FUNCTION_URL")
+                and converter.function_key == os.environ.get("PDF_CONVERTER_FUNCTION_KEY", ""))
+    if isinstance(converter, LambdaConverter):
+        return converter.function_name == os.environ.get("PDF_CONVERTER_FUNCTION_NAME")
+    return True
+
+
+def converter_metrics() -> Dict[str, Dict]:
+    """Metrics for every backend used by this process"""
+    with _converters_lock:
+        return {name: converter.metrics.snapshot() for name, converter in _converters.items()}
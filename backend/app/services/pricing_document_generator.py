@@ -13,6 +13,8 @@ from docx.enum.text import WD_BREAK
 from docx.oxml import OxmlElement
 from docx.text.paragraph import Paragraph
 from docx.oxml.ns import qn
+from app.utils.docx_placeholders import replace_placeholders
+from app.utils.docx_stream import serialize_document, DOCX_CONTENT_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +31,16 @@ class PricingDocumentGenerator:
         """
         self.s3_service = s3_service
         self.use_s3 = s3_service is not None
+        # Resolved local template path, keyed by PRICING_TEMPLATE_PATH value
+        self._template_path_cache: Dict[Optional[str], Path] = {}
         
         # Check if we're in Azure (has Azure Storage connection string but no S3)
         self.use_azure = not self.use_s3 and bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
         self.azure_blob_service = None
         if self.use_azure:
             try:
-                from app.services.azure_blob_service import AzureBlobService
-                self.azure_blob_service = AzureBlobService()
+                from app.services.azure_blob_service import get_azure_blob_service
+                self.azure_blob_service = get_azure_blob_service()
             except Exception as e:
                 logger.warning(f"Failed to initialize Azure Blob Service: {e}")
                 self.use_azure = False
@@ -62,6 +66,61 @@ class PricingDocumentGenerator:
                 self.output_dir = Path("/tmp/generated_documents")
                 self.output_dir.mkdir(parents=True, exist_ok=True)
     
+    def _resolve_template_path(self) -> Path:
+        """
+        Locate the local Pricing Document template.
+        
+        Memoised per PRICING_TEMPLATE_PATH value; discovery re-runs only if the
+        previously resolved file disappears.
+        
+        Returns:
+            Path to the template (may not exist if no template could be found)
+        """
+        template_env = os.environ.get("PRICING_TEMPLATE_PATH")
+        cached = self._template_path_cache.get(template_env)
+        if cached is not None and cached.exists():
+            return cached
+        
+        template_path: Path | None = None
+        if template_env:
+            env_path = Path(template_env)
+            if env_path.exists():
+                template_path = env_path
+        
+        if template_path is None:
+            # Check if we're running in Docker (/app exists) or locally
+            is_docker = Path("/app").exists()
+            
+            if is_docker:
+                # Docker environment: use /app paths
+                docs_dir = Path("/app/docs")
+                candidate = docs_dir / "PA GC15 Pricing Doc SERVICE TITLE.docx"
+                if candidate.exists():
+                    template_path = candidate
+                else:
+                    template_path = self.templates_dir / "pricing_template.docx"
+            else:
+                # Local development: use relative paths from backend directory
+                backend_dir = Path(__file__).parent.parent.parent
+                docs_dir = backend_dir / "docs"
+                templates_dir = backend_dir / "templates"
+                
+                # Check docs first, then templates
+                candidate = docs_dir / "PA GC15 Pricing Doc SERVICE TITLE.docx"
+                if candidate.exists():
+                    template_path = candidate
+                elif templates_dir.exists():
+                    for p in templates_dir.glob("*pricing*.docx"):
+                        template_path = p
+                        break
+                
+                if template_path is None:
+                    template_path = templates_dir / "pricing_template.docx"
+        
+        if template_path.exists():
+            self._template_path_cache[template_env] = template_path
+        return template_path
+    
     def generate_pricing_document(
         self,
         service_name: str,
@@ -82,62 +141,28 @@ class PricingDocumentGenerator:
             Dict with paths to generated Word document
         """
         
-        # Load template
+        # Load template (parsed once per process, deep-copied per request)
+        from app.services.template_cache import template_cache
+        blob_template_key = os.environ.get("PRICING_TEMPLATE_BLOB_KEY")
         if self.use_s3:
-            # AWS Lambda: download template from S3 to /tmp
+            # AWS Lambda: read template from S3, revalidated by ETag
             template_key = os.environ.get("PRICING_TEMPLATE_S3_KEY", "templates/pricing_template.docx")
-            template_path = self.output_dir / "pricing_template.docx"
-            self.s3_service.download_template(template_key, template_path)
+            doc = template_cache.get_s3(self.s3_service, template_key)
+        elif self.use_azure and blob_template_key:
+            # Azure: optional template stored in blob storage, revalidated by ETag
+            doc = template_cache.get_azure(self.azure_blob_service, blob_template_key)
         else:
-            # Docker/local: use local filesystem
-            template_env = os.environ.get("PRICING_TEMPLATE_PATH")
-            template_path: Path | None = None
-            if template_env:
-                env_path = Path(template_env)
-                if env_path.exists():
-                    template_path = env_path
-            
-            if template_path is None:
-                # Check if we're running in Docker (/app exists) or locally
-                is_docker = Path("/app").exists()
-                
-                if is_docker:
-                    # Docker environment: use /app paths
-                    docs_dir = Path("/app/docs")
-                    candidate = docs_dir / "PA GC15 Pricing Doc SERVICE TITLE.docx"
-                    if candidate.exists():
-                        template_path = candidate
-                    else:
-                        template_path = self.templates_dir / "pricing_template.docx"
-                else:
-                    # Local development: use relative paths from backend directory
-                    backend_dir = Path(__file__).parent.parent.parent
-                    docs_dir = backend_dir / "docs"
-                    templates_dir = backend_dir / "templates"
-                    
-                    # Check docs first, then templates
-                    candidate = docs_dir / "PA GC15 Pricing Doc SERVICE TITLE.docx"
-                    if candidate.exists():
-                        template_path = candidate
-                    elif templates_dir.exists():
-                        for p in templates_dir.glob("*pricing*.docx"):
-                            template_path = p
-                            break
-                    
-                    if template_path is None:
-                        template_path = templates_dir / "pricing_template.docx"
-            
+            # Docker/local: use local filesystem, revalidated by mtime/size
+            template_path = self._resolve_template_path()
             if not Path(template_path).exists():
                 raise FileNotFoundError(f"Pricing template not found: {template_path}")
-        
-        # Create a copy to work with
-        doc = Document(str(template_path))
+            doc = template_cache.get_local(template_path)
         
         # Replace title with service name - map to Cover Page and Title
         self._replace_title(doc, service_name)
         
-        # Replace placeholders across all text nodes
-        self._replace_text_in_all_wt(doc, {
+        # Replace placeholders in one pass over every part, including placeholders split across runs
+        replace_placeholders(doc, {
             'SERVICE TITLE': service_name,
             'SERVICE NAME': service_name,
             '{{SERVICE_NAME}}': service_name,
@@ -210,22 +235,18 @@ class PricingDocumentGenerator:
             output_dir = self.output_dir
             s3_key = None
         
-        # Ensure output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save Word document
-        doc.save(str(word_path))
-        
-        # Final safeguard: replace placeholders directly in the saved XML parts
-        self._replace_in_saved_docx(str(word_path), {
-            'SERVICE TITLE': service_name,
-            'SERVICE NAME': service_name,
-            '{{SERVICE_NAME}}': service_name,
-        })
+        # Serialise once into memory; Azure/S3 uploads stream this buffer and never touch local disk
+        serialized = serialize_document(doc)
+        upload_to_azure = bool(self.use_azure and self.azure_blob_service and new_proposal_metadata)
+        if not ((self.use_s3 and s3_key) or upload_to_azure):
+            # Ensure output directory exists
+            output_dir.mkdir(parents=True, exist_ok=True)
+            # Save Word document
+            serialized.write_to(word_path)
         
         # Upload to Azure Blob Storage if in Azure environment
         word_blob_key = None
-        if self.use_azure and self.azure_blob_service and new_proposal_metadata:
+        if upload_to_azure:
             # Construct blob key matching the SharePoint folder structure
             service_name_clean = new_proposal_metadata.get('service', service_name)
             lot = new_proposal_metadata.get('lot', lot)
@@ -235,11 +256,21 @@ class PricingDocumentGenerator:
             
             if blob_key:
                 try:
-                    self.azure_blob_service.upload_file(word_path, blob_key)
+                    self.azure_blob_service.upload_stream(
+                        serialized.rewind(),
+                        blob_key,
+                        length=serialized.size,
+                        content_type=DOCX_CONTENT_TYPE,
+                    )
                     word_blob_key = blob_key
                     logger.info(f"Uploaded pricing document to Azure Blob Storage: {word_blob_key}")
                 except Exception as e:
                     logger.error(f"Failed to upload pricing document to Azure Blob Storage: {e}")
+                    # Keep a local copy so the document isn't lost
+                    try:
+                        serialized.write_to(word_path)
+                    except Exception as write_error:
+                        logger.error(f"Failed to save local fallback copy: {write_error}")
         
         # Upload to S3 if in Lambda environment
         if self.use_s3 and s3_key:
@@ -250,8 +281,12 @@ class PricingDocumentGenerator:
             if not bucket_sharepoint:
                 raise ValueError("Target S3 bucket for Pricing document not configured")
             
-            with open(word_path, 'rb') as f:
-                s3_client.upload_fileobj(f, bucket_sharepoint, s3_key)
+            s3_client.upload_fileobj(
+                serialized.rewind(),
+                bucket_sharepoint,
+                s3_key,
+                ExtraArgs={'ContentType': DOCX_CONTENT_TYPE}
+            )
             
             # Generate presigned URL
             word_url = s3_client.generate_presigned_url(
@@ -263,25 +298,30 @@ class PricingDocumentGenerator:
             return {
                 "word_path": word_url,
                 "word_s3_key": s3_key,
-                "filename": filename_base
+                "filename": filename_base,
+                "word_sha256": serialized.sha256,
+                "word_size": serialized.size
             }
         elif self.use_azure:
             # Azure: return blob keys
             return {
-                "word_path": str(word_path),
+                "word_path": word_blob_key or str(word_path),
                 "word_blob_key": word_blob_key,
-                "filename": filename_base
+                "filename": filename_base,
+                "word_sha256": serialized.sha256,
+                "word_size": serialized.size
             }
         else:
             # Docker/local: return local paths
             return {
                 "word_path": str(word_path),
-                "filename": filename_base
+                "filename": filename_base,
+                "word_sha256": serialized.sha256,
+                "word_size": serialized.size
             }
     
     def _replace_title(self, doc: Document, service_name: str):
         """Replace the first Heading 1 with service name, or append to existing title"""
-        replaced = False
         for paragraph in doc.paragraphs:
             if paragraph.style.name == 'Heading 1':
                 # Found the title - append service name to existing title
@@ -295,67 +335,6 @@ class PricingDocumentGenerator:
                 for run in paragraph.runs:
                     run.font.size = Pt(24)
                     run.font.bold = True
-                replaced = True
                 break
-        
-        # Fallback: replace literal occurrences of placeholders
-        if not replaced:
-            placeholders = ['SERVICE TITLE', 'SERVICE NAME', '{{SERVICE_NAME}}']
-            for p in doc.paragraphs:
-                for r in p.runs:
-                    for placeholder in placeholders:
-                        if placeholder in r.text:
-                            r.text = r.text.replace(placeholder, service_name)
-                            replaced = True
-                            break
-                    if replaced:
-                        break
-                if replaced:
-                    break
+        # Templates without a Heading 1 rely on the placeholder pass (replace_placeholders)
     
-    def _replace_text_in_all_wt(self, doc: Document, mapping: Dict[str, str]):
-        """Replace text in all w:t nodes within the main document"""
-        ns = {
-            'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-            'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-        }
-        try:
-            for xpath in ('.//w:t', './/a:t'):
-                for t in doc._element.xpath(xpath, namespaces=ns):
-                    if t.text:
-                        txt = t.text
-                        replaced = txt
-                        for old, new in mapping.items():
-                            if old in replaced:
-                                replaced = replaced.replace(old, new)
-                        if replaced != txt:
-                            t.text = replaced
-        except Exception:
-            pass
-    
-    def _replace_in_saved_docx(self, docx_path: str, mapping: Dict[str, str]):
-        """Open the saved .docx and replace placeholders in XML files as a last step"""
-        try:
-            from zipfile import ZipFile, ZIP_DEFLATED
-            import io
-            with ZipFile(docx_path, 'r') as zin:
-                buf = io.BytesIO()
-                with ZipFile(buf, 'w', ZIP_DEFLATED) as zout:
-                    for item in zin.infolist():
-                        data = zin.read(item.filename)
-                        if item.filename.startswith('word/') and item.filename.endswith('.xml'):
-                            try:
-                                text = data.decode('utf-8')
-                                for old, new in mapping.items():
-                                    if old in text:
-                                        text = text.replace(old, new)
-                                data = text.encode('utf-8')
-                            except Exception:
-                                pass
-                        zout.writestr(item, data)
-            # Overwrite original file
-            with open(docx_path, 'wb') as f:
-                f.write(buf.getvalue())
-        except Exception:
-            pass
-
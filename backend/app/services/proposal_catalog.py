@@ -0,0 +1,607 @@
+"""
+Persistent proposal catalog
+
+One row per service folder (version, LOT, folder) holding owner, sponsor,
+document presence, last update and status, so the proposals dashboards run an
+indexed query instead of listing storage and parsing every OWNER file.
+
+Rows are written through by folder/metadata creation, document generation and
+deletion in this process. A reconciliation pass rebuilds the catalog from storage
+on first use and then every PROPOSAL_CATALOG_RECONCILE_SECONDS, which picks up
+changes made elsewhere.
+
+PROPOSAL_CATALOG selects the database: "sqlite" (PROPOSAL_CATALOG_PATH, default
+backend/data/proposal_catalog.sqlite3), "postgres" (DATABASE_URL through
+DatabaseService) or "off". It defaults to "postgres" when DATABASE_URL is set and
+to "off" otherwise: Lambda containers share neither disk nor psycopg2, and local
+mode already reads folders from the in-memory mock SharePoint catalog.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.identity import canonical_name, canonical_names
+
+logger = logging.getLogger(__name__)
+
+# Bump when owner_key() changes so existing catalogs are re-keyed by a reconciliation
+OWNER_KEY_VERSION = 2
+
+STATUS_DRAFT = "draft"
+STATUS_INCOMPLETE = "incomplete"
+STATUS_COMPLETE = "complete"
+
+LOTS = ("2", "2a", "2b", "3")
+REMOTE_VERSIONS = ("14", "15")
+
+# Service folder (and optionally a file in it) anywhere in a local path, blob key or S3 key
+FOLDER_PATH_RE = re.compile(
+    r"GCloud (?P<version>[^/\\]+)[/\\]PA Services[/\\]Cloud Support Services LOT (?P<lot>[^/\\]+)"
+    r"[/\\](?P<folder>[^/\\]+)(?:[/\\](?P<file>[^/\\]+))?[/\\]?$"
+)
+
+COLUMNS = (
+    "gcloud_version", "lot", "folder_name", "service_name", "owner", "owner_key", "sponsor",
+    "last_edited_by", "has_metadata", "service_desc_key", "pricing_doc_key", "last_update",
+    "status", "catalogued_at",
+)
+KEY_COLUMNS = ("gcloud_version", "lot", "folder_name")
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS proposal_catalog (
+        gcloud_version TEXT NOT NULL,
+        lot TEXT NOT NULL,
+        folder_name TEXT NOT NULL,
+        service_name TEXT NOT NULL,
+        owner TEXT NOT NULL DEFAULT '',
+        owner_key TEXT NOT NULL DEFAULT '',
+        sponsor TEXT NOT NULL DEFAULT '',
+        last_edited_by TEXT,
+        has_metadata INTEGER NOT NULL DEFAULT 0,
+        service_desc_key TEXT,
+        pricing_doc_key TEXT,
+        last_update DOUBLE PRECISION,
+        status TEXT NOT NULL DEFAULT 'draft',
+        catalogued_at DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (gcloud_version, lot, folder_name)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS proposal_catalog_owner_key ON proposal_catalog (owner_key)",
+    """
+    CREATE TABLE IF NOT EXISTS proposal_catalog_state (
+        name TEXT PRIMARY KEY,
+        value DOUBLE PRECISION
+    )
+    """,
+)
+
+
+def owner_key(owner: str) -> str:
+    """Lookup key for an owner name or email (see app.utils.identity.canonical_name)"""
+    return canonical_name(owner)
+
+
+def proposal_status(service_desc_exists: bool, pricing_doc_exists: bool) -> str:
+    if service_desc_exists and pricing_doc_exists:
+        return STATUS_COMPLETE
+    if service_desc_exists or pricing_doc_exists:
+        return STATUS_INCOMPLETE
+    return STATUS_DRAFT
+
+
+def parse_folder_path(path) -> Optional[Tuple[str, str, str, Optional[str]]]:
+    """(version, lot, folder, file or None) for a service folder path/key, or None outside the taxonomy"""
+    match = FOLDER_PATH_RE.search(str(path))
+    if not match:
+        return None
+    return match["version"], match["lot"], match["folder"], match["file"]
+
+
+def _document_type(version: str, folder: str, filename: str) -> Optional[Tuple[str, bool]]:
+    """('SERVICE DESC' | 'Pricing Doc', is_draft) for a folder's Word document, else None"""
+    for doc_type in ("SERVICE DESC", "Pricing Doc"):
+        filename_base = f"PA GC{version} {doc_type} {folder}"
+        if filename == f"{filename_base}.docx":
+            return doc_type, False
+        if filename == f"{filename_base}_draft.docx":
+            return doc_type, True
+    return None
+
+
+def catalog_row(
+    gcloud_version: str,
+    lot: str,
+    folder_name: str,
+    metadata: Optional[Dict[str, str]] = None,
+    service_desc_key: Optional[str] = None,
+    pricing_doc_key: Optional[str] = None,
+    last_update: Optional[float] = None
+) -> Dict[str, Any]:
+    """Row for a service folder from its parsed metadata and document keys"""
+    metadata = metadata or {}
+    owner = (metadata.get('owner') or '').strip()
+    return {
+        "gcloud_version": gcloud_version,
+        "lot": lot,
+        "folder_name": folder_name,
+        "service_name": metadata.get('service_name') or metadata.get('service') or folder_name,
+        "owner": owner,
+        "owner_key": owner_key(owner),
+        "sponsor": metadata.get('sponsor') or '',
+        "last_edited_by": metadata.get('last_edited_by'),
+        "has_metadata": 1 if metadata else 0,
+        "service_desc_key": service_desc_key,
+        "pricing_doc_key": pricing_doc_key,
+        "last_update": last_update,
+        "status": proposal_status(bool(service_desc_key), bool(pricing_doc_key)),
+    }
+
+
+def proposal_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Proposal summary in the shape returned by the dashboard endpoints"""
+    service_name = row["service_name"]
+    gcloud_version = row["gcloud_version"]
+    lot = row["lot"]
+    status = row["status"]
+    last_update_str = datetime.fromtimestamp(row["last_update"]).isoformat() if row["last_update"] else None
+    return {
+        "id": f"{service_name}_{gcloud_version}_{lot}".replace(" ", "_").lower(),
+        "title": service_name,
+        "framework_version": f"G-Cloud {gcloud_version}",
+        "gcloud_version": gcloud_version,
+        "lot": lot,
+        "status": status,
+        "completion_percentage": {STATUS_COMPLETE: 100.0, STATUS_INCOMPLETE: 50.0}.get(status, 0.0),
+        "section_count": 2,  # SERVICE DESC and Pricing Doc
+        "valid_sections": 2 if status == STATUS_COMPLETE else 1 if status == STATUS_INCOMPLETE else 0,
+        "created_at": last_update_str or datetime.now().isoformat(),
+        "updated_at": last_update_str or datetime.now().isoformat(),
+        "last_update": last_update_str,
+        "service_desc_exists": bool(row["service_desc_key"]),
+        "pricing_doc_exists": bool(row["pricing_doc_key"]),
+        "owner": row["owner"],
+        "sponsor": row["sponsor"],
+    }
+
+
+class ProposalCatalog:
+    """
+    Proposal rows in SQLite or Postgres
+
+    Args:
+        connect: Returns a new DB-API connection (closed after each operation)
+        scan: Yields a catalog_row() for every service folder in storage
+        paramstyle: "qmark" (sqlite3) or "format" (psycopg2)
+        reconcile_seconds: Rebuild interval (PROPOSAL_CATALOG_RECONCILE_SECONDS, default 900)
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        scan: Callable[[], Iterable[Dict[str, Any]]],
+        paramstyle: str = "qmark",
+        reconcile_seconds: Optional[float] = None
+    ):
+        self._connect = connect
+        self._scan = scan
+        self.paramstyle = paramstyle
+        self.reconcile_seconds = reconcile_seconds if reconcile_seconds is not None \
+            else float(os.environ.get("PROPOSAL_CATALOG_RECONCILE_SECONDS", "900"))
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _run(self, fn: Callable[[Any], Any]) -> Any:
+        conn = self._connect()
+        try:
+            cur = conn.cursor()
+            try:
+                creating_schema = not self._schema_ready
+                if creating_schema:
+                    for statement in SCHEMA:
+                        cur.execute(statement)
+                result = fn(cur)
+            finally:
+                cur.close()
+            conn.commit()
+            if creating_schema:
+                self._schema_ready = True
+            return result
+        finally:
+            conn.close()
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("?", "%s") if self.paramstyle == "format" else sql
+
+    @staticmethod
+    def _rows(cur) -> List[Dict[str, Any]]:
+        columns = [desc[0] for desc in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def _upsert_sql(self, only_older: bool = False) -> str:
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS if column not in KEY_COLUMNS)
+        sql = (
+            f"INSERT INTO proposal_catalog ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+            f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}"
+        )
+        if only_older:
+            # Reconciliation must not overwrite rows written through while it was scanning
+            sql += " WHERE proposal_catalog.catalogued_at < excluded.catalogued_at"
+        return self._sql(sql)
+
+    def _get(self, cur, version: str, lot: str, folder: str) -> Optional[Dict[str, Any]]:
+        cur.execute(
+            self._sql("SELECT * FROM proposal_catalog WHERE gcloud_version = ? AND lot = ? AND folder_name = ?"),
+            (version, lot, folder)
+        )
+        rows = self._rows(cur)
+        return rows[0] if rows else None
+
+    def _update(self, version: str, lot: str, folder: str, change: Callable[[Dict[str, Any]], None]):
+        """Read-modify-write one row (created empty if missing)"""
+        def apply(cur):
+            row = self._get(cur, version, lot, folder) or catalog_row(version, lot, folder)
+            change(row)
+            row["status"] = proposal_status(bool(row["service_desc_key"]), bool(row["pricing_doc_key"]))
+            row["catalogued_at"] = time.time()
+            cur.execute(self._upsert_sql(), tuple(row[column] for column in COLUMNS))
+
+        with self._lock:
+            self._run(apply)
+
+    def record_folder(self, path, metadata: Optional[Dict[str, str]] = None):
+        """
+        Register a created service folder, or its metadata file
+
+        Args:
+            path: Folder path, blob prefix or S3 prefix
+            metadata: Parsed OWNER metadata, when the metadata file was written
+        """
+        parsed = parse_folder_path(path)
+        if parsed is None:
+            return
+        version, lot, folder, _ = parsed
+
+        def change(row):
+            if metadata:
+                fresh = catalog_row(version, lot, folder, metadata)
+                for column in ("service_name", "owner", "owner_key", "sponsor", "last_edited_by", "has_metadata"):
+                    row[column] = fresh[column]
+
+        self._update(version, lot, folder, change)
+
+    def record_document(self, key: str, mtime: Optional[float] = None):
+        """Register a SERVICE DESC / Pricing Doc Word document written to its service folder"""
+        parsed = parse_folder_path(key)
+        if parsed is None or parsed[3] is None:
+            return
+        version, lot, folder, filename = parsed
+        document = _document_type(version, folder, filename)
+        if document is None:
+            return
+        doc_type, is_draft = document
+        column = "service_desc_key" if doc_type == "SERVICE DESC" else "pricing_doc_key"
+
+        def change(row):
+            current = row[column]
+            # A completed document wins over its draft
+            if not (is_draft and current and not current.endswith('_draft.docx')):
+                row[column] = key
+            row["last_update"] = mtime or time.time()
+
+        self._update(version, lot, folder, change)
+
+    def forget_document(self, key: str):
+        """Drop a deleted document (reconciliation restores a remaining draft)"""
+        parsed = parse_folder_path(key)
+        if parsed is None or parsed[3] is None:
+            return
+        version, lot, folder, _ = parsed
+
+        def change(row):
+            for column in ("service_desc_key", "pricing_doc_key"):
+                if row[column] == key:
+                    row[column] = None
+
+        self._update(version, lot, folder, change)
+
+    def remove_folder(self, path):
+        """Drop a deleted service folder"""
+        parsed = parse_folder_path(path)
+        if parsed is None:
+            return
+        with self._lock:
+            self._run(lambda cur: cur.execute(
+                self._sql("DELETE FROM proposal_catalog WHERE gcloud_version = ? AND lot = ? AND folder_name = ?"),
+                parsed[:3]
+            ))
+
+    def _state(self) -> Dict[str, float]:
+        def read(cur):
+            cur.execute("SELECT name, value FROM proposal_catalog_state")
+            return dict(cur.fetchall())
+        return self._run(read)
+
+    def reconciled_at(self) -> Optional[float]:
+        return self._state().get("reconciled_at")
+
+    def reconcile(self) -> int:
+        """
+        Rebuild the catalog from storage
+
+        Scanned rows replace catalogued ones unless those were written through after
+        the scan started; rows for folders no longer in storage are deleted.
+
+        Returns:
+            Number of service folders scanned
+        """
+        with self._reconcile_lock:
+            started = time.time()
+            rows = list(self._scan())
+            for row in rows:
+                row["catalogued_at"] = started
+
+            def apply(cur):
+                sql = self._upsert_sql(only_older=True)
+                for row in rows:
+                    cur.execute(sql, tuple(row[column] for column in COLUMNS))
+                cur.execute(self._sql("DELETE FROM proposal_catalog WHERE catalogued_at < ?"), (started,))
+                cur.execute("DELETE FROM proposal_catalog_state")
+                cur.execute(
+                    self._sql("INSERT INTO proposal_catalog_state (name, value) VALUES (?, ?), (?, ?)"),
+                    ("reconciled_at", started, "owner_key_version", OWNER_KEY_VERSION)
+                )
+
+            with self._lock:
+                self._run(apply)
+            logger.info(f"Proposal catalog reconciled: {len(rows)} service folders in {time.time() - started:.2f}s")
+            return len(rows)
+
+    def ensure_reconciled(self):
+        """Build the catalog from storage if it has never been reconciled (or was keyed differently)"""
+        state = self._state()
+        if state.get("reconciled_at") is None or state.get("owner_key_version") != OWNER_KEY_VERSION:
+            self.reconcile()
+
+    def reconcile_if_due(self) -> bool:
+        reconciled_at = self.reconciled_at()
+        if reconciled_at is not None and time.time() - reconciled_at < self.reconcile_seconds:
+            return False
+        self.reconcile()
+        return True
+
+    def proposals(self, owner: Optional[str] = None, aliases: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Proposals with metadata in LOTs 2, 2a, 2b and 3, most recently updated first
+
+        Args:
+            owner: Only this owner's proposals, looked up by canonical name on the owner_key index
+            aliases: Other identities of the same owner (e.g. their email address)
+        """
+        self.ensure_reconciled()
+        sql = f"SELECT * FROM proposal_catalog WHERE has_metadata = 1 AND lot IN ({', '.join('?' for _ in LOTS)})"
+        params: List[Any] = list(LOTS)
+        if owner is not None:
+            keys = sorted(canonical_names([owner, *aliases]))
+            if not keys:
+                return []
+            sql += f" AND owner_key IN ({', '.join('?' for _ in keys)})"
+            params.extend(keys)
+
+        def query(cur):
+            cur.execute(self._sql(sql), tuple(params))
+            return self._rows(cur)
+
+        proposals = [proposal_from_row(row) for row in self._run(query)]
+        proposals.sort(key=lambda x: x.get("last_update") or "", reverse=True)
+        return proposals
+
+    def stats(self) -> Dict[str, Any]:
+        def count(cur):
+            cur.execute("SELECT COUNT(*) FROM proposal_catalog")
+            return cur.fetchone()[0]
+        return {"folders": self._run(count), "reconciled_at": self.reconciled_at()}
+
+
+def _scan_local(mock_base: Path) -> Iterable[Dict[str, Any]]:
+    from sharepoint_service.mock_sharepoint import get_mock_catalog
+    for folder in get_mock_catalog(mock_base).folders():
+        service_desc = folder.document("SERVICE DESC")
+        pricing_doc = folder.document("Pricing Doc")
+        mtimes = [folder.files[path.name] for path in (service_desc, pricing_doc) if path is not None]
+        yield catalog_row(
+            folder.gcloud_version, folder.lot, folder.name, folder.metadata,
+            str(service_desc) if service_desc else None,
+            str(pricing_doc) if pricing_doc else None,
+            max(mtimes) if mtimes else None
+        )
+
+
+def _scan_s3() -> Iterable[Dict[str, Any]]:
+    from sharepoint_service.s3_sharepoint import scan_lot
+    for version in REMOTE_VERSIONS:
+        for lot in LOTS:
+            for folder in scan_lot(version, lot, refresh=True).values():
+                service_desc = folder.document("SERVICE DESC")
+                pricing_doc = folder.document("Pricing Doc")
+                mtimes = [entry.mtime for entry in (service_desc, pricing_doc) if entry is not None and entry.mtime]
+                yield catalog_row(
+                    version, lot, folder.folder_name, folder.metadata,
+                    service_desc.name if service_desc else None,
+                    pricing_doc.name if pricing_doc else None,
+                    max(mtimes) if mtimes else None
+                )
+
+
+def parse_blob_metadata(blob_name: str, content: str) -> Dict[str, str]:
+    """Metadata from a metadata.json blob or a legacy 'N. KEY: value' OWNER .txt blob"""
+    if blob_name.endswith('metadata.json'):
+        return json.loads(content)
+    metadata = {}
+    for line in content.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip().lstrip('0123456789. ').strip()
+            if key:
+                metadata[key.lower().replace(' ', '_')] = value.strip()
+    return metadata
+
+
+def _scan_azure() -> Iterable[Dict[str, Any]]:
+    from app.services.azure_blob_service import get_azure_blob_service
+    from app.services.blob_index import get_blob_index
+    azure_blob_service = get_azure_blob_service()
+    index = get_blob_index()
+    index.refresh()
+    for version in REMOTE_VERSIONS:
+        for lot in LOTS:
+            for folder_name, files in index.folders(version, lot).items():
+                metadata = None
+                metadata_file = next((name for name in files if name.endswith('metadata.json')), None) \
+                    or next((name for name in files if name.endswith('.txt') and 'OWNER' in name), None)
+                if metadata_file:
+                    try:
+                        content = azure_blob_service.get_file_bytes(files[metadata_file].name).decode('utf-8')
+                        metadata = parse_blob_metadata(metadata_file, content)
+                    except Exception as e:
+                        logger.warning(f"Error reading metadata blob {files[metadata_file].name}: {e}")
+                documents = {}
+                for doc_type in ("SERVICE DESC", "Pricing Doc"):
+                    filename = f"PA GC{version} {doc_type} {folder_name}.docx"
+                    documents[doc_type] = files.get(filename) or files.get(filename.replace('.docx', '_draft.docx'))
+                mtimes = [entry.mtime for entry in documents.values() if entry is not None and entry.mtime]
+                yield catalog_row(
+                    version, lot, folder_name, metadata,
+                    documents["SERVICE DESC"].name if documents["SERVICE DESC"] else None,
+                    documents["Pricing Doc"].name if documents["Pricing Doc"] else None,
+                    max(mtimes) if mtimes else None
+                )
+
+
+_catalog: Optional[ProposalCatalog] = None
+_catalog_key: Optional[Tuple] = None
+_catalog_lock = threading.Lock()
+
+
+def get_proposal_catalog() -> Optional[ProposalCatalog]:
+    """
+    Process-wide catalog for the configured database and storage mode
+
+    Returns:
+        ProposalCatalog, or None when PROPOSAL_CATALOG is "off"
+    """
+    global _catalog, _catalog_key
+    use_s3 = os.environ.get("USE_S3", "false").lower() == "true"
+    backend = os.environ.get("PROPOSAL_CATALOG", "postgres" if os.environ.get("DATABASE_URL") else "off").lower()
+    if backend not in ("sqlite", "postgres"):
+        return None
+
+    if use_s3:
+        storage = ('s3', os.environ.get('SHAREPOINT_BUCKET_NAME', ''))
+        scan = _scan_s3
+    elif os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""):
+        storage = ('azure',)
+        scan = _scan_azure
+    else:
+        from sharepoint_service.mock_sharepoint import MOCK_BASE_PATH
+        storage = ('local', str(MOCK_BASE_PATH))
+        scan = lambda: _scan_local(MOCK_BASE_PATH)
+
+    if backend == "postgres":
+        location = os.environ.get("DATABASE_URL", "")
+    else:
+        location = os.environ.get("PROPOSAL_CATALOG_PATH") \
+            or str(Path(__file__).resolve().parents[2] / "data" / "proposal_catalog.sqlite3")
+    key = (backend, location) + storage
+
+    with _catalog_lock:
+        if _catalog is None or _catalog_key != key:
+            if backend == "postgres":
+                from app.services.database import get_db_service
+                db_service = get_db_service()
+                if db_service is None:
+                    logger.warning("Proposal catalog needs psycopg2 for Postgres; catalog disabled")
+                    return None
+                _catalog = ProposalCatalog(db_service.get_connection, scan, paramstyle="format")
+            else:
+                Path(location).parent.mkdir(parents=True, exist_ok=True)
+                _catalog = ProposalCatalog(lambda: sqlite3.connect(location, timeout=30), scan)
+            _catalog_key = key
+            if storage[0] == 'azure':
+                _register_azure_listener()
+        return _catalog
+
+
+def _register_azure_listener():
+    from app.services.azure_blob_service import get_azure_blob_service
+
+    def on_write(blob_name: str, size: Optional[int] = None):
+        if blob_name.endswith('.docx'):
+            record_document(blob_name)
+
+    get_azure_blob_service().add_write_listener(on_write)
+
+
+def _write_through(path, action: str, fn: Callable[[ProposalCatalog], None]):
+    if parse_folder_path(path) is None:
+        return
+    try:
+        catalog = get_proposal_catalog()
+        if catalog is not None:
+            fn(catalog)
+    except Exception as e:
+        logger.warning(f"Failed to {action} in proposal catalog: {e}")
+
+
+def record_folder(path, metadata: Optional[Dict[str, str]] = None):
+    """Write-through for a created folder or metadata file (best effort)"""
+    _write_through(path, f"record folder {path}", lambda catalog: catalog.record_folder(path, metadata))
+
+
+def record_document(key: str, mtime: Optional[float] = None):
+    """Write-through for a generated Word document (best effort)"""
+    _write_through(key, f"record document {key}", lambda catalog: catalog.record_document(key, mtime))
+
+
+def forget_document(key: str):
+    """Write-through for a deleted document (best effort)"""
+    _write_through(key, f"forget document {key}", lambda catalog: catalog.forget_document(key))
+
+
+def remove_folder(path):
+    """Write-through for a deleted service folder (best effort)"""
+    _write_through(path, f"remove folder {path}", lambda catalog: catalog.remove_folder(path))
+
+
+def start_reconciler() -> Optional[threading.Thread]:
+    """
+    Reconcile the catalog in a daemon thread now and whenever it is older than
+    PROPOSAL_CATALOG_RECONCILE_SECONDS
+
+    Returns:
+        The thread, or None when the catalog is off
+    """
+    catalog = get_proposal_catalog()
+    if catalog is None:
+        return None
+
+    def loop():
+        while True:
+            try:
+                catalog.reconcile_if_due()
+            except Exception as e:
+                logger.warning(f"Proposal catalog reconciliation failed: {e}")
+            time.sleep(max(catalog.reconcile_seconds / 10, 5))
+
+    thread = threading.Thread(target=loop, name="proposal-catalog-reconciler", daemon=True)
+    thread.start()
+    return thread
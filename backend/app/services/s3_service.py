@@ -47,6 +47,44 @@ class S3Service:
         except ClientError as e:
             raise FileNotFoundError(f"Failed to download template from S3: {e}")
     
+    def get_template_etag(self, template_key: str) -> str:
+        """
+        Get the ETag of a template (used to revalidate cached copies)
+        
+        Args:
+            template_key: S3 key for the template
+            
+        Returns:
+            Template ETag
+        """
+        if not self.template_bucket:
+            raise ValueError("Template bucket not configured")
+        
+        try:
+            response = self.s3_client.head_object(Bucket=self.template_bucket, Key=template_key)
+            return response['ETag']
+        except ClientError as e:
+            raise FileNotFoundError(f"Failed to read template metadata from S3: {e}")
+    
+    def get_template_bytes(self, template_key: str) -> bytes:
+        """
+        Read template content from S3 without writing it to disk
+        
+        Args:
+            template_key: S3 key for the template
+            
+        Returns:
+            Template content as bytes
+        """
+        if not self.template_bucket:
+            raise ValueError("Template bucket not configured")
+        
+        try:
+            response = self.s3_client.get_object(Bucket=self.template_bucket, Key=template_key)
+            return response['Body'].read()
+        except ClientError as e:
+            raise FileNotFoundError(f"Failed to download template from S3: {e}")
+    
     def upload_document(self, local_path: Path, s3_key: str, bucket: Optional[str] = None) -> str:
         """
         Upload generated document to S3
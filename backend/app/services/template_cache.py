@@ -0,0 +1,207 @@
+"""
+Process-wide cache of parsed .docx templates
+Loads and parses each template once and hands out deep copies per request
+"""
+
+import copy
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from docx import Document
+
+logger = logging.getLogger(__name__)
+
+# Remote sources (S3/Azure) are revalidated with a HEAD request at most this often
+REMOTE_REVALIDATE_SECONDS = float(os.environ.get("TEMPLATE_CACHE_REVALIDATE_SECONDS", "30"))
+
+
+@dataclass
+class _CachedTemplate:
+    """A parsed template plus the validator it was loaded with"""
+    document: Document
+    validator: Tuple
+    checked_at: float
+
+
+class _Source(NamedTuple):
+    """Where a template comes from and how to check and load it"""
+    key: str
+    current_validator: Callable[[], Tuple]
+    load: Callable[[], bytes]
+    remote: bool
+
+
+class TemplateCache:
+    """
+    Caches parsed python-docx templates keyed by source.
+
+    Local files are revalidated on every request with a stat (mtime + size).
+    S3 objects and Azure blobs are revalidated by ETag, at most once every
+    REMOTE_REVALIDATE_SECONDS. Callers always receive a deep copy of the cached
+    document so they can mutate it freely.
+
+    The version_* methods return the validator of the cached template as a string
+    (e.g. for content-hash keys) under the same revalidation rules, so callers
+    never issue their own HEAD requests.
+
+    Validator requests and loads run under a per-template lock, so only callers
+    of the template being revalidated wait on the network; the shared lock only
+    guards the entry table.
+    """
+
+    def __init__(self, remote_revalidate_seconds: float = REMOTE_REVALIDATE_SECONDS):
+        self.remote_revalidate_seconds = remote_revalidate_seconds
+        self._entries: Dict[str, _CachedTemplate] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _local_source(template_path: Path) -> _Source:
+        template_path = Path(template_path)
+        stat = template_path.stat()
+        validator = (stat.st_mtime_ns, stat.st_size)
+        return _Source(
+            key=f"file:{template_path.resolve()}",
+            current_validator=lambda: validator,
+            load=lambda: template_path.read_bytes(),
+            remote=False,
+        )
+
+    @staticmethod
+    def _s3_source(s3_service, template_key: str) -> _Source:
+        return _Source(
+            key=f"s3:{s3_service.template_bucket}/{template_key}",
+            current_validator=lambda: (s3_service.get_template_etag(template_key),),
+            load=lambda: s3_service.get_template_bytes(template_key),
+            remote=True,
+        )
+
+    @staticmethod
+    def _azure_source(azure_blob_service, blob_name: str) -> _Source:
+        return _Source(
+            key=f"azure:{azure_blob_service.container_name}/{blob_name}",
+            current_validator=lambda: (azure_blob_service.get_blob_etag(blob_name),),
+            load=lambda: azure_blob_service.get_file_bytes(blob_name),
+            remote=True,
+        )
+
+    def get_local(self, template_path: Path) -> Document:
+        """
+        Get a working copy of a template stored on the local filesystem
+
+        Args:
+            template_path: Path to the .docx template
+
+        Returns:
+            Deep copy of the parsed template
+        """
+        return self._get(self._local_source(template_path))
+
+    def get_s3(self, s3_service, template_key: str) -> Document:
+        """
+        Get a working copy of a template stored in the S3 template bucket
+
+        Args:
+            s3_service: S3Service instance
+            template_key: S3 key of the template
+
+        Returns:
+            Deep copy of the parsed template
+        """
+        return self._get(self._s3_source(s3_service, template_key))
+
+    def get_azure(self, azure_blob_service, blob_name: str) -> Document:
+        """
+        Get a working copy of a template stored in Azure Blob Storage
+
+        Args:
+            azure_blob_service: AzureBlobService instance
+            blob_name: Blob name (key) of the template
+
+        Returns:
+            Deep copy of the parsed template
+        """
+        return self._get(self._azure_source(azure_blob_service, blob_name))
+
+    def version_local(self, template_path: Path) -> str:
+        """Revision of a local template (file:{mtime_ns}:{size})"""
+        return self._version(self._local_source(template_path))
+
+    def version_s3(self, s3_service, template_key: str) -> str:
+        """Revision of an S3 template (s3:{etag})"""
+        return self._version(self._s3_source(s3_service, template_key))
+
+    def version_azure(self, azure_blob_service, blob_name: str) -> str:
+        """Revision of an Azure template (azure:{etag})"""
+        return self._version(self._azure_source(azure_blob_service, blob_name))
+
+    def clear(self):
+        """Drop all cached templates"""
+        with self._lock:
+            self._entries.clear()
+
+    def _fresh_entry(self, source: _Source) -> Tuple[Optional[_CachedTemplate], bool]:
+        """Current entry for source, and whether it can be served without revalidating"""
+        with self._lock:
+            entry = self._entries.get(source.key)
+            fresh = (
+                entry is not None
+                and source.remote
+                and time.monotonic() - entry.checked_at < self.remote_revalidate_seconds
+            )
+            return entry, fresh
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _entry(self, source: _Source) -> Tuple[_CachedTemplate, bool]:
+        """Revalidated cache entry for source, and whether it was served without loading"""
+        entry, fresh = self._fresh_entry(source)
+        if fresh:
+            return entry, True
+        with self._key_lock(source.key):
+            # Another caller may have revalidated or loaded it while we waited
+            entry, fresh = self._fresh_entry(source)
+            if fresh:
+                return entry, True
+            validator = source.current_validator()
+            if entry is not None and entry.validator == validator:
+                with self._lock:
+                    entry.checked_at = time.monotonic()
+                return entry, True
+            logger.info(f"Loading template into cache: {source.key}")
+            entry = _CachedTemplate(
+                document=Document(BytesIO(source.load())),
+                validator=validator,
+                checked_at=time.monotonic(),
+            )
+            with self._lock:
+                self._entries[source.key] = entry
+                self.misses += 1
+            return entry, False
+
+    def _get(self, source: _Source) -> Document:
+        entry, cached = self._entry(source)
+        if cached:
+            with self._lock:
+                self.hits += 1
+        # The prototype is never mutated, so copying outside the lock is safe
+        return copy.deepcopy(entry.document)
+
+    def _version(self, source: _Source) -> str:
+        entry, _ = self._entry(source)
+        kind = source.key.split(':', 1)[0]
+        return ':'.join([kind, *(str(part) for part in entry.validator)])
+
+
+# Global instance shared by all document generators in the process
+template_cache = TemplateCache()
@@ -0,0 +1,166 @@
+"""
+Index over the top-level elements of a python-docx document body
+
+`doc.paragraphs` rebuilds a proxy for every paragraph on each access and
+`paragraph.style.name` does a styles lookup per paragraph, so repeated heading
+scans are quadratic on long documents. BodyIndex resolves style ids to names
+once, keeps the body's headings in document order (with their text), and is
+updated as elements are inserted or removed so callers can walk sections with
+plain lxml sibling navigation.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from docx.oxml.ns import qn
+from docx.styles import BabelFish
+from docx.text.paragraph import Paragraph
+
+W_P = qn('w:p')
+W_PPR = qn('w:pPr')
+W_PSTYLE = qn('w:pStyle')
+W_VAL = qn('w:val')
+
+
+class BodyIndex:
+    """Heading/style index for the body of one document (built once per generation)"""
+
+    def __init__(self, doc):
+        """
+        Args:
+            doc: python-docx Document
+        """
+        self.doc = doc
+        self.body = doc._element.body
+        self.style_names: Dict[str, str] = {}
+        self.default_style_name: Optional[str] = None
+        for style in doc.styles.element.iterchildren(qn('w:style')):
+            style_id = style.get(qn('w:styleId'))
+            name_el = style.find(qn('w:name'))
+            name = BabelFish.internal2ui(name_el.get(W_VAL)) if name_el is not None else style_id
+            self.style_names[style_id] = name
+            if style.get(qn('w:type')) == 'paragraph' and style.get(qn('w:default')) in ('1', 'true', 'on'):
+                self.default_style_name = name
+
+        # Headings in document order plus their text, keyed by element
+        self.headings: List = []
+        self.heading_text: Dict[object, str] = {}
+        for el in self.body.iterchildren(W_P):
+            if self.is_heading(el):
+                self.headings.append(el)
+                self.heading_text[el] = Paragraph(el, None).text
+
+    @classmethod
+    def for_document(cls, doc) -> 'BodyIndex':
+        """Get the index attached to a document, building it on first use"""
+        index = getattr(doc.part, '_body_index', None)
+        if index is None:
+            index = cls(doc)
+            doc.part._body_index = index
+        return index
+
+    @staticmethod
+    def of_part(part) -> Optional['BodyIndex']:
+        """Get the index attached to a document part, if one has been built"""
+        return getattr(part, '_body_index', None)
+
+    def style_name(self, el) -> Optional[str]:
+        """Resolved paragraph style name for a w:p element (None for non-paragraphs)"""
+        if el.tag != W_P:
+            return None
+        ppr = el.find(W_PPR)
+        pstyle = ppr.find(W_PSTYLE) if ppr is not None else None
+        if pstyle is None:
+            return self.default_style_name
+        return self.style_names.get(pstyle.get(W_VAL), self.default_style_name)
+
+    def is_heading(self, el) -> bool:
+        name = self.style_name(el)
+        return bool(name and name.startswith('Heading'))
+
+    def paragraph(self, el) -> Paragraph:
+        """Paragraph proxy for a top-level w:p element"""
+        return Paragraph(el, self.doc._body)
+
+    def find_heading(self, match: Callable[[str], bool], style_name: Optional[str] = None):
+        """
+        First heading (in document order) whose text satisfies `match`
+
+        Args:
+            match: Predicate over the heading text
+            style_name: Optionally restrict to one heading style (e.g. 'Heading 1')
+
+        Returns:
+            The heading w:p element, or None
+        """
+        for el in self.headings:
+            if el.getparent() is not self.body:
+                continue
+            if style_name and self.style_name(el) != style_name:
+                continue
+            if match(self.heading_text.get(el, '')):
+                return el
+        return None
+
+    def section_elements(self, heading_el) -> List:
+        """Top-level elements after a heading up to (not including) the next heading"""
+        result = []
+        el = heading_el.getnext()
+        while el is not None and not self.is_heading(el):
+            result.append(el)
+            el = el.getnext()
+        return result
+
+    def next_paragraph(self, el):
+        """Next top-level w:p sibling after an element, or None"""
+        el = el.getnext()
+        while el is not None and el.tag != W_P:
+            el = el.getnext()
+        return el
+
+    def last_paragraph(self) -> Optional[Paragraph]:
+        """Last top-level paragraph of the body, or None"""
+        for el in reversed(self.body):
+            if el.tag == W_P:
+                return self.paragraph(el)
+        return None
+
+    def register(self, el):
+        """
+        Record an element that was inserted into (or whose heading text changed in) the body
+
+        Args:
+            el: Top-level element now attached to the body
+        """
+        if el.getparent() is not self.body or el.tag != W_P:
+            return
+        if not self.is_heading(el):
+            if el in self.heading_text:
+                self._forget(el)
+            return
+        if el not in self.heading_text:
+            # Slot the heading after the nearest preceding heading
+            prev = el.getprevious()
+            while prev is not None and not (prev.tag == W_P and prev in self.heading_text):
+                prev = prev.getprevious()
+            pos = self.headings.index(prev) + 1 if prev is not None else 0
+            self.headings.insert(pos, el)
+        self.heading_text[el] = Paragraph(el, None).text
+
+    def append(self, el):
+        """Append an element to the end of the body and index it"""
+        self.body.append(el)
+        self.register(el)
+
+    def remove(self, el):
+        """Detach a top-level element from the body and drop it from the index"""
+        if el.getparent() is self.body:
+            self.body.remove(el)
+        if el in self.heading_text:
+            self._forget(el)
+
+    def _forget(self, el):
+        del self.heading_text[el]
+        try:
+            self.headings.remove(el)
+        except ValueError:
+            pass
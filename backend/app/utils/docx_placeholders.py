@@ -0,0 +1,162 @@
+"""
+Single-pass placeholder substitution for python-docx documents
+
+The mapping is compiled into one regex alternation and applied once to every
+WordprocessingML/DrawingML text node in the in-memory package (body, headers,
+footers, shapes and text boxes). Placeholders split across several runs of
+the same paragraph are matched on the paragraph's joined text and rewritten
+in place, so the saved archive never needs a second pass.
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+_TEXT_TAGS = (W_NS + 't', A_NS + 't')
+_PARAGRAPH_TAGS = (W_NS + 'p', A_NS + 'p')
+
+
+@lru_cache(maxsize=32)
+def _compile(keys: Tuple[str, ...]) -> re.Pattern:
+    # Longest first so overlapping placeholders prefer the most specific match
+    ordered = sorted(keys, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(k) for k in ordered))
+
+
+class PlaceholderReplacer:
+    """Compiled placeholder -> value substitution for a .docx package"""
+
+    def __init__(self, mapping: Dict[str, str]):
+        """
+        Args:
+            mapping: Placeholder text to replacement text
+        """
+        self.mapping = {k: v for k, v in mapping.items() if k}
+        self.pattern = _compile(tuple(sorted(self.mapping))) if self.mapping else None
+
+    def replace_in_document(self, doc) -> int:
+        """
+        Replace placeholders in every XML part of the document under word/
+
+        Args:
+            doc: python-docx Document
+
+        Returns:
+            Number of placeholders replaced
+        """
+        if self.pattern is None:
+            return 0
+        count = 0
+        for part in doc.part.package.iter_parts():
+            partname = str(part.partname)
+            if not (partname.startswith('/word/') and partname.endswith('.xml')):
+                continue
+            element = getattr(part, '_element', None)
+            if element is not None:
+                count += self.replace_in_element(element)
+            elif isinstance(getattr(part, '_blob', None), (bytes, bytearray)):
+                # Parts python-docx doesn't model (footnotes, endnotes, ...) stay as raw XML
+                count += self._replace_in_blob(part)
+        return count
+
+    def replace_in_element(self, root) -> int:
+        """
+        Replace placeholders in all text nodes below an lxml element
+
+        Args:
+            root: lxml element (e.g. a part's root element)
+
+        Returns:
+            Number of placeholders replaced
+        """
+        groups: Dict[object, List] = {}
+        for t in root.iter(*_TEXT_TAGS):
+            p = t.getparent()
+            while p is not None and p.tag not in _PARAGRAPH_TAGS:
+                p = p.getparent()
+            groups.setdefault(p, []).append(t)
+
+        count = 0
+        for nodes in groups.values():
+            count += self._replace_in_nodes(nodes)
+        return count
+
+    def _replace_in_nodes(self, nodes: List) -> int:
+        texts = [t.text or '' for t in nodes]
+        joined = ''.join(texts)
+        matches = list(self.pattern.finditer(joined))
+        if not matches:
+            return 0
+
+        if len(nodes) == 1:
+            self._set_text(nodes[0], self.pattern.sub(lambda m: self.mapping[m.group(0)], joined))
+            return len(matches)
+
+        # Map each character offset of the joined text back to its owning node;
+        # a match spanning several runs is written into the run where it starts
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text)
+        ends = starts[1:] + [offset]
+        pieces: List[List[str]] = [[] for _ in nodes]
+
+        def owner(pos: int) -> int:
+            return bisect_right(starts, pos) - 1
+
+        def copy_span(a: int, b: int):
+            while a < b:
+                i = owner(a)
+                end = min(b, ends[i])
+                pieces[i].append(joined[a:end])
+                a = end
+
+        pos = 0
+        for m in matches:
+            copy_span(pos, m.start())
+            pieces[owner(m.start())].append(self.mapping[m.group(0)])
+            pos = m.end()
+        copy_span(pos, len(joined))
+
+        for t, old, new in zip(nodes, texts, pieces):
+            new_text = ''.join(new)
+            if new_text != old:
+                self._set_text(t, new_text)
+        return len(matches)
+
+    @staticmethod
+    def _set_text(t, text: str):
+        t.text = text
+        if t.tag == _TEXT_TAGS[0] and text != text.strip():
+            t.set(XML_SPACE, 'preserve')
+
+    def _replace_in_blob(self, part) -> int:
+        try:
+            xml = part._blob.decode('utf-8')
+        except UnicodeDecodeError:
+            return 0
+        xml, count = self.pattern.subn(lambda m: escape(self.mapping[m.group(0)]), xml)
+        if count:
+            part._blob = xml.encode('utf-8')
+        return count
+
+
+def replace_placeholders(doc, mapping: Dict[str, str]) -> int:
+    """
+    Replace placeholders throughout a document in a single pass
+
+    Args:
+        doc: python-docx Document
+        mapping: Placeholder text to replacement text
+
+    Returns:
+        Number of placeholders replaced
+    """
+    return PlaceholderReplacer(mapping).replace_in_document(doc)
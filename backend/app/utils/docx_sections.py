@@ -0,0 +1,128 @@
+"""
+Named, regenerable sections inside generated documents
+
+Each generated section is delimited by a hidden bookmark whose start sits in the
+section's first paragraph and whose end sits in its last one, so the section can
+be located and rewritten in place later. A JSON manifest describing the content
+each section was built from travels inside the .docx as a package part.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+# Hidden bookmarks (leading underscore) are not listed in Word's bookmark dialog
+SECTION_BOOKMARK_PREFIX = '_GcSection_'
+
+MANIFEST_PARTNAME = '/gcloud/generation-manifest.json'
+MANIFEST_CONTENT_TYPE = 'application/json'
+MANIFEST_RELTYPE = 'http://schemas.paconsulting.com/gcloud/relationships/generation-manifest'
+
+W_BOOKMARK_START = qn('w:bookmarkStart')
+W_BOOKMARK_END = qn('w:bookmarkEnd')
+W_ID = qn('w:id')
+W_NAME = qn('w:name')
+W_PPR = qn('w:pPr')
+
+
+def next_bookmark_id(doc) -> int:
+    ids = [int(el.get(W_ID)) for el in doc._element.iter(W_BOOKMARK_START) if (el.get(W_ID) or '').isdigit()]
+    return max(ids, default=0) + 1
+
+
+def _body_child(body, el):
+    while el is not None and el.getparent() is not body:
+        el = el.getparent()
+    return el
+
+
+def mark_section(doc, name: str, first_el, last_el):
+    """
+    Bookmark the body elements first_el..last_el (inclusive) as a named section
+
+    Args:
+        doc: python-docx Document
+        name: Section name
+        first_el, last_el: w:p elements that are direct children of the body
+    """
+    bookmark_id = str(next_bookmark_id(doc))
+    start = OxmlElement('w:bookmarkStart')
+    start.set(W_ID, bookmark_id)
+    start.set(W_NAME, SECTION_BOOKMARK_PREFIX + name)
+    end = OxmlElement('w:bookmarkEnd')
+    end.set(W_ID, bookmark_id)
+    ppr = first_el.find(W_PPR)
+    if ppr is not None:
+        ppr.addnext(start)
+    else:
+        first_el.insert(0, start)
+    last_el.append(end)
+
+
+def find_section(doc, name: str) -> Optional[Tuple[object, object]]:
+    """
+    Locate a named section
+
+    Returns:
+        (first, last) body elements of the section, or None if it is not present
+    """
+    body = doc._element.body
+    target = SECTION_BOOKMARK_PREFIX + name
+    start = next((el for el in body.iter(W_BOOKMARK_START) if el.get(W_NAME) == target), None)
+    if start is None:
+        return None
+    bookmark_id = start.get(W_ID)
+    end = next((el for el in body.iter(W_BOOKMARK_END) if el.get(W_ID) == bookmark_id), None)
+    if end is None:
+        return None
+    first, last = _body_child(body, start), _body_child(body, end)
+    if first is None or last is None:
+        return None
+    return first, last
+
+
+def section_elements(first, last) -> List:
+    """Body elements from first to last inclusive"""
+    elements = []
+    el = first
+    while el is not None:
+        elements.append(el)
+        if el is last:
+            return elements
+        el = el.getnext()
+    # last does not follow first: the section is malformed
+    return []
+
+
+def _manifest_part(doc) -> Optional[Part]:
+    for rel in doc.part.package.rels.values():
+        if rel.reltype == MANIFEST_RELTYPE and not rel.is_external:
+            return rel.target_part
+    return None
+
+
+def read_manifest(doc) -> Optional[Dict]:
+    """Generation manifest stored in the document, or None"""
+    part = _manifest_part(doc)
+    if part is None:
+        return None
+    try:
+        return json.loads(part.blob)
+    except ValueError:
+        return None
+
+
+def write_manifest(doc, manifest: Dict):
+    """Store (or replace) the generation manifest in the document package"""
+    blob = json.dumps(manifest, sort_keys=True).encode('utf-8')
+    part = _manifest_part(doc)
+    if part is not None:
+        part._blob = blob
+        return
+    package = doc.part.package
+    part = Part(PackURI(MANIFEST_PARTNAME), MANIFEST_CONTENT_TYPE, blob, package)
+    package.relate_to(part, MANIFEST_RELTYPE)
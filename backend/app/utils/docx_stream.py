@@ -0,0 +1,86 @@
+"""
+In-memory serialisation of generated documents
+
+Documents are saved into a BytesIO buffer and hashed once so they can be
+streamed straight to Azure Blob Storage / S3 without a /tmp round trip.
+"""
+
+import hashlib
+import zipfile
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Package parts that change on every save without changing the rendered document
+VOLATILE_PARTS = {"docProps/core.xml"}
+
+
+@dataclass
+class SerializedDocument:
+    """A saved .docx held in memory, with its SHA-256 and size"""
+    buffer: BytesIO
+    sha256: str
+    size: int
+
+    def rewind(self) -> BytesIO:
+        """Return the buffer positioned at the start, ready to be streamed"""
+        self.buffer.seek(0)
+        return self.buffer
+
+    def content_sha256(self) -> str:
+        """Normalised content hash (see docx_content_hash)"""
+        return docx_content_hash(self.buffer.getvalue())
+
+    def write_to(self, path: Path) -> Path:
+        """Write the document to a local file (local/mock SharePoint mode)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.buffer.getbuffer())
+        return path
+
+
+def serialize_document(doc) -> SerializedDocument:
+    """
+    Save a python-docx Document into memory
+
+    Args:
+        doc: python-docx Document
+
+    Returns:
+        SerializedDocument with buffer, SHA-256 hex digest and size in bytes
+    """
+    buffer = BytesIO()
+    doc.save(buffer)
+    view = buffer.getbuffer()
+    sha256 = hashlib.sha256(view).hexdigest()
+    size = view.nbytes
+    view.release()
+    buffer.seek(0)
+    return SerializedDocument(buffer=buffer, sha256=sha256, size=size)
+
+
+def docx_content_hash(data: bytes) -> str:
+    """
+    Hash a .docx by its parts rather than its zip bytes
+
+    Zip entry timestamps and docProps/core.xml (modified date, revision) differ
+    between saves of identical content, so the raw bytes cannot key a PDF cache.
+    The PDF converter (pdf_converter/content_hash.py) computes the same digest.
+
+    Args:
+        data: .docx file bytes
+
+    Returns:
+        Hex SHA-256 digest over the sorted part names and their uncompressed content
+    """
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(BytesIO(data)) as package:
+        for name in sorted(package.namelist()):
+            if name in VOLATILE_PARTS:
+                continue
+            digest.update(name.encode("utf-8") + b"\0")
+            digest.update(hashlib.sha256(package.read(name)).digest())
+    return digest.hexdigest()
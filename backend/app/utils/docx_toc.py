@@ -0,0 +1,398 @@
+"""
+Server-side Table of Contents materialisation
+
+Fills the document's TOC field with real entries built from the body headings
+(heading text, hyperlink to a bookmark on the heading, PAGEREF page-number
+field), so the PDF converter does not need a global field-update pass.
+
+Page numbers are a layout estimate written as the PAGEREF cached result; the
+PAGEREF fields themselves stay live, so any later field update corrects them.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from app.utils.docx_sections import next_bookmark_id
+
+TOC_BOOKMARK_PREFIX = '_TocGc'
+HEADING_LEVEL = re.compile(r'^Heading (\d)$')
+TOC_OUTLINE_LEVELS = re.compile(r'\\o\s+"(\d)-(\d)"')
+
+W_P = qn('w:p')
+W_T = qn('w:t')
+W_R = qn('w:r')
+W_TBL = qn('w:tbl')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+W_TR_PR = qn('w:trPr')
+W_TR_HEIGHT = qn('w:trHeight')
+W_VAL = qn('w:val')
+WP_EXTENT = qn('wp:extent')
+W_SDT = qn('w:sdt')
+W_SDT_CONTENT = qn('w:sdtContent')
+W_BR = qn('w:br')
+W_TYPE = qn('w:type')
+W_PPR = qn('w:pPr')
+W_SECT_PR = qn('w:sectPr')
+W_PAGE_BREAK_BEFORE = qn('w:pageBreakBefore')
+W_FLD_SIMPLE = qn('w:fldSimple')
+W_FLD_CHAR = qn('w:fldChar')
+W_FLD_CHAR_TYPE = qn('w:fldCharType')
+W_INSTR = qn('w:instr')
+W_INSTR_TEXT = qn('w:instrText')
+W_HYPERLINK = qn('w:hyperlink')
+W_ANCHOR = qn('w:anchor')
+W_BOOKMARK_START = qn('w:bookmarkStart')
+W_BOOKMARK_END = qn('w:bookmarkEnd')
+W_NAME = qn('w:name')
+W_ID = qn('w:id')
+
+# Rough page model for the page-number estimate (11pt body text)
+LINES_PER_PAGE = 46
+TWIPS_PER_CHAR = 110
+EMU_PER_TWIP = 635
+TEXT_HEIGHT_TWIPS = 13958  # A4 with 2.54cm margins
+
+
+@dataclass
+class TocField:
+    """The TOC field instruction and the paragraphs it spans"""
+    instruction: str
+    paragraphs: List
+
+
+def find_toc_field(body) -> Optional[TocField]:
+    """
+    Locate the TOC field (simple or complex, in the body or a TOC content control)
+
+    Returns:
+        TocField, or None if the document has no TOC field
+    """
+    for el in body.iter(W_FLD_SIMPLE, W_INSTR_TEXT):
+        instruction = el.get(W_INSTR) if el.tag == W_FLD_SIMPLE else el.text
+        if not instruction or not instruction.strip().startswith('TOC'):
+            continue
+        p = el
+        while p is not None and p.tag != W_P:
+            p = p.getparent()
+        if p is None:
+            return None
+        if el.tag == W_FLD_SIMPLE:
+            return TocField(instruction.strip(), [p])
+        return TocField(instruction.strip(), _complex_field_paragraphs(p))
+    return None
+
+
+def _complex_field_paragraphs(first_p) -> List:
+    """Paragraphs from first_p until the fldChar end that closes the field begun in it"""
+    paragraphs = []
+    depth = 0
+    p = first_p
+    while p is not None:
+        if p.tag == W_P:
+            paragraphs.append(p)
+            for fld_char in p.iter(W_FLD_CHAR):
+                kind = fld_char.get(W_FLD_CHAR_TYPE)
+                if kind == 'begin':
+                    depth += 1
+                elif kind == 'end':
+                    depth -= 1
+            if depth <= 0:
+                return paragraphs
+        p = p.getnext()
+    return paragraphs
+
+
+def toc_is_materialised(doc) -> bool:
+    """True if the document has no TOC field or its TOC already holds generated entries"""
+    field = find_toc_field(doc._element.body)
+    if field is None:
+        return True
+    return any(
+        (link.get(W_ANCHOR) or '').startswith(TOC_BOOKMARK_PREFIX)
+        for p in field.paragraphs
+        for link in p.iter(W_HYPERLINK)
+    )
+
+
+def materialise_toc(doc, index) -> bool:
+    """
+    Replace the TOC field's cached result with entries for the current headings
+
+    Args:
+        doc: python-docx Document
+        index: BodyIndex of the document
+
+    Returns:
+        True if entries were written, False if there is no TOC field or no headings
+    """
+    body = doc._element.body
+    field = find_toc_field(body)
+    if field is None:
+        return False
+    low, high = 1, 3
+    match = TOC_OUTLINE_LEVELS.search(field.instruction)
+    if match:
+        low, high = int(match.group(1)), int(match.group(2))
+
+    headings: List[Tuple[object, int, str]] = []
+    for el in index.headings:
+        if el.getparent() is not body:
+            continue
+        level = HEADING_LEVEL.match(index.style_name(el) or '')
+        text = ''.join(t.text or '' for t in el.iter(W_T)).strip()
+        if level and low <= int(level.group(1)) <= high and text:
+            headings.append((el, int(level.group(1)), text))
+    if not headings:
+        return False
+
+    _remove_toc_bookmarks(body)
+    styles = _toc_style_ids(doc)
+    tab_pos = str(_text_width_twips(doc))
+    entries = []
+    page_runs: Dict[object, object] = {}
+    for i, (heading_el, level, text) in enumerate(headings):
+        name = f"{TOC_BOOKMARK_PREFIX}{i + 1:06d}"
+        _bookmark_heading(doc, heading_el, name)
+        p, page_t = _entry_paragraph(text, name, styles.get(level), level, tab_pos)
+        entries.append(p)
+        page_runs[heading_el] = page_t
+
+    # Open the complex field in the first entry and close it after the last
+    first, last = entries[0], entries[-1]
+    ppr = first.find(W_PPR)
+    for kind, instr in (('begin', None), (None, f' {field.instruction} '), ('separate', None)):
+        run = _field_char_run(kind) if kind else _instr_run(instr)
+        ppr.addnext(run)
+        ppr = run
+    last.append(_field_char_run('end'))
+
+    anchor = field.paragraphs[0]
+    for p in entries:
+        anchor.addprevious(p)
+    for p in field.paragraphs:
+        if p.getparent() is body:
+            index.remove(p)
+        elif p.getparent() is not None:
+            p.getparent().remove(p)
+
+    for heading_el, page in estimate_pages(doc, list(page_runs)).items():
+        page_runs[heading_el].text = str(page)
+    return True
+
+
+def _remove_toc_bookmarks(body):
+    ids = set()
+    for start in list(body.iter(W_BOOKMARK_START)):
+        if (start.get(W_NAME) or '').startswith(TOC_BOOKMARK_PREFIX):
+            ids.add(start.get(W_ID))
+            start.getparent().remove(start)
+    for end in list(body.iter(W_BOOKMARK_END)):
+        if end.get(W_ID) in ids:
+            end.getparent().remove(end)
+
+
+def _bookmark_heading(doc, heading_el, name: str):
+    bookmark_id = str(next_bookmark_id(doc))
+    start = OxmlElement('w:bookmarkStart')
+    start.set(W_ID, bookmark_id)
+    start.set(W_NAME, name)
+    end = OxmlElement('w:bookmarkEnd')
+    end.set(W_ID, bookmark_id)
+    ppr = heading_el.find(W_PPR)
+    if ppr is not None:
+        ppr.addnext(start)
+    else:
+        heading_el.insert(0, start)
+    heading_el.append(end)
+
+
+def _entry_paragraph(text: str, bookmark: str, style_id: Optional[str], level: int, tab_pos: str):
+    p = OxmlElement('w:p')
+    ppr = OxmlElement('w:pPr')
+    if style_id:
+        pstyle = OxmlElement('w:pStyle')
+        pstyle.set(qn('w:val'), style_id)
+        ppr.append(pstyle)
+    tabs = OxmlElement('w:tabs')
+    tab = OxmlElement('w:tab')
+    tab.set(qn('w:val'), 'right')
+    tab.set(qn('w:leader'), 'dot')
+    tab.set(qn('w:pos'), tab_pos)
+    tabs.append(tab)
+    ppr.append(tabs)
+    if not style_id:
+        ind = OxmlElement('w:ind')
+        ind.set(qn('w:left'), str(220 * (level - 1)))
+        ppr.append(ind)
+    p.append(ppr)
+
+    link = OxmlElement('w:hyperlink')
+    link.set(W_ANCHOR, bookmark)
+    link.set(qn('w:history'), '1')
+    link.append(_text_run(text))
+    tab_run = OxmlElement('w:r')
+    tab_run.append(OxmlElement('w:tab'))
+    link.append(tab_run)
+    link.append(_field_char_run('begin'))
+    link.append(_instr_run(f' PAGEREF {bookmark} \\h '))
+    link.append(_field_char_run('separate'))
+    page_run = _text_run('')
+    link.append(page_run)
+    link.append(_field_char_run('end'))
+    p.append(link)
+    return p, page_run.find(W_T)
+
+
+def _text_run(text: str):
+    run = OxmlElement('w:r')
+    t = OxmlElement('w:t')
+    t.text = text
+    if text != text.strip():
+        t.set(qn('xml:space'), 'preserve')
+    run.append(t)
+    return run
+
+
+def _field_char_run(kind: str):
+    run = OxmlElement('w:r')
+    fld_char = OxmlElement('w:fldChar')
+    fld_char.set(W_FLD_CHAR_TYPE, kind)
+    run.append(fld_char)
+    return run
+
+
+def _instr_run(instruction: str):
+    run = OxmlElement('w:r')
+    instr = OxmlElement('w:instrText')
+    instr.set(qn('xml:space'), 'preserve')
+    instr.text = instruction
+    run.append(instr)
+    return run
+
+
+def _toc_style_ids(doc) -> Dict[int, str]:
+    """Style ids of the 'toc N' paragraph styles present in the document"""
+    ids = {}
+    for level in range(1, 10):
+        try:
+            ids[level] = doc.styles[f'toc {level}'].style_id
+        except KeyError:
+            pass
+    return ids
+
+
+def _text_width_twips(doc) -> int:
+    try:
+        section = doc.sections[0]
+        return int((section.page_width - section.left_margin - section.right_margin) / EMU_PER_TWIP)
+    except Exception:
+        return 9026  # A4 with 2.54cm margins
+
+
+def _text_height_twips(doc) -> int:
+    try:
+        section = doc.sections[0]
+        return int((section.page_height - section.top_margin - section.bottom_margin) / EMU_PER_TWIP)
+    except Exception:
+        return TEXT_HEIGHT_TWIPS
+
+
+def estimate_pages(doc, targets: List) -> Dict[object, int]:
+    """
+    Estimate the page each target body element starts on
+
+    Counts explicit page/section breaks and approximates text flow with a
+    fixed lines-per-page model. Drawings are sized from their wp:extent and
+    table rows from their content or w:trHeight, whichever is taller; a
+    drawing or row that does not fit in the rest of a page starts the next.
+
+    Args:
+        doc: python-docx Document
+        targets: Top-level body elements to report
+
+    Returns:
+        Mapping of target element -> 1-based page number
+    """
+    chars_per_line = max(20, _text_width_twips(doc) // TWIPS_PER_CHAR)
+    twips_per_line = _text_height_twips(doc) / LINES_PER_PAGE
+    wanted = set(targets)
+    pages: Dict[object, int] = {}
+    state = {'page': 1, 'lines': 0.0}
+
+    def advance(lines: float):
+        state['lines'] += lines
+        if state['lines'] > LINES_PER_PAGE:
+            state['page'] += int(state['lines'] // LINES_PER_PAGE)
+            state['lines'] %= LINES_PER_PAGE
+
+    def new_page():
+        if state['lines'] > 0:
+            state['page'] += 1
+            state['lines'] = 0.0
+
+    def advance_block(lines: float):
+        # Pictures and table rows move to the next page rather than splitting
+        if lines <= LINES_PER_PAGE and state['lines'] + lines > LINES_PER_PAGE:
+            new_page()
+        advance(lines)
+
+    def drawing_lines(el) -> float:
+        return sum(
+            int(extent.get('cy') or 0) / EMU_PER_TWIP / twips_per_line
+            for extent in el.iter(WP_EXTENT)
+        )
+
+    def paragraph_lines(el, width_chars: int) -> float:
+        length = sum(len(t.text or '') for t in el.iter(W_T))
+        text = math.ceil(length / max(1, width_chars))
+        drawings = drawing_lines(el)
+        return drawings + text if drawings else max(1, text)
+
+    def row_lines(tr) -> float:
+        cells = tr.findall(W_TC)
+        width = chars_per_line // max(1, len(cells))
+        content = max(
+            (sum(paragraph_lines(p, width) for p in tc.iter(W_P)) for tc in cells),
+            default=1
+        )
+        height = tr.find(f'{W_TR_PR}/{W_TR_HEIGHT}')
+        if height is not None and (height.get(W_VAL) or '').isdigit():
+            fixed = int(height.get(W_VAL)) / twips_per_line
+            # hRule="exact" clips content; "atLeast" (the default) grows with it
+            return fixed if height.get(qn('w:hRule')) == 'exact' else max(fixed, content)
+        return content
+
+    def walk(elements):
+        for el in elements:
+            if el.tag == W_SDT:
+                content = el.find(W_SDT_CONTENT)
+                if content is not None:
+                    walk(content)
+            elif el.tag == W_TBL:
+                for tr in el.findall(W_TR):
+                    advance_block(row_lines(tr))
+            elif el.tag == W_P:
+                ppr = el.find(W_PPR)
+                if ppr is not None and ppr.find(W_PAGE_BREAK_BEFORE) is not None:
+                    new_page()
+                if el in wanted:
+                    pages[el] = state['page']
+                lines = paragraph_lines(el, chars_per_line) + (1.5 if el in wanted else 0.3)
+                if el.find(f'.//{WP_EXTENT}') is not None:
+                    advance_block(lines)
+                else:
+                    advance(lines)
+                for br in el.iter(W_BR):
+                    if br.get(W_TYPE) == 'page':
+                        new_page()
+                if ppr is not None and ppr.find(W_SECT_PR) is not None:
+                    new_page()
+
+    walk(doc._element.body)
+    return pages
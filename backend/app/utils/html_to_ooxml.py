@@ -0,0 +1,383 @@
+"""
+Render Service Definition rich text (HTML) straight into WordprocessingML
+
+The HTML is parsed with lxml and walked once; paragraphs, runs, lists, tables and
+pictures are emitted as w:p / w:tbl elements at the insertion point, without
+going through python-docx paragraph/run proxies.
+"""
+
+import re
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
+
+import lxml.html
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.oxml.table import CT_Tbl
+from docx.oxml.shape import CT_Inline
+from docx.shared import Inches
+
+WHITESPACE = re.compile(r'\s+')
+
+# Run formatting applied by inline tags, in w:rPr schema order
+RUN_FORMATS = ('b', 'i', 'strike', 'u', 'vertAlign')
+INLINE_FORMAT_TAGS = {
+    'strong': 'b', 'b': 'b',
+    'em': 'i', 'i': 'i', 'cite': 'i',
+    's': 'strike', 'strike': 'strike', 'del': 'strike',
+    'u': 'u', 'ins': 'u',
+    'sub': 'subscript', 'sup': 'superscript',
+}
+HEADING_STYLES = {
+    'h1': 'Heading 3', 'h2': 'Heading 3', 'h3': 'Heading 3',
+    'h4': 'Heading 4', 'h5': 'Heading 4', 'h6': 'Heading 4',
+}
+BLOCK_TAGS = frozenset((
+    'p', 'div', 'section', 'article', 'header', 'footer', 'blockquote', 'pre', 'figure',
+    'ul', 'ol', 'table', 'hr', *HEADING_STYLES,
+))
+LIST_STYLES = {'ul': 'List Bullet', 'ol': 'List Number'}
+MAX_LIST_LEVEL = 3
+TABLE_STYLE = 'Table Grid'
+
+
+class HtmlRenderer:
+    """
+    Emits OOXML for an HTML fragment after a given body element.
+
+    One renderer can be reused for many fragments of the same document; resolved
+    style ids and the usable text width are cached on it.
+    """
+
+    def __init__(self, doc, image_loader: Callable[[str], Optional[bytes]]):
+        """
+        Args:
+            doc: python-docx Document the elements are inserted into
+            image_loader: Returns image bytes for an <img src>, or None if unavailable
+        """
+        self.doc = doc
+        self.part = doc.part
+        self.image_loader = image_loader
+        self._style_ids: Dict[str, Optional[str]] = {}
+        self._known_styles: Dict[str, bool] = {}
+        self._text_width = None
+        self._cursor = None
+        self._emitted: List = []
+
+    def render(self, after_el, html: str) -> List:
+        """
+        Render an HTML fragment directly after after_el
+
+        Args:
+            after_el: Body-level element to insert after
+            html: HTML fragment
+
+        Returns:
+            Inserted top-level elements in document order (the last one is always a w:p)
+        """
+        self._cursor = after_el
+        self._emitted = []
+        if not html or not html.strip():
+            return []
+        root = lxml.html.fragment_fromstring(html, create_parent='div')
+        self._blocks(root, style=None)
+        if self._emitted and self._emitted[-1].tag != qn('w:p'):
+            # Keep a paragraph after a trailing table so callers can chain after it
+            self._emit(OxmlElement('w:p'))
+        return self._emitted
+
+    # Block level
+
+    def _emit(self, el):
+        self._cursor.addnext(el)
+        self._cursor = el
+        self._emitted.append(el)
+        return el
+
+    def _blocks(self, container, style: Optional[str]):
+        """Render children of a block container; runs of inline content share one paragraph"""
+        state = _InlineState(self, style)
+        self._text(state, container.text, frozenset())
+        for child in container:
+            tag = child.tag if isinstance(child.tag, str) else None
+            if tag in BLOCK_TAGS:
+                state.close()
+                self._block(child, tag)
+            elif tag is not None:
+                self._inline(state, child, frozenset())
+            self._text(state, child.tail, frozenset())
+        state.close()
+
+    def _block(self, node, tag: str):
+        if tag in HEADING_STYLES:
+            state = _InlineState(self, HEADING_STYLES[tag], eager=True)
+            self._inline_children(state, node, frozenset())
+            state.close()
+        elif tag in LIST_STYLES:
+            self._list(node, tag, level=1)
+        elif tag == 'table':
+            self._table(node)
+        elif tag == 'hr':
+            self._emit(OxmlElement('w:p'))
+        elif tag == 'p' or not any(isinstance(c.tag, str) and c.tag in BLOCK_TAGS for c in node):
+            state = _InlineState(self, 'Normal', eager=True)
+            self._inline_children(state, node, frozenset(), preserve=(tag == 'pre'))
+            state.close()
+        else:
+            # div/section/blockquote containing further blocks
+            self._blocks(node, style='Normal')
+
+    def _list(self, node, tag: str, level: int):
+        style = LIST_STYLES[tag]
+        level_style = style if level == 1 else f"{style} {min(level, MAX_LIST_LEVEL)}"
+        for li in node:
+            if li.tag != 'li':
+                continue
+            state = _InlineState(self, level_style, eager=True, fallback_style=style, level=level)
+            self._text(state, li.text, frozenset())
+            nested = []
+            for child in li:
+                if child.tag in LIST_STYLES:
+                    nested.append(child)
+                elif isinstance(child.tag, str):
+                    self._inline(state, child, frozenset())
+                self._text(state, child.tail, frozenset())
+            state.close()
+            for sub in nested:
+                self._list(sub, sub.tag, level + 1)
+
+    def _table(self, node):
+        rows = [tr for tr in node.iter('tr') if _owning_table(tr) is node]
+        if not rows:
+            return
+        cells = [[c for c in tr if c.tag in ('td', 'th')] for tr in rows]
+        cols = max((len(r) for r in cells), default=0)
+        if cols == 0:
+            return
+        tbl = CT_Tbl.new_tbl(len(rows), cols, self._usable_width())
+        style_id = self._style_id(TABLE_STYLE)
+        if style_id:
+            tbl_style = OxmlElement('w:tblStyle')
+            tbl_style.set(qn('w:val'), style_id)
+            tbl.tblPr.insert(0, tbl_style)
+        for tr_el, row in zip(tbl.tr_lst, cells):
+            for tc, cell in zip(tr_el.tc_lst, row):
+                state = _InlineState(self, None, paragraph=tc.p_lst[0])
+                fmt = frozenset(('b',)) if cell.tag == 'th' else frozenset()
+                self._inline_children(state, cell, fmt)
+                state.close()
+        self._emit(tbl)
+
+    # Inline level
+
+    def _inline_children(self, state: '_InlineState', node, fmt: frozenset, preserve: bool = False):
+        self._text(state, node.text, fmt, preserve)
+        for child in node:
+            if isinstance(child.tag, str):
+                self._inline(state, child, fmt, preserve)
+            self._text(state, child.tail, fmt, preserve)
+
+    def _inline(self, state: '_InlineState', node, fmt: frozenset, preserve: bool = False):
+        tag = node.tag
+        if tag == 'br':
+            state.add_break()
+        elif tag == 'img':
+            self._image(state, node.get('src'))
+        elif tag in LIST_STYLES or tag in BLOCK_TAGS:
+            # Block nested in inline context (e.g. <p> in <li> or a table cell): keep it on a new line
+            if state.has_content:
+                state.add_break()
+            self._inline_children(state, node, fmt, preserve)
+        else:
+            if tag in INLINE_FORMAT_TAGS:
+                fmt = fmt | {INLINE_FORMAT_TAGS[tag]}
+            self._inline_children(state, node, fmt, preserve)
+
+    def _text(self, state: '_InlineState', text: Optional[str], fmt: frozenset, preserve: bool = False):
+        if not text:
+            return
+        if not preserve:
+            text = WHITESPACE.sub(' ', text)
+            if not state.has_content:
+                text = text.lstrip()
+            if not text:
+                return
+        state.add_text(text, fmt)
+
+    def _image(self, state: '_InlineState', src: Optional[str]):
+        if not src:
+            return
+        run = None
+        try:
+            data = self.image_loader(src)
+            if data is None:
+                raise ValueError("image unavailable")
+            run = self._picture_run(data)
+        except Exception:
+            run = None
+        if not state.owns_paragraph:
+            # Table cell: keep the picture (or its textual reference) inside the cell
+            if run is None:
+                state.add_text(f"[image: {src}]", frozenset())
+            else:
+                state.add_run(run)
+            return
+        if run is None:
+            # If the image cannot be loaded or decoded, keep a textual reference instead
+            state.close()
+            fallback = _InlineState(self, None, eager=True)
+            fallback.add_text(f"[image: {src}]", frozenset())
+            fallback.close()
+            return
+        if state.has_content:
+            state.close()
+            picture = _InlineState(self, None, eager=True)
+            picture.add_run(run)
+            picture.close()
+        else:
+            state.add_run(run)
+            state.close()
+
+    def _picture_run(self, data: bytes):
+        rId, image = self.part.get_or_add_image(BytesIO(data))
+        max_width = self._usable_width()
+        width = max_width if image.width > max_width else None
+        cx, cy = image.scaled_dimensions(width, None)
+        inline = CT_Inline.new_pic_inline(self.part.next_id, rId, image.filename, cx, cy)
+        run = OxmlElement('w:r')
+        drawing = OxmlElement('w:drawing')
+        drawing.append(inline)
+        run.append(drawing)
+        return run
+
+    # Document lookups
+
+    def _style_id(self, name: Optional[str]) -> Optional[str]:
+        """Style id for a style name (None for the default paragraph style or unknown styles)"""
+        if name is None:
+            return None
+        if name not in self._style_ids:
+            styles = self.doc.styles
+            try:
+                style = styles[name]
+                default = styles.default(WD_STYLE_TYPE.PARAGRAPH)
+                self._style_ids[name] = None if default is not None and style.style_id == default.style_id else style.style_id
+            except KeyError:
+                self._style_ids[name] = None
+        return self._style_ids[name]
+
+    def _has_style(self, name: str) -> bool:
+        if name not in self._known_styles:
+            try:
+                self.doc.styles[name]
+                self._known_styles[name] = True
+            except KeyError:
+                self._known_styles[name] = False
+        return self._known_styles[name]
+
+    def _usable_width(self) -> int:
+        """Text width of the first section in EMU"""
+        if self._text_width is None:
+            width = None
+            try:
+                section = self.doc.sections[0]
+                width = section.page_width - section.left_margin - section.right_margin
+            except Exception:
+                pass
+            self._text_width = int(width) if width and width > 0 else int(Inches(6))
+        return self._text_width
+
+
+class _InlineState:
+    """A paragraph being filled with runs; created lazily unless eager"""
+
+    def __init__(self, renderer: HtmlRenderer, style: Optional[str], eager: bool = False,
+                 paragraph=None, fallback_style: Optional[str] = None, level: int = 1):
+        self.renderer = renderer
+        self.style = style
+        self.fallback_style = fallback_style
+        self.level = level
+        self.p = paragraph
+        self.has_content = False
+        self.owns_paragraph = paragraph is None
+        if eager and self.p is None:
+            self._open()
+
+    def _open(self):
+        p = OxmlElement('w:p')
+        style_name = self.style
+        indent = False
+        if style_name and self.fallback_style and not self.renderer._has_style(style_name):
+            style_name, indent = self.fallback_style, True
+        style_id = self.renderer._style_id(style_name)
+        if style_id or indent:
+            ppr = OxmlElement('w:pPr')
+            if style_id:
+                pstyle = OxmlElement('w:pStyle')
+                pstyle.set(qn('w:val'), style_id)
+                ppr.append(pstyle)
+            if indent:
+                ind = OxmlElement('w:ind')
+                ind.set(qn('w:left'), str(360 * (self.level + 1)))
+                ppr.append(ind)
+            p.append(ppr)
+        self.p = self.renderer._emit(p)
+
+    def add_text(self, text: str, fmt: frozenset):
+        if self.p is None:
+            self._open()
+        run = OxmlElement('w:r')
+        if fmt:
+            rpr = OxmlElement('w:rPr')
+            for flag in RUN_FORMATS:
+                if flag == 'vertAlign':
+                    align = 'subscript' if 'subscript' in fmt else 'superscript' if 'superscript' in fmt else None
+                    if align:
+                        el = OxmlElement('w:vertAlign')
+                        el.set(qn('w:val'), align)
+                        rpr.append(el)
+                elif flag in fmt:
+                    el = OxmlElement(f'w:{flag}')
+                    if flag == 'u':
+                        el.set(qn('w:val'), 'single')
+                    rpr.append(el)
+            run.append(rpr)
+        t = OxmlElement('w:t')
+        t.text = text
+        if text != text.strip():
+            t.set(qn('xml:space'), 'preserve')
+        run.append(t)
+        self.p.append(run)
+        self.has_content = True
+
+    def add_break(self):
+        if self.p is None:
+            self._open()
+        run = OxmlElement('w:r')
+        run.append(OxmlElement('w:br'))
+        self.p.append(run)
+        self.has_content = True
+
+    def add_run(self, run):
+        if self.p is None:
+            self._open()
+        self.p.append(run)
+        self.has_content = True
+
+    def close(self):
+        """Finish the paragraph (trailing whitespace is trimmed); later content opens a new one"""
+        if self.p is not None and self.has_content:
+            texts = self.p.findall(f"{qn('w:r')}/{qn('w:t')}")
+            if texts and texts[-1].text != texts[-1].text.rstrip():
+                texts[-1].text = texts[-1].text.rstrip()
+        if self.owns_paragraph:
+            self.p = None
+            self.has_content = False
+
+
+def _owning_table(el):
+    el = el.getparent()
+    while el is not None and el.tag != 'table':
+        el = el.getparent()
+    return el
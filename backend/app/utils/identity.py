@@ -0,0 +1,48 @@
+"""
+Canonical person names for matching OWNER metadata against signed-in users
+
+SharePoint metadata stores owners as free-text display names ("Conor Macklin"),
+while requests identify users by Entra ID display name or email
+("conor.macklin@paconsulting.com"). canonical_name maps the forms one person
+appears in to the same key.
+"""
+
+import re
+import unicodedata
+from typing import Iterable, Set
+
+_SEPARATORS = re.compile(r"[\s._\-]+")
+_DROPPED = re.compile(r"[^\w ]")
+
+
+def canonical_name(value: str) -> str:
+    """
+    Matching key for a display name or email address
+
+    Handles case, surrounding/repeated whitespace, accents ("José" = "Jose"),
+    dotted or underscored forms ("firstname.lastname", "firstname_lastname"), email
+    addresses (local part, ignoring any "+tag") and "Lastname, Firstname".
+
+    Args:
+        value: Display name, "Lastname, Firstname" or email address
+
+    Returns:
+        Lower-case ASCII-folded words joined by single spaces ("" for empty input)
+    """
+    if not value:
+        return ""
+    value = value.strip()
+    if '@' in value:
+        value = value.split('@', 1)[0].split('+', 1)[0]
+    elif value.count(',') == 1:
+        last, first = value.split(',')
+        value = f"{first} {last}"
+    # Strip accents: decompose, then drop the combining marks
+    value = ''.join(c for c in unicodedata.normalize('NFKD', value) if not unicodedata.combining(c))
+    value = _SEPARATORS.sub(' ', value.casefold())
+    return _DROPPED.sub('', value).strip()
+
+
+def canonical_names(values: Iterable[str]) -> Set[str]:
+    """Non-empty canonical keys of several identities of one user"""
+    return {key for key in (canonical_name(value) for value in values if value) if key}
@@ -0,0 +1,25 @@
+"""
+Normalised .docx content hash used to key the PDF cache
+
+Must stay in step with app.utils.docx_stream.docx_content_hash so hashes
+computed by the generator and by the converter agree.
+"""
+
+import hashlib
+import zipfile
+from io import BytesIO
+
+# Package parts that change on every save without changing the rendered document
+VOLATILE_PARTS = {"docProps/core.xml"}
+
+
+def docx_content_hash(data: bytes) -> str:
+    """Hex SHA-256 over the sorted part names and their uncompressed content"""
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(BytesIO(data)) as package:
+        for name in sorted(package.namelist()):
+            if name in VOLATILE_PARTS:
+                continue
+            digest.update(name.encode("utf-8") + b"\0")
+            digest.update(hashlib.sha256(package.read(name)).digest())
+    return digest.hexdigest()
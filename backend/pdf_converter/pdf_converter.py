@@ -6,14 +6,42 @@ This preserves all formatting, images, colors, cover page, contents page, etc.
 
 import os
 import json
-import subprocess
+import time
+import shutil
+import threading
 import boto3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from pdf_converter.content_hash import docx_content_hash
+    from pdf_converter.soffice_pool import get_pool
+except ImportError:  # Lambda image: modules sit flat in the task root
+    from content_hash import docx_content_hash
+    from soffice_pool import get_pool
+
 s3_client = boto3.client('s3')
 
 OUTPUT_BUCKET = os.environ.get('OUTPUT_BUCKET_NAME')
 
+# Documents in flight at once in batch mode (downloads/uploads overlap conversions)
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '8'))
+
+# PDFs are keyed by the normalised .docx content so identical documents are converted once
+PDF_CACHE_ENABLED = os.environ.get('PDF_CACHE_ENABLED', 'true').lower() == 'true'
+# Copies under PDF_CACHE_PREFIX are never deleted here: the output bucket's "expire-pdf-cache"
+# lifecycle rule removes them (infrastructure/terraform/aws, pdf_cache_expiration_days,
+# default 30). Keep the rule's prefix in step if this is overridden.
+PDF_CACHE_PREFIX = os.environ.get('PDF_CACHE_PREFIX', '_pdf_cache/')
+SOURCE_HASH_METADATA = 'source-sha256'
+
+# Resolve the pool's UNO interpreter during init, so a degraded pool is logged once per container
+get_pool()
+
+# Per-container counters, returned with every response
+cache_stats = {'hits': 0, 'misses': 0}
+_cache_stats_lock = threading.Lock()
+
 
 def handler(event, context):
     """
@@ -29,18 +57,27 @@ def handler(event, context):
     {
         "success": bool,
         "pdf_s3_key": "generated/document_name.pdf",
-        "pdf_url": "presigned_url"
+        "pdf_url": "presigned_url",
+        "cache": "hit" | "miss",
+        "cache_stats": {"hits": int, "misses": int}
     }
+    
+    Batch events carry a "documents" list instead; see handle_batch.
     """
     try:
         # Parse input
         if isinstance(event, str):
             event = json.loads(event)
         
+        if 'documents' in event:
+            return handle_batch(event)
+        
         word_s3_key = event.get('word_s3_key')
         word_bucket = event.get('word_bucket', OUTPUT_BUCKET)
         output_bucket = event.get('output_bucket', word_bucket or OUTPUT_BUCKET)
         override_pdf_key = event.get('pdf_s3_key')
+        # The generator fills in the TOC itself; callers that did not are updated here
+        update_fields = event.get('update_fields', True)
         
         if not word_s3_key:
             raise ValueError("word_s3_key is required")
@@ -62,103 +99,10 @@ def handler(event, context):
         local_word_path = input_dir / word_filename
         s3_client.download_file(word_bucket, word_s3_key, str(local_word_path))
         
-        # Convert to PDF using LibreOffice headless
+        # Convert to PDF on a warm LibreOffice worker (or reuse a PDF of identical content)
         # This preserves all formatting, images, colors, cover page, contents page, etc.
-        pdf_filename = word_filename.replace('.docx', '.pdf')
-        local_pdf_path = output_dir / pdf_filename
-        
-        # LibreOffice headless command
-        # Try different paths for LibreOffice
-        libreoffice_cmd = None
-        possible_paths = [
-            '/opt/libreoffice7.6/program/soffice',  # Shelf image location
-            '/usr/bin/libreoffice7.6',
-            '/usr/bin/libreoffice',
-            '/usr/bin/soffice',
-            'libreoffice7.6',
-            'libreoffice',
-            'soffice'
-        ]
-        
-        for cmd_path in possible_paths:
-            try:
-                # Check if it's an absolute path
-                if cmd_path.startswith('/'):
-                    if os.path.exists(cmd_path) and os.access(cmd_path, os.X_OK):
-                        libreoffice_cmd = cmd_path
-                        break
-                else:
-                    # Use which for commands in PATH
-                    result = subprocess.run(['which', cmd_path], capture_output=True, text=True, timeout=5)
-                    if result.returncode == 0:
-                        libreoffice_cmd = result.stdout.strip()
-                        break
-            except:
-                continue
-        
-        if not libreoffice_cmd:
-            raise RuntimeError(f"LibreOffice not found. Checked: {', '.join(possible_paths)}")
-        
-        # --headless: Run without GUI
-        # --convert-to pdf: Convert to PDF format
-        # --outdir: Output directory
-        # --nofirststartwizard: Skip first start wizard
-        # --nodefault: Don't use default settings
-        # --update: Update fields (like TOC) before converting
-        cmd = [
-            libreoffice_cmd,
-            '--headless',
-            '--nofirststartwizard',
-            '--nodefault',
-            '--update',  # Update fields (TOC, etc.) before conversion
-            '--convert-to', 'pdf',
-            '--outdir', str(output_dir),
-            str(local_word_path)
-        ]
-        
-        # Set environment variables for LibreOffice
-        env = os.environ.copy()
-        env['HOME'] = '/tmp'
-        env['USERPROFILE'] = '/tmp'
-        # Disable Java (not needed for headless conversion)
-        env['JAVA_HOME'] = ''
-        env['SAL_USE_VCLPLUGIN'] = 'headless'
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=120,  # 2 minutes timeout
-            env=env,
-            cwd=str(input_dir)
-        )
-        
-        if result.returncode != 0:
-            error_msg = f"LibreOffice conversion failed: {result.stderr}"
-            print(f"ERROR: {error_msg}")
-            print(f"STDOUT: {result.stdout}")
-            raise RuntimeError(error_msg)
-        
-        # LibreOffice outputs PDF with same name but .pdf extension
-        # Check if PDF was created
-        expected_pdf = output_dir / pdf_filename
-        if not expected_pdf.exists():
-            # Sometimes LibreOffice creates PDF with different casing or naming
-            # Try to find any PDF file in output directory
-            pdf_files = list(output_dir.glob('*.pdf'))
-            if pdf_files:
-                expected_pdf = pdf_files[0]
-            else:
-                raise FileNotFoundError(f"PDF not generated: {expected_pdf}")
-        
-        # Upload PDF to S3
         pdf_s3_key = override_pdf_key or word_s3_key.replace('.docx', '.pdf')
-        s3_client.upload_file(
-            str(expected_pdf),
-            output_bucket,
-            pdf_s3_key,
-            ExtraArgs={'ContentType': 'application/pdf'}
-        )
+        cache_result = convert_and_upload(local_word_path, output_dir, output_bucket, pdf_s3_key, update_fields)
         
         # Generate presigned URL for PDF
         presigned_url = s3_client.generate_presigned_url(
@@ -169,12 +113,13 @@ def handler(event, context):
         
         # Cleanup
         local_word_path.unlink(missing_ok=True)
-        expected_pdf.unlink(missing_ok=True)
         
         return {
             'success': True,
             'pdf_s3_key': pdf_s3_key,
-            'pdf_url': presigned_url
+            'pdf_url': presigned_url,
+            'cache': cache_result,
+            'cache_stats': dict(cache_stats)
         }
         
     except Exception as e:
@@ -187,3 +132,184 @@ def handler(event, context):
         }
         print(f"PDF conversion error: {json.dumps(error_details)}")
         return error_details
+
+
+def handle_batch(event):
+    """
+    Convert many documents in one invocation
+    
+    Documents are processed concurrently: each is downloaded, converted on the
+    next free warm LibreOffice worker, and uploaded, so transfers overlap the
+    conversions of other documents.
+    
+    Expected event format:
+    {
+        "documents": [
+            {"word_s3_key": "...", "pdf_s3_key": "... (optional)", "update_fields": bool (optional)},
+            ...
+        ],
+        "word_bucket": "bucket (default for items)",
+        "output_bucket": "bucket (default for items)",
+        "update_fields": bool (default for items)
+    }
+    
+    Returns:
+    {
+        "success": bool (true when every document converted),
+        "converted": int,
+        "failed": int,
+        "elapsed_ms": int,
+        "cache_stats": {"hits": int, "misses": int},
+        "results": [
+            {"word_s3_key", "success", "cache", "pdf_s3_key", "pdf_url" | "error", "timings_ms": {...}},
+            ...
+        ]
+    }
+    """
+    documents = event.get('documents')
+    if not isinstance(documents, list) or not documents:
+        raise ValueError("documents must be a non-empty list")
+    word_bucket = event.get('word_bucket', OUTPUT_BUCKET)
+    output_bucket = event.get('output_bucket', word_bucket or OUTPUT_BUCKET)
+    update_fields = event.get('update_fields', True)
+    
+    batch_dir = Path('/tmp/batch')
+    started = time.perf_counter()
+    
+    def convert_item(numbered):
+        i, item = numbered
+        word_s3_key = item.get('word_s3_key')
+        result = {'word_s3_key': word_s3_key, 'success': False}
+        timings = {}
+        result['timings_ms'] = timings
+        work_dir = batch_dir / str(i)
+        try:
+            if not word_s3_key:
+                raise ValueError("word_s3_key is required")
+            item_word_bucket = item.get('word_bucket', word_bucket)
+            item_output_bucket = item.get('output_bucket', output_bucket)
+            if not item_word_bucket or not item_output_bucket:
+                raise ValueError("word_bucket and output_bucket are required")
+            
+            # Per-item directory: documents from different folders may share a filename
+            work_dir.mkdir(parents=True, exist_ok=True)
+            local_word_path = work_dir / Path(word_s3_key).name
+            
+            t = time.perf_counter()
+            s3_client.download_file(item_word_bucket, word_s3_key, str(local_word_path))
+            timings['download'] = int((time.perf_counter() - t) * 1000)
+            
+            pdf_s3_key = item.get('pdf_s3_key') or word_s3_key.replace('.docx', '.pdf')
+            result['cache'] = convert_and_upload(
+                local_word_path, work_dir, item_output_bucket, pdf_s3_key,
+                item.get('update_fields', update_fields), timings
+            )
+            
+            result.update({
+                'success': True,
+                'pdf_s3_key': pdf_s3_key,
+                'pdf_url': s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={'Bucket': item_output_bucket, 'Key': pdf_s3_key},
+                    ExpiresIn=3600
+                )
+            })
+        except Exception as e:
+            result.update({'error': str(e), 'error_type': type(e).__name__})
+            print(f"PDF batch item failed ({word_s3_key}): {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(BATCH_CONCURRENCY, len(documents)))) as executor:
+        results = list(executor.map(convert_item, enumerate(documents)))
+    
+    converted = sum(1 for r in results if r['success'])
+    return {
+        'success': converted == len(results),
+        'converted': converted,
+        'failed': len(results) - converted,
+        'elapsed_ms': int((time.perf_counter() - started) * 1000),
+        'cache_stats': dict(cache_stats),
+        'results': results
+    }
+
+
+def _record_cache(hit: bool):
+    with _cache_stats_lock:
+        cache_stats['hits' if hit else 'misses'] += 1
+
+
+def _reuse_cached_pdf(bucket, pdf_s3_key, source_id):
+    """Point pdf_s3_key at an existing PDF converted from the same content, if there is one"""
+    # The target already holds the PDF of this content (e.g. "complete" re-run on unchanged input)
+    try:
+        head = s3_client.head_object(Bucket=bucket, Key=pdf_s3_key)
+        if head.get('Metadata', {}).get(SOURCE_HASH_METADATA) == source_id:
+            return True
+    except Exception:
+        pass
+    # Same content was converted under another key: server-side copy, no download
+    try:
+        s3_client.copy_object(
+            Bucket=bucket,
+            Key=pdf_s3_key,
+            CopySource={'Bucket': bucket, 'Key': f"{PDF_CACHE_PREFIX}{source_id}.pdf"},
+            Metadata={SOURCE_HASH_METADATA: source_id},
+            MetadataDirective='REPLACE',
+            ContentType='application/pdf'
+        )
+        return True
+    except Exception:
+        return False
+
+
+def convert_and_upload(local_word_path, output_dir, output_bucket, pdf_s3_key, update_fields, timings=None):
+    """
+    Produce the PDF for a downloaded document at pdf_s3_key
+    
+    Args:
+        timings: Optional dict receiving cache/convert/upload durations in ms
+    
+    Returns:
+        'hit' when an existing PDF of identical content was reused, 'miss' when LibreOffice ran
+    """
+    timings = {} if timings is None else timings
+    source_id = None
+    if PDF_CACHE_ENABLED:
+        t = time.perf_counter()
+        try:
+            # Field updates change the output, so they are part of the key
+            source_id = docx_content_hash(local_word_path.read_bytes()) + ('-fields' if update_fields else '')
+        except Exception as e:
+            print(f"Cannot hash {local_word_path.name}, converting without cache: {e}")
+        hit = bool(source_id) and _reuse_cached_pdf(output_bucket, pdf_s3_key, source_id)
+        timings['cache'] = int((time.perf_counter() - t) * 1000)
+        _record_cache(hit)
+        if hit:
+            print(f"PDF cache hit for {pdf_s3_key} ({source_id})")
+            return 'hit'
+    
+    t = time.perf_counter()
+    pdf_path = get_pool().convert(local_word_path, output_dir, update_fields=update_fields)
+    timings['convert'] = int((time.perf_counter() - t) * 1000)
+    t = time.perf_counter()
+    try:
+        extra_args = {'ContentType': 'application/pdf'}
+        if source_id:
+            extra_args['Metadata'] = {SOURCE_HASH_METADATA: source_id}
+        s3_client.upload_file(str(pdf_path), output_bucket, pdf_s3_key, ExtraArgs=extra_args)
+    finally:
+        pdf_path.unlink(missing_ok=True)
+    timings['upload'] = int((time.perf_counter() - t) * 1000)
+    
+    if source_id:
+        try:
+            s3_client.copy_object(
+                Bucket=output_bucket,
+                Key=f"{PDF_CACHE_PREFIX}{source_id}.pdf",
+                CopySource={'Bucket': output_bucket, 'Key': pdf_s3_key}
+            )
+        except Exception as e:
+            print(f"Failed to store PDF in cache: {e}")
+    return 'miss'
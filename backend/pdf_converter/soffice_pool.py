@@ -0,0 +1,379 @@
+"""
+Warm LibreOffice worker pool for the PDF converter
+
+Each worker owns a long-lived headless soffice process listening on a UNO
+socket, with its own user profile directory so several instances never contend
+for the same profile lock. Conversions are sent to an idle worker over the UNO
+bridge instead of paying a cold soffice start per document. Workers are health
+checked before use, recycled after a number of jobs, and the pool size caps
+concurrent conversions.
+
+The UNO client runs in a companion uno_bridge.py process per worker, under an
+interpreter that can import pyuno: SOFFICE_PYTHON, else LibreOffice's bundled
+program/python (the Lambda image's pyuno is built against it, not against the
+runtime's Python), else this interpreter if it has pyuno. Without one, the pool
+logs that it is degraded and workers fall back to one cold soffice process per
+conversion, still confined to the worker's own (already initialised) profile.
+"""
+
+import os
+import sys
+import json
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+SOFFICE_PATHS = [
+    '/opt/libreoffice7.6/program/soffice',  # Shelf image location
+    '/usr/bin/libreoffice7.6',
+    '/usr/bin/libreoffice',
+    '/usr/bin/soffice',
+    'libreoffice7.6',
+    'libreoffice',
+    'soffice'
+]
+
+POOL_SIZE = int(os.environ.get('SOFFICE_POOL_SIZE', '1'))
+MAX_JOBS_PER_WORKER = int(os.environ.get('SOFFICE_MAX_JOBS', '50'))
+CONVERT_TIMEOUT = int(os.environ.get('SOFFICE_CONVERT_TIMEOUT', '120'))
+STARTUP_TIMEOUT = int(os.environ.get('SOFFICE_STARTUP_TIMEOUT', '60'))
+BASE_PORT = int(os.environ.get('SOFFICE_BASE_PORT', '2002'))
+PROFILE_ROOT = Path(os.environ.get('SOFFICE_PROFILE_ROOT', '/tmp/soffice-profiles'))
+BRIDGE_SCRIPT = Path(__file__).resolve().parent / 'uno_bridge.py'
+
+_soffice_binary: Optional[str] = None
+
+
+def find_soffice() -> str:
+    """
+    Locate the LibreOffice binary (cached after the first lookup)
+
+    Raises:
+        RuntimeError: If no LibreOffice binary is found
+    """
+    global _soffice_binary
+    if _soffice_binary:
+        return _soffice_binary
+    for cmd_path in SOFFICE_PATHS:
+        if cmd_path.startswith('/'):
+            if os.path.exists(cmd_path) and os.access(cmd_path, os.X_OK):
+                _soffice_binary = cmd_path
+                return cmd_path
+        else:
+            resolved = shutil.which(cmd_path)
+            if resolved:
+                _soffice_binary = resolved
+                return resolved
+    raise RuntimeError(f"LibreOffice not found. Checked: {', '.join(SOFFICE_PATHS)}")
+
+
+def _soffice_env() -> dict:
+    env = os.environ.copy()
+    env['HOME'] = '/tmp'
+    env['USERPROFILE'] = '/tmp'
+    # Disable Java (not needed for headless conversion)
+    env['JAVA_HOME'] = ''
+    env['SAL_USE_VCLPLUGIN'] = 'headless'
+    return env
+
+
+def find_uno_python(binary: Optional[str]) -> Optional[str]:
+    """
+    Interpreter that can run the UNO bridge for the given soffice binary
+
+    Returns:
+        Path of the interpreter, or None if pyuno is not available anywhere
+    """
+    configured = os.environ.get('SOFFICE_PYTHON')
+    if configured:
+        return configured if os.access(configured, os.X_OK) else None
+    if binary:
+        bundled = Path(binary).resolve().parent / 'python'
+        if bundled.is_file() and os.access(bundled, os.X_OK):
+            return str(bundled)
+    try:
+        import uno  # noqa: F401
+        return sys.executable
+    except ImportError:
+        return None
+
+
+class SofficeWorker:
+    """One headless LibreOffice instance with a private profile"""
+
+    def __init__(self, binary: str, worker_id: int, uno_python: Optional[str]):
+        self.binary = binary
+        self.worker_id = worker_id
+        self.port = BASE_PORT + worker_id
+        self.profile_dir = PROFILE_ROOT / f"worker-{worker_id}"
+        self.uno_python = uno_python
+        self.jobs = 0
+        self.process: Optional[subprocess.Popen] = None
+        self.bridge: Optional[subprocess.Popen] = None
+
+    @property
+    def use_uno(self) -> bool:
+        return self.uno_python is not None
+
+    @property
+    def profile_url(self) -> str:
+        return self.profile_dir.resolve().as_uri()
+
+    def _base_args(self) -> List[str]:
+        return [
+            self.binary,
+            '--headless',
+            '--invisible',
+            '--nologo',
+            '--norestore',
+            '--nofirststartwizard',
+            '--nodefault',
+            f'-env:UserInstallation={self.profile_url}',
+        ]
+
+    def start(self):
+        """Start the soffice listener and connect to it (no-op in subprocess mode)"""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.jobs = 0
+        if not self.use_uno:
+            return
+        self.process = subprocess.Popen(
+            self._base_args() + [f'--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=_soffice_env(),
+        )
+        bridge_env = _soffice_env()
+        if self.uno_python != sys.executable:
+            # LibreOffice's Python must not pick up this runtime's module paths
+            bridge_env.pop('PYTHONPATH', None)
+            bridge_env.pop('PYTHONHOME', None)
+        self.bridge = subprocess.Popen(
+            [self.uno_python, str(BRIDGE_SCRIPT), str(self.port), str(STARTUP_TIMEOUT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            env=bridge_env,
+        )
+        # The bridge retries the connection itself and answers within STARTUP_TIMEOUT
+        try:
+            self._read_reply()
+        except Exception as e:
+            self.kill()
+            self.stop()
+            raise RuntimeError(f"soffice worker {self.worker_id} did not accept connections: {e}")
+        print(f"soffice worker {self.worker_id} ready on port {self.port}")
+
+    def _request(self, **request):
+        self.bridge.stdin.write(json.dumps(request) + '\n')
+        self.bridge.stdin.flush()
+        self._read_reply()
+
+    def _read_reply(self):
+        line = self.bridge.stdout.readline()
+        if not line:
+            code = self.process.poll() if self.process is not None else None
+            raise RuntimeError(f"UNO bridge of soffice worker {self.worker_id} exited (soffice: {code})")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise RuntimeError(reply.get('error') or 'UNO bridge request failed')
+
+    def is_healthy(self) -> bool:
+        if not self.use_uno:
+            return self.profile_dir.exists()
+        for process in (self.process, self.bridge):
+            if process is None or process.poll() is not None:
+                return False
+        try:
+            self._request(op='ping')
+            return True
+        except Exception:
+            return False
+
+    def convert(self, word_path: Path, output_dir: Path, update_fields: bool) -> Path:
+        """
+        Convert one document to PDF
+
+        Args:
+            word_path: Local .docx path
+            output_dir: Directory for the PDF
+            update_fields: Refresh indexes (TOC) and fields before export
+
+        Returns:
+            Path of the generated PDF
+        """
+        self.jobs += 1
+        pdf_path = output_dir / f"{word_path.stem}.pdf"
+        if self.use_uno:
+            self._convert_uno(word_path, pdf_path, update_fields)
+        else:
+            self._convert_subprocess(word_path, output_dir, update_fields)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF not generated: {pdf_path}")
+        return pdf_path
+
+    def _convert_uno(self, word_path: Path, pdf_path: Path, update_fields: bool):
+        # A hung conversion cannot be interrupted over UNO; killing the processes fails the call
+        watchdog = threading.Timer(CONVERT_TIMEOUT, self.kill)
+        watchdog.start()
+        try:
+            self._request(
+                op='convert',
+                word=str(word_path.resolve()),
+                pdf=str(pdf_path.resolve()),
+                update_fields=update_fields,
+            )
+        finally:
+            watchdog.cancel()
+
+    def _convert_subprocess(self, word_path: Path, output_dir: Path, update_fields: bool):
+        cmd = self._base_args()
+        if update_fields:
+            cmd.append('--update')  # Update fields (TOC, etc.) before conversion
+        cmd += ['--convert-to', 'pdf', '--outdir', str(output_dir), str(word_path)]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=CONVERT_TIMEOUT,
+            env=_soffice_env(),
+            cwd=str(word_path.parent)
+        )
+        if result.returncode != 0:
+            print(f"STDOUT: {result.stdout}")
+            raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+
+    def kill(self):
+        for process in (self.process, self.bridge):
+            if process is not None and process.poll() is None:
+                process.kill()
+
+    def stop(self):
+        """Terminate the soffice process, keeping the profile for the next start"""
+        if self.bridge is not None:
+            if self.bridge.poll() is None:
+                try:
+                    self._request(op='terminate')
+                except Exception:
+                    pass
+            try:
+                self.bridge.stdin.close()
+                self.bridge.wait(timeout=10)
+            except Exception:
+                self.bridge.kill()
+                self.bridge.wait()
+            self.bridge.stdout.close()
+            self.bridge = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+
+class SofficePool:
+    """Fixed-size pool of warm LibreOffice workers"""
+
+    def __init__(self, size: int = POOL_SIZE, max_jobs: int = MAX_JOBS_PER_WORKER,
+                 binary: Optional[str] = None, use_uno: Optional[bool] = None,
+                 uno_python: Optional[str] = None):
+        self.size = max(1, size)
+        self.max_jobs = max(1, max_jobs)
+        self.binary = binary
+        if use_uno is False:
+            self.uno_python = None
+        else:
+            self.uno_python = uno_python or self._resolve_uno_python()
+            if self.uno_python is None:
+                if use_uno:
+                    raise RuntimeError("use_uno=True but no interpreter can import pyuno (set SOFFICE_PYTHON)")
+                print(
+                    "WARNING: soffice pool DEGRADED - no interpreter can import pyuno "
+                    "(set SOFFICE_PYTHON or ship LibreOffice's program/python); every PDF "
+                    "conversion will cold-start its own soffice process"
+                )
+            else:
+                print(f"soffice pool: UNO bridge runs under {self.uno_python}")
+        self._idle: queue.Queue = queue.Queue()
+        self._workers: List[SofficeWorker] = []
+        self._lock = threading.Lock()
+
+    @property
+    def use_uno(self) -> bool:
+        return self.uno_python is not None
+
+    def _resolve_uno_python(self) -> Optional[str]:
+        try:
+            binary = self.binary or find_soffice()
+        except RuntimeError:
+            binary = None
+        return find_uno_python(binary)
+
+    def _checkout(self, timeout: Optional[float]) -> SofficeWorker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._workers) < self.size:
+                worker = SofficeWorker(self.binary or find_soffice(), len(self._workers), self.uno_python)
+                self._workers.append(worker)
+                return worker
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No LibreOffice worker free after {timeout}s")
+
+    def convert(self, word_path: Path, output_dir: Path, update_fields: bool = True,
+                timeout: Optional[float] = None) -> Path:
+        """
+        Convert a document on the next free worker (blocks while all workers are busy)
+
+        Args:
+            word_path: Local .docx path
+            output_dir: Directory for the PDF
+            update_fields: Refresh fields (TOC) before export
+            timeout: Seconds to wait for a free worker (None waits indefinitely)
+
+        Returns:
+            Path of the generated PDF
+        """
+        worker = self._checkout(timeout)
+        try:
+            if not worker.is_healthy():
+                worker.stop()
+                worker.start()
+            return worker.convert(word_path, output_dir, update_fields)
+        except Exception:
+            # Never hand a worker in an unknown state to the next job
+            worker.stop()
+            raise
+        finally:
+            if worker.jobs >= self.max_jobs:
+                print(f"Recycling soffice worker {worker.worker_id} after {worker.jobs} jobs")
+                worker.stop()
+                worker.jobs = 0
+            self._idle.put(worker)
+
+    def shutdown(self):
+        for worker in self._workers:
+            worker.stop()
+
+
+_pool: Optional[SofficePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SofficePool:
+    """Process-wide pool, kept warm across invocations of a reused container"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SofficePool()
+        return _pool
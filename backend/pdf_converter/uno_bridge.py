@@ -0,0 +1,123 @@
+"""
+UNO bridge for one warm soffice worker
+
+Runs under an interpreter that can import pyuno - normally LibreOffice's own
+program/python, since the bundled pyuno is built against that Python rather
+than the Lambda runtime's. Connects to the worker's soffice listener and then
+serves requests from the pool, one JSON object per line:
+
+    {"op": "ping"}
+    {"op": "convert", "word": "/tmp/a.docx", "pdf": "/tmp/a.pdf", "update_fields": true}
+    {"op": "terminate"}
+
+Each request gets one JSON reply line: {"ok": true} or {"ok": false, "error": "..."}.
+The first line written is the connection result. Standalone: no imports from
+the converter package, and nothing newer than the Python LibreOffice bundles.
+
+Usage: python uno_bridge.py <port> <startup_timeout_seconds>
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def _props(**values):
+    from com.sun.star.beans import PropertyValue
+    result = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name, prop.Value = name, value
+        result.append(prop)
+    return tuple(result)
+
+
+def connect(port, timeout):
+    """Desktop of the soffice listening on port, retrying until timeout"""
+    import uno
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        'com.sun.star.bridge.UnoUrlResolver', local_context
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            context = resolver.resolve(
+                'uno:socket,host=127.0.0.1,port=%d;urp;StarOffice.ComponentContext' % port
+            )
+            return context.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', context)
+        except Exception:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.25)
+
+
+def convert(desktop, word_path, pdf_path, update_fields):
+    import uno
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(word_path), '_blank', 0, _props(Hidden=True, ReadOnly=True)
+    )
+    if doc is None:
+        raise RuntimeError('LibreOffice could not open %s' % os.path.basename(word_path))
+    try:
+        if update_fields:
+            indexes = doc.getDocumentIndexes()
+            for i in range(indexes.getCount()):
+                indexes.getByIndex(i).update()
+            doc.getTextFields().refresh()
+        doc.storeToURL(uno.systemPathToFileUrl(pdf_path), _props(FilterName='writer_pdf_Export'))
+    finally:
+        try:
+            doc.close(True)
+        except Exception:
+            pass
+
+
+def serve(desktop, requests, replies):
+    for line in requests:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        op = request.get('op')
+        try:
+            if op == 'ping':
+                desktop.getComponents()
+            elif op == 'convert':
+                convert(desktop, request['word'], request['pdf'], request.get('update_fields', True))
+            elif op == 'terminate':
+                try:
+                    desktop.terminate()
+                except Exception:
+                    pass  # The listener drops the bridge as it exits
+                reply(replies, ok=True)
+                return
+            else:
+                raise ValueError('unknown op %r' % op)
+            reply(replies, ok=True)
+        except Exception as e:
+            reply(replies, ok=False, error='%s: %s' % (type(e).__name__, e))
+
+
+def reply(replies, **payload):
+    replies.write(json.dumps(payload) + '\n')
+    replies.flush()
+
+
+def main(argv):
+    port, timeout = int(argv[1]), float(argv[2])
+    # Keep the protocol stream private: anything LibreOffice prints goes to stderr
+    replies = os.fdopen(os.dup(1), 'w')
+    os.dup2(2, 1)
+    try:
+        desktop = connect(port, timeout)
+    except Exception as e:
+        reply(replies, ok=False, error='%s: %s' % (type(e).__name__, e))
+        return 1
+    reply(replies, ok=True)
+    serve(desktop, sys.stdin, replies)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
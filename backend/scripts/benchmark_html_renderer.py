@@ -0,0 +1,131 @@
+"""
+Benchmark Service Definition HTML rendering on large rich-text blocks.
+
+Compares the previous BeautifulSoup renderer (html.parser + python-docx
+paragraph/run proxies, one paragraph insert per node) with the lxml renderer
+that emits OOXML elements directly.
+
+Usage:
+    python scripts/benchmark_html_renderer.py [blocks] [iterations]
+"""
+
+from pathlib import Path
+import copy
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.text.paragraph import Paragraph
+from app.utils.html_to_ooxml import HtmlRenderer
+
+TEMPLATE = Path(__file__).parent.parent / "templates" / "service_description_template.docx"
+
+BLOCK = (
+    "<h3>Capability {n}</h3>"
+    "<p>Our <strong>cloud support</strong> service covers <em>discovery</em>, migration and "
+    "<strong>run <em>operations</em></strong> for {n} workloads.<br>Delivered by cleared staff.</p>"
+    "<ul><li>Assessment and <b>planning</b></li><li>Landing zone build</li><li>Managed service</li></ul>"
+    "<ol><li>Engage</li><li>Design</li><li>Deliver</li></ol>"
+    "<p>Further detail on approach, governance, security and assurance for capability {n}.</p>"
+)
+
+
+def _insert_paragraph_after(paragraph, text='', style_name=None):
+    new_p = OxmlElement('w:p')
+    paragraph._p.addnext(new_p)
+    new_para = Paragraph(new_p, paragraph._parent)
+    if text:
+        new_para.add_run(text)
+    if style_name:
+        new_para.style = style_name
+    return new_para
+
+
+def legacy(doc, after_para, html):
+    """Previous renderer (images omitted: none in the benchmark content)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def render_inline(run, node):
+        if node.name in ('strong', 'b'):
+            run.add_text(node.get_text())
+            run.bold = True
+            return
+        if node.name in ('em', 'i'):
+            run.add_text(node.get_text())
+            run.italic = True
+            return
+        if node.name == 'br':
+            run.add_break()
+            return
+        run.add_text(node if isinstance(node, str) else node.get_text())
+
+    def add_paragraph_with_inlines(text_or_node, style_name=None):
+        p = _insert_paragraph_after(after_para, '')
+        if style_name:
+            p.style = style_name
+        if isinstance(text_or_node, str):
+            p.add_run(text_or_node)
+        else:
+            for child in text_or_node.children:
+                if isinstance(child, str):
+                    p.add_run(child)
+                elif child.name in ['strong', 'b', 'em', 'i', 'br']:
+                    render_inline(p.add_run(''), child)
+                else:
+                    p.add_run(child.get_text())
+        return p
+
+    last = after_para
+    for el in soup.contents:
+        if isinstance(el, str) and el.strip():
+            last = add_paragraph_with_inlines(el, None)
+        elif getattr(el, 'name', None):
+            name = el.name.lower()
+            if name == 'h3':
+                last = add_paragraph_with_inlines(el, 'Heading 3')
+            elif name == 'p':
+                last = add_paragraph_with_inlines(el, 'Normal')
+            elif name in ['ul', 'ol']:
+                for li in el.find_all('li', recursive=False):
+                    last = _insert_paragraph_after(last, li.get_text(), 'List Bullet' if name == 'ul' else 'List Number')
+            elif name == 'br':
+                last = _insert_paragraph_after(last, '')
+            else:
+                last = add_paragraph_with_inlines(el, 'Normal')
+    return last
+
+
+def lxml_renderer(doc, after_para, html):
+    return HtmlRenderer(doc, lambda src: None).render(after_para._p, html)
+
+
+def measure(fn, prototype, html, iterations):
+    docs = [copy.deepcopy(prototype) for _ in range(iterations)]
+    anchors = [d.add_paragraph('') for d in docs]
+    start = time.perf_counter()
+    for d, anchor in zip(docs, anchors):
+        fn(d, anchor, html)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    html = "".join(BLOCK.format(n=n) for n in range(blocks))
+    prototype = Document(str(TEMPLATE))
+    print(f"HTML: {len(html) / 1024:.0f} KiB ({blocks} blocks), {iterations} iterations")
+    results = {}
+    for name, fn in (("BeautifulSoup", legacy), ("lxml direct", lxml_renderer)):
+        results[name] = measure(fn, prototype, html, iterations)
+        print(f"{name:>14}: {results[name] * 1000:8.1f} ms/render")
+    old_t, new_t = results.values()
+    print(f"{'speedup':>14}: {old_t / new_t:8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
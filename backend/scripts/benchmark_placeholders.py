@@ -0,0 +1,114 @@
+"""
+Benchmark placeholder substitution on the stock Service Description template.
+
+Compares the previous three-pass approach (run-level title fallback, per-node
+mapping loop over w:t/a:t, then rewriting the saved .docx archive) with the
+single-pass compiled engine followed by a plain save.
+
+Usage:
+    python scripts/benchmark_placeholders.py [iterations]
+"""
+
+from pathlib import Path
+import copy
+import io
+import sys
+import time
+import tracemalloc
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from docx import Document
+from app.utils.docx_placeholders import replace_placeholders
+
+TEMPLATE = Path(__file__).parent.parent / "templates" / "service_description_template.docx"
+MAPPING = {
+    'ENTER SERVICE NAME HERE': 'Benchmark Service',
+    'Enter Service Name Here': 'Benchmark Service',
+    'enter service name here': 'Benchmark Service',
+    'Add Title': 'Benchmark Service',
+    '{{SERVICE_NAME}}': 'Benchmark Service',
+}
+NS = {
+    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+}
+
+
+def legacy(doc):
+    """Previous pipeline: run fallback + w:t mapping loop + saved-archive rewrite"""
+    from zipfile import ZipFile, ZIP_DEFLATED
+    for p in doc.paragraphs:
+        for r in p.runs:
+            for placeholder in MAPPING:
+                if placeholder in r.text:
+                    r.text = r.text.replace(placeholder, MAPPING[placeholder])
+    try:
+        # Mirrors the old code exactly, including the swallowed TypeError that
+        # BaseOxmlElement.xpath() raises for the namespaces= keyword
+        for xpath in ('.//w:t', './/a:t'):
+            for t in doc._element.xpath(xpath, namespaces=NS):
+                if t.text:
+                    replaced = t.text
+                    for old, new in MAPPING.items():
+                        if old in replaced:
+                            replaced = replaced.replace(old, new)
+                    if replaced != t.text:
+                        t.text = replaced
+    except Exception:
+        pass
+    saved = io.BytesIO()
+    doc.save(saved)
+    saved.seek(0)
+    out = io.BytesIO()
+    with ZipFile(saved, 'r') as zin, ZipFile(out, 'w', ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename.startswith('word/') and item.filename.endswith('.xml'):
+                text = data.decode('utf-8')
+                for old, new in MAPPING.items():
+                    if old in text:
+                        text = text.replace(old, new)
+                data = text.encode('utf-8')
+            zout.writestr(item, data)
+    return out.getvalue()
+
+
+def single_pass(doc):
+    """New pipeline: compiled single-pass substitution + one save"""
+    replace_placeholders(doc, MAPPING)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def measure(fn, prototype, iterations):
+    docs = [copy.deepcopy(prototype) for _ in range(iterations)]
+    start = time.perf_counter()
+    for d in docs:
+        fn(d)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    fn(copy.deepcopy(prototype))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    prototype = Document(str(TEMPLATE))
+    print(f"Template: {TEMPLATE.name} ({TEMPLATE.stat().st_size / 1024:.0f} KiB), {iterations} iterations")
+    results = {}
+    for name, fn in (("legacy three-pass", legacy), ("single-pass", single_pass)):
+        elapsed, peak = measure(fn, prototype, iterations)
+        results[name] = (elapsed, peak)
+        print(f"{name:>18}: {elapsed * 1000:8.1f} ms/doc   peak alloc {peak / 1024 / 1024:6.2f} MiB")
+    (old_t, old_m), (new_t, new_m) = results.values()
+    print(f"{'saving':>18}: {(1 - new_t / old_t) * 100:8.1f} % time   {(1 - new_m / old_m) * 100:6.1f} % peak alloc")
+
+
+if __name__ == "__main__":
+    main()
@@ -233,8 +233,8 @@ def read_document_content(service_name: str, doc_type: str, lot: str, gcloud_ver
         # doc_path is (blob_key, None) indicating Azure Blob Storage
         blob_key = doc_path[0]
         try:
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
+            from app.services.azure_blob_service import get_azure_blob_service
+            azure_blob_service = get_azure_blob_service()
             
             # Download document from Azure Blob Storage to memory
             doc_bytes = azure_blob_service.get_file_bytes(blob_key)
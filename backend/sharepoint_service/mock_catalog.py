@@ -0,0 +1,303 @@
+"""
+In-memory catalog of the local mock_sharepoint tree
+
+    GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{service folder}/{file}
+
+Search, folder listings and the proposals dashboards read service folders, their
+OWNER metadata and document mtimes from here instead of walking the tree with
+iterdir/glob/exists/stat on every request. Each OWNER file is parsed once and
+re-parsed only when its mtime moves.
+
+Changes are picked up from inotify events when watchdog is installed, otherwise
+by polling directory mtimes at most every MOCK_CATALOG_POLL_SECONDS. inotify does
+not see writes made by other hosts on a network share, so set
+MOCK_CATALOG_WATCH=poll there. Polling sees files being created, removed or
+renamed (the directory mtime moves) but not in-place rewrites, so writers in this
+process call note_change().
+"""
+
+import os
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sharepoint_service.name_index import ServiceNameIndex
+
+logger = logging.getLogger(__name__)
+
+LOT_PREFIX = "Cloud Support Services LOT "
+
+FolderKey = Tuple[str, str, str]
+
+
+@dataclass
+class FolderRecord:
+    """A service folder: parsed OWNER metadata plus file name -> mtime"""
+    gcloud_version: str
+    lot: str
+    name: str
+    path: Path
+    mtime_ns: int
+    files: Dict[str, float] = field(default_factory=dict)
+    metadata: Optional[Dict[str, str]] = None
+    metadata_file: Optional[str] = None
+
+    def document(self, doc_type: str) -> Optional[Path]:
+        """
+        Path of the SERVICE DESC / Pricing Doc, preferring the completed file over its draft
+
+        Returns:
+            Path or None if neither file exists
+        """
+        if doc_type not in ("SERVICE DESC", "Pricing Doc"):
+            return None
+        filename = f"PA GC{self.gcloud_version} {doc_type} {self.name}.docx"
+        for candidate in (filename, filename.replace('.docx', '_draft.docx')):
+            if candidate in self.files:
+                return self.path / candidate
+        return None
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _subdirs(path: Path) -> List[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            return sorted((entry for entry in entries if entry.is_dir()), key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+
+class MockCatalog:
+    """
+    Catalog of one mock_sharepoint base directory
+
+    Args:
+        base_path: mock_sharepoint root
+        parse_metadata: OWNER file content -> metadata dict (or None)
+        poll_seconds: Minimum interval between mtime polls (MOCK_CATALOG_POLL_SECONDS, default 2)
+        watch: "auto" (inotify via watchdog when importable) or "poll" (MOCK_CATALOG_WATCH)
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        parse_metadata: Callable[[str], Optional[Dict[str, str]]],
+        poll_seconds: Optional[float] = None,
+        watch: Optional[str] = None
+    ):
+        self.base_path = Path(base_path)
+        self.parse_metadata = parse_metadata
+        self.poll_seconds = poll_seconds if poll_seconds is not None else float(os.environ.get("MOCK_CATALOG_POLL_SECONDS", "2"))
+        self._folders: Dict[FolderKey, FolderRecord] = {}
+        # LOT directory -> (mtime_ns when listed, service folder names)
+        self._lots: Dict[Path, Tuple[int, List[str]]] = {}
+        self._name_indexes: Dict[Tuple[str, str], ServiceNameIndex] = {}
+        self._dirty: Set[Path] = set()
+        self._structure_dirty = True
+        self._synced_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._observer = None
+        self.syncs = 0
+        self.folder_scans = 0
+        if (watch or os.environ.get("MOCK_CATALOG_WATCH", "auto")).lower() != "poll":
+            self._start_watcher()
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def _start_watcher(self):
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            logger.info("watchdog not installed; mock SharePoint catalog will poll directory mtimes")
+            return
+
+        catalog = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                catalog.note_change(event.src_path)
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path:
+                    catalog.note_change(dest_path)
+
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_Handler(), str(self.base_path), recursive=True)
+            observer.start()
+            self._observer = observer
+        except Exception as e:
+            logger.warning(f"Could not watch {self.base_path}, polling instead: {e}")
+
+    def stop(self):
+        """Stop the filesystem watcher (the catalog keeps working by polling)"""
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
+
+    def note_change(self, path):
+        """Mark the service folder containing path (or the tree layout) as changed"""
+        try:
+            parts = Path(path).relative_to(self.base_path).parts
+        except ValueError:
+            return
+        with self._lock:
+            if len(parts) >= 4:
+                self._dirty.add(self.base_path.joinpath(*parts[:4]))
+            if len(parts) <= 4 or not self._known_folder(parts):
+                # A version, LOT or service folder itself was added, removed or renamed
+                self._structure_dirty = True
+
+    def _known_folder(self, parts: Tuple[str, ...]) -> bool:
+        if not parts[0].startswith("GCloud ") or not parts[2].startswith(LOT_PREFIX):
+            return False
+        return (parts[0][len("GCloud "):], parts[2][len(LOT_PREFIX):], parts[3]) in self._folders
+
+    def invalidate(self):
+        """Re-stat every folder on the next read"""
+        with self._lock:
+            self._structure_dirty = True
+            self._lots.clear()
+            for record in self._folders.values():
+                record.mtime_ns = -1
+
+    def _scan_folder(self, version: str, lot: str, path: Path, previous: Optional[FolderRecord]) -> FolderRecord:
+        self.folder_scans += 1
+        record = FolderRecord(version, lot, path.name, path, _mtime_ns(path) or 0)
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        record.files[entry.name] = entry.stat().st_mtime
+        except OSError as e:
+            logger.warning(f"Error scanning {path}: {e}")
+        owner_files = sorted(name for name in record.files if name.startswith("OWNER") and name.endswith(".txt"))
+        if owner_files:
+            record.metadata_file = owner_files[0]
+            unchanged = previous is not None and previous.metadata_file == record.metadata_file \
+                and previous.files.get(record.metadata_file) == record.files[record.metadata_file]
+            if unchanged:
+                record.metadata = previous.metadata
+            else:
+                try:
+                    with open(path / record.metadata_file, 'r', encoding='utf-8') as f:
+                        record.metadata = self.parse_metadata(f.read())
+                except Exception as e:
+                    logger.error(f"Error reading metadata file {path / record.metadata_file}: {e}")
+        return record
+
+    def _lot_dirs(self) -> List[Tuple[str, str, Path]]:
+        lots = []
+        for version_dir in _subdirs(self.base_path):
+            if not version_dir.name.startswith("GCloud "):
+                continue
+            version = version_dir.name[len("GCloud "):]
+            for lot_dir in _subdirs(Path(version_dir.path) / "PA Services"):
+                if lot_dir.name.startswith(LOT_PREFIX):
+                    lots.append((version, lot_dir.name[len(LOT_PREFIX):], Path(lot_dir.path)))
+        return lots
+
+    def _sync(self):
+        """Re-list LOT directories and re-scan service folders whose mtime moved"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._structure_dirty = False
+            folders: Dict[FolderKey, FolderRecord] = {}
+            lots: Dict[Path, Tuple[int, List[str]]] = {}
+            for version, lot, lot_path in self._lot_dirs():
+                lot_mtime = _mtime_ns(lot_path)
+                listed = self._lots.get(lot_path)
+                if listed is not None and listed[0] == lot_mtime:
+                    names = listed[1]
+                else:
+                    names = [entry.name for entry in _subdirs(lot_path)]
+                    self._name_indexes.pop((version, lot), None)
+                lots[lot_path] = (lot_mtime, names)
+                for name in names:
+                    key = (version, lot, name)
+                    path = lot_path / name
+                    previous = self._folders.get(key)
+                    if previous is None or path in dirty or _mtime_ns(path) != previous.mtime_ns:
+                        if not path.is_dir():
+                            continue
+                        folders[key] = self._scan_folder(version, lot, path, previous)
+                    else:
+                        folders[key] = previous
+            for version, lot in {key[:2] for key in self._folders} - {key[:2] for key in folders}:
+                self._name_indexes.pop((version, lot), None)
+            self._folders = folders
+            self._lots = lots
+            self._synced_at = time.monotonic()
+            self.syncs += 1
+
+    def _refresh_dirty(self):
+        """Re-scan only the folders reported by note_change"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for key, record in list(self._folders.items()):
+                if record.path in dirty:
+                    if record.path.is_dir():
+                        self._folders[key] = self._scan_folder(record.gcloud_version, record.lot, record.path, record)
+                    else:
+                        del self._folders[key]
+                        self._name_indexes.pop(key[:2], None)
+
+    def _revalidate(self):
+        with self._lock:
+            if self._synced_at is None or self._structure_dirty:
+                self._sync()
+            elif not self.watching and time.monotonic() - self._synced_at >= self.poll_seconds:
+                self._sync()
+            elif self._dirty:
+                self._refresh_dirty()
+
+    def folders(self, gcloud_version: Optional[str] = None, lot: Optional[str] = None) -> List[FolderRecord]:
+        """Service folders (optionally of one version/LOT), ordered by version, LOT and name"""
+        self._revalidate()
+        with self._lock:
+            return [
+                record for key, record in sorted(self._folders.items())
+                if (gcloud_version is None or key[0] == gcloud_version) and (lot is None or key[1] == lot)
+            ]
+
+    def folder(self, gcloud_version: str, lot: str, name: str) -> Optional[FolderRecord]:
+        self._revalidate()
+        with self._lock:
+            return self._folders.get((gcloud_version, lot, name))
+
+    def name_index(self, gcloud_version: str, lot: str) -> ServiceNameIndex:
+        """Fuzzy service-name index over one LOT's folders (rebuilt when folders come or go)"""
+        self._revalidate()
+        with self._lock:
+            index = self._name_indexes.get((gcloud_version, lot))
+            if index is None:
+                names = [key[2] for key in self._folders if key[:2] == (gcloud_version, lot)]
+                index = self._name_indexes[(gcloud_version, lot)] = ServiceNameIndex(names)
+            return index
+
+    def versions(self) -> List[str]:
+        self._revalidate()
+        with self._lock:
+            return sorted({key[0] for key in self._folders})
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "folders": len(self._folders),
+                "watching": self.watching,
+                "syncs": self.syncs,
+                "folder_scans": self.folder_scans,
+            }
@@ -5,10 +5,13 @@ Mimics SharePoint operations using local file system.
 
 import os
 import re
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple
 import logging
 
+from sharepoint_service.mock_catalog import LOT_PREFIX, FolderRecord, MockCatalog
+
 logger = logging.getLogger(__name__)
 
 # Base path for mock SharePoint structure. Support multiple deployment layouts.
@@ -57,9 +60,90 @@ def fuzzy_match(query: str, service_name: str) -> bool:
     return query_clean in service_clean or service_clean in query_clean
 
 
+def parse_metadata_content(content: str) -> Optional[Dict[str, str]]:
+    """
+    Parse the SERVICE, OWNER, SPONSOR and LAST EDITED BY lines of an OWNER metadata file.
+    
+    Args:
+        content: Text of the metadata file
+        
+    Returns:
+        Dict with 'service', 'owner', 'sponsor', 'last_edited_by' or None if none are present
+    """
+    # Parse format:
+    # 1. SERVICE: [Service Name]
+    # 2. OWNER: [First name] [Last name]
+    # 3. SPONSOR: [First name] [Last name]
+    # 4. LAST EDITED BY: [First name] [Last name] (optional)
+    
+    service_match = re.search(r'1\.\s*SERVICE:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    owner_match = re.search(r'2\.\s*OWNER:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    sponsor_match = re.search(r'3\.\s*SPONSOR:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    last_edited_match = re.search(r'4\.\s*LAST EDITED BY:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    
+    metadata = {}
+    if service_match:
+        metadata['service'] = service_match.group(1).strip()
+    if owner_match:
+        metadata['owner'] = owner_match.group(1).strip()
+    if sponsor_match:
+        metadata['sponsor'] = sponsor_match.group(1).strip()
+    if last_edited_match:
+        metadata['last_edited_by'] = last_edited_match.group(1).strip()
+    
+    return metadata if metadata else None
+
+
+_catalogs: Dict[str, MockCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_mock_catalog(base_path: Optional[Path] = None) -> Optional[MockCatalog]:
+    """
+    Process-wide catalog of the mock SharePoint tree.
+    
+    Args:
+        base_path: Tree root (defaults to MOCK_BASE_PATH)
+        
+    Returns:
+        MockCatalog, or None when there is no local tree (Azure)
+    """
+    base_path = base_path or MOCK_BASE_PATH
+    if base_path is None:
+        return None
+    key = str(base_path)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = MockCatalog(Path(base_path), parse_metadata_content)
+        return _catalogs[key]
+
+
+def note_local_change(path) -> None:
+    """Tell the catalog about a file or folder this process wrote or deleted under the mock tree."""
+    with _catalogs_lock:
+        catalogs = list(_catalogs.values())
+    for catalog in catalogs:
+        catalog.note_change(path)
+
+
+def _catalog_folder(folder_path: Path) -> Optional[FolderRecord]:
+    """Catalog record for a service folder path, or None if it is outside the catalogued taxonomy"""
+    catalog = get_mock_catalog()
+    if catalog is None:
+        return None
+    try:
+        parts = Path(folder_path).relative_to(catalog.base_path).parts
+    except ValueError:
+        return None
+    if len(parts) != 4 or not parts[0].startswith("GCloud ") or not parts[2].startswith(LOT_PREFIX):
+        return None
+    return catalog.folder(parts[0][len("GCloud "):], parts[2][len(LOT_PREFIX):], parts[3])
+
+
 def read_metadata_file(folder_path: Path) -> Optional[Dict[str, str]]:
     """
     Read metadata .txt file and parse SERVICE, OWNER, SPONSOR, LAST EDITED BY.
+    Service folders under MOCK_BASE_PATH are answered from the catalog.
     
     Args:
         folder_path: Path to service folder containing metadata file
@@ -67,8 +151,12 @@ def read_metadata_file(folder_path: Path) -> Optional[Dict[str, str]]:
     Returns:
         Dict with 'service', 'owner', 'sponsor', 'last_edited_by' or None if not found
     """
+    record = _catalog_folder(folder_path)
+    if record is not None:
+        return dict(record.metadata) if record.metadata else None
+    
     # Find .txt file starting with "OWNER"
-    txt_files = list(folder_path.glob("OWNER*.txt"))
+    txt_files = sorted(Path(folder_path).glob("OWNER*.txt"))
     if not txt_files:
         return None
     
@@ -76,31 +164,7 @@ def read_metadata_file(folder_path: Path) -> Optional[Dict[str, str]]:
     
     try:
         with open(metadata_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Parse format:
-        # 1. SERVICE: [Service Name]
-        # 2. OWNER: [First name] [Last name]
-        # 3. SPONSOR: [First name] [Last name]
-        # 4. LAST EDITED BY: [First name] [Last name] (optional)
-        
-        service_match = re.search(r'1\.\s*SERVICE:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        owner_match = re.search(r'2\.\s*OWNER:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        sponsor_match = re.search(r'3\.\s*SPONSOR:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        last_edited_match = re.search(r'4\.\s*LAST EDITED BY:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        
-        metadata = {}
-        if service_match:
-            metadata['service'] = service_match.group(1).strip()
-        if owner_match:
-            metadata['owner'] = owner_match.group(1).strip()
-        if sponsor_match:
-            metadata['sponsor'] = sponsor_match.group(1).strip()
-        if last_edited_match:
-            metadata['last_edited_by'] = last_edited_match.group(1).strip()
-        
-        return metadata if metadata else None
-        
+            return parse_metadata_content(f.read())
     except Exception as e:
         logger.error(f"Error reading metadata file {metadata_file}: {e}")
         return None
@@ -138,25 +202,18 @@ def search_documents(query: str, doc_type: Optional[str] = None, gcloud_version:
     # Determine which versions to search
     versions_to_search = ["14", "15"] if search_all_versions else [gcloud_version]
     
+    catalog = get_mock_catalog()
+    if catalog is None:
+        return results
+    
     for version in versions_to_search:
-        base_path = MOCK_BASE_PATH / f"GCloud {version}" / "PA Services"
-        
         # Search all LOTs (2, 2a, 2b, 3)
         for lot in ["2", "2a", "2b", "3"]:
-            lot_folder = base_path / f"Cloud Support Services LOT {lot}"
-            
-            if not lot_folder.exists():
-                continue
-            
-            # Iterate through service folders
-            for service_folder in lot_folder.iterdir():
-                if not service_folder.is_dir():
-                    continue
+            for folder in catalog.folders(version, lot):
+                service_name = folder.name
                 
-                service_name = service_folder.name
-                
-                # Read metadata
-                metadata = read_metadata_file(service_folder)
+                # Metadata was parsed when the folder was catalogued
+                metadata = folder.metadata
                 if not metadata:
                     continue
                 
@@ -168,17 +225,10 @@ def search_documents(query: str, doc_type: Optional[str] = None, gcloud_version:
                 # In real SharePoint, we'd check if documents exist
                 doc_types = []
                 
-                # Check if documents exist, otherwise assume both types are available
-                service_desc_path = service_folder / f"PA GC{version} SERVICE DESC {service_folder.name}.docx"
-                pricing_doc_path = service_folder / f"PA GC{version} Pricing Doc {service_folder.name}.docx"
-                
-                # Also check for draft files
-                service_desc_draft_path = service_folder / f"PA GC{version} SERVICE DESC {service_folder.name}_draft.docx"
-                pricing_doc_draft_path = service_folder / f"PA GC{version} Pricing Doc {service_folder.name}_draft.docx"
-                
-                if service_desc_path.exists() or service_desc_draft_path.exists() or not doc_type or doc_type == "SERVICE DESC":
+                # Regular or draft files, from the catalogued file names
+                if folder.document("SERVICE DESC") or not doc_type or doc_type == "SERVICE DESC":
                     doc_types.append("SERVICE DESC")
-                if pricing_doc_path.exists() or pricing_doc_draft_path.exists() or not doc_type or doc_type == "Pricing Doc":
+                if folder.document("Pricing Doc") or not doc_type or doc_type == "Pricing Doc":
                     doc_types.append("Pricing Doc")
                 
                 # Filter by doc_type if specified
@@ -193,7 +243,7 @@ def search_documents(query: str, doc_type: Optional[str] = None, gcloud_version:
                         "service_name": metadata.get('service', service_name),
                         "owner": metadata.get('owner', ''),
                         "sponsor": metadata.get('sponsor', ''),
-                        "folder_path": str(service_folder),
+                        "folder_path": str(folder.path),
                         "doc_type": dt,
                         "lot": lot,
                         "gcloud_version": version
@@ -202,117 +252,136 @@ def search_documents(query: str, doc_type: Optional[str] = None, gcloud_version:
     return results
 
 
-def get_document_path(service_name: str, doc_type: str, lot: str, gcloud_version: str = "14") -> Optional[Path]:
+def _lot_resolver(lot: str, gcloud_version: str):
     """
-    Get path to document file.
-    Checks Azure Blob Storage if in Azure environment, otherwise checks local filesystem.
+    Document lookup for one LOT: (service_name, doc_type) -> location or None.
     
-    Args:
-        service_name: Service name
-        doc_type: Document type ("SERVICE DESC" or "Pricing Doc")
-        lot: LOT number ("2" or "3")
-        gcloud_version: GCloud version ("14" or "15")
-        
-    Returns:
-        Path to document file or None if not found
-        In Azure, returns a special marker object that read_document_content can handle
+    The folder names are fuzzy-matched through a precompiled ServiceNameIndex, so
+    resolving many services in the same LOT shares one index and one listing.
     """
-    import os
-    
     # Check if we're in Azure (has Azure Storage connection string)
     use_azure = bool(os.environ.get("AZURE_STORAGE_CONNECTION_STRING", ""))
     
     if use_azure:
         # In Azure: check Azure Blob Storage
         try:
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
+            from app.services.blob_index import get_blob_index
+            blob_index = get_blob_index()
             
-            # Search for matching service folders in Azure Blob Storage
             # Use service_name directly with spaces - NO normalization
             base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
-            blob_list = azure_blob_service.list_blobs(prefix=base_prefix)
+            names = blob_index.name_index(gcloud_version, lot)
             
-            # Find service folder using fuzzy match
-            service_folder_name = None
-            for blob_name in blob_list:
-                # Extract folder name from blob path
-                # Format: GCloud {version}/PA Services/Cloud Support Services LOT {lot}/{folder}/{filename}
-                parts = blob_name.split('/')
-                if len(parts) >= 4:
-                    folder_name = parts[3]
-                    if fuzzy_match(service_name, folder_name):
-                        service_folder_name = folder_name
-                        break
-            
-            if not service_folder_name:
-                return None
-            
-            # Determine filename - use service_folder_name (actual folder name) not service_name (search query)
-            # This ensures we match the filename format used when saving documents
-            if doc_type == "SERVICE DESC":
-                filename = f"PA GC{gcloud_version} SERVICE DESC {service_folder_name}.docx"
-                draft_filename = f"PA GC{gcloud_version} SERVICE DESC {service_folder_name}_draft.docx"
-            elif doc_type == "Pricing Doc":
-                filename = f"PA GC{gcloud_version} Pricing Doc {service_folder_name}.docx"
-                draft_filename = f"PA GC{gcloud_version} Pricing Doc {service_folder_name}_draft.docx"
-            else:
+            def resolve_azure(service_name: str, doc_type: str):
+                if doc_type not in ("SERVICE DESC", "Pricing Doc"):
+                    return None
+                # Best-ranked service folder for the fuzzy match
+                service_folder_name = names.best(service_name)
+                if not service_folder_name:
+                    return None
+                
+                # Use the actual folder name (not the search query) to match the saved filename
+                filename = f"PA GC{gcloud_version} {doc_type} {service_folder_name}.docx"
+                files = blob_index.folder_files(gcloud_version, lot, service_folder_name)
+                
+                # Try regular file first, then draft file
+                for candidate in (filename, filename.replace('.docx', '_draft.docx')):
+                    if candidate in files:
+                        # Tuple (blob_key, None) marks Azure Blob Storage for read_document_content
+                        return (f"{base_prefix}{service_folder_name}/{candidate}", None)
                 return None
             
-            # Try regular file first
-            blob_key = f"{base_prefix}{service_folder_name}/{filename}"
-            if azure_blob_service.blob_exists(blob_key):
-                # Return a special marker that read_document_content can handle
-                # We'll use a tuple (blob_key, None) to indicate Azure Blob Storage
-                return (blob_key, None)
-            
-            # If regular file doesn't exist, try draft file
-            draft_blob_key = f"{base_prefix}{service_folder_name}/{draft_filename}"
-            if azure_blob_service.blob_exists(draft_blob_key):
-                return (draft_blob_key, None)
-            
-            return None
+            return resolve_azure
         except Exception as e:
             logger.error(f"Error checking Azure Blob Storage: {e}")
             # Fall through to local filesystem check
     
-    # Local filesystem check (original logic)
-    base_path = MOCK_BASE_PATH / f"GCloud {gcloud_version}" / "PA Services"
-    lot_folder = base_path / f"Cloud Support Services LOT {lot}"
-    
-    # Find service folder (fuzzy match)
-    service_folder = None
-    for folder in lot_folder.iterdir():
-        if folder.is_dir() and fuzzy_match(service_name, folder.name):
-            service_folder = folder
-            break
-    
-    if not service_folder:
+    # Local filesystem check, answered from the catalog
+    catalog = get_mock_catalog()
+    if catalog is None:
+        return lambda service_name, doc_type: None
+    names = catalog.name_index(gcloud_version, lot)
+    
+    def resolve_local(service_name: str, doc_type: str) -> Optional[Path]:
+        # Best-ranked service folder for the fuzzy match that still exists
+        for folder_name in names.matches(service_name):
+            service_folder = catalog.folder(gcloud_version, lot, folder_name)
+            if service_folder:
+                # Regular file first, then draft file
+                return service_folder.document(doc_type)
         return None
     
-    # Determine filename - try regular file first, then draft file
-    if doc_type == "SERVICE DESC":
-        filename = f"PA GC{gcloud_version} SERVICE DESC {service_folder.name}.docx"
-        draft_filename = f"PA GC{gcloud_version} SERVICE DESC {service_folder.name}_draft.docx"
-    elif doc_type == "Pricing Doc":
-        filename = f"PA GC{gcloud_version} Pricing Doc {service_folder.name}.docx"
-        draft_filename = f"PA GC{gcloud_version} Pricing Doc {service_folder.name}_draft.docx"
-    else:
-        return None
+    return resolve_local
+
+
+def get_document_path(service_name: str, doc_type: str, lot: str, gcloud_version: str = "14") -> Optional[Path]:
+    """
+    Get path to document file.
+    Checks Azure Blob Storage if in Azure environment, otherwise checks local filesystem.
     
-    # Try regular file first
-    doc_path = service_folder / filename
-    if doc_path.exists():
-        return doc_path
+    Args:
+        service_name: Service name
+        doc_type: Document type ("SERVICE DESC" or "Pricing Doc")
+        lot: LOT number ("2" or "3")
+        gcloud_version: GCloud version ("14" or "15")
+        
+    Returns:
+        Path to document file or None if not found
+        In Azure, returns a special marker object that read_document_content can handle
+    """
+    return _lot_resolver(lot, gcloud_version)(service_name, doc_type)
+
+
+def get_document_paths_bulk(requests: Iterable[Tuple[str, str, str, str]]) -> List[Optional[Path]]:
+    """
+    Resolve many documents in one pass, sharing each LOT's listing and name index.
     
-    # If regular file doesn't exist, try draft file
-    draft_path = service_folder / draft_filename
-    if draft_path.exists():
-        return draft_path
+    Args:
+        requests: (service_name, doc_type, lot, gcloud_version) tuples
+        
+    Returns:
+        get_document_path results in request order
+    """
+    resolvers = {}
+    results = []
+    for service_name, doc_type, lot, gcloud_version in requests:
+        if (lot, gcloud_version) not in resolvers:
+            resolvers[(lot, gcloud_version)] = _lot_resolver(lot, gcloud_version)
+        results.append(resolvers[(lot, gcloud_version)](service_name, doc_type))
+    return results
+
+
+def find_service_folder(service_name: str, lot: str, gcloud_version: str = "15") -> Optional[Path]:
+    """
+    Existing local service folder best matching service_name (fuzzy).
     
+    Args:
+        service_name: Service name
+        lot: LOT number
+        gcloud_version: GCloud version
+        
+    Returns:
+        Folder path or None if no folder matches
+    """
+    catalog = get_mock_catalog()
+    if catalog is None:
+        return None
+    for folder_name in catalog.name_index(gcloud_version, lot).matches(service_name):
+        folder = catalog.folder(gcloud_version, lot, folder_name)
+        if folder:
+            return folder.path
     return None
 
 
+def _proposal_catalog():
+    """Proposal catalog write-through functions, or None where the app package is not importable"""
+    try:
+        from app.services import proposal_catalog
+        return proposal_catalog
+    except ImportError:
+        return None
+
+
 def create_folder(service_name: str, lot: str, gcloud_version: str = "15") -> Tuple[bool, str]:
     """
     Create folder structure for new proposal.
@@ -333,6 +402,9 @@ def create_folder(service_name: str, lot: str, gcloud_version: str = "15") -> Tu
         # In Azure/S3: folders are just prefixes, return the prefix path
         # Use service_name directly with spaces - NO normalization
         folder_path = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/"
+        catalog = _proposal_catalog()
+        if catalog:
+            catalog.record_folder(folder_path)
         return True, folder_path
     
     # Local filesystem: create actual directories
@@ -345,6 +417,10 @@ def create_folder(service_name: str, lot: str, gcloud_version: str = "15") -> Tu
     # Create service folder
     service_folder = lot_folder / service_name
     service_folder.mkdir(parents=True, exist_ok=True)
+    note_local_change(service_folder)
+    catalog = _proposal_catalog()
+    if catalog:
+        catalog.record_folder(service_folder)
     
     return True, str(service_folder)
 
@@ -383,8 +459,8 @@ def create_metadata_file(folder_path: str, service: str, owner: str, sponsor: st
         
         if use_azure:
             # In Azure: upload to Blob Storage
-            from app.services.azure_blob_service import AzureBlobService
-            azure_blob_service = AzureBlobService()
+            from app.services.azure_blob_service import get_azure_blob_service
+            azure_blob_service = get_azure_blob_service()
             
             # folder_path is a blob prefix in Azure (ends with /)
             if folder_path.endswith('/'):
@@ -394,12 +470,11 @@ def create_metadata_file(folder_path: str, service: str, owner: str, sponsor: st
             
             # Upload metadata file
             from io import BytesIO
-            content_bytes = BytesIO(content.encode('utf-8'))
-            blob_client = azure_blob_service.blob_service_client.get_blob_client(
-                container=azure_blob_service.container_name,
-                blob=blob_key
-            )
-            blob_client.upload_blob(content_bytes, overwrite=True)
+            content_bytes = content.encode('utf-8')
+            azure_blob_service.upload_stream(BytesIO(content_bytes), blob_key, length=len(content_bytes))
+            catalog = _proposal_catalog()
+            if catalog:
+                catalog.record_folder(folder_path, parse_metadata_content(content))
             return True
         else:
             # Local filesystem: create actual file
@@ -408,6 +483,10 @@ def create_metadata_file(folder_path: str, service: str, owner: str, sponsor: st
             metadata_path = folder / filename
             with open(metadata_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            note_local_change(metadata_path)
+            catalog = _proposal_catalog()
+            if catalog:
+                catalog.record_folder(folder, parse_metadata_content(content))
             return True
         
     except Exception as e:
@@ -426,25 +505,19 @@ def list_all_folders(gcloud_version: str = "14") -> List[Dict]:
         List of folders with metadata
     """
     results = []
-    base_path = MOCK_BASE_PATH / f"GCloud {gcloud_version}" / "PA Services"
+    catalog = get_mock_catalog()
+    if catalog is None:
+        return results
     
     for lot in ["2", "2a", "2b", "3"]:
-        lot_folder = base_path / f"Cloud Support Services LOT {lot}"
-        
-        if not lot_folder.exists():
-            continue
-        
-        for service_folder in lot_folder.iterdir():
-            if not service_folder.is_dir():
-                continue
-            
-            metadata = read_metadata_file(service_folder)
+        for folder in catalog.folders(gcloud_version, lot):
+            metadata = folder.metadata
             if metadata:
                 results.append({
-                    "service_name": metadata.get('service', service_folder.name),
+                    "service_name": metadata.get('service', folder.name),
                     "owner": metadata.get('owner', ''),
                     "sponsor": metadata.get('sponsor', ''),
-                    "folder_path": str(service_folder),
+                    "folder_path": str(folder.path),
                     "lot": lot,
                     "gcloud_version": gcloud_version
                 })
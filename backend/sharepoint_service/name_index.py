@@ -0,0 +1,106 @@
+"""
+Precompiled index for fuzzy service-name lookups
+
+fuzzy_match() treats a query and a folder name as matching when, lower-cased and
+without a trailing version marker (" v2"), either contains the other. Checking it
+against every folder costs two regex substitutions per candidate and returns
+whichever folder happens to be listed first. ServiceNameIndex normalises folder
+names once, narrows candidates with a trigram index and ranks the matches:
+
+    1. identical names (ignoring case and surrounding whitespace)
+    2. identical once version markers are removed
+    3. folder name containing the query
+    4. folder name contained in the query
+
+with ties broken by closest length, then by name.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+_VERSION_SUFFIX = re.compile(r'\s+v\d+\s*$')
+
+
+def normalise_service_name(name: str) -> str:
+    """Lower-cased, stripped name without a trailing version marker (as compared by fuzzy_match)"""
+    return _VERSION_SUFFIX.sub('', name.lower().strip())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ServiceNameIndex:
+    """Ranked fuzzy_match lookups over a fixed set of service folder names"""
+
+    def __init__(self, names: Iterable[str]):
+        self.names = sorted({name for name in names if name})
+        self._lower: Dict[str, str] = {}
+        self._clean: Dict[str, str] = {}
+        self._gram_counts: Dict[str, int] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # Names too short to have trigrams are checked on every lookup
+        self._short: List[str] = []
+        for name in self.names:
+            self._lower[name] = name.lower().strip()
+            clean = self._clean[name] = normalise_service_name(name)
+            grams = _trigrams(clean)
+            self._gram_counts[name] = len(grams)
+            if not grams:
+                self._short.append(name)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _candidates(self, query_clean: str) -> Iterable[str]:
+        grams = _trigrams(query_clean)
+        if not grams:
+            return self.names
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        # Folder names containing the query have every query trigram
+        candidates = set(postings[0]).intersection(*postings[1:]) if postings[0] else set()
+        # Folder names contained in the query have all of their trigrams in the query
+        hits = Counter()
+        for posting in postings:
+            hits.update(posting)
+        candidates.update(name for name, count in hits.items() if count == self._gram_counts[name])
+        candidates.update(self._short)
+        return candidates
+
+    def matches(self, query: str) -> List[str]:
+        """
+        Every folder name fuzzy_match(query, name) accepts, best first
+
+        Args:
+            query: Service name as entered or stored in metadata
+
+        Returns:
+            Ranked folder names (empty if none match)
+        """
+        if not query:
+            return []
+        query_lower = query.lower().strip()
+        query_clean = normalise_service_name(query)
+        ranked = []
+        for name in self._candidates(query_clean):
+            clean = self._clean[name]
+            if self._lower[name] == query_lower:
+                rank = 0
+            elif clean == query_clean:
+                rank = 1
+            elif query_clean in clean:
+                rank = 2
+            elif clean in query_clean:
+                rank = 3
+            else:
+                continue
+            ranked.append((rank, abs(len(clean) - len(query_clean)), name))
+        return [name for _, _, name in sorted(ranked)]
+
+    def best(self, query: str) -> Optional[str]:
+        """Best-ranked matching folder name, or None"""
+        matches = self.matches(query)
+        return matches[0] if matches else None
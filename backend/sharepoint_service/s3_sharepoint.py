@@ -5,18 +5,32 @@ Mirrors the mock_sharepoint interface using S3 buckets.
 
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List, Dict, Optional, Tuple
 import logging
 import boto3
 from botocore.exceptions import ClientError
 from io import BytesIO
 
+from sharepoint_service.name_index import ServiceNameIndex
+
 logger = logging.getLogger(__name__)
 
 # S3 client (will be initialized when needed)
 _s3_client = None
 _sharepoint_bucket_name = None
 
+LOT_FOLDER_RE = re.compile(r"^GCloud (?P<version>[^/]+)/PA Services/Cloud Support Services LOT (?P<lot>[^/]+)/(?P<folder>[^/]+)/?$")
+
+# (gcloud_version, lot) -> (monotonic scan time, folder name -> FolderScan)
+_scan_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, "FolderScan"]]] = {}
+_scan_lock = threading.Lock()
+# (gcloud_version, lot) -> (the scan it was built from, index of its folder names)
+_name_indexes: Dict[Tuple[str, str], Tuple[Dict[str, "FolderScan"], ServiceNameIndex]] = {}
+
 
 def get_s3_client():
     """Get or create S3 client"""
@@ -70,6 +84,12 @@ def read_metadata_file(folder_path: str) -> Optional[Dict[str, str]]:
     Returns:
         Dict with 'service', 'owner', 'sponsor', 'last_edited_by' or None if not found
     """
+    # Service folders are answered from the (cached) LOT scan
+    match = LOT_FOLDER_RE.match(folder_path)
+    if match:
+        folder = scan_lot(match['version'], match['lot']).get(match['folder'])
+        return folder.metadata if folder else None
+    
     bucket_name = get_sharepoint_bucket()
     if not bucket_name:
         logger.error("SHAREPOINT_BUCKET_NAME not set")
@@ -100,29 +120,7 @@ def read_metadata_file(folder_path: str) -> Optional[Dict[str, str]]:
         # Read metadata file
         obj_response = s3.get_object(Bucket=bucket_name, Key=metadata_key)
         content = obj_response['Body'].read().decode('utf-8')
-        
-        # Parse format:
-        # 1. SERVICE: [Service Name]
-        # 2. OWNER: [First name] [Last name]
-        # 3. SPONSOR: [First name] [Last name]
-        # 4. LAST EDITED BY: [First name] [Last name] (optional)
-        
-        service_match = re.search(r'1\.\s*SERVICE:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        owner_match = re.search(r'2\.\s*OWNER:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        sponsor_match = re.search(r'3\.\s*SPONSOR:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        last_edited_match = re.search(r'4\.\s*LAST EDITED BY:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        
-        metadata = {}
-        if service_match:
-            metadata['service'] = service_match.group(1).strip()
-        if owner_match:
-            metadata['owner'] = owner_match.group(1).strip()
-        if sponsor_match:
-            metadata['sponsor'] = sponsor_match.group(1).strip()
-        if last_edited_match:
-            metadata['last_edited_by'] = last_edited_match.group(1).strip()
-        
-        return metadata if metadata else None
+        return parse_metadata_content(content)
         
     except ClientError as e:
         logger.error(f"Error reading metadata file from S3: {e}")
@@ -132,6 +130,159 @@ def read_metadata_file(folder_path: str) -> Optional[Dict[str, str]]:
         return None
 
 
+def parse_metadata_content(content: str) -> Optional[Dict[str, str]]:
+    """
+    Parse an OWNER *.txt metadata file.
+    
+    Format:
+        1. SERVICE: [Service Name]
+        2. OWNER: [First name] [Last name]
+        3. SPONSOR: [First name] [Last name]
+        4. LAST EDITED BY: [First name] [Last name] (optional)
+    
+    Returns:
+        Dict with 'service', 'owner', 'sponsor', 'last_edited_by' or None if no field matched
+    """
+    service_match = re.search(r'1\.\s*SERVICE:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    owner_match = re.search(r'2\.\s*OWNER:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    sponsor_match = re.search(r'3\.\s*SPONSOR:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    last_edited_match = re.search(r'4\.\s*LAST EDITED BY:\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
+    
+    metadata = {}
+    if service_match:
+        metadata['service'] = service_match.group(1).strip()
+    if owner_match:
+        metadata['owner'] = owner_match.group(1).strip()
+    if sponsor_match:
+        metadata['sponsor'] = sponsor_match.group(1).strip()
+    if last_edited_match:
+        metadata['last_edited_by'] = last_edited_match.group(1).strip()
+    
+    return metadata if metadata else None
+
+
+@dataclass
+class FolderScan:
+    """One service folder as seen by a LOT scan"""
+    folder_name: str
+    folder_path: str
+    lot: str
+    gcloud_version: str
+    files: Dict[str, object] = field(default_factory=dict)  # file name -> BlobEntry
+    metadata: Optional[Dict[str, str]] = None
+    
+    @property
+    def metadata_key(self) -> Optional[str]:
+        for name in self.files:
+            if name.endswith('.txt') and 'OWNER' in name:
+                return self.folder_path + name
+        return None
+    
+    def document(self, doc_type: str):
+        """BlobEntry of the SERVICE DESC / Pricing Doc (regular file first, then draft) or None"""
+        filename = f"PA GC{self.gcloud_version} {doc_type} {self.folder_name}.docx"
+        return self.files.get(filename) or self.files.get(filename.replace('.docx', '_draft.docx'))
+
+
+def scan_lot(gcloud_version: str, lot: str, refresh: bool = False) -> Dict[str, FolderScan]:
+    """
+    All service folders of a LOT with their files and parsed metadata.
+    
+    One paginated listing of the LOT prefix is grouped by folder, then the OWNER
+    metadata files are fetched concurrently (S3_SCAN_MAX_WORKERS threads, default 8).
+    Results are reused for S3_SCAN_TTL_SECONDS (default 15) so the owner and admin
+    views, get_document_path and read_metadata_file share one scan.
+    
+    Args:
+        gcloud_version: GCloud version ("14" or "15")
+        lot: LOT number
+        refresh: Ignore a cached scan
+        
+    Returns:
+        Dict of folder name -> FolderScan (empty if the bucket is not configured or listing fails)
+    """
+    ttl = float(os.environ.get("S3_SCAN_TTL_SECONDS", "15"))
+    key = (gcloud_version, lot)
+    with _scan_lock:
+        cached = _scan_cache.get(key)
+    if cached and not refresh and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    bucket_name = get_sharepoint_bucket()
+    if not bucket_name:
+        logger.error("SHAREPOINT_BUCKET_NAME not set")
+        return {}
+    
+    from app.services.blob_index import BlobEntry
+    
+    s3 = get_s3_client()
+    lot_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
+    folders: Dict[str, FolderScan] = {}
+    try:
+        paginator = s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=lot_prefix):
+            for obj in page.get('Contents', []):
+                relative = obj['Key'][len(lot_prefix):]
+                if '/' not in relative:
+                    continue
+                folder_name, filename = relative.split('/', 1)
+                folder = folders.get(folder_name)
+                if folder is None:
+                    folder = folders[folder_name] = FolderScan(
+                        folder_name=folder_name,
+                        folder_path=f"{lot_prefix}{folder_name}/",
+                        lot=lot,
+                        gcloud_version=gcloud_version
+                    )
+                if filename and not filename.endswith('/'):
+                    folder.files[filename] = BlobEntry.from_s3_object(obj)
+    except ClientError as e:
+        logger.error(f"Error listing folders from S3: {e}")
+        return {}
+    
+    def load_metadata(folder: FolderScan):
+        try:
+            body = s3.get_object(Bucket=bucket_name, Key=folder.metadata_key)['Body'].read()
+            folder.metadata = parse_metadata_content(body.decode('utf-8'))
+        except Exception as e:
+            logger.warning(f"Error reading metadata file {folder.metadata_key}: {e}")
+    
+    with_metadata = [folder for folder in folders.values() if folder.metadata_key]
+    if with_metadata:
+        workers = min(int(os.environ.get("S3_SCAN_MAX_WORKERS", "8")), len(with_metadata))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(load_metadata, with_metadata))
+    
+    with _scan_lock:
+        _scan_cache[key] = (time.monotonic(), folders)
+    return folders
+
+
+def invalidate_scan_cache():
+    """Drop cached LOT scans (after this process writes or deletes objects)"""
+    with _scan_lock:
+        _scan_cache.clear()
+        _name_indexes.clear()
+
+
+def lot_name_index(gcloud_version: str, lot: str) -> Tuple[Dict[str, FolderScan], ServiceNameIndex]:
+    """
+    The LOT scan together with a fuzzy service-name index of its folders.
+    
+    The index is rebuilt only when scan_lot returns a new scan.
+    """
+    folders = scan_lot(gcloud_version, lot)
+    key = (gcloud_version, lot)
+    with _scan_lock:
+        cached = _name_indexes.get(key)
+        if cached and cached[0] is folders:
+            return folders, cached[1]
+    index = ServiceNameIndex(folders)
+    with _scan_lock:
+        _name_indexes[key] = (folders, index)
+    return folders, index
+
+
 def search_documents(query: str, doc_type: Optional[str] = None, gcloud_version: str = "14", search_all_versions: bool = False) -> List[Dict]:
     """
     Search documents in S3 SharePoint structure.
@@ -150,98 +301,46 @@ def search_documents(query: str, doc_type: Optional[str] = None, gcloud_version:
     if not query:
         return []
     
-    bucket_name = get_sharepoint_bucket()
-    if not bucket_name:
-        logger.error("SHAREPOINT_BUCKET_NAME not set")
-        return []
-    
-    s3 = get_s3_client()
     results = []
     
     # Determine which versions to search
     versions_to_search = ["14", "15"] if search_all_versions else [gcloud_version]
     
     for version in versions_to_search:
-        base_prefix = f"GCloud {version}/PA Services/"
-        
         # Search both LOT 2 and LOT 3
         for lot in ["2", "3"]:
-            lot_prefix = base_prefix + f"Cloud Support Services LOT {lot}/"
-            
-            try:
-                # List all service folders
-                paginator = s3.get_paginator('list_objects_v2')
-                pages = paginator.paginate(Bucket=bucket_name, Prefix=lot_prefix, Delimiter='/')
+            for service_folder_name, folder in scan_lot(version, lot).items():
+                metadata = folder.metadata
+                if not metadata:
+                    continue
                 
-                for page in pages:
-                    # Get common prefixes (folders)
-                    if 'CommonPrefixes' not in page:
-                        continue
-                    
-                    for prefix_info in page['CommonPrefixes']:
-                        service_prefix = prefix_info['Prefix']
-                        service_folder_name = service_prefix.rstrip('/').split('/')[-1]
-                        
-                        # Read metadata
-                        metadata = read_metadata_file(service_prefix)
-                        if not metadata:
-                            continue
-                        
-                        # Fuzzy match against service name
-                        if not fuzzy_match(query, service_folder_name):
-                            continue
-                        
-                        # Check for document types
-                        doc_types = []
-                        
-                        # Check if documents exist
-                        service_desc_key = f"{service_prefix}PA GC{version} SERVICE DESC {service_folder_name}.docx"
-                        pricing_doc_key = f"{service_prefix}PA GC{version} Pricing Doc {service_folder_name}.docx"
-                        service_desc_draft_key = f"{service_prefix}PA GC{version} SERVICE DESC {service_folder_name}_draft.docx"
-                        pricing_doc_draft_key = f"{service_prefix}PA GC{version} Pricing Doc {service_folder_name}_draft.docx"
-                        
-                        # Check if files exist
-                        try:
-                            s3.head_object(Bucket=bucket_name, Key=service_desc_key)
-                            doc_types.append("SERVICE DESC")
-                        except ClientError:
-                            try:
-                                s3.head_object(Bucket=bucket_name, Key=service_desc_draft_key)
-                                doc_types.append("SERVICE DESC")
-                            except ClientError:
-                                if not doc_type or doc_type == "SERVICE DESC":
-                                    doc_types.append("SERVICE DESC")
-                        
-                        try:
-                            s3.head_object(Bucket=bucket_name, Key=pricing_doc_key)
-                            doc_types.append("Pricing Doc")
-                        except ClientError:
-                            try:
-                                s3.head_object(Bucket=bucket_name, Key=pricing_doc_draft_key)
-                                doc_types.append("Pricing Doc")
-                            except ClientError:
-                                if not doc_type or doc_type == "Pricing Doc":
-                                    doc_types.append("Pricing Doc")
-                        
-                        # Filter by doc_type if specified
-                        if doc_type:
-                            if doc_type not in doc_types:
-                                doc_types = [doc_type]
-                        
-                        # Add results for each document type
-                        for dt in doc_types:
-                            results.append({
-                                "service_name": metadata.get('service', service_folder_name),
-                                "owner": metadata.get('owner', ''),
-                                "sponsor": metadata.get('sponsor', ''),
-                                "folder_path": service_prefix,
-                                "doc_type": dt,
-                                "lot": lot,
-                                "gcloud_version": version
-                            })
-            except ClientError as e:
-                logger.error(f"Error searching S3: {e}")
-                continue
+                # Fuzzy match against service name
+                if not fuzzy_match(query, service_folder_name):
+                    continue
+                
+                # Document types present in the folder listing (regular or draft);
+                # a requested type is reported even when the file does not exist yet
+                doc_types = []
+                for dt in ("SERVICE DESC", "Pricing Doc"):
+                    if folder.document(dt) or not doc_type or doc_type == dt:
+                        doc_types.append(dt)
+                
+                # Filter by doc_type if specified
+                if doc_type:
+                    if doc_type not in doc_types:
+                        doc_types = [doc_type]
+                
+                # Add results for each document type
+                for dt in doc_types:
+                    results.append({
+                        "service_name": metadata.get('service', service_folder_name),
+                        "owner": metadata.get('owner', ''),
+                        "sponsor": metadata.get('sponsor', ''),
+                        "folder_path": folder.folder_path,
+                        "doc_type": dt,
+                        "lot": lot,
+                        "gcloud_version": version
+                    })
     
     return results
 
@@ -259,63 +358,38 @@ def get_document_path(service_name: str, doc_type: str, lot: str, gcloud_version
     Returns:
         S3 key (path) to document file or None if not found
     """
-    bucket_name = get_sharepoint_bucket()
-    if not bucket_name:
-        logger.error("SHAREPOINT_BUCKET_NAME not set")
-        return None
-    
-    s3 = get_s3_client()
-    base_prefix = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/"
+    return get_document_paths_bulk([(service_name, doc_type, lot, gcloud_version)])[0]
+
+
+def get_document_paths_bulk(requests: Iterable[Tuple[str, str, str, str]]) -> List[Optional[str]]:
+    """
+    Resolve many documents in one pass, sharing each LOT's scan and name index.
     
-    try:
-        # List all service folders
-        paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket_name, Prefix=base_prefix, Delimiter='/')
-        
-        service_folder_name = None
-        for page in pages:
-            if 'CommonPrefixes' not in page:
-                continue
-            
-            for prefix_info in page['CommonPrefixes']:
-                folder_name = prefix_info['Prefix'].rstrip('/').split('/')[-1]
-                if fuzzy_match(service_name, folder_name):
-                    service_folder_name = folder_name
-                    service_prefix = prefix_info['Prefix']
-                    break
-            
-            if service_folder_name:
-                break
-        
-        if not service_folder_name:
-            return None
-        
-        # Determine filename - try regular file first, then draft file
-        if doc_type == "SERVICE DESC":
-            filename = f"PA GC{gcloud_version} SERVICE DESC {service_folder_name}.docx"
-            draft_filename = f"PA GC{gcloud_version} SERVICE DESC {service_folder_name}_draft.docx"
-        elif doc_type == "Pricing Doc":
-            filename = f"PA GC{gcloud_version} Pricing Doc {service_folder_name}.docx"
-            draft_filename = f"PA GC{gcloud_version} Pricing Doc {service_folder_name}_draft.docx"
-        else:
-            return None
+    Args:
+        requests: (service_name, doc_type, lot, gcloud_version) tuples
         
-        # Try regular file first
-        doc_key = f"{service_prefix}{filename}"
-        try:
-            s3.head_object(Bucket=bucket_name, Key=doc_key)
-            return doc_key
-        except ClientError:
-            # If regular file doesn't exist, try draft file
-            draft_key = f"{service_prefix}{draft_filename}"
-            try:
-                s3.head_object(Bucket=bucket_name, Key=draft_key)
-                return draft_key
-            except ClientError:
-                return None
-    
-    except ClientError as e:
-        logger.error(f"Error getting document path from S3: {e}")
+    Returns:
+        get_document_path results (S3 keys or None) in request order
+    """
+    results = []
+    for service_name, doc_type, lot, gcloud_version in requests:
+        if doc_type not in ("SERVICE DESC", "Pricing Doc"):
+            results.append(None)
+            continue
+        # Folder and file existence come from the (cached) LOT listing; no per-file HEAD requests
+        folders, index = lot_name_index(gcloud_version, lot)
+        folder_name = index.best(service_name)
+        entry = folders[folder_name].document(doc_type) if folder_name else None
+        results.append(entry.name if entry else None)
+    return results
+
+
+def _proposal_catalog():
+    """Proposal catalog write-through functions, or None where the app package is not importable"""
+    try:
+        from app.services import proposal_catalog
+        return proposal_catalog
+    except ImportError:
         return None
 
 
@@ -335,6 +409,9 @@ def create_folder(service_name: str, lot: str, gcloud_version: str = "15") -> Tu
     folder_path = f"GCloud {gcloud_version}/PA Services/Cloud Support Services LOT {lot}/{service_name}/"
     # In S3, folders are implicit (just prefixes), so we don't need to create them
     # They'll be created when we upload files
+    catalog = _proposal_catalog()
+    if catalog:
+        catalog.record_folder(folder_path)
     return True, folder_path
 
 
@@ -382,6 +459,10 @@ def create_metadata_file(folder_path: str, service: str, owner: str, sponsor: st
             Body=content.encode('utf-8'),
             ContentType='text/plain'
         )
+        invalidate_scan_cache()
+        catalog = _proposal_catalog()
+        if catalog:
+            catalog.record_folder(folder_path, parse_metadata_content(content))
         
         return True
         
@@ -403,47 +484,31 @@ def list_all_folders(gcloud_version: str = "14") -> List[Dict]:
     Returns:
         List of folders with metadata
     """
-    bucket_name = get_sharepoint_bucket()
-    if not bucket_name:
-        logger.error("SHAREPOINT_BUCKET_NAME not set")
-        return []
-    
-    s3 = get_s3_client()
     results = []
-    base_prefix = f"GCloud {gcloud_version}/PA Services/"
     
     for lot in ["2", "3"]:
-        lot_prefix = base_prefix + f"Cloud Support Services LOT {lot}/"
-        
-        try:
-            paginator = s3.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=bucket_name, Prefix=lot_prefix, Delimiter='/')
-            
-            for page in pages:
-                if 'CommonPrefixes' not in page:
-                    continue
-                
-                for prefix_info in page['CommonPrefixes']:
-                    service_prefix = prefix_info['Prefix']
-                    
-                    metadata = read_metadata_file(service_prefix)
-                    if metadata:
-                        results.append({
-                            "service_name": metadata.get('service', service_prefix.rstrip('/').split('/')[-1]),
-                            "owner": metadata.get('owner', ''),
-                            "sponsor": metadata.get('sponsor', ''),
-                            "folder_path": service_prefix,
-                            "lot": lot,
-                            "gcloud_version": gcloud_version
-                        })
-        except ClientError as e:
-            logger.error(f"Error listing folders from S3: {e}")
-            continue
+        for folder_name, folder in scan_lot(gcloud_version, lot).items():
+            metadata = folder.metadata
+            if not metadata:
+                continue
+            documents = {dt: folder.document(dt) for dt in ("SERVICE DESC", "Pricing Doc")}
+            modified = [entry.last_modified for entry in documents.values() if entry and entry.last_modified]
+            results.append({
+                "service_name": metadata.get('service', folder_name),
+                "owner": metadata.get('owner', ''),
+                "sponsor": metadata.get('sponsor', ''),
+                "folder_path": folder.folder_path,
+                "lot": lot,
+                "gcloud_version": gcloud_version,
+                # Document keys and newest modification time, from the same listing
+                "service_desc_key": documents["SERVICE DESC"].name if documents["SERVICE DESC"] else None,
+                "pricing_doc_key": documents["Pricing Doc"].name if documents["Pricing Doc"] else None,
+                "last_modified": max(modified).isoformat() if modified else None
+            })
     
     return results
 
 
-# S3-specific helper functions
 def upload_file_to_s3(local_path: str, s3_key: str) -> bool:
     """
     Upload a local file to S3.
@@ -465,6 +530,10 @@ def upload_file_to_s3(local_path: str, s3_key: str) -> bool:
     try:
         with open(local_path, 'rb') as f:
             s3.upload_fileobj(f, bucket_name, s3_key)
+        invalidate_scan_cache()
+        catalog = _proposal_catalog()
+        if catalog:
+            catalog.record_document(s3_key)
         return True
     except ClientError as e:
         logger.error(f"Error uploading file to S3: {e}")
@@ -550,6 +619,10 @@ def delete_file_from_s3(s3_key: str) -> bool:
     
     try:
         s3.delete_object(Bucket=bucket_name, Key=s3_key)
+        invalidate_scan_cache()
+        catalog = _proposal_catalog()
+        if catalog:
+            catalog.forget_document(s3_key)
         return True
     except ClientError as e:
         logger.error(f"Error deleting file from S3: {e}")
@@ -559,7 +632,7 @@ def delete_file_from_s3(s3_key: str) -> bool:
         return False
 
 
-def list_files_in_folder(folder_path: str) -> List[str]:
+def list_files_in_folder(folder_path: str) -> List["BlobEntry"]:
     """
     List all files in an S3 folder (prefix).
     
@@ -567,8 +640,11 @@ def list_files_in_folder(folder_path: str) -> List[str]:
         folder_path: S3 prefix (folder path)
         
     Returns:
-        List of S3 keys (file paths)
+        List of BlobEntry (key, size, last_modified, etag, content_md5) taken
+        from the listing, as AzureBlobService.list_blobs returns
     """
+    from app.services.blob_index import BlobEntry
+    
     bucket_name = get_sharepoint_bucket()
     if not bucket_name:
         logger.error("SHAREPOINT_BUCKET_NAME not set")
@@ -588,7 +664,7 @@ def list_files_in_folder(folder_path: str) -> List[str]:
             for obj in page['Contents']:
                 # Skip if it's a "folder" (ends with /)
                 if not obj['Key'].endswith('/'):
-                    files.append(obj['Key'])
+                    files.append(BlobEntry.from_s3_object(obj))
         
         return files
     except ClientError as e:
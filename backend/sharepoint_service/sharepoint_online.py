@@ -302,6 +302,21 @@ def get_document_path(
         return (None, None)
 
 
+def get_document_paths_bulk(
+    lookups: List[Tuple[str, str, str, str]]
+) -> List[Tuple[Optional[str], Optional[Path]]]:
+    """
+    Resolve many documents, one Graph request each (no shared listing to reuse)
+    
+    Args:
+        lookups: (service_name, doc_type, lot, gcloud_version) tuples
+        
+    Returns:
+        get_document_path results in request order
+    """
+    return [get_document_path(*lookup) for lookup in lookups]
+
+
 def create_folder(
     folder_path: str,
     gcloud_version: str = "15"
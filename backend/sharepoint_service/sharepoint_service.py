@@ -20,6 +20,7 @@ fuzzy_match = None
 read_metadata_file = None
 search_documents = None
 get_document_path = None
+get_document_paths_bulk = None
 create_folder = None
 create_metadata_file = None
 list_all_folders = None
@@ -37,6 +38,7 @@ if USE_SHAREPOINT:
             read_metadata_file,
             search_documents,
             get_document_path,
+            get_document_paths_bulk,
             create_folder,
             create_metadata_file,
             list_all_folders,
@@ -63,6 +65,7 @@ elif USE_S3:
             read_metadata_file,
             search_documents,
             get_document_path,
+            get_document_paths_bulk,
             create_folder,
             create_metadata_file,
             list_all_folders,
@@ -87,6 +90,7 @@ else:
             read_metadata_file,
             search_documents,
             get_document_path,
+            get_document_paths_bulk,
             create_folder,
             create_metadata_file,
             list_all_folders,
@@ -114,6 +118,7 @@ __all__ = [
     'read_metadata_file',
     'search_documents',
     'get_document_path',
+    'get_document_paths_bulk',
     'create_folder',
     'create_metadata_file',
     'list_all_folders',
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("azure.storage.blob")
+
+from app.services import azure_blob_service as module  # noqa: E402
+
+
+class _FakeContainer:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def get_container_properties(self):
+        self.calls.append("properties")
+
+
+class _FakeServiceClient:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def get_container_client(self, name):
+        return _FakeContainer(self.calls)
+
+
+def test_clients_and_container_check_are_shared(monkeypatch):
+    calls = []
+    created = []
+
+    def from_connection_string(conn, **options):
+        created.append(options)
+        return _FakeServiceClient(calls)
+
+    monkeypatch.setattr(module.BlobServiceClient, "from_connection_string", from_connection_string)
+    monkeypatch.setattr(module, "_clients", {})
+    monkeypatch.setattr(module, "_checked_containers", set())
+    monkeypatch.setattr(module, "_services", {})
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", "UseDevelopmentStorage=true")
+    monkeypatch.setenv("AZURE_BLOB_RETRY_TOTAL", "2")
+
+    first = module.get_azure_blob_service()
+    assert module.get_azure_blob_service() is first
+    # Direct construction reuses the client and skips the container round trip
+    module.AzureBlobService()
+    module.AzureBlobService(container_name="other")
+
+    assert len(created) == 1
+    assert created[0]["retry_total"] == 2
+    assert calls == ["properties", "properties"]
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.services.blob_index import BlobEntry, BlobListingIndex
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+MODIFIED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _FakeContainer:
+    def __init__(self, names):
+        self.names = list(names)
+        self.listings = 0
+
+    def list_blobs(self, name_starts_with=None):
+        self.listings += 1
+        for name in self.names:
+            if name.startswith(name_starts_with or ""):
+                yield SimpleNamespace(
+                    name=name, size=10, etag="e", last_modified=MODIFIED,
+                    content_settings=SimpleNamespace(content_md5=bytearray(b"\x01\xff")),
+                )
+
+
+class _FakeBlobService:
+    def __init__(self, names):
+        self.container_client = _FakeContainer(names)
+        self.listeners = []
+
+    def add_write_listener(self, listener):
+        self.listeners.append(listener)
+
+    def list_blobs(self, prefix=""):
+        return [BlobEntry.from_blob_properties(blob) for blob in self.container_client.list_blobs(name_starts_with=prefix)]
+
+
+def _names(index, prefix):
+    return [entry.name for entry in index.list_blobs(prefix)]
+
+
+def _service():
+    return _FakeBlobService([
+        f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx",
+        f"{LOT3}/Alpha/metadata.json",
+        f"{LOT3}/Beta/metadata.json",
+        "GCloud 14/PA Services/Cloud Support Services LOT 2a/Gamma/metadata.json",
+        "other/file.txt",
+    ])
+
+
+def test_prefix_queries_share_one_listing():
+    service = _service()
+    index = BlobListingIndex(service, ttl_seconds=60)
+
+    assert _names(index, f"{LOT3}/") == [
+        f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx",
+        f"{LOT3}/Alpha/metadata.json",
+        f"{LOT3}/Beta/metadata.json",
+    ]
+    assert _names(index, "GCloud 14/PA Services/Cloud Support Services LOT 2a/") == [
+        "GCloud 14/PA Services/Cloud Support Services LOT 2a/Gamma/metadata.json"
+    ]
+    assert _names(index, "GCloud 14/PA Services/Cloud Support Services LOT 2b/") == []
+    assert service.container_client.listings == 1
+    assert sorted(index.folders("15", "3")) == ["Alpha", "Beta"]
+    entry = index.entry(f"{LOT3}/Beta/metadata.json")
+    assert (entry.size, entry.etag, entry.content_md5, entry.mtime) == (10, "e", "01ff", MODIFIED.timestamp())
+
+
+def test_writes_are_visible_without_relisting():
+    service = _service()
+    index = BlobListingIndex(service, ttl_seconds=60)
+    index.refresh()
+
+    service.listeners[0](f"{LOT3}/Delta/metadata.json", 42)
+
+    assert f"{LOT3}/Delta/metadata.json" in _names(index, f"{LOT3}/")
+    assert index.folders("15", "3")["Delta"]["metadata.json"].size == 42
+    assert service.container_client.listings == 1
+
+
+def test_ttl_expiry_and_pass_through():
+    service = _service()
+    index = BlobListingIndex(service, ttl_seconds=60)
+    _names(index, f"{LOT3}/")
+    index.invalidate()
+    _names(index, f"{LOT3}/")
+    assert index.refreshes == 2
+
+    # Prefixes outside the taxonomy root and a zero TTL go straight to storage
+    assert _names(index, "other/") == ["other/file.txt"]
+    uncached = BlobListingIndex(_service(), ttl_seconds=0)
+    uncached.list_blobs(f"{LOT3}/")
+    assert uncached.refreshes == 0
+
+
+def test_s3_listing_entries():
+    single = BlobEntry.from_s3_object({"Key": "a.docx", "Size": 3, "ETag": '"9e107d9d372bb6826bd81d3542a419d6"', "LastModified": MODIFIED})
+    multipart = BlobEntry.from_s3_object({"Key": "b.docx", "Size": 3, "ETag": '"d41d8cd98f00b204e9800998ecf8427e-2"'})
+
+    assert (single.name, single.size, single.content_md5, single.mtime) == ("a.docx", 3, "9e107d9d372bb6826bd81d3542a419d6", MODIFIED.timestamp())
+    assert multipart.content_md5 is None and multipart.mtime is None
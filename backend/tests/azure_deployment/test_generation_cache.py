@@ -0,0 +1,140 @@
+from docx import Document
+
+from app.services.document_generator import DocumentGenerator
+
+
+class _FakeBlobService:
+    container_name = "sharepoint"
+
+    def __init__(self):
+        self.blobs = {}
+        self.metadata = {}
+        self.uploads = 0
+
+    def upload_stream(self, stream, blob_name, length=None, content_type=None, metadata=None):
+        self.blobs[blob_name] = stream.read()
+        self.metadata[blob_name] = dict(metadata or {})
+        self.uploads += 1
+        return blob_name
+
+    def get_blob_metadata(self, blob_name):
+        return dict(self.metadata.get(blob_name, {})) if blob_name in self.blobs else None
+
+    def set_blob_metadata(self, blob_name, metadata):
+        self.metadata[blob_name] = dict(metadata)
+
+    def blob_exists(self, blob_name):
+        return blob_name in self.blobs
+
+    def notify_write(self, blob_name, size=None):
+        pass
+
+    def copy_blob(self, source_blob_name, dest_blob_name, metadata=None):
+        self.blobs[dest_blob_name] = self.blobs[source_blob_name]
+        self.metadata[dest_blob_name] = dict(metadata if metadata is not None else self.metadata.get(source_blob_name, {}))
+
+
+class _ConverterResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return {"success": True, "pdf_blob_key": self._payload["pdf_blob_key"]}
+
+
+def _generator(tmp_path, monkeypatch, blobs):
+    tpl = tmp_path / "tpl.docx"
+    if not tpl.exists():
+        Document().save(tpl)
+    monkeypatch.setenv("SERVICE_DESC_TEMPLATE_PATH", str(tpl))
+    generator = DocumentGenerator()
+    generator.output_dir = tmp_path / "out"
+    generator.use_azure = True
+    generator.azure_blob_service = blobs
+    return generator
+
+
+def _complete(generator, description="desc"):
+    return generator.generate_service_description(
+        title="Cached Svc",
+        description=description,
+        features=["f1"],
+        benefits=["b1"],
+        new_proposal_metadata={"service": "Cached Svc", "lot": "3", "gcloud_version": "15"},
+    )
+
+
+def test_unchanged_complete_reuses_word_and_pdf(tmp_path, monkeypatch):
+    import requests
+    conversions = []
+
+    def fake_post(url, json, timeout):
+        conversions.append(json)
+        blobs.blobs[json["pdf_blob_key"]] = b"%PDF"
+        return _ConverterResponse(json)
+
+    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setenv("PDF_CONVERTER_FUNCTION_URL", "http://converter")
+    blobs = _FakeBlobService()
+    generator = _generator(tmp_path, monkeypatch, blobs)
+
+    first = _complete(generator)
+    second = _complete(generator, description="  desc\r\n")
+    assert blobs.uploads == 1 and len(conversions) == 1
+    assert second["cached"] is True
+    assert second["word_blob_key"] == first["word_blob_key"]
+    assert second["pdf_blob_key"] == first["pdf_blob_key"]
+    assert second["word_sha256"] == first["word_sha256"]
+
+    _complete(generator, description="changed")
+    assert blobs.uploads == 2 and len(conversions) == 2
+
+
+def test_missing_pdf_forces_regeneration(tmp_path, monkeypatch):
+    monkeypatch.delenv("PDF_CONVERTER_FUNCTION_URL", raising=False)
+    blobs = _FakeBlobService()
+    generator = _generator(tmp_path, monkeypatch, blobs)
+    _complete(generator)
+
+    # Converter configured later: the previous save has no PDF so it cannot be reused
+    import requests
+    monkeypatch.setenv("PDF_CONVERTER_FUNCTION_URL", "http://converter")
+    monkeypatch.setattr(requests, "post", lambda url, json, timeout: _ConverterResponse(json))
+    result = _complete(generator)
+    assert blobs.uploads == 2
+    assert "cached" not in result
+
+
+def test_identical_word_content_reuses_converted_pdf(tmp_path, monkeypatch):
+    import requests
+    from app.services.pdf_cache import PDF_CACHE_PREFIX, pdf_cache_stats
+    conversions = []
+
+    def fake_post(url, json, timeout):
+        conversions.append(json)
+        blobs.blobs[json["pdf_blob_key"]] = b"%PDF"
+        return _ConverterResponse(json)
+
+    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setenv("PDF_CONVERTER_FUNCTION_URL", "http://converter")
+    # Bypass the input-level cache so the Word document is rebuilt and re-uploaded
+    monkeypatch.setenv("GENERATION_CACHE_ENABLED", "false")
+    blobs = _FakeBlobService()
+    generator = _generator(tmp_path, monkeypatch, blobs)
+    before = pdf_cache_stats.snapshot()
+
+    first = _complete(generator)
+    _complete(generator)
+    assert blobs.uploads == 2 and len(conversions) == 1
+    assert any(name.startswith(PDF_CACHE_PREFIX) for name in blobs.blobs)
+
+    # The content-addressed copy serves the same content after the PDF was removed
+    del blobs.blobs[first["pdf_blob_key"]]
+    third = _complete(generator)
+    assert len(conversions) == 1
+    assert third["pdf_blob_key"] in blobs.blobs
+
+    after = pdf_cache_stats.snapshot()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (2, 1)
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from pdf_converter import pdf_converter
+
+
+def test_pdf_handler_requires_word_key(monkeypatch):
+    monkeypatch.setenv("OUTPUT_BUCKET_NAME", "dummy")
+    result = pdf_converter.handler({}, None)
+    assert result["success"] is False
+    assert result["error_type"] == "ValueError"
+    assert "word_s3_key" in result["error"]
+
+
+def test_pdf_handler_parses_string_event(monkeypatch):
+    monkeypatch.setenv("OUTPUT_BUCKET_NAME", "dummy")
+    event = json.dumps({"word_s3_key": "generated/test.docx", "word_bucket": "dummy"})
+    # Patch boto3 client to avoid AWS calls
+    class FakeClient:
+        def download_file(self, *args, **kwargs):
+            raise FileNotFoundError("skip actual download")
+
+    monkeypatch.setattr(pdf_converter, "s3_client", FakeClient())
+    result = pdf_converter.handler(event, None)
+    assert result["success"] is False
+    assert result["error_type"] in {"FileNotFoundError", "RuntimeError"}
+
+
+
+def test_pdf_handler_batch_reports_per_item_results(monkeypatch):
+    uploaded = {}
+
+    class FakeClient:
+        def download_file(self, bucket, key, path):
+            if "missing" in key:
+                raise FileNotFoundError(key)
+            with open(path, "wb") as f:
+                f.write(b"docx")
+
+        def upload_file(self, path, bucket, key, ExtraArgs=None):
+            uploaded[key] = bucket
+
+        def generate_presigned_url(self, op, Params=None, ExpiresIn=None):
+            return f"https://example/{Params['Key']}"
+
+    class FakePool:
+        def __init__(self):
+            self.calls = []
+
+        def convert(self, word_path, output_dir, update_fields=True):
+            self.calls.append(update_fields)
+            pdf = output_dir / (word_path.stem + ".pdf")
+            pdf.write_bytes(b"%PDF")
+            return pdf
+
+    pool = FakePool()
+    monkeypatch.setattr(pdf_converter, "s3_client", FakeClient())
+    monkeypatch.setattr(pdf_converter, "get_pool", lambda: pool)
+    event = {
+        "word_bucket": "in",
+        "output_bucket": "out",
+        "update_fields": False,
+        "documents": [
+            {"word_s3_key": "a/Doc.docx"},
+            {"word_s3_key": "b/Doc.docx", "pdf_s3_key": "pdfs/b.pdf", "update_fields": True},
+            {"word_s3_key": "missing/Doc.docx"},
+        ],
+    }
+    result = pdf_converter.handler(event, None)
+
+    assert result["success"] is False
+    assert (result["converted"], result["failed"]) == (2, 1)
+    first, second, third = result["results"]
+    assert first["pdf_s3_key"] == "a/Doc.pdf" and set(first["timings_ms"]) == {"download", "cache", "convert", "upload"}
+    assert second["pdf_url"] == "https://example/pdfs/b.pdf"
+    assert third["error_type"] == "FileNotFoundError"
+    assert uploaded == {"a/Doc.pdf": "out", "pdfs/b.pdf": "out"}
+    assert sorted(pool.calls) == [False, True]
+
+
+def _docx_bytes(text):
+    from io import BytesIO
+    from zipfile import ZipFile
+    buffer = BytesIO()
+    with ZipFile(buffer, "w") as z:
+        z.writestr("word/document.xml", text)
+        z.writestr("docProps/core.xml", str(id(buffer)))  # differs per save
+    return buffer.getvalue()
+
+
+def test_pdf_handler_reuses_pdf_of_identical_content(monkeypatch):
+    objects = {}
+
+    class FakeClient:
+        def __init__(self):
+            self.source = None
+
+        def download_file(self, bucket, key, path):
+            with open(path, "wb") as f:
+                f.write(_docx_bytes("same content"))
+
+        def head_object(self, Bucket, Key):
+            if Key not in objects:
+                raise FileNotFoundError(Key)
+            return {"Metadata": objects[Key]}
+
+        def copy_object(self, Bucket, Key, CopySource, Metadata=None, **kwargs):
+            if CopySource["Key"] not in objects:
+                raise FileNotFoundError(CopySource["Key"])
+            objects[Key] = Metadata if Metadata is not None else objects[CopySource["Key"]]
+
+        def upload_file(self, path, bucket, key, ExtraArgs=None):
+            objects[key] = ExtraArgs.get("Metadata", {})
+
+        def generate_presigned_url(self, op, Params=None, ExpiresIn=None):
+            return "https://example/pdf"
+
+    class FakePool:
+        calls = 0
+
+        def convert(self, word_path, output_dir, update_fields=True):
+            FakePool.calls += 1
+            pdf = output_dir / (word_path.stem + ".pdf")
+            pdf.write_bytes(b"%PDF")
+            return pdf
+
+    monkeypatch.setattr(pdf_converter, "s3_client", FakeClient())
+    monkeypatch.setattr(pdf_converter, "get_pool", lambda: FakePool())
+    monkeypatch.setattr(pdf_converter, "cache_stats", {"hits": 0, "misses": 0})
+
+    first = pdf_converter.handler({"word_s3_key": "a/Doc.docx", "word_bucket": "b"}, None)
+    # Same key again (re-complete), then identical content under another key
+    again = pdf_converter.handler({"word_s3_key": "a/Doc.docx", "word_bucket": "b"}, None)
+    other = pdf_converter.handler({"word_s3_key": "c/Other.docx", "word_bucket": "b"}, None)
+    # Converting without field updates produces a different PDF
+    no_fields = pdf_converter.handler(
+        {"word_s3_key": "a/Doc.docx", "word_bucket": "b", "update_fields": False}, None
+    )
+
+    assert [r["cache"] for r in (first, again, other, no_fields)] == ["miss", "hit", "hit", "miss"]
+    assert FakePool.calls == 2
+    assert "c/Other.pdf" in objects
+    assert no_fields["cache_stats"] == {"hits": 2, "misses": 2}
@@ -0,0 +1,200 @@
+import json
+import stat
+import sys
+import threading
+from pathlib import Path
+
+from pdf_converter import soffice_pool
+from pdf_converter.soffice_pool import SofficePool
+
+
+def _fake_soffice(tmp_path: Path) -> Path:
+    """Script standing in for soffice: records its argv and writes the PDF"""
+    log = tmp_path / "calls.jsonl"
+    script = tmp_path / "soffice"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys, time\n"
+        "from pathlib import Path\n"
+        "args = sys.argv[1:]\n"
+        f"with open({str(log)!r}, 'a') as f: f.write(json.dumps(args) + '\\n')\n"
+        "time.sleep(0.05)\n"
+        "out = Path(args[args.index('--outdir') + 1])\n"
+        "(out / (Path(args[-1]).stem + '.pdf')).write_bytes(b'%PDF-1.4')\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+def _calls(tmp_path: Path):
+    return [json.loads(line) for line in (tmp_path / "calls.jsonl").read_text().splitlines()]
+
+
+def test_pool_caps_concurrency_and_isolates_profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(soffice_pool, "PROFILE_ROOT", tmp_path / "profiles")
+    pool = SofficePool(size=2, max_jobs=10, binary=str(_fake_soffice(tmp_path)), use_uno=False)
+    out = tmp_path / "out"
+    out.mkdir()
+    docs = []
+    for i in range(6):
+        doc = tmp_path / f"doc{i}.docx"
+        doc.write_bytes(b"docx")
+        docs.append(doc)
+
+    threads = [threading.Thread(target=pool.convert, args=(doc, out)) for doc in docs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(p.name for p in out.glob("*.pdf")) == sorted(f"doc{i}.pdf" for i in range(6))
+    # Never more than two workers, each with its own profile
+    profiles = {arg for call in _calls(tmp_path) for arg in call if arg.startswith("-env:UserInstallation=")}
+    assert len(pool._workers) == 2
+    assert len(profiles) == 2
+
+
+def test_update_flag_follows_request_and_workers_recycle(tmp_path, monkeypatch):
+    monkeypatch.setattr(soffice_pool, "PROFILE_ROOT", tmp_path / "profiles")
+    pool = SofficePool(size=1, max_jobs=2, binary=str(_fake_soffice(tmp_path)), use_uno=False)
+    doc = tmp_path / "doc.docx"
+    doc.write_bytes(b"docx")
+
+    pdf = pool.convert(doc, tmp_path, update_fields=False)
+    assert pdf == tmp_path / "doc.pdf"
+    pool.convert(doc, tmp_path, update_fields=True)
+    calls = _calls(tmp_path)
+    assert "--update" not in calls[0]
+    assert "--update" in calls[1]
+    # Two jobs hit the recycle limit: the worker is reset before the next job
+    assert pool._workers[0].jobs == 0
+
+
+FAKE_UNO = '''
+import json, os
+
+def _log(*event):
+    with open(os.environ["FAKE_UNO_LOG"], "a") as f:
+        f.write(json.dumps(event) + "\\n")
+
+def systemPathToFileUrl(path):
+    return "file://" + path
+
+class _Indexes:
+    def getCount(self):
+        return 1
+    def getByIndex(self, i):
+        return self
+    def update(self):
+        _log("update_indexes")
+
+class _Fields:
+    def refresh(self):
+        _log("refresh_fields")
+
+class _Doc:
+    def getDocumentIndexes(self):
+        return _Indexes()
+    def getTextFields(self):
+        return _Fields()
+    def storeToURL(self, url, props):
+        with open(url[len("file://"):], "wb") as f:
+            f.write(b"%PDF-1.4")
+        _log("store", [p.Value for p in props])
+    def close(self, deliver):
+        pass
+
+class _Desktop:
+    def loadComponentFromURL(self, url, frame, flags, props):
+        _log("load", url)
+        return _Doc()
+    def getComponents(self):
+        return []
+    def terminate(self):
+        _log("terminate")
+        open(os.environ["FAKE_UNO_STOP"], "w").close()
+
+class _Resolver:
+    def resolve(self, url):
+        _log("resolve", url)
+        return _Context()
+
+class _ServiceManager:
+    def createInstanceWithContext(self, name, context):
+        return _Resolver() if name.endswith("UnoUrlResolver") else _Desktop()
+
+class _Context:
+    ServiceManager = _ServiceManager()
+
+def getComponentContext():
+    return _Context()
+'''
+
+
+def _fake_pyuno(tmp_path: Path, monkeypatch) -> Path:
+    """uno and com.sun.star.beans stand-ins, importable by the bridge process"""
+    root = tmp_path / "pyuno"
+    package = root / "com" / "sun" / "star" / "beans"
+    package.mkdir(parents=True)
+    for directory in (root / "com", root / "com" / "sun", root / "com" / "sun" / "star"):
+        (directory / "__init__.py").write_text("")
+    (package / "__init__.py").write_text("class PropertyValue:\n    Name = None\n    Value = None\n")
+    (root / "uno.py").write_text(FAKE_UNO)
+    monkeypatch.setenv("PYTHONPATH", str(root))
+    monkeypatch.setenv("FAKE_UNO_LOG", str(tmp_path / "uno.jsonl"))
+    monkeypatch.setenv("FAKE_UNO_STOP", str(tmp_path / "stop"))
+    return tmp_path / "uno.jsonl"
+
+
+def _fake_listener(tmp_path: Path) -> Path:
+    """soffice stand-in for --accept mode: records its argv and runs until the desktop terminates"""
+    script = tmp_path / "soffice"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys, time\n"
+        f"with open({str(tmp_path / 'calls.jsonl')!r}, 'a') as f: f.write(json.dumps(sys.argv[1:]) + '\\n')\n"
+        "stop = os.environ['FAKE_UNO_STOP']\n"
+        "while not os.path.exists(stop): time.sleep(0.02)\n"
+        "os.remove(stop)\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+def test_uno_workers_stay_warm_across_conversions(tmp_path, monkeypatch):
+    monkeypatch.setattr(soffice_pool, "PROFILE_ROOT", tmp_path / "profiles")
+    uno_log = _fake_pyuno(tmp_path, monkeypatch)
+    pool = SofficePool(size=1, max_jobs=10, binary=str(_fake_listener(tmp_path)), use_uno=True, uno_python=sys.executable)
+    docs = []
+    for name in ("a", "b"):
+        doc = tmp_path / f"{name}.docx"
+        doc.write_bytes(b"docx")
+        docs.append(doc)
+
+    try:
+        assert pool.convert(docs[0], tmp_path, update_fields=True) == tmp_path / "a.pdf"
+        assert pool.convert(docs[1], tmp_path, update_fields=False) == tmp_path / "b.pdf"
+    finally:
+        pool.shutdown()
+
+    # One listener for both documents, never a per-document --convert-to
+    calls = _calls(tmp_path)
+    assert len(calls) == 1 and not any("--convert-to" in arg for arg in calls[0])
+    assert any(arg.startswith("--accept=socket") for arg in calls[0])
+    events = [json.loads(line) for line in uno_log.read_text().splitlines()]
+    names = [event[0] for event in events]
+    assert names == ["resolve", "load", "update_indexes", "refresh_fields", "store", "load", "store", "terminate"]
+    assert events[4][1] == ["writer_pdf_Export"]
+    assert pool._workers[0].process is None and pool._workers[0].bridge is None
+
+
+def test_bundled_libreoffice_python_runs_the_bridge(tmp_path, monkeypatch):
+    monkeypatch.delenv("SOFFICE_PYTHON", raising=False)
+    program = tmp_path / "program"
+    program.mkdir()
+    for name in ("soffice", "python"):
+        (program / name).write_text("#!/bin/sh\n")
+        (program / name).chmod(0o755)
+
+    assert soffice_pool.find_uno_python(str(program / "soffice")) == str(program / "python")
+    assert SofficePool(binary=str(program / "soffice")).use_uno
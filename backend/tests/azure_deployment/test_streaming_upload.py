@@ -0,0 +1,44 @@
+import hashlib
+from docx import Document
+
+from app.services.document_generator import DocumentGenerator
+
+
+class _FakeBlobService:
+    container_name = "sharepoint"
+
+    def __init__(self):
+        self.uploads = {}
+
+    def upload_stream(self, stream, blob_name, length=None, content_type=None, metadata=None):
+        self.uploads[blob_name] = stream.read()
+        return blob_name
+
+
+def test_azure_generation_streams_without_local_file(tmp_path, monkeypatch):
+    tpl = tmp_path / "tpl.docx"
+    d = Document()
+    p = d.add_paragraph("Contents"); p.style = "Heading 2"
+    d.save(tpl)
+    monkeypatch.setenv("SERVICE_DESC_TEMPLATE_PATH", str(tpl))
+    monkeypatch.delenv("PDF_CONVERTER_FUNCTION_URL", raising=False)
+
+    generator = DocumentGenerator()
+    generator.output_dir = tmp_path / "out"
+    generator.use_azure = True
+    generator.azure_blob_service = _FakeBlobService()
+
+    result = generator.generate_service_description(
+        title="Stream Svc",
+        description="desc",
+        features=["f1"],
+        benefits=["b1"],
+        new_proposal_metadata={"service": "Stream Svc", "lot": "3", "gcloud_version": "15"},
+    )
+
+    key = "GCloud 15/PA Services/Cloud Support Services LOT 3/Stream Svc/PA GC15 SERVICE DESC Stream Svc.docx"
+    uploaded = generator.azure_blob_service.uploads[key]
+    assert result["word_blob_key"] == key
+    assert result["word_size"] == len(uploaded)
+    assert result["word_sha256"] == hashlib.sha256(uploaded).hexdigest()
+    assert not (tmp_path / "out").exists()
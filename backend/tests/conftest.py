@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -10,3 +11,7 @@ def _ensure_repo_root_on_path() -> None:
 
 _ensure_repo_root_on_path()
 
+
+# TestClient startup runs start_reconciler(); never let it open a catalog database
+# under backend/data. Tests that need a catalog construct ProposalCatalog directly.
+os.environ["PROPOSAL_CATALOG"] = "off"
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import uuid
+
+import pytest
+
+from app.services import async_storage
+from app.services.async_storage import LocalAsyncStorage
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+
+
+async def _round_trip(storage):
+    await storage.put(f"{LOT3}/Alpha/a.json", b"alpha")
+    await storage.put(f"{LOT3}/Beta/b.json", b"beta")
+    listed = [entry.name for entry in await storage.list(f"{LOT3}/")]
+    contents = await storage.get_many([f"{LOT3}/Beta/b.json", f"{LOT3}/Missing/c.json"])
+    streamed = b"".join([chunk async for chunk in storage.stream(f"{LOT3}/Alpha/a.json")])
+    await storage.delete(f"{LOT3}/Alpha/a.json")
+    return listed, contents, streamed, await storage.exists(f"{LOT3}/Alpha/a.json")
+
+
+def _assert_round_trip(result):
+    listed, contents, streamed, exists_after_delete = result
+    assert listed == [f"{LOT3}/Alpha/a.json", f"{LOT3}/Beta/b.json"]
+    assert contents[0] == b"beta" and isinstance(contents[1], FileNotFoundError)
+    assert streamed == b"alpha"
+    assert not exists_after_delete
+
+
+def test_local_storage_round_trip(tmp_path):
+    _assert_round_trip(asyncio.run(_round_trip(LocalAsyncStorage(tmp_path))))
+
+
+def test_local_listing_is_served_from_the_catalog(tmp_path):
+    from sharepoint_service.mock_sharepoint import get_mock_catalog
+
+    storage = LocalAsyncStorage(tmp_path)
+    asyncio.run(storage.put(f"{LOT3}/Alpha/a.json", b"alpha"))
+    catalog = get_mock_catalog(tmp_path)
+    assert [entry.name for entry in asyncio.run(storage.list(f"{LOT3}/Alpha/"))] == [f"{LOT3}/Alpha/a.json"]
+
+    scans = catalog.folder_scans
+    asyncio.run(storage.list(f"{LOT3}/"))
+    assert catalog.folder_scans == scans
+
+    # Writes through the storage are visible to the next listing
+    asyncio.run(storage.put(f"{LOT3}/Gamma/g.json", b"gamma"))
+    assert [entry.name for entry in asyncio.run(storage.list(f"{LOT3}/Gamma/"))] == [f"{LOT3}/Gamma/g.json"]
+
+
+def test_s3_storage_round_trip():
+    moto = pytest.importorskip("moto")
+    import boto3
+    from app.services.async_storage import S3AsyncStorage
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="sharepoint")
+        _assert_round_trip(asyncio.run(_round_trip(S3AsyncStorage("sharepoint", client=client))))
+
+
+def test_azure_storage_round_trip():
+    connection_string = os.environ.get("AZURITE_CONNECTION_STRING")
+    if not connection_string:
+        pytest.skip("AZURITE_CONNECTION_STRING not set (Azurite blob endpoint)")
+    pytest.importorskip("azure.storage.blob.aio")
+    from azure.storage.blob import BlobServiceClient
+    from app.services.async_storage import AzureAsyncStorage
+
+    container = f"test-{uuid.uuid4().hex[:12]}"
+    BlobServiceClient.from_connection_string(connection_string).create_container(container)
+
+    async def scenario():
+        storage = AzureAsyncStorage(connection_string, container)
+        try:
+            return await _round_trip(storage)
+        finally:
+            await storage.close()
+
+    try:
+        _assert_round_trip(asyncio.run(scenario()))
+    finally:
+        BlobServiceClient.from_connection_string(connection_string).delete_container(container)
+
+
+def test_get_many_overlaps_fetches(tmp_path):
+    class SlowStorage(LocalAsyncStorage):
+        in_flight = 0
+        peak = 0
+
+        async def get(self, key):
+            SlowStorage.in_flight += 1
+            SlowStorage.peak = max(SlowStorage.peak, SlowStorage.in_flight)
+            await asyncio.sleep(0.01)
+            SlowStorage.in_flight -= 1
+            return key.encode()
+
+    storage = SlowStorage(tmp_path, max_concurrency=3)
+    results = asyncio.run(storage.get_many([str(i) for i in range(8)]))
+
+    assert results == [str(i).encode() for i in range(8)]
+    assert SlowStorage.peak == 3
+
+
+def test_analytics_reads_responses_through_storage(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")  # questionnaire parser dependency
+    from app.api.routes import analytics
+
+    storage = LocalAsyncStorage(tmp_path)
+    monkeypatch.setattr(async_storage, "get_async_storage", lambda: storage)
+    monkeypatch.setattr(analytics, "get_parser", lambda: None)
+    (tmp_path / LOT3 / "Alpha").mkdir(parents=True)
+    (tmp_path / LOT3 / "Alpha" / "questionnaire_responses.json").write_text(json.dumps({"is_draft": False, "answers": []}))
+    (tmp_path / LOT3 / "Beta").mkdir(parents=True)
+    (tmp_path / LOT3 / "Beta" / "metadata.json").write_text("{}")
+
+    statuses = asyncio.run(analytics.get_all_services_status("3", "15"))
+    responses = asyncio.run(analytics.get_all_questionnaire_responses("3", "15"))
+
+    assert [(s.service_name, s.has_responses, s.completion_percentage) for s in statuses] == [("Alpha", True, 100), ("Beta", False, 0)]
+    assert [(r["service_name"], r["lot"]) for r in responses] == [("Alpha", "3")]
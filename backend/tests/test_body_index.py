@@ -0,0 +1,40 @@
+from docx import Document
+from app.utils.docx_body_index import BodyIndex
+from app.services.document_generator import document_generator
+
+
+def _doc():
+    d = Document()
+    d.add_paragraph("Contents", style="Heading 2")
+    d.add_paragraph("old toc")
+    d.add_paragraph("Service Definition", style="Heading 2")
+    d.add_paragraph("body 1")
+    d.add_table(rows=1, cols=1)
+    d.add_paragraph("About PA", style="Heading 2")
+    d.add_paragraph("about text")
+    return d
+
+
+def test_index_tracks_headings_through_insert_and_remove():
+    d = _doc()
+    index = BodyIndex.for_document(d)
+    assert [index.heading_text[h] for h in index.headings] == ["Contents", "Service Definition", "About PA"]
+
+    sd = index.find_heading(lambda text: "Service Definition" in text)
+    assert len(index.section_elements(sd)) == 2  # paragraph + table
+
+    # Insert a new heading through the generator helper: it is slotted in document order
+    new = document_generator._insert_paragraph_after(index.paragraph(sd), "Sub", "Heading 3")
+    assert [index.heading_text[h] for h in index.headings] == ["Contents", "Service Definition", "Sub", "About PA"]
+
+    document_generator._remove_heading_block(d, new._p)
+    assert "Sub" not in [p.text for p in d.paragraphs]
+    assert [index.heading_text[h] for h in index.headings] == ["Contents", "Service Definition", "About PA"]
+
+
+def test_extract_heading_block_detaches_until_next_heading():
+    d = _doc()
+    block = document_generator._extract_heading_block(d, "service definition")
+    assert len(block) == 3
+    assert [p.text for p in d.paragraphs] == ["Contents", "old toc", "About PA", "about text"]
+    assert BodyIndex.for_document(d).find_heading(lambda text: "Service" in text) is None
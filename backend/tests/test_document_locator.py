@@ -0,0 +1,119 @@
+import pytest
+
+from app.services import document_locator
+from app.services.document_locator import (
+    DocumentLocation,
+    DocumentLocator,
+    RANK_OUTPUT_GENERATED,
+    RANK_SHAREPOINT_FOLDER,
+    get_document_locator,
+    record_upload,
+)
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+
+
+def _locator(locations, **kwargs):
+    calls = []
+
+    def scan():
+        calls.append(1)
+        return list(locations)
+
+    return DocumentLocator(scan, **kwargs), calls
+
+
+def test_lookup_prefers_rank_and_falls_back_to_draft():
+    locator, calls = _locator([
+        DocumentLocation('s3', f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.pdf", 'sharepoint', RANK_SHAREPOINT_FOLDER),
+        DocumentLocation('s3', "generated/PA GC15 SERVICE DESC Alpha.pdf", 'output', RANK_OUTPUT_GENERATED),
+        DocumentLocation('s3', f"{LOT3}/Beta/PA GC15 SERVICE DESC Beta_draft.docx", 'sharepoint', RANK_SHAREPOINT_FOLDER),
+    ], ttl_seconds=300, miss_refresh_seconds=300)
+
+    assert locator.lookup("PA GC15 SERVICE DESC Alpha.pdf").bucket == 'output'
+    assert locator.lookup("PA GC15 SERVICE DESC Beta.docx").key.endswith("Beta_draft.docx")
+    assert locator.lookup("PA GC15 SERVICE DESC Gamma.docx") is None
+    assert len(calls) == 1
+
+
+def test_recorded_uploads_are_found_without_rescanning():
+    locator, calls = _locator([], ttl_seconds=300, miss_refresh_seconds=300)
+    locator.rebuild()
+
+    locator.record(DocumentLocation('local', f"/data/{LOT3}/Gamma/PA GC15 Pricing Doc Gamma.docx"))
+
+    assert locator.lookup("PA GC15 Pricing Doc Gamma.docx").key.endswith("Gamma.docx")
+    assert len(calls) == 1
+
+
+def test_miss_triggers_rescan_once_index_is_old_enough():
+    locations = []
+    locator, calls = _locator(locations, ttl_seconds=300, miss_refresh_seconds=0)
+    locator.rebuild()
+    locations.append(DocumentLocation('azure', f"{LOT3}/Delta/PA GC15 SERVICE DESC Delta.pdf"))
+
+    assert locator.lookup("PA GC15 SERVICE DESC Delta.pdf") is not None
+    assert len(calls) == 2
+
+
+def test_local_locator_scans_mock_sharepoint(tmp_path, monkeypatch):
+    monkeypatch.delenv("USE_S3", raising=False)
+    monkeypatch.delenv("AZURE_STORAGE_CONNECTION_STRING", raising=False)
+    monkeypatch.setattr(document_locator, "_locator", None)
+    folder = tmp_path / LOT3 / "Alpha"
+    folder.mkdir(parents=True)
+    (folder / "PA GC15 SERVICE DESC Alpha_draft.docx").write_bytes(b"docx")
+    (folder / "OWNER Jane Doe.txt").write_text("owner")
+
+    locator = get_document_locator(tmp_path)
+    found = locator.lookup("PA GC15 SERVICE DESC Alpha.docx")
+    record_upload('local', str(folder / "PA GC15 Pricing Doc Alpha.docx"))
+
+    assert found.key == str(folder / "PA GC15 SERVICE DESC Alpha_draft.docx")
+    assert locator.lookup("OWNER Jane Doe.txt") is None
+    assert locator.lookup("PA GC15 Pricing Doc Alpha.docx") is not None
+    assert get_document_locator(tmp_path) is locator
+
+
+def test_miss_falls_back_to_probe_and_records_the_hit():
+    probed = []
+
+    def probe(filename):
+        probed.append(filename)
+        if filename == "PA GC15 SERVICE DESC Eps_draft.docx":
+            return DocumentLocation('azure', f"{LOT3}/Eps/{filename}")
+        return None
+
+    locator = DocumentLocator(lambda: [], ttl_seconds=300, miss_refresh_seconds=300, probe=probe)
+
+    assert locator.lookup("PA GC15 SERVICE DESC Eps.docx").key == f"{LOT3}/Eps/PA GC15 SERVICE DESC Eps_draft.docx"
+    assert probed == ["PA GC15 SERVICE DESC Eps.docx", "PA GC15 SERVICE DESC Eps_draft.docx"]
+    # The hit is remembered
+    assert locator.lookup("PA GC15 SERVICE DESC Eps_draft.docx") is not None
+    assert len(probed) == 2
+
+
+def test_s3_scan_is_limited_to_generated_and_lot_prefixes(monkeypatch):
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        s3 = boto3.client('s3')
+        for bucket in ("sharepoint", "output"):
+            s3.create_bucket(Bucket=bucket)
+        s3.put_object(Bucket="output", Key="generated/PA GC15 SERVICE DESC Alpha.pdf", Body=b"pdf")
+        s3.put_object(Bucket="output", Key="PA GC15 Pricing Doc Alpha.docx", Body=b"docx")
+        s3.put_object(Bucket="sharepoint", Key=f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx", Body=b"docx")
+        s3.put_object(Bucket="sharepoint", Key="GCloud 15/Archive/PA GC15 SERVICE DESC Old.docx", Body=b"docx")
+
+        scanned = {(location.bucket, location.key) for location in document_locator._scan_s3("sharepoint", "output")}
+        assert scanned == {
+            ("output", "generated/PA GC15 SERVICE DESC Alpha.pdf"),
+            ("sharepoint", f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx"),
+        }
+
+        # The unscanned output root is still found by the HEAD fallback
+        root = document_locator._probe_s3("sharepoint", "output", "PA GC15 Pricing Doc Alpha.docx")
+        assert (root.bucket, root.key, root.rank) == ("output", "PA GC15 Pricing Doc Alpha.docx", document_locator.RANK_OUTPUT_ROOT)
+        assert document_locator._probe_s3("sharepoint", "output", "PA GC15 SERVICE DESC Missing.docx") is None
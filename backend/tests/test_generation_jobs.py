@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.generation_jobs import LocalJobQueue, JOB_FAILED, JOB_SUCCEEDED
+
+
+def test_submit_job_and_poll_until_done():
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/templates/service-description/jobs",
+        json={"title": "Job Svc", "description": "desc", "features": ["f1"], "benefits": ["b1"]},
+    )
+    assert response.status_code == 202
+    submitted = response.json()
+    assert submitted["status"] in ("queued", "running")
+
+    status = client.get(submitted["status_url"], params={"wait": 30}).json()
+    assert status["status"] == JOB_SUCCEEDED
+    assert status["result"]["word_filename"].startswith("Job Svc_")
+
+    assert client.get("/api/v1/templates/service-description/jobs/unknown").status_code == 404
+
+
+def test_failed_job_records_error():
+    jobs = LocalJobQueue(workers=1)
+
+    def boom():
+        raise ValueError("template missing")
+
+    job = jobs.submit("service_description", boom)
+    job = jobs.wait(job.id, timeout=5)
+    assert job.status == JOB_FAILED
+    assert job.error == "template missing"
@@ -0,0 +1,64 @@
+import base64
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+from app.utils.html_to_ooxml import HtmlRenderer
+
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+def _render(html, images=None):
+    doc = Document()
+    anchor = doc.add_paragraph("anchor")
+    doc.add_paragraph("after")
+    elements = HtmlRenderer(doc, lambda src: (images or {}).get(src)).render(anchor._p, html)
+    return doc, elements
+
+
+def _describe(doc, elements):
+    out = []
+    for el in elements:
+        if el.tag == qn("w:tbl"):
+            out.append(("table", [[tc.xpath("string(.)") for tc in tr.tc_lst] for tr in el.tr_lst]))
+        else:
+            p = Paragraph(el, doc._body)
+            out.append((p.style.name, p.text))
+    return out
+
+
+def test_blocks_keep_order_and_inline_formatting():
+    doc, elements = _render("<h3>Title</h3><p>One <strong>bold <em>both</em></strong></p><p>Two<br>lines</p>")
+    assert _describe(doc, elements) == [
+        ("Heading 3", "Title"),
+        ("Normal", "One bold both"),
+        ("Normal", "Two\nlines"),
+    ]
+    both = elements[1].xpath(".//w:r[w:t='both']")[0]
+    assert both.rPr.b is not None and both.rPr.i is not None
+    # Rendered content sits between the anchor and the following paragraph
+    assert [p.text for p in doc.paragraphs][-1] == "after"
+
+
+def test_nested_lists_and_tables_render_in_place():
+    doc, elements = _render(
+        "<ul><li>a<ul><li>a.1</li></ul></li><li>b</li></ul>"
+        "<table><tr><th>H</th><td>v</td></tr></table>"
+    )
+    assert _describe(doc, elements) == [
+        ("List Bullet", "a"),
+        ("List Bullet 2", "a.1"),
+        ("List Bullet", "b"),
+        ("table", [["H", "v"]]),
+        ("Normal", ""),
+    ]
+    assert elements[3].getnext() is elements[4]
+
+
+def test_images_embed_or_fall_back_to_reference():
+    doc, elements = _render('<p><img src="ok"></p><p>x <img src="missing"></p>', images={"ok": PNG})
+    assert len(doc.inline_shapes) == 1
+    assert ("Normal", "[image: missing]") in _describe(doc, elements)
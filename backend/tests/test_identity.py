@@ -0,0 +1,19 @@
+from app.utils.identity import canonical_name, canonical_names
+
+
+def test_canonical_name_folds_display_name_and_email_forms():
+    forms = [
+        "José  Álvarez",
+        "jose alvarez",
+        " JOSE ALVAREZ ",
+        "Jose.Alvarez@paconsulting.com",
+        "jose_alvarez+gcloud@example.org",
+        "Álvarez, José",
+    ]
+    assert {canonical_name(form) for form in forms} == {"jose alvarez"}
+
+
+def test_canonical_name_keeps_distinct_people_apart():
+    assert canonical_name("Mary-Jane O'Brien") == "mary jane obrien"
+    assert canonical_name("Jane Smith") != canonical_name("Jane Smithson")
+    assert canonical_names(["", None, "Jane Smith"]) == {"jane smith"}
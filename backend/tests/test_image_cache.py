@@ -0,0 +1,87 @@
+import base64
+import threading
+import time
+
+from docx import Document
+
+from app.services.image_cache import ImageCache, collect_image_sources
+import app.services.image_cache as image_cache_module
+
+
+# 1x1 transparent PNG
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def test_prefetch_downloads_concurrently_and_once(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_get(url, timeout):
+        with lock:
+            calls.append(url)
+        time.sleep(0.2)
+        return _Response(PNG)
+
+    import requests
+    monkeypatch.setattr(requests, "get", fake_get)
+    cache = ImageCache(max_workers=4)
+    urls = [f"http://img/{i}.png" for i in range(4)]
+
+    start = time.perf_counter()
+    result = cache.prefetch(urls + urls)
+    assert time.perf_counter() - start < 0.6
+    assert sorted(calls) == urls
+    assert all(result[u] == PNG for u in urls)
+
+    # Second generation is served from cache; identical content is stored once
+    cache.prefetch(urls)
+    assert len(calls) == 4
+    assert len(cache._content) == 1
+
+
+def test_cache_is_size_bounded():
+    cache = ImageCache(max_bytes=200)
+    for i in range(5):
+        data = bytes([i]) * 80
+        cache.fetch("data:image/png;base64," + base64.b64encode(data).decode())
+    assert cache._size <= 200
+    assert len(cache._content) == 2
+
+
+def test_generated_document_embeds_prefetched_images(tmp_path, monkeypatch):
+    tpl = tmp_path / "tpl.docx"
+    Document().save(tpl)
+    monkeypatch.setenv("SERVICE_DESC_TEMPLATE_PATH", str(tpl))
+    monkeypatch.setattr(image_cache_module, "image_cache", ImageCache())
+    data_url = "data:image/png;base64," + base64.b64encode(PNG).decode()
+    blocks = [{"subtitle": "Images", "content": f'<p>Diagram<img src="{data_url}"></p><p><img src="http://bad/x.png"></p>'}]
+    assert collect_image_sources(blocks) == [data_url, "http://bad/x.png"]
+
+    import requests
+
+    def failing_get(url, timeout):
+        raise requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(requests, "get", failing_get)
+    from app.services.document_generator import DocumentGenerator
+    import app.services.document_generator as generator_module
+    monkeypatch.setattr(generator_module, "image_cache", image_cache_module.image_cache)
+
+    generator = DocumentGenerator()
+    generator.output_dir = tmp_path
+    result = generator.generate_service_description(
+        title="Image Svc", description="d", features=["f"], benefits=["b"], service_definition=blocks,
+    )
+    doc = Document(result["word_path"])
+    assert len(doc.inline_shapes) == 1
+    assert any("[image: http://bad/x.png]" in p.text for p in doc.paragraphs)
@@ -0,0 +1,75 @@
+from docx import Document
+
+from app.services.document_generator import DocumentGenerator
+
+
+def _outline(path):
+    return [(p.style.name, p.text) for p in Document(str(path)).paragraphs]
+
+
+def _update(generator, folder, **content):
+    return generator.generate_service_description(
+        title="Inc Svc",
+        update_metadata={"folder_path": str(folder), "gcloud_version": "15", "service_name": "Inc Svc", "lot": "3"},
+        **content,
+    )
+
+
+def _content(**overrides):
+    content = dict(
+        description="First description",
+        features=["feature one", "feature two"],
+        benefits=["benefit one"],
+        service_definition=[
+            {"subtitle": "Overview", "content": "<p>Overview text</p>"},
+            {"subtitle": "Approach", "content": "<ul><li>step</li></ul>"},
+        ],
+    )
+    content.update(overrides)
+    return content
+
+
+def test_update_rewrites_changed_sections_in_place(tmp_path, monkeypatch):
+    generator = DocumentGenerator()
+    folder = tmp_path / "Inc Svc"
+    folder.mkdir()
+    first = _update(generator, folder, **_content())
+
+    builds = []
+    original_build = generator._build_document
+    monkeypatch.setattr(generator, "_build_document", lambda *a: builds.append(a) or original_build(*a))
+
+    changed = _content(
+        features=["feature one", "feature 2 reworded", "feature three"],
+        service_definition=[
+            {"subtitle": "Overview", "content": "<p>New overview</p>"},
+            {"subtitle": "Approach", "content": "<ul><li>step</li></ul>"},
+        ],
+    )
+    second = _update(generator, folder, **changed)
+    assert builds == []
+    assert second["word_path"] == first["word_path"]
+
+    # The in-place result matches a full rebuild of the same content
+    monkeypatch.setenv("INCREMENTAL_UPDATES_ENABLED", "false")
+    rebuilt_folder = tmp_path / "rebuilt" / "Inc Svc"
+    rebuilt_folder.mkdir(parents=True)
+    rebuilt = _update(DocumentGenerator(), rebuilt_folder, **changed)
+    assert _outline(second["word_path"]) == _outline(rebuilt["word_path"])
+
+
+def test_title_change_falls_back_to_full_rebuild(tmp_path, monkeypatch):
+    generator = DocumentGenerator()
+    folder = tmp_path / "Inc Svc"
+    folder.mkdir()
+    _update(generator, folder, **_content())
+
+    builds = []
+    original_build = generator._build_document
+    monkeypatch.setattr(generator, "_build_document", lambda *a: builds.append(a) or original_build(*a))
+    generator.generate_service_description(
+        title="Renamed Svc",
+        update_metadata={"folder_path": str(folder), "gcloud_version": "15", "service_name": "Inc Svc", "lot": "3"},
+        **_content(),
+    )
+    assert len(builds) == 1
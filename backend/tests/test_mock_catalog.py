@@ -0,0 +1,55 @@
+from sharepoint_service.mock_catalog import MockCatalog
+from sharepoint_service.mock_sharepoint import parse_metadata_content
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+
+
+def _folder(base, name, owner="Jane Smith", docs=()):
+    folder = base / LOT3 / name
+    folder.mkdir(parents=True)
+    (folder / f"OWNER {owner}.txt").write_text(f"1. SERVICE: {name}\n2. OWNER: {owner}\n3. SPONSOR: Sam Jones\n")
+    for doc in docs:
+        (folder / doc).write_bytes(b"docx")
+    return folder
+
+
+def test_catalog_parses_metadata_once_and_prefers_completed_documents(tmp_path):
+    _folder(tmp_path, "Alpha", docs=["PA GC15 SERVICE DESC Alpha.docx", "PA GC15 SERVICE DESC Alpha_draft.docx"])
+    _folder(tmp_path, "Beta", owner="Joe Bloggs", docs=["PA GC15 Pricing Doc Beta_draft.docx"])
+    catalog = MockCatalog(tmp_path, parse_metadata_content, poll_seconds=0, watch="poll")
+
+    alpha, beta = catalog.folders("15", "3")
+    assert alpha.metadata == {"service": "Alpha", "owner": "Jane Smith", "sponsor": "Sam Jones"}
+    assert alpha.document("SERVICE DESC").name == "PA GC15 SERVICE DESC Alpha.docx"
+    assert alpha.document("Pricing Doc") is None
+    assert beta.document("Pricing Doc").name == "PA GC15 Pricing Doc Beta_draft.docx"
+    assert catalog.versions() == ["15"]
+
+    # Unchanged folders are not re-scanned by later polls
+    scans = catalog.folder_scans
+    catalog.folders()
+    assert catalog.folder_scans == scans
+
+
+def test_polling_picks_up_new_folders_and_files(tmp_path):
+    alpha = _folder(tmp_path, "Alpha")
+    catalog = MockCatalog(tmp_path, parse_metadata_content, poll_seconds=0, watch="poll")
+    assert catalog.folder("15", "3", "Alpha").document("SERVICE DESC") is None
+
+    (alpha / "PA GC15 SERVICE DESC Alpha.docx").write_bytes(b"docx")
+    _folder(tmp_path, "Gamma")
+
+    assert catalog.folder("15", "3", "Alpha").document("SERVICE DESC") is not None
+    assert [folder.name for folder in catalog.folders()] == ["Alpha", "Gamma"]
+
+
+def test_note_change_refreshes_in_place_rewrites(tmp_path):
+    alpha = _folder(tmp_path, "Alpha")
+    catalog = MockCatalog(tmp_path, parse_metadata_content, poll_seconds=3600, watch="poll")
+    assert catalog.folder("15", "3", "Alpha").metadata["sponsor"] == "Sam Jones"
+
+    owner_file = alpha / "OWNER Jane Smith.txt"
+    owner_file.write_text("1. SERVICE: Alpha\n2. OWNER: Jane Smith\n3. SPONSOR: Ann Lee\n")
+    catalog.note_change(owner_file)
+
+    assert catalog.folder("15", "3", "Alpha").metadata["sponsor"] == "Ann Lee"
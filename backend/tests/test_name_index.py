@@ -0,0 +1,53 @@
+from sharepoint_service import mock_sharepoint
+from sharepoint_service.mock_sharepoint import fuzzy_match
+from sharepoint_service.name_index import ServiceNameIndex
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+NAMES = ["Agile Test Title", "Test Title", "Test Title v2", "Test", "AI", "Data Platform", "Cloud Migration v3"]
+
+
+def test_matches_are_ranked_deterministically():
+    index = ServiceNameIndex(reversed(NAMES))
+
+    assert index.matches("Test Title") == ["Test Title", "Test Title v2", "Agile Test Title", "Test"]
+    assert index.best(" test title V2 ") == "Test Title v2"
+    assert index.best("cloud migration") == "Cloud Migration v3"
+    assert index.best("Unknown Service") is None
+    assert index.matches("") == []
+
+
+def test_matches_agree_with_fuzzy_match():
+    index = ServiceNameIndex(NAMES)
+
+    for query in ["test", "Title", "ai", "a", "Data Platform Services", "migration v1", "Agile", "xyz", " Test Title "]:
+        assert set(index.matches(query)) == {name for name in NAMES if fuzzy_match(query, name)}, query
+
+
+def test_bulk_lookup_resolves_against_one_index(tmp_path, monkeypatch):
+    for name, docs in [("Agile Test Title", ["PA GC15 SERVICE DESC Agile Test Title.docx"]),
+                       ("Test Title", ["PA GC15 SERVICE DESC Test Title_draft.docx", "PA GC15 Pricing Doc Test Title.docx"])]:
+        folder = tmp_path / LOT3 / name
+        folder.mkdir(parents=True)
+        for doc in docs:
+            (folder / doc).write_bytes(b"docx")
+    monkeypatch.delenv("AZURE_STORAGE_CONNECTION_STRING", raising=False)
+    monkeypatch.setenv("MOCK_CATALOG_WATCH", "poll")
+    monkeypatch.setattr(mock_sharepoint, "MOCK_BASE_PATH", tmp_path)
+
+    paths = mock_sharepoint.get_document_paths_bulk([
+        ("test title", "SERVICE DESC", "3", "15"),
+        ("Test Title", "Pricing Doc", "3", "15"),
+        ("Agile", "SERVICE DESC", "3", "15"),
+        ("Missing", "SERVICE DESC", "3", "15"),
+        ("Test Title", "SERVICE DESC", "2", "15"),
+    ])
+
+    assert [path.name if path else None for path in paths] == [
+        "PA GC15 SERVICE DESC Test Title_draft.docx",
+        "PA GC15 Pricing Doc Test Title.docx",
+        "PA GC15 SERVICE DESC Agile Test Title.docx",
+        None,
+        None,
+    ]
+    assert mock_sharepoint.get_document_path("Title", "SERVICE DESC", "3", "15") == paths[0]
+    assert mock_sharepoint.find_service_folder("agile test", "3", "15") == tmp_path / LOT3 / "Agile Test Title"
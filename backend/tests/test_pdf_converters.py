@@ -0,0 +1,115 @@
+import asyncio
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+from app.services import pdf_converters
+from app.services.pdf_converters import (
+    ConversionRequest,
+    ConversionResult,
+    ConverterOverloaded,
+    HttpFunctionConverter,
+    LocalConverter,
+    PdfConverter,
+    get_pdf_converter,
+)
+
+
+class _BlockingConverter(PdfConverter):
+    name = "blocking"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def _convert(self, request):
+        self.started.release()
+        self.release.wait(5)
+        return ConversionResult(success=True, pdf_key=request.pdf_key)
+
+
+def test_admission_control_bounds_concurrency_and_queue():
+    converter = _BlockingConverter(max_concurrency=1, max_queue=1, queue_timeout=5)
+    results = []
+
+    def run():
+        results.append(converter.convert(ConversionRequest("a.docx", "a.pdf")))
+
+    first = threading.Thread(target=run)
+    first.start()
+    converter.started.acquire(timeout=5)
+    second = threading.Thread(target=run)
+    second.start()
+    while converter.metrics.snapshot()["queued"] < 1:
+        time.sleep(0.001)
+
+    # One running, one waiting: the next caller is refused instead of piling up
+    with pytest.raises(ConverterOverloaded):
+        converter.convert(ConversionRequest("b.docx", "b.pdf"))
+
+    converter.release.set()
+    first.join()
+    second.join()
+    snapshot = converter.metrics.snapshot()
+    assert [r.success for r in results] == [True, True]
+    assert (snapshot["succeeded"], snapshot["rejected"], snapshot["in_flight"], snapshot["queued"]) == (2, 1, 0, 0)
+    assert "latency_ms_p95" in snapshot
+
+
+def test_slot_wait_times_out():
+    converter = _BlockingConverter(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+    worker = threading.Thread(target=converter.convert, args=(ConversionRequest("a.docx", "a.pdf"),))
+    worker.start()
+    converter.started.acquire(timeout=5)
+    with pytest.raises(ConverterOverloaded):
+        converter.convert(ConversionRequest("b.docx", "b.pdf"))
+    converter.release.set()
+    worker.join()
+
+
+def test_backend_follows_deployment_mode(monkeypatch):
+    monkeypatch.setattr(pdf_converters, "_converters", {})
+    monkeypatch.delenv("PDF_CONVERTER_BACKEND", raising=False)
+    monkeypatch.delenv("PDF_CONVERTER_FUNCTION_URL", raising=False)
+    assert get_pdf_converter(use_azure=True) is None
+
+    monkeypatch.setenv("PDF_CONVERTER_FUNCTION_URL", "http://converter")
+    converter = get_pdf_converter(use_azure=True)
+    assert isinstance(converter, HttpFunctionConverter)
+    assert get_pdf_converter(use_azure=True) is converter
+
+    monkeypatch.setenv("PDF_CONVERTER_BACKEND", "none")
+    assert get_pdf_converter(use_azure=True) is None
+
+
+def test_local_converter_runs_on_the_warm_pool(tmp_path, monkeypatch):
+    from pdf_converter import soffice_pool
+    from pdf_converter.soffice_pool import SofficePool
+
+    monkeypatch.setattr(soffice_pool, "PROFILE_ROOT", tmp_path / "profiles")
+    binary = tmp_path / "soffice"
+    binary.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "from pathlib import Path\n"
+        "args = sys.argv[1:]\n"
+        "out = Path(args[args.index('--outdir') + 1])\n"
+        "(out / (Path(args[-1]).stem + '.pdf')).write_bytes(b'%PDF-1.4')\n"
+    )
+    binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+    pool = SofficePool(size=1, binary=str(binary), use_uno=False)
+    converter = LocalConverter(pool, max_concurrency=1)
+    word = tmp_path / "draft-1234.docx"
+    word.write_bytes(b"docx")
+    pdf = tmp_path / "PA GC15 SERVICE DESC Alpha.pdf"
+
+    result = asyncio.run(converter.convert_async(ConversionRequest(str(word), str(pdf))))
+
+    assert result.success and result.pdf_key == str(pdf)
+    assert pdf.read_bytes() == b"%PDF-1.4"
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith(".convert-")] == []
+    assert pool._workers[0].jobs == 1
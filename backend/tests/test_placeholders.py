@@ -0,0 +1,28 @@
+from docx import Document
+from app.utils.docx_placeholders import replace_placeholders
+
+
+def test_placeholder_split_across_runs_is_replaced():
+    d = Document()
+    p = d.add_paragraph()
+    p.add_run("Welcome to {{SERV")
+    p.add_run("ICE_")
+    p.add_run("NAME}} today")
+
+    count = replace_placeholders(d, {'{{SERVICE_NAME}}': 'My Service'})
+
+    assert count == 1
+    assert p.text == "Welcome to My Service today"
+    assert [r.text for r in p.runs] == ["Welcome to My Service", "", " today"]
+
+
+def test_placeholders_replaced_in_headers_and_all_occurrences():
+    d = Document()
+    d.sections[0].header.paragraphs[0].text = "Header SERVICE TITLE"
+    d.add_paragraph("SERVICE TITLE and SERVICE NAME")
+
+    count = replace_placeholders(d, {'SERVICE TITLE': 'Svc', 'SERVICE NAME': 'Svc'})
+
+    assert count == 3
+    assert d.sections[0].header.paragraphs[0].text == "Header Svc"
+    assert d.paragraphs[0].text == "Svc and Svc"
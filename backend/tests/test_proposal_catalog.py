@@ -0,0 +1,93 @@
+import sqlite3
+
+from app.services.proposal_catalog import ProposalCatalog, catalog_row
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+
+
+def _catalog(tmp_path, rows):
+    scans = []
+
+    def scan():
+        scans.append(1)
+        return [dict(row) for row in rows]
+
+    db_path = tmp_path / "catalog.sqlite3"
+    return ProposalCatalog(lambda: sqlite3.connect(db_path), scan, reconcile_seconds=3600), scans
+
+
+def test_first_query_reconciles_then_filters_by_owner(tmp_path):
+    catalog, scans = _catalog(tmp_path, [
+        catalog_row("15", "3", "Alpha", {"service": "Alpha", "owner": "Jane Smith", "sponsor": "Sam Jones"},
+                    f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx", None, 1700000000.0),
+        catalog_row("15", "3", "Beta", {"service": "Beta", "owner": "Joe Bloggs"}),
+        catalog_row("15", "3", "Orphan"),
+    ])
+
+    proposals = catalog.proposals(owner="jane smith ")
+    assert [(p["title"], p["status"], p["sponsor"]) for p in proposals] == [("Alpha", "incomplete", "Sam Jones")]
+    assert {p["title"] for p in catalog.proposals()} == {"Alpha", "Beta"}
+    assert len(scans) == 1
+
+
+def test_write_through_updates_rows_without_rescanning(tmp_path):
+    catalog, scans = _catalog(tmp_path, [])
+    catalog.ensure_reconciled()
+
+    catalog.record_folder(f"/srv/mock_sharepoint/{LOT3}/Gamma", {"service": "Gamma", "owner": "Ann Lee"})
+    catalog.record_document(f"/srv/mock_sharepoint/{LOT3}/Gamma/PA GC15 Pricing Doc Gamma_draft.docx")
+    catalog.record_document(f"/srv/mock_sharepoint/{LOT3}/Gamma/PA GC15 SERVICE DESC Gamma.docx")
+    (proposal,) = catalog.proposals(owner="Ann Lee")
+    assert proposal["status"] == "complete"
+
+    # A later draft save does not hide the completed document
+    catalog.record_document(f"{LOT3}/Gamma/PA GC15 SERVICE DESC Gamma_draft.docx")
+    catalog.forget_document(f"/srv/mock_sharepoint/{LOT3}/Gamma/PA GC15 Pricing Doc Gamma_draft.docx")
+    (proposal,) = catalog.proposals(owner="Ann Lee")
+    assert (proposal["service_desc_exists"], proposal["pricing_doc_exists"]) == (True, False)
+
+    catalog.remove_folder(f"{LOT3}/Gamma/")
+    assert catalog.proposals() == []
+    assert len(scans) == 1
+
+
+def test_reconcile_drops_vanished_folders_and_persists(tmp_path):
+    rows = [catalog_row("15", "2", "Alpha", {"owner": "Jane Smith"}), catalog_row("15", "2", "Beta", {"owner": "Jane Smith"})]
+    catalog, _ = _catalog(tmp_path, rows)
+    catalog.reconcile()
+    rows.pop()
+    catalog.reconcile()
+
+    # A new process over the same database serves the catalog without scanning
+    reopened, scans = _catalog(tmp_path, [])
+    assert [p["title"] for p in reopened.proposals(owner="Jane Smith")] == ["Alpha"]
+    assert scans == []
+
+
+def test_owner_lookup_uses_canonical_names_and_aliases(tmp_path):
+    catalog, _ = _catalog(tmp_path, [
+        catalog_row("15", "2", "Alpha", {"owner": "José Álvarez"}),
+        catalog_row("15", "2", "Beta", {"owner": "Jane Smith"}),
+    ])
+
+    assert [p["title"] for p in catalog.proposals(owner="jose alvarez")] == ["Alpha"]
+    assert [p["title"] for p in catalog.proposals(owner="Jose", aliases=["jose.alvarez@paconsulting.com"])] == ["Alpha"]
+    assert catalog.proposals(owner="") == []
+
+
+def test_catalog_defaults_to_postgres_only_when_a_database_is_configured(monkeypatch):
+    from app.services import database, proposal_catalog
+
+    monkeypatch.delenv("PROPOSAL_CATALOG", raising=False)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.delenv("USE_S3", raising=False)
+    monkeypatch.delenv("AZURE_STORAGE_CONNECTION_STRING", raising=False)
+    monkeypatch.setattr(proposal_catalog, "_catalog", None)
+    assert proposal_catalog.get_proposal_catalog() is None
+
+    class _DbService:
+        get_connection = staticmethod(lambda: None)
+
+    monkeypatch.setenv("DATABASE_URL", "postgresql://user@localhost/gcloud")
+    monkeypatch.setattr(database, "get_db_service", lambda: _DbService())
+    assert proposal_catalog.get_proposal_catalog().paramstyle == "format"
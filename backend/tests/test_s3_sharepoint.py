@@ -0,0 +1,85 @@
+from collections import Counter
+
+import pytest
+
+from sharepoint_service import s3_sharepoint
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+LOT3 = "GCloud 15/PA Services/Cloud Support Services LOT 3"
+OBJECTS = {
+    f"{LOT3}/Alpha/OWNER Jane Doe.txt": b"1. SERVICE: Alpha\n2. OWNER: Jane Doe\n3. SPONSOR: Sam Roe\n",
+    f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx": b"docx",
+    f"{LOT3}/Alpha/PA GC15 Pricing Doc Alpha_draft.docx": b"docx",
+    f"{LOT3}/Beta/OWNER John Roe.txt": b"1. SERVICE: Beta\n2. OWNER: John Roe\n3. SPONSOR: Sam Roe\n",
+    f"{LOT3}/Gamma/notes.md": b"no metadata",
+}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """A moto-backed SharePoint bucket; ``s3.calls`` counts API operations"""
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="bucket")
+        for key, body in OBJECTS.items():
+            client.put_object(Bucket="bucket", Key=key, Body=body)
+
+        client.calls = Counter()
+        client.meta.events.register(
+            "before-call.s3.*",
+            lambda model, **kwargs: client.calls.update([model.name]),
+        )
+        monkeypatch.setattr(s3_sharepoint, "get_s3_client", lambda: client)
+        monkeypatch.setattr(s3_sharepoint, "get_sharepoint_bucket", lambda: "bucket")
+        s3_sharepoint.invalidate_scan_cache()
+        yield client
+        s3_sharepoint.invalidate_scan_cache()
+
+
+def test_scan_lists_once_and_reads_each_metadata_file_once(s3):
+    folders = s3_sharepoint.list_all_folders("15")
+    alpha = next(f for f in folders if f["service_name"] == "Alpha")
+    modified = s3.head_object(Bucket="bucket", Key=alpha["pricing_doc_key"])["LastModified"]
+    s3.calls.clear()
+
+    assert [f["service_name"] for f in folders] == ["Alpha", "Beta"]
+    assert alpha["service_desc_key"] == f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx"
+    assert alpha["pricing_doc_key"] == f"{LOT3}/Alpha/PA GC15 Pricing Doc Alpha_draft.docx"
+    assert alpha["last_modified"] == modified.isoformat()
+
+    # Follow-up lookups are served from the same scan
+    assert s3_sharepoint.read_metadata_file(f"{LOT3}/Beta/")["owner"] == "John Roe"
+    assert s3_sharepoint.get_document_path("Alpha", "Pricing Doc", "3", "15") == alpha["pricing_doc_key"]
+    assert s3_sharepoint.get_document_path("Beta", "SERVICE DESC", "3", "15") is None
+    assert [r["doc_type"] for r in s3_sharepoint.search_documents("alpha", gcloud_version="15")] == ["SERVICE DESC", "Pricing Doc"]
+    assert s3.calls == Counter()
+
+
+def test_scan_issues_one_listing_per_lot_and_no_heads(s3):
+    s3_sharepoint.list_all_folders("15")
+
+    # LOT 2 and LOT 3 listed once each; two metadata bodies
+    assert s3.calls == Counter({"ListObjectsV2": 2, "GetObject": 2})
+
+
+def test_writes_invalidate_the_scan(s3):
+    s3_sharepoint.list_all_folders("15")
+
+    assert s3_sharepoint.create_metadata_file(f"{LOT3}/Gamma/", "Gamma", "Ann Lee", "Sam Roe")
+
+    assert [f["service_name"] for f in s3_sharepoint.list_all_folders("15")] == ["Alpha", "Beta", "Gamma"]
+
+
+def test_bulk_lookup_shares_one_scan(s3):
+    keys = s3_sharepoint.get_document_paths_bulk([
+        ("alpha", "SERVICE DESC", "3", "15"),
+        ("Alpha", "Pricing Doc", "3", "15"),
+        ("Beta", "SERVICE DESC", "3", "15"),
+        ("Alpha", "Unknown", "3", "15"),
+    ])
+
+    assert keys == [f"{LOT3}/Alpha/PA GC15 SERVICE DESC Alpha.docx", f"{LOT3}/Alpha/PA GC15 Pricing Doc Alpha_draft.docx", None, None]
+    assert s3.calls["ListObjectsV2"] == 1
+    assert s3.calls["HeadObject"] == 0
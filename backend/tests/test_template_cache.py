@@ -0,0 +1,111 @@
+import os
+import threading
+from docx import Document
+from app.services.template_cache import TemplateCache
+
+
+def _make_template(path, text):
+    d = Document()
+    d.add_paragraph(text)
+    d.save(path)
+
+
+def test_template_parsed_once_and_copies_are_independent(tmp_path):
+    tpl = tmp_path / "tpl.docx"
+    _make_template(tpl, "SERVICE TITLE")
+    cache = TemplateCache()
+
+    first = cache.get_local(tpl)
+    first.paragraphs[0].text = "Changed"
+    second = cache.get_local(tpl)
+
+    assert cache.misses == 1 and cache.hits == 1
+    assert second.paragraphs[0].text == "SERVICE TITLE"
+
+
+def test_template_reloaded_when_file_changes(tmp_path):
+    tpl = tmp_path / "tpl.docx"
+    _make_template(tpl, "Original")
+    cache = TemplateCache()
+    assert cache.get_local(tpl).paragraphs[0].text == "Original"
+
+    _make_template(tpl, "Updated template")
+    st = tpl.stat()
+    os.utime(tpl, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get_local(tpl).paragraphs[0].text == "Updated template"
+    assert cache.misses == 2
+
+
+class _FakeS3:
+    template_bucket = "tpl-bucket"
+
+    def __init__(self, data):
+        self.data = data
+        self.etag = '"v1"'
+        self.gets = 0
+
+    def get_template_etag(self, key):
+        return self.etag
+
+    def get_template_bytes(self, key):
+        self.gets += 1
+        return self.data
+
+
+def test_remote_template_revalidated_by_etag(tmp_path):
+    tpl = tmp_path / "tpl.docx"
+    _make_template(tpl, "Remote")
+    s3 = _FakeS3(tpl.read_bytes())
+    cache = TemplateCache(remote_revalidate_seconds=0)
+
+    cache.get_s3(s3, "templates/t.docx")
+    cache.get_s3(s3, "templates/t.docx")
+    assert s3.gets == 1
+
+    s3.etag = '"v2"'
+    cache.get_s3(s3, "templates/t.docx")
+    assert s3.gets == 2
+
+
+def test_version_shares_the_cached_validator(tmp_path):
+    tpl = tmp_path / "tpl.docx"
+    _make_template(tpl, "Remote")
+    s3 = _FakeS3(tpl.read_bytes())
+    heads = []
+    s3.get_template_etag = lambda key: heads.append(key) or s3.etag
+    cache = TemplateCache(remote_revalidate_seconds=60)
+
+    assert cache.version_s3(s3, "templates/t.docx") == 's3:"v1"'
+    cache.get_s3(s3, "templates/t.docx")
+    assert cache.version_s3(s3, "templates/t.docx") == 's3:"v1"'
+    # One HEAD and one load, however often the version is asked for within the revalidation window
+    assert (len(heads), s3.gets) == (1, 1)
+    stat = tpl.stat()
+    assert cache.version_local(tpl) == f"file:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def test_slow_revalidation_only_blocks_its_own_template(tmp_path):
+    tpl = tmp_path / "tpl.docx"
+    _make_template(tpl, "Remote")
+    slow, fast = _FakeS3(tpl.read_bytes()), _FakeS3(tpl.read_bytes())
+    slow.template_bucket = "slow-bucket"
+    head_started, release = threading.Event(), threading.Event()
+
+    def slow_etag(key):
+        head_started.set()
+        release.wait(5)
+        return slow.etag
+
+    slow.get_template_etag = slow_etag
+    cache = TemplateCache(remote_revalidate_seconds=0)
+    waiter = threading.Thread(target=cache.get_s3, args=(slow, "templates/t.docx"))
+    waiter.start()
+    try:
+        assert head_started.wait(5)
+        # Served while the other template's HEAD is still outstanding
+        assert cache.get_s3(fast, "templates/t.docx").paragraphs[0].text == "Remote"
+    finally:
+        release.set()
+        waiter.join(5)
+    assert slow.gets == 1 and cache.misses == 2
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from app.services.document_generator import document_generator
+from app.utils.docx_toc import TOC_BOOKMARK_PREFIX, find_toc_field, toc_is_materialised
+
+
+def _toc_entries(doc):
+    """(text, anchor, cached page) for each TOC hyperlink entry"""
+    field = find_toc_field(doc._element.body)
+    assert field is not None
+    entries = []
+    for p in field.paragraphs:
+        for link in p.iter(qn('w:hyperlink')):
+            texts = [t.text for t in link.iter(qn('w:t'))]
+            entries.append((texts[0], link.get(qn('w:anchor')), texts[-1]))
+    return entries
+
+
+def test_generated_toc_lists_headings_with_page_numbers():
+    result = document_generator.generate_service_description(
+        title="Toc Service",
+        description="A short description",
+        features=["Feature one"],
+        benefits=["Benefit one"],
+        service_definition=[
+            {"subtitle": "Overview", "content": "<p>" + "Long text. " * 800 + "</p>"},
+            {"subtitle": "Approach", "content": "<p>Approach text</p>"},
+        ],
+    )
+    doc = Document(str(Path(result["word_path"])))
+    assert toc_is_materialised(doc)
+
+    entries = _toc_entries(doc)
+    texts = [text for text, _, _ in entries]
+    for heading in ("Toc Service", "Short Service Description", "Service Definition", "Overview", "Approach"):
+        assert heading in texts
+
+    # Every entry links to a bookmark on the heading it names
+    bookmarks = {}
+    for p in doc.paragraphs:
+        for start in p._p.iter(qn('w:bookmarkStart')):
+            if start.get(qn('w:name')).startswith(TOC_BOOKMARK_PREFIX):
+                bookmarks[start.get(qn('w:name'))] = p.text
+    for text, anchor, page in entries:
+        assert bookmarks[anchor] == text
+        assert page.isdigit()
+
+    # The PAGEREF fields stay live, and long content pushes later headings onto later pages
+    instructions = "".join(t.text for t in doc.element.body.iter(qn('w:instrText')))
+    assert instructions.count("PAGEREF") == len(entries)
+    pages = {text: int(page) for text, _, page in entries}
+    assert pages["Approach"] > pages["Overview"]
+
+
+def test_regenerating_toc_replaces_previous_entries(tmp_path):
+    folder = tmp_path / "Toc Svc"
+    folder.mkdir()
+    update_metadata = {"folder_path": str(folder), "gcloud_version": "15", "service_name": "Toc Svc", "lot": "3"}
+    content = dict(description="d", features=["f"], benefits=["b"],
+                   service_definition=[{"subtitle": "First", "content": "<p>x</p>"}])
+    document_generator.generate_service_description(title="Toc Svc", update_metadata=update_metadata, **content)
+    content["service_definition"] = [{"subtitle": "First", "content": "<p>x</p>"},
+                                     {"subtitle": "Second", "content": "<p>y</p>"}]
+    result = document_generator.generate_service_description(title="Toc Svc", update_metadata=update_metadata, **content)
+
+    doc = Document(result["word_path"])
+    texts = [text for text, _, _ in _toc_entries(doc)]
+    assert texts.count("First") == 1
+    assert "Second" in texts
+    names = [el.get(qn('w:name')) for el in doc.element.body.iter(qn('w:bookmarkStart'))]
+    toc_names = [n for n in names if n.startswith(TOC_BOOKMARK_PREFIX)]
+    assert len(toc_names) == len(set(toc_names)) == len(texts)
+
+
+def test_page_estimate_sizes_pictures_and_table_rows():
+    import base64
+    from io import BytesIO
+    from docx.shared import Cm
+    from app.utils.docx_toc import estimate_pages
+
+    png = base64.b64decode(
+        "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+    )
+    doc = Document()
+    first = doc.add_heading("Diagram", level=1)
+    doc.add_picture(BytesIO(png), height=Cm(18))
+    doc.add_paragraph("Caption")
+    # Does not fit under the caption, so the picture starts page 2
+    doc.add_picture(BytesIO(png), height=Cm(12))
+    after_pictures = doc.add_heading("Rates", level=1)
+    table = doc.add_table(rows=4, cols=2)
+    for row in table.rows:
+        row.height = Cm(9)  # Two rows per page; rows never split
+    after_table = doc.add_heading("Terms", level=1)
+
+    pages = estimate_pages(doc, [first._p, after_pictures._p, after_table._p])
+
+    assert pages[first._p] == 1
+    assert pages[after_pictures._p] == 2
+    assert pages[after_table._p] == 4
@@ -26,3 +26,26 @@ resource "azurerm_storage_container" "containers" {
   container_access_type = "private"
 }
 
+
+# Content-addressed PDF cache copies (PDF_CACHE_PREFIX in app/services/pdf_cache.py)
+# grow by one blob per distinct document version; expire them in every container
+resource "azurerm_storage_management_policy" "pdf_cache" {
+  count              = var.pdf_cache_expiration_days > 0 && length(var.containers) > 0 ? 1 : 0
+  storage_account_id = azurerm_storage_account.this.id
+
+  rule {
+    name    = "expire-pdf-cache"
+    enabled = true
+
+    filters {
+      blob_types   = ["blockBlob"]
+      prefix_match = [for container in var.containers : "${container}/_pdf_cache/"]
+    }
+
+    actions {
+      base_blob {
+        delete_after_days_since_modification_greater_than = var.pdf_cache_expiration_days
+      }
+    }
+  }
+}
@@ -17,6 +17,12 @@ variable "containers" {
   default     = []
 }
 
+variable "pdf_cache_expiration_days" {
+  description = "Days before cached PDF copies under _pdf_cache/ are deleted (0 disables the policy)"
+  type        = number
+  default     = 30
+}
+
 variable "account_tier" {
   type    = string
   default = "Standard"
@@ -145,6 +145,30 @@ resource "aws_s3_bucket_lifecycle_configuration" "uploads" {
   }
 }
 
+# Content-addressed PDF cache copies (PDF_CACHE_PREFIX in pdf_converter.py). Every
+# distinct document version adds one; an expired entry is re-created on the next miss.
+resource "aws_s3_bucket_lifecycle_configuration" "output" {
+  bucket = aws_s3_bucket.output.id
+
+  rule {
+    id     = "expire-pdf-cache"
+    status = "Enabled"
+
+    filter {
+      prefix = "_pdf_cache/"
+    }
+
+    expiration {
+      days = var.pdf_cache_expiration_days
+    }
+
+    # The bucket is versioned: also drop the versions expiry leaves behind
+    noncurrent_version_expiration {
+      noncurrent_days = 1
+    }
+  }
+}
+
 # S3 Bucket for Lambda Deployment Package
 resource "aws_s3_bucket" "lambda_deploy" {
   bucket = "${var.project_name}-${var.environment}-lambda-deploy"
@@ -30,6 +30,12 @@ variable "tags" {
   }
 }
 
+variable "pdf_cache_expiration_days" {
+  description = "Days before cached PDF copies under _pdf_cache/ in the output bucket are deleted"
+  type        = number
+  default     = 30
+}
+
 variable "lambda_deploy_s3_key" {
   description = "S3 key for Lambda deployment package (e.g., 'lambda-package.zip')"
   type        = string